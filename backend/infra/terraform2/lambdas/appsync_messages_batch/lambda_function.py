@@ -1,13 +1,23 @@
 """
 AppSync Lambda Resolver: Batch fetch messages with reactions
-Efficiently fetches messages and their reactions in a single call using parallel DynamoDB queries.
+Serves the `messages` and `messageHistory` queries. Each page costs a fixed
+number of DynamoDB round trips regardless of how many messages or reactions
+it holds:
+
+1. One Query over the room's time-ordered `MSG#{ts}#{id}` sort keys
+2. One BatchGetItem for the page's reaction rollups (`MSG#{id}` / `SUMMARY#REACTIONS`)
+3. One BatchGetItem for the viewer's own `REACT#{shortcode}#{userId}` items
+
+`messageHistory` pages backwards with an opaque cursor (the last sort key of
+the previous page); `messages` keeps its `after` timestamp argument.
 """
+import base64
 import json
 import os
-import asyncio
-from concurrent.futures import ThreadPoolExecutor
-from typing import Dict, List, Any, Optional
+import time
+from typing import Dict, List, Any, Optional, Tuple
 import boto3
+from boto3.dynamodb.conditions import Key
 from botocore.config import Config
 
 # DynamoDB client with retry configuration
@@ -18,7 +28,6 @@ dynamodb_config = Config(
     }
 )
 dynamodb = boto3.resource('dynamodb', config=dynamodb_config)
-dynamodb_client = boto3.client('dynamodb', config=dynamodb_config)
 
 # Get table names from environment
 CORE_TABLE_NAME = os.getenv('DYNAMODB_TABLE_NAME', 'gg_core')
@@ -26,94 +35,179 @@ GUILD_TABLE_NAME = os.getenv('GUILD_TABLE_NAME', 'gg_guild')
 print(f"Lambda initialized with CORE_TABLE_NAME={CORE_TABLE_NAME}, GUILD_TABLE_NAME={GUILD_TABLE_NAME}")
 core_table = dynamodb.Table(CORE_TABLE_NAME)
 guild_table = dynamodb.Table(GUILD_TABLE_NAME)
-print(f"Lambda tables initialized: core_table.name={core_table.name}, guild_table.name={guild_table.name}")
 
+MAX_PAGE_SIZE = 100
+# BatchGetItem accepts at most 100 keys per request
+BATCH_GET_MAX_KEYS = 100
+REACTION_ROLLUP_SK = 'SUMMARY#REACTIONS'
+
+
+class InvalidCursor(ValueError):
+    pass
 
-def fetch_single_message_reactions_sync(message_id: str, table_to_use=None) -> tuple:
-    """Fetch reactions for a single message (synchronous)"""
+
+def encode_cursor(sort_key: str) -> str:
+    """Opaque cursor for the page that starts after `sort_key`."""
+    return base64.urlsafe_b64encode(json.dumps({'sk': sort_key}).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> str:
     try:
-        # Use provided table or default to core_table
-        if table_to_use is None:
-            table_to_use = core_table
-        
-        pk = f'MSG#{message_id}'
-        
-        # Query reaction summaries
-        response = table_to_use.query(
-            KeyConditionExpression='PK = :pk AND begins_with(SK, :sk)',
-            ExpressionAttributeValues={
-                ':pk': pk,
-                ':sk': 'SUMMARY#REACT#'
-            }
-        )
-        
-        reactions = []
-        for item in response.get('Items', []):
-            sk = item.get('SK', '')
-            if not sk.startswith('SUMMARY#REACT#'):
-                continue
-            
-            shortcode = sk.replace('SUMMARY#REACT#', '')
-            if not shortcode:
-                continue
-            
-            # Check if user has reacted (would require additional query, skip for now)
-            # Could optimize by batching GetItem calls for viewerHasReacted checks
-            reactions.append({
-                'shortcode': shortcode,
-                'unicode': item.get('unicode', ''),
-                'count': item.get('count', 0),
-                'viewerHasReacted': False  # Could be enhanced with batch GetItem
-            })
-        
-        return (message_id, reactions)
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_key = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())['sk']
     except Exception as e:
-        print(f"Error fetching reactions for message {message_id}: {e}")
-        return (message_id, [])
+        raise InvalidCursor('Invalid cursor') from e
+    if not isinstance(sort_key, str) or not sort_key.startswith('MSG#'):
+        raise InvalidCursor('Invalid cursor')
+    return sort_key
 
 
-async def fetch_reactions_parallel(message_ids: List[str], user_id: str, table_to_use=None) -> Dict[str, List[Dict[str, Any]]]:
+def batch_get_items(table_name: str, keys: List[Dict[str, str]], projection: Optional[str] = None,
+                    max_attempts: int = 4) -> List[Dict[str, Any]]:
+    """BatchGetItem in chunks of 100 keys, retrying unprocessed keys with backoff."""
+    items: List[Dict[str, Any]] = []
+    for start in range(0, len(keys), BATCH_GET_MAX_KEYS):
+        request: Dict[str, Any] = {'Keys': keys[start:start + BATCH_GET_MAX_KEYS]}
+        if projection:
+            request['ProjectionExpression'] = projection
+        for attempt in range(max_attempts):
+            if attempt:
+                time.sleep(0.05 * (2 ** (attempt - 1)))
+            response = dynamodb.batch_get_item(RequestItems={table_name: request})
+            items.extend(response.get('Responses', {}).get(table_name, []))
+            unprocessed = response.get('UnprocessedKeys', {}).get(table_name)
+            if not unprocessed:
+                break
+            request = unprocessed
+        else:
+            print(f"WARNING: {len(request.get('Keys', []))} keys still unprocessed after {max_attempts} attempts")
+    return items
+
+
+def fetch_reactions_batch(message_ids: List[str], user_id: Optional[str]) -> Dict[str, List[Dict[str, Any]]]:
     """
-    Batch fetch reactions for multiple messages in parallel using asyncio and ThreadPoolExecutor.
+    Reactions for a page of messages in (at most) two BatchGetItem round trips.
+    Reactions always live in the core table, for guild rooms too.
     Returns dict mapping message_id to list of reactions.
     """
     if not message_ids:
         return {}
-    
-    # Use ThreadPoolExecutor to run synchronous boto3 calls in parallel
-    loop = asyncio.get_event_loop()
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        # Create tasks for parallel execution
-        tasks = [
-            loop.run_in_executor(executor, fetch_single_message_reactions_sync, msg_id, table_to_use)
-            for msg_id in message_ids if msg_id
+
+    rollups = batch_get_items(
+        CORE_TABLE_NAME,
+        [{'PK': f'MSG#{message_id}', 'SK': REACTION_ROLLUP_SK} for message_id in message_ids],
+    )
+
+    summaries: Dict[str, List[Tuple[str, str, int]]] = {}
+    for item in rollups:
+        message_id = item['PK'][len('MSG#'):]
+        entries = []
+        for name, value in item.items():
+            if not name.startswith('count#'):
+                continue
+            count = int(value)
+            if count <= 0:
+                continue
+            shortcode = name[len('count#'):]
+            entries.append((shortcode, item.get(f'unicode#{shortcode}', ''), count))
+        summaries[message_id] = sorted(entries, key=lambda entry: (-entry[2], entry[0]))
+
+    viewer_reacted = set()
+    if user_id:
+        viewer_keys = [
+            {'PK': f'MSG#{message_id}', 'SK': f'REACT#{shortcode}#{user_id}'}
+            for message_id, entries in summaries.items()
+            for shortcode, _, _ in entries
+        ]
+        for item in batch_get_items(CORE_TABLE_NAME, viewer_keys, projection='PK, SK'):
+            viewer_reacted.add((item['PK'], item['SK']))
+
+    return {
+        message_id: [
+            {
+                'shortcode': shortcode,
+                'unicode': unicode,
+                'count': count,
+                'viewerHasReacted': (f'MSG#{message_id}', f'REACT#{shortcode}#{user_id}') in viewer_reacted,
+            }
+            for shortcode, unicode, count in entries
         ]
-        
-        # Wait for all tasks to complete
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-    
-    # Build reactions dictionary
-    reactions_by_message = {}
-    for result in results:
-        if isinstance(result, Exception):
-            print(f"Error in parallel reaction fetch: {result}")
-            continue
-        message_id, reactions = result
-        reactions_by_message[message_id] = reactions
-    
-    return reactions_by_message
-
-
-def handler(event: Dict[str, Any], context: Any) -> List[Dict[str, Any]]:
+        for message_id, entries in summaries.items()
+    }
+
+
+def query_messages(room_id: str, limit: int, after: Optional[int] = None,
+                   cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """One page of a room's messages, newest first, and the sort key to continue from."""
+    # Guild chat lives in gg_guild, every other room in gg_core; roomId is the partition key
+    table_to_query = guild_table if room_id.startswith('GUILD#') else core_table
+
+    if after:
+        # Range condition on the sort key rather than a filter, so Limit counts only matching messages
+        key_condition = Key('PK').eq(room_id) & Key('SK').between(f'MSG#{int(after) + 1}', 'MSG$')
+    else:
+        key_condition = Key('PK').eq(room_id) & Key('SK').begins_with('MSG#')
+
+    query_params: Dict[str, Any] = {
+        'KeyConditionExpression': key_condition,
+        'ScanIndexForward': False,
+        'Limit': limit
+    }
+    if cursor:
+        query_params['ExclusiveStartKey'] = {'PK': room_id, 'SK': decode_cursor(cursor)}
+
+    response = table_to_query.query(**query_params)
+    last_key = response.get('LastEvaluatedKey')
+    return response.get('Items', []), (last_key['SK'] if last_key else None)
+
+
+def to_message(item: Dict[str, Any], room_id: str) -> Dict[str, Any]:
+    message = {
+        'id': item.get('id'),
+        'roomId': item.get('roomId', room_id),
+        'senderId': item.get('senderId'),
+        'senderNickname': item.get('senderNickname'),
+        'text': item.get('text', ''),
+        'ts': int(item.get('ts', 0))
+    }
+    if item.get('emojiMetadata'):
+        metadata = item['emojiMetadata']
+        message['emojiMetadata'] = {
+            'shortcodes': list(metadata.get('shortcodes', [])),
+            'unicodeCount': int(metadata.get('unicodeCount', 0)),
+        }
+    if item.get('replyToId'):
+        message['replyToId'] = item['replyToId']
+    return message
+
+
+def load_page(room_id: str, user_id: Optional[str], limit: int, after: Optional[int] = None,
+              cursor: Optional[str] = None) -> Dict[str, Any]:
+    items, last_sort_key = query_messages(room_id, limit, after=after, cursor=cursor)
+    messages = [to_message(item, room_id) for item in items]
+
+    reactions_by_message = fetch_reactions_batch([m['id'] for m in messages if m.get('id')], user_id)
+    for message in messages:
+        message['reactions'] = reactions_by_message.get(message.get('id'), [])
+
+    return {
+        'items': messages,
+        'nextCursor': encode_cursor(last_sort_key) if last_sort_key else None,
+    }
+
+
+def handler(event: Dict[str, Any], context: Any) -> Any:
     """
-    AppSync Lambda resolver handler for messages query with batch reactions.
-    
+    AppSync Lambda resolver handler for the messages and messageHistory queries.
+
     Event structure from AppSync (after request template processing):
     {
         "payload": {
+            "fieldName": "messageHistory",  # only sent by the messageHistory resolver
             "arguments": {
                 "roomId": "ROOM-general",
-                "after": 1234567890,
+                "after": 1234567890,         # messages
+                "cursor": "eyJzayI6...",     # messageHistory
                 "limit": 50
             },
             "identity": {
@@ -126,130 +220,49 @@ def handler(event: Dict[str, Any], context: Any) -> List[Dict[str, Any]]:
         }
     }
     """
+    # AppSync Lambda resolvers receive the event directly (not wrapped in payload)
+    # The request template sends: { "version": "2018-05-29", "operation": "Invoke", "payload": {...} }
+    # But Lambda receives the full event structure
+    payload = event.get('payload', event)  # Fallback to event if payload doesn't exist
+    if not isinstance(payload, dict):
+        payload = {}
+    is_history = payload.get('fieldName') == 'messageHistory'
+
     try:
-        print(f"Lambda event received: {json.dumps(event, default=str)}")
-        
-        # AppSync Lambda resolvers receive the event directly (not wrapped in payload)
-        # The request template sends: { "version": "2018-05-29", "operation": "Invoke", "payload": {...} }
-        # But Lambda receives the full event structure
-        payload = event.get('payload', event)  # Fallback to event if payload doesn't exist
-        
         # Extract arguments and identity
-        args = payload.get('arguments', {}) if isinstance(payload, dict) else {}
-        identity = payload.get('identity', {}) if isinstance(payload, dict) else {}
-        resolver_context = payload.get('resolverContext', {}) if isinstance(payload, dict) else {}
-        
-        print(f"Extracted args: {json.dumps(args, default=str)}")
-        print(f"Extracted identity keys: {list(identity.keys()) if isinstance(identity, dict) else 'not a dict'}")
-        
+        args = payload.get('arguments') or {}
+        identity = payload.get('identity') or {}
+        resolver_context = payload.get('resolverContext') or {}
+
         # Get user ID from identity
         user_id = None
         if isinstance(identity, dict):
             user_id = identity.get('sub') or identity.get('userId')
         if not user_id and isinstance(resolver_context, dict):
             user_id = resolver_context.get('sub') or resolver_context.get('userId')
-        
+
         if not user_id:
+            # Don't raise error (some queries might not require auth); viewerHasReacted is then always false
             print("WARNING: No user ID found in identity context")
-            # Don't raise error, return empty list (some queries might not require auth)
-            # But log it for debugging
-            user_id = 'unknown'
-        
-        room_id = args.get('roomId') if isinstance(args, dict) else None
+
+        room_id = args.get('roomId')
         if not room_id:
             print("ERROR: roomId is required but not provided")
-            return []  # Return empty list instead of raising
-        
-        after = args.get('after')
-        limit = min(args.get('limit', 50), 100)  # Cap at 100 messages
-        
-        # Determine table and partition key based on roomId
-        if room_id.startswith('GUILD#'):
-            # Guild chat - use gg_guild table with roomId as PK
-            table_to_query = guild_table
-            pk = room_id  # Use the actual roomId (GUILD#guild_id)
-        else:
-            # General room - use gg_core table
-            table_to_query = core_table
-            pk = room_id
-        
-        # Query messages from DynamoDB
-        # Note: boto3 uses KeyConditionExpression (not query.expression like AppSync JS)
-        query_params = {
-            'KeyConditionExpression': 'PK = :pk AND begins_with(SK, :sk)',
-            'ExpressionAttributeValues': {
-                ':pk': pk,
-                ':sk': 'MSG#'
-            },
-            'ScanIndexForward': False,
-            'Limit': limit
-        }
-        
-        # Add filter for 'after' timestamp if provided
-        if after:
-            query_params['FilterExpression'] = 'ts > :after'
-            query_params['ExpressionAttributeValues'][':after'] = after
-        
-        print(f"Querying DynamoDB table {table_to_query.name} with params: {json.dumps(query_params, default=str)}")
-        print(f"Using PK: {pk}, room_id: {room_id}, table: {table_to_query.name}")
-        response = table_to_query.query(**query_params)
-        print(f"DynamoDB response: {json.dumps({'Count': len(response.get('Items', [])), 'ScannedCount': response.get('ScannedCount', 0), 'Items': response.get('Items', [])[:2] if response.get('Items') else []}, default=str)}")
-        items = response.get('Items', [])
-        
-        # Transform messages
-        messages = []
-        message_ids = []
-        
-        for item in items:
-            message = {
-                'id': item.get('id'),
-                'roomId': item.get('roomId', room_id),
-                'senderId': item.get('senderId'),
-                'senderNickname': item.get('senderNickname'),
-                'text': item.get('text', ''),
-                'ts': item.get('ts', 0)
-            }
-            
-            if item.get('replyToId'):
-                message['replyToId'] = item['replyToId']
-            
-            messages.append(message)
-            if message.get('id'):
-                message_ids.append(message['id'])
-        
-        # Batch fetch reactions for all messages in parallel
-        if message_ids:
-            # Run async function in event loop
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                reactions_by_message = loop.run_until_complete(
-                    fetch_reactions_parallel(message_ids, user_id, table_to_query)
-                )
-            finally:
-                loop.close()
-        else:
-            reactions_by_message = {}
-        
-        # Attach reactions to messages
-        for message in messages:
-            message_id = message.get('id')
-            message['reactions'] = reactions_by_message.get(message_id, [])
-        
+            return {'items': [], 'nextCursor': None} if is_history else []
+
+        limit = max(1, min(int(args.get('limit') or 50), MAX_PAGE_SIZE))
+
+        if is_history:
+            return load_page(room_id, user_id, limit, cursor=args.get('cursor'))
+
         # Always return a list, never null (required by GraphQL schema [Message!]!)
-        return messages if messages else []
-        
+        return load_page(room_id, user_id, limit, after=args.get('after'))['items']
+
+    except InvalidCursor:
+        raise
     except Exception as e:
         print(f"Error in messages batch resolver: {e}")
         import traceback
         traceback.print_exc()
-        # Return empty list instead of raising to avoid null response
-        # AppSync will handle the error via the response template
-        error_response = {
-            'error': str(e),
-            'errorType': type(e).__name__
-        }
-        # Return empty list to satisfy GraphQL schema (non-nullable array)
-        # The error will be logged but we return [] to prevent GraphQL errors
-        return []
-
+        # Return an empty page instead of raising to satisfy the non-nullable schema types
+        return {'items': [], 'nextCursor': None} if is_history else []
@@ -1342,6 +1342,36 @@ resource "aws_api_gateway_resource" "messaging_rooms_id_members" {
   path_part   = "members"
 }
 
+resource "aws_api_gateway_resource" "messaging_guilds" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  parent_id   = aws_api_gateway_resource.messaging.id
+  path_part   = "guilds"
+}
+
+resource "aws_api_gateway_resource" "messaging_guilds_id" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  parent_id   = aws_api_gateway_resource.messaging_guilds.id
+  path_part   = "{guild_id}"
+}
+
+resource "aws_api_gateway_resource" "messaging_guilds_id_members" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  parent_id   = aws_api_gateway_resource.messaging_guilds_id.id
+  path_part   = "members"
+}
+
+resource "aws_api_gateway_resource" "messaging_guilds_id_members_user_id" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  parent_id   = aws_api_gateway_resource.messaging_guilds_id_members.id
+  path_part   = "{user_id}"
+}
+
+resource "aws_api_gateway_resource" "messaging_guilds_id_members_user_id_revoke" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  parent_id   = aws_api_gateway_resource.messaging_guilds_id_members_user_id.id
+  path_part   = "revoke"
+}
+
 # WebSocket API for real-time messaging
 resource "aws_api_gateway_resource" "messaging_websocket" {
   rest_api_id = aws_api_gateway_rest_api.rest_api.id
@@ -1392,6 +1422,12 @@ resource "aws_api_gateway_resource" "xp_award" {
   path_part   = "award"
 }
 
+resource "aws_api_gateway_resource" "xp_award_batch" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  parent_id   = aws_api_gateway_resource.xp.id
+  path_part   = "award-batch"
+}
+
 resource "aws_api_gateway_resource" "levels" {
   rest_api_id = aws_api_gateway_rest_api.rest_api.id
   parent_id   = aws_api_gateway_rest_api.rest_api.root_resource_id
@@ -1464,18 +1500,54 @@ resource "aws_api_gateway_resource" "leaderboard_global" {
   path_part   = "global"
 }
 
+resource "aws_api_gateway_resource" "leaderboard_global_page" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  parent_id   = aws_api_gateway_resource.leaderboard_global.id
+  path_part   = "page"
+}
+
+resource "aws_api_gateway_resource" "leaderboard_global_me" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  parent_id   = aws_api_gateway_resource.leaderboard_global.id
+  path_part   = "me"
+}
+
 resource "aws_api_gateway_resource" "leaderboard_level" {
   rest_api_id = aws_api_gateway_rest_api.rest_api.id
   parent_id   = aws_api_gateway_resource.leaderboard.id
   path_part   = "level"
 }
 
+resource "aws_api_gateway_resource" "leaderboard_level_page" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  parent_id   = aws_api_gateway_resource.leaderboard_level.id
+  path_part   = "page"
+}
+
+resource "aws_api_gateway_resource" "leaderboard_level_me" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  parent_id   = aws_api_gateway_resource.leaderboard_level.id
+  path_part   = "me"
+}
+
 resource "aws_api_gateway_resource" "leaderboard_badges" {
   rest_api_id = aws_api_gateway_rest_api.rest_api.id
   parent_id   = aws_api_gateway_resource.leaderboard.id
   path_part   = "badges"
 }
 
+resource "aws_api_gateway_resource" "leaderboard_badges_page" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  parent_id   = aws_api_gateway_resource.leaderboard_badges.id
+  path_part   = "page"
+}
+
+resource "aws_api_gateway_resource" "leaderboard_badges_me" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  parent_id   = aws_api_gateway_resource.leaderboard_badges.id
+  path_part   = "me"
+}
+
 # POST /users/signup (public)
 resource "aws_api_gateway_resource" "user_signup" {
   rest_api_id = aws_api_gateway_rest_api.rest_api.id
@@ -2581,6 +2653,65 @@ resource "aws_api_gateway_integration_response" "xp_award_options_integration_re
   }
 }
 
+# POST /xp/award-batch (internal - no auth required, but API key)
+resource "aws_api_gateway_method" "xp_award_batch_post" {
+  rest_api_id      = aws_api_gateway_rest_api.rest_api.id
+  resource_id      = aws_api_gateway_resource.xp_award_batch.id
+  http_method      = "POST"
+  authorization    = "NONE"
+  api_key_required = true
+}
+
+resource "aws_api_gateway_method" "xp_award_batch_options" {
+  rest_api_id   = aws_api_gateway_rest_api.rest_api.id
+  resource_id   = aws_api_gateway_resource.xp_award_batch.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "xp_award_batch_post_integration" {
+  rest_api_id             = aws_api_gateway_rest_api.rest_api.id
+  resource_id             = aws_api_gateway_resource.xp_award_batch.id
+  http_method             = aws_api_gateway_method.xp_award_batch_post.http_method
+  type                    = "AWS_PROXY"
+  integration_http_method = "POST"
+  uri                     = "arn:aws:apigateway:${var.aws_region}:lambda:path/2015-03-31/functions/${var.gamification_service_lambda_arn}/invocations"
+}
+
+resource "aws_api_gateway_integration" "xp_award_batch_options_integration" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  resource_id = aws_api_gateway_resource.xp_award_batch.id
+  http_method = aws_api_gateway_method.xp_award_batch_options.http_method
+  type        = "MOCK"
+  request_templates = {
+    "application/json" = jsonencode({ statusCode = 200 })
+  }
+}
+
+resource "aws_api_gateway_method_response" "xp_award_batch_options_response" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  resource_id = aws_api_gateway_resource.xp_award_batch.id
+  http_method = aws_api_gateway_method.xp_award_batch_options.http_method
+  status_code = "200"
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_integration_response" "xp_award_batch_options_integration_response" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  resource_id = aws_api_gateway_resource.xp_award_batch.id
+  http_method = aws_api_gateway_method.xp_award_batch_options.http_method
+  status_code = aws_api_gateway_method_response.xp_award_batch_options_response.status_code
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'${local.cors_allow_headers}'"
+    "method.response.header.Access-Control-Allow-Methods" = "'POST,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'${local.cors_allow_origin}'"
+  }
+}
+
 # GET /badges (public)
 resource "aws_api_gateway_method" "badges_get" {
   rest_api_id      = aws_api_gateway_rest_api.rest_api.id
@@ -3074,6 +3205,125 @@ resource "aws_api_gateway_integration_response" "leaderboard_global_options_inte
   }
 }
 
+# GET /leaderboard/global/page (public)
+resource "aws_api_gateway_method" "leaderboard_global_page_get" {
+  rest_api_id      = aws_api_gateway_rest_api.rest_api.id
+  resource_id      = aws_api_gateway_resource.leaderboard_global_page.id
+  http_method      = "GET"
+  authorization    = "NONE"
+  api_key_required = true
+}
+
+resource "aws_api_gateway_method" "leaderboard_global_page_options" {
+  rest_api_id   = aws_api_gateway_rest_api.rest_api.id
+  resource_id   = aws_api_gateway_resource.leaderboard_global_page.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "leaderboard_global_page_get_integration" {
+  rest_api_id             = aws_api_gateway_rest_api.rest_api.id
+  resource_id             = aws_api_gateway_resource.leaderboard_global_page.id
+  http_method             = aws_api_gateway_method.leaderboard_global_page_get.http_method
+  type                    = "AWS_PROXY"
+  integration_http_method = "POST"
+  uri                     = "arn:aws:apigateway:${var.aws_region}:lambda:path/2015-03-31/functions/${var.gamification_service_lambda_arn}/invocations"
+}
+
+resource "aws_api_gateway_integration" "leaderboard_global_page_options_integration" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  resource_id = aws_api_gateway_resource.leaderboard_global_page.id
+  http_method = aws_api_gateway_method.leaderboard_global_page_options.http_method
+  type        = "MOCK"
+  request_templates = {
+    "application/json" = jsonencode({ statusCode = 200 })
+  }
+}
+
+resource "aws_api_gateway_method_response" "leaderboard_global_page_options_response" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  resource_id = aws_api_gateway_resource.leaderboard_global_page.id
+  http_method = aws_api_gateway_method.leaderboard_global_page_options.http_method
+  status_code = "200"
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_integration_response" "leaderboard_global_page_options_integration_response" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  resource_id = aws_api_gateway_resource.leaderboard_global_page.id
+  http_method = aws_api_gateway_method.leaderboard_global_page_options.http_method
+  status_code = aws_api_gateway_method_response.leaderboard_global_page_options_response.status_code
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'${local.cors_allow_headers}'"
+    "method.response.header.Access-Control-Allow-Methods" = "'GET,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'${local.cors_allow_origin}'"
+  }
+}
+
+# GET /leaderboard/global/me (authenticated)
+resource "aws_api_gateway_method" "leaderboard_global_me_get" {
+  rest_api_id      = aws_api_gateway_rest_api.rest_api.id
+  resource_id      = aws_api_gateway_resource.leaderboard_global_me.id
+  http_method      = "GET"
+  authorization    = "CUSTOM"
+  authorizer_id    = aws_api_gateway_authorizer.lambda_authorizer.id
+  api_key_required = true
+}
+
+resource "aws_api_gateway_method" "leaderboard_global_me_options" {
+  rest_api_id   = aws_api_gateway_rest_api.rest_api.id
+  resource_id   = aws_api_gateway_resource.leaderboard_global_me.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "leaderboard_global_me_get_integration" {
+  rest_api_id             = aws_api_gateway_rest_api.rest_api.id
+  resource_id             = aws_api_gateway_resource.leaderboard_global_me.id
+  http_method             = aws_api_gateway_method.leaderboard_global_me_get.http_method
+  type                    = "AWS_PROXY"
+  integration_http_method = "POST"
+  uri                     = "arn:aws:apigateway:${var.aws_region}:lambda:path/2015-03-31/functions/${var.gamification_service_lambda_arn}/invocations"
+}
+
+resource "aws_api_gateway_integration" "leaderboard_global_me_options_integration" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  resource_id = aws_api_gateway_resource.leaderboard_global_me.id
+  http_method = aws_api_gateway_method.leaderboard_global_me_options.http_method
+  type        = "MOCK"
+  request_templates = {
+    "application/json" = jsonencode({ statusCode = 200 })
+  }
+}
+
+resource "aws_api_gateway_method_response" "leaderboard_global_me_options_response" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  resource_id = aws_api_gateway_resource.leaderboard_global_me.id
+  http_method = aws_api_gateway_method.leaderboard_global_me_options.http_method
+  status_code = "200"
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_integration_response" "leaderboard_global_me_options_integration_response" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  resource_id = aws_api_gateway_resource.leaderboard_global_me.id
+  http_method = aws_api_gateway_method.leaderboard_global_me_options.http_method
+  status_code = aws_api_gateway_method_response.leaderboard_global_me_options_response.status_code
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'${local.cors_allow_headers}'"
+    "method.response.header.Access-Control-Allow-Methods" = "'GET,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'${local.cors_allow_origin}'"
+  }
+}
+
 # GET /leaderboard/level (public)
 resource "aws_api_gateway_method" "leaderboard_level_get" {
   rest_api_id      = aws_api_gateway_rest_api.rest_api.id
@@ -3133,6 +3383,125 @@ resource "aws_api_gateway_integration_response" "leaderboard_level_options_integ
   }
 }
 
+# GET /leaderboard/level/page (public)
+resource "aws_api_gateway_method" "leaderboard_level_page_get" {
+  rest_api_id      = aws_api_gateway_rest_api.rest_api.id
+  resource_id      = aws_api_gateway_resource.leaderboard_level_page.id
+  http_method      = "GET"
+  authorization    = "NONE"
+  api_key_required = true
+}
+
+resource "aws_api_gateway_method" "leaderboard_level_page_options" {
+  rest_api_id   = aws_api_gateway_rest_api.rest_api.id
+  resource_id   = aws_api_gateway_resource.leaderboard_level_page.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "leaderboard_level_page_get_integration" {
+  rest_api_id             = aws_api_gateway_rest_api.rest_api.id
+  resource_id             = aws_api_gateway_resource.leaderboard_level_page.id
+  http_method             = aws_api_gateway_method.leaderboard_level_page_get.http_method
+  type                    = "AWS_PROXY"
+  integration_http_method = "POST"
+  uri                     = "arn:aws:apigateway:${var.aws_region}:lambda:path/2015-03-31/functions/${var.gamification_service_lambda_arn}/invocations"
+}
+
+resource "aws_api_gateway_integration" "leaderboard_level_page_options_integration" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  resource_id = aws_api_gateway_resource.leaderboard_level_page.id
+  http_method = aws_api_gateway_method.leaderboard_level_page_options.http_method
+  type        = "MOCK"
+  request_templates = {
+    "application/json" = jsonencode({ statusCode = 200 })
+  }
+}
+
+resource "aws_api_gateway_method_response" "leaderboard_level_page_options_response" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  resource_id = aws_api_gateway_resource.leaderboard_level_page.id
+  http_method = aws_api_gateway_method.leaderboard_level_page_options.http_method
+  status_code = "200"
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_integration_response" "leaderboard_level_page_options_integration_response" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  resource_id = aws_api_gateway_resource.leaderboard_level_page.id
+  http_method = aws_api_gateway_method.leaderboard_level_page_options.http_method
+  status_code = aws_api_gateway_method_response.leaderboard_level_page_options_response.status_code
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'${local.cors_allow_headers}'"
+    "method.response.header.Access-Control-Allow-Methods" = "'GET,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'${local.cors_allow_origin}'"
+  }
+}
+
+# GET /leaderboard/level/me (authenticated)
+resource "aws_api_gateway_method" "leaderboard_level_me_get" {
+  rest_api_id      = aws_api_gateway_rest_api.rest_api.id
+  resource_id      = aws_api_gateway_resource.leaderboard_level_me.id
+  http_method      = "GET"
+  authorization    = "CUSTOM"
+  authorizer_id    = aws_api_gateway_authorizer.lambda_authorizer.id
+  api_key_required = true
+}
+
+resource "aws_api_gateway_method" "leaderboard_level_me_options" {
+  rest_api_id   = aws_api_gateway_rest_api.rest_api.id
+  resource_id   = aws_api_gateway_resource.leaderboard_level_me.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "leaderboard_level_me_get_integration" {
+  rest_api_id             = aws_api_gateway_rest_api.rest_api.id
+  resource_id             = aws_api_gateway_resource.leaderboard_level_me.id
+  http_method             = aws_api_gateway_method.leaderboard_level_me_get.http_method
+  type                    = "AWS_PROXY"
+  integration_http_method = "POST"
+  uri                     = "arn:aws:apigateway:${var.aws_region}:lambda:path/2015-03-31/functions/${var.gamification_service_lambda_arn}/invocations"
+}
+
+resource "aws_api_gateway_integration" "leaderboard_level_me_options_integration" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  resource_id = aws_api_gateway_resource.leaderboard_level_me.id
+  http_method = aws_api_gateway_method.leaderboard_level_me_options.http_method
+  type        = "MOCK"
+  request_templates = {
+    "application/json" = jsonencode({ statusCode = 200 })
+  }
+}
+
+resource "aws_api_gateway_method_response" "leaderboard_level_me_options_response" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  resource_id = aws_api_gateway_resource.leaderboard_level_me.id
+  http_method = aws_api_gateway_method.leaderboard_level_me_options.http_method
+  status_code = "200"
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_integration_response" "leaderboard_level_me_options_integration_response" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  resource_id = aws_api_gateway_resource.leaderboard_level_me.id
+  http_method = aws_api_gateway_method.leaderboard_level_me_options.http_method
+  status_code = aws_api_gateway_method_response.leaderboard_level_me_options_response.status_code
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'${local.cors_allow_headers}'"
+    "method.response.header.Access-Control-Allow-Methods" = "'GET,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'${local.cors_allow_origin}'"
+  }
+}
+
 # GET /leaderboard/badges (public)
 resource "aws_api_gateway_method" "leaderboard_badges_get" {
   rest_api_id      = aws_api_gateway_rest_api.rest_api.id
@@ -3192,6 +3561,125 @@ resource "aws_api_gateway_integration_response" "leaderboard_badges_options_inte
   }
 }
 
+# GET /leaderboard/badges/page (public)
+resource "aws_api_gateway_method" "leaderboard_badges_page_get" {
+  rest_api_id      = aws_api_gateway_rest_api.rest_api.id
+  resource_id      = aws_api_gateway_resource.leaderboard_badges_page.id
+  http_method      = "GET"
+  authorization    = "NONE"
+  api_key_required = true
+}
+
+resource "aws_api_gateway_method" "leaderboard_badges_page_options" {
+  rest_api_id   = aws_api_gateway_rest_api.rest_api.id
+  resource_id   = aws_api_gateway_resource.leaderboard_badges_page.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "leaderboard_badges_page_get_integration" {
+  rest_api_id             = aws_api_gateway_rest_api.rest_api.id
+  resource_id             = aws_api_gateway_resource.leaderboard_badges_page.id
+  http_method             = aws_api_gateway_method.leaderboard_badges_page_get.http_method
+  type                    = "AWS_PROXY"
+  integration_http_method = "POST"
+  uri                     = "arn:aws:apigateway:${var.aws_region}:lambda:path/2015-03-31/functions/${var.gamification_service_lambda_arn}/invocations"
+}
+
+resource "aws_api_gateway_integration" "leaderboard_badges_page_options_integration" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  resource_id = aws_api_gateway_resource.leaderboard_badges_page.id
+  http_method = aws_api_gateway_method.leaderboard_badges_page_options.http_method
+  type        = "MOCK"
+  request_templates = {
+    "application/json" = jsonencode({ statusCode = 200 })
+  }
+}
+
+resource "aws_api_gateway_method_response" "leaderboard_badges_page_options_response" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  resource_id = aws_api_gateway_resource.leaderboard_badges_page.id
+  http_method = aws_api_gateway_method.leaderboard_badges_page_options.http_method
+  status_code = "200"
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_integration_response" "leaderboard_badges_page_options_integration_response" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  resource_id = aws_api_gateway_resource.leaderboard_badges_page.id
+  http_method = aws_api_gateway_method.leaderboard_badges_page_options.http_method
+  status_code = aws_api_gateway_method_response.leaderboard_badges_page_options_response.status_code
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'${local.cors_allow_headers}'"
+    "method.response.header.Access-Control-Allow-Methods" = "'GET,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'${local.cors_allow_origin}'"
+  }
+}
+
+# GET /leaderboard/badges/me (authenticated)
+resource "aws_api_gateway_method" "leaderboard_badges_me_get" {
+  rest_api_id      = aws_api_gateway_rest_api.rest_api.id
+  resource_id      = aws_api_gateway_resource.leaderboard_badges_me.id
+  http_method      = "GET"
+  authorization    = "CUSTOM"
+  authorizer_id    = aws_api_gateway_authorizer.lambda_authorizer.id
+  api_key_required = true
+}
+
+resource "aws_api_gateway_method" "leaderboard_badges_me_options" {
+  rest_api_id   = aws_api_gateway_rest_api.rest_api.id
+  resource_id   = aws_api_gateway_resource.leaderboard_badges_me.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "leaderboard_badges_me_get_integration" {
+  rest_api_id             = aws_api_gateway_rest_api.rest_api.id
+  resource_id             = aws_api_gateway_resource.leaderboard_badges_me.id
+  http_method             = aws_api_gateway_method.leaderboard_badges_me_get.http_method
+  type                    = "AWS_PROXY"
+  integration_http_method = "POST"
+  uri                     = "arn:aws:apigateway:${var.aws_region}:lambda:path/2015-03-31/functions/${var.gamification_service_lambda_arn}/invocations"
+}
+
+resource "aws_api_gateway_integration" "leaderboard_badges_me_options_integration" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  resource_id = aws_api_gateway_resource.leaderboard_badges_me.id
+  http_method = aws_api_gateway_method.leaderboard_badges_me_options.http_method
+  type        = "MOCK"
+  request_templates = {
+    "application/json" = jsonencode({ statusCode = 200 })
+  }
+}
+
+resource "aws_api_gateway_method_response" "leaderboard_badges_me_options_response" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  resource_id = aws_api_gateway_resource.leaderboard_badges_me.id
+  http_method = aws_api_gateway_method.leaderboard_badges_me_options.http_method
+  status_code = "200"
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_integration_response" "leaderboard_badges_me_options_integration_response" {
+  rest_api_id = aws_api_gateway_rest_api.rest_api.id
+  resource_id = aws_api_gateway_resource.leaderboard_badges_me.id
+  http_method = aws_api_gateway_method.leaderboard_badges_me_options.http_method
+  status_code = aws_api_gateway_method_response.leaderboard_badges_me_options_response.status_code
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'${local.cors_allow_headers}'"
+    "method.response.header.Access-Control-Allow-Methods" = "'GET,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'${local.cors_allow_origin}'"
+  }
+}
+
 # /quests (CUSTOM)
 resource "aws_api_gateway_method" "quests_get" {
   rest_api_id      = aws_api_gateway_rest_api.rest_api.id
@@ -6156,6 +6644,26 @@ resource "aws_api_gateway_integration" "messaging_rooms_id_members_options_integ
   }
 }
 
+# POST /messaging/guilds/{guild_id}/members/{user_id}/revoke (internal - called by guild-service with API key)
+resource "aws_api_gateway_method" "messaging_guilds_id_members_user_id_revoke_post" {
+  count            = local.messaging_lambda_valid ? 1 : 0
+  rest_api_id      = aws_api_gateway_rest_api.rest_api.id
+  resource_id      = aws_api_gateway_resource.messaging_guilds_id_members_user_id_revoke.id
+  http_method      = "POST"
+  authorization    = "NONE"
+  api_key_required = true
+}
+
+resource "aws_api_gateway_integration" "messaging_guilds_id_members_user_id_revoke_post_integration" {
+  count                    = local.messaging_lambda_valid ? 1 : 0
+  rest_api_id             = aws_api_gateway_rest_api.rest_api.id
+  resource_id             = aws_api_gateway_resource.messaging_guilds_id_members_user_id_revoke.id
+  http_method             = aws_api_gateway_method.messaging_guilds_id_members_user_id_revoke_post[0].http_method
+  type                    = "AWS_PROXY"
+  integration_http_method = "POST"
+  uri                     = "arn:aws:apigateway:${var.aws_region}:lambda:path/2015-03-31/functions/${var.messaging_service_lambda_arn}/invocations"
+}
+
 # WebSocket methods for real-time messaging
 resource "aws_api_gateway_method" "messaging_websocket_connect" {
   count         = local.messaging_lambda_valid ? 1 : 0
@@ -6675,6 +7183,7 @@ resource "aws_api_gateway_deployment" "deployment" {
       aws_api_gateway_method.messaging_rooms_id_leave_options,
       aws_api_gateway_method.messaging_rooms_id_members_get,
       aws_api_gateway_method.messaging_rooms_id_members_options,
+      aws_api_gateway_method.messaging_guilds_id_members_user_id_revoke_post,
       aws_api_gateway_method.messaging_websocket_connect,
       aws_api_gateway_method.messaging_websocket_disconnect,
       aws_api_gateway_method.messaging_websocket_default,
@@ -6756,6 +7265,8 @@ resource "aws_api_gateway_deployment" "deployment" {
       aws_api_gateway_method.levels_history_options,
       aws_api_gateway_method.xp_award_post,
       aws_api_gateway_method.xp_award_options,
+      aws_api_gateway_method.xp_award_batch_post,
+      aws_api_gateway_method.xp_award_batch_options,
       aws_api_gateway_method.badges_get,
       aws_api_gateway_method.badges_options,
       aws_api_gateway_method.badges_me_get,
@@ -6769,10 +7280,22 @@ resource "aws_api_gateway_deployment" "deployment" {
       aws_api_gateway_method.challenges_options,
       aws_api_gateway_method.leaderboard_global_get,
       aws_api_gateway_method.leaderboard_global_options,
+      aws_api_gateway_method.leaderboard_global_page_get,
+      aws_api_gateway_method.leaderboard_global_page_options,
+      aws_api_gateway_method.leaderboard_global_me_get,
+      aws_api_gateway_method.leaderboard_global_me_options,
       aws_api_gateway_method.leaderboard_level_get,
       aws_api_gateway_method.leaderboard_level_options,
+      aws_api_gateway_method.leaderboard_level_page_get,
+      aws_api_gateway_method.leaderboard_level_page_options,
+      aws_api_gateway_method.leaderboard_level_me_get,
+      aws_api_gateway_method.leaderboard_level_me_options,
       aws_api_gateway_method.leaderboard_badges_get,
       aws_api_gateway_method.leaderboard_badges_options,
+      aws_api_gateway_method.leaderboard_badges_page_get,
+      aws_api_gateway_method.leaderboard_badges_page_options,
+      aws_api_gateway_method.leaderboard_badges_me_get,
+      aws_api_gateway_method.leaderboard_badges_me_options,
     ]))
   }
   depends_on = [
@@ -6914,6 +7437,7 @@ resource "aws_api_gateway_deployment" "deployment" {
     aws_api_gateway_integration.messaging_rooms_id_join_options_integration,
     aws_api_gateway_integration.messaging_rooms_id_leave_post_integration,
     aws_api_gateway_integration.messaging_rooms_id_leave_options_integration,
+    aws_api_gateway_integration.messaging_guilds_id_members_user_id_revoke_post_integration,
     aws_api_gateway_integration.messaging_websocket_connect_integration,
     aws_api_gateway_integration.messaging_websocket_disconnect_integration,
     aws_api_gateway_integration.messaging_websocket_default_integration,
@@ -6960,6 +7484,8 @@ resource "aws_api_gateway_deployment" "deployment" {
     aws_api_gateway_integration.levels_history_options_integration,
     aws_api_gateway_integration.xp_award_post_integration,
     aws_api_gateway_integration.xp_award_options_integration,
+    aws_api_gateway_integration.xp_award_batch_post_integration,
+    aws_api_gateway_integration.xp_award_batch_options_integration,
     aws_api_gateway_integration.badges_get_integration,
     aws_api_gateway_integration.badges_options_integration,
     aws_api_gateway_integration.badges_me_get_integration,
@@ -6973,10 +7499,22 @@ resource "aws_api_gateway_deployment" "deployment" {
     aws_api_gateway_integration.challenges_options_integration,
     aws_api_gateway_integration.leaderboard_global_get_integration,
     aws_api_gateway_integration.leaderboard_global_options_integration,
+    aws_api_gateway_integration.leaderboard_global_page_get_integration,
+    aws_api_gateway_integration.leaderboard_global_page_options_integration,
+    aws_api_gateway_integration.leaderboard_global_me_get_integration,
+    aws_api_gateway_integration.leaderboard_global_me_options_integration,
     aws_api_gateway_integration.leaderboard_level_get_integration,
     aws_api_gateway_integration.leaderboard_level_options_integration,
+    aws_api_gateway_integration.leaderboard_level_page_get_integration,
+    aws_api_gateway_integration.leaderboard_level_page_options_integration,
+    aws_api_gateway_integration.leaderboard_level_me_get_integration,
+    aws_api_gateway_integration.leaderboard_level_me_options_integration,
     aws_api_gateway_integration.leaderboard_badges_get_integration,
     aws_api_gateway_integration.leaderboard_badges_options_integration,
+    aws_api_gateway_integration.leaderboard_badges_page_get_integration,
+    aws_api_gateway_integration.leaderboard_badges_page_options_integration,
+    aws_api_gateway_integration.leaderboard_badges_me_get_integration,
+    aws_api_gateway_integration.leaderboard_badges_me_options_integration,
   ]
   lifecycle { create_before_destroy = true }
 }
@@ -10,7 +10,12 @@ locals {
   src_all      = fileset(local.src_abs, "**")
   excluded_set = flatten([for p in var.exclude_globs : fileset(local.src_abs, p)])
   src_files    = [for f in local.src_all : f if !contains(local.excluded_set, f)]
-  src_hash     = sha1(join(",", [for f in local.src_files : filesha256("${local.src_abs}/${f}")]))
+  # Files from outside src_dir (e.g. shared modules under services/common) copied into the package at their key path
+  extra_abs  = { for dest, src in var.extra_files : dest => abspath(src) }
+  src_hash   = sha1(join(",", concat(
+    [for f in local.src_files : filesha256("${local.src_abs}/${f}")],
+    [for dest, src in local.extra_abs : "${dest}:${filesha256(src)}"]
+  )))
 }
 
 resource "null_resource" "build_ps" {
@@ -24,6 +29,10 @@ resource "null_resource" "build_ps" {
       New-Item -Force -ItemType Directory -Path '${local.build_abs}' | Out-Null
       New-Item -Force -ItemType Directory -Path '${local.dist_abs}'  | Out-Null
       robocopy '${local.src_abs}' '${local.build_abs}' /E /NFL /NDL /NJH /NJS /NC /NS | Out-Null
+      %{ for dest, src in local.extra_abs ~}
+      New-Item -Force -ItemType Directory -Path (Split-Path -Parent '${local.build_abs}/${dest}') | Out-Null
+      Copy-Item -Force '${src}' '${local.build_abs}/${dest}'
+      %{ endfor ~}
       if (Test-Path '${local.src_abs}\${var.requirements_file}') {
         docker run --rm -v "${local.build_abs}:/out" -v "${local.src_abs}:/src" --entrypoint /bin/sh ${var.python_builder_image} -lc "pip install -r /src/${var.requirements_file} --target /out"
       }
@@ -39,6 +48,9 @@ resource "null_resource" "build_bash" {
     command = <<-BASH
       rm -rf "${local.build_abs}" "${local.dist_abs}" && mkdir -p "${local.build_abs}" "${local.dist_abs}"
       cp -R "${local.src_abs}/." "${local.build_abs}/"
+      %{ for dest, src in local.extra_abs ~}
+      mkdir -p "$(dirname "${local.build_abs}/${dest}")" && cp "${src}" "${local.build_abs}/${dest}"
+      %{ endfor ~}
       if [ -f "${local.src_abs}/${var.requirements_file}" ]; then
         docker run --rm -v "${local.build_abs}:/out" -v "${local.src_abs}:/src" --entrypoint /bin/sh ${var.python_builder_image} -lc 'pip install -r /src/${var.requirements_file} --target /out'
       fi
@@ -50,3 +50,8 @@ variable "environment_variables" {
   type    = map(string)
   default = {}
 }
+variable "extra_files" {
+  description = "Files outside src_dir to add to the package, as { \"path/in/zip\" = \"source/path\" }"
+  type        = map(string)
+  default     = {}
+}
@@ -0,0 +1,65 @@
+import { util } from '@aws-appsync/utils';
+
+/**
+ * Keeps one reaction rollup item per message alongside the per-shortcode
+ * summaries, so message history can load the reactions for a whole page with
+ * a single BatchGetItem:
+ *
+ *   PK = MSG#<messageId>, SK = SUMMARY#REACTIONS
+ *   count#<shortcode> = <count>, unicode#<shortcode> = <unicode>
+ */
+function getInput(ctx) {
+  const prev = ctx.prev || {};
+  const base = prev && typeof prev === 'object'
+    ? (prev.result !== undefined ? prev.result : prev)
+    : {};
+  const args = ctx.args || {};
+  const delta = typeof base.delta === 'number' ? base.delta : 0;
+  return {
+    messageId: base.messageId || args.messageId,
+    shortcode: base.shortcode || args.shortcode,
+    unicode: base.unicode || args.unicode,
+    delta,
+    added: base.added === true,
+  };
+}
+
+export function request(ctx) {
+  const input = getInput(ctx);
+  const { messageId, shortcode, unicode, delta } = input;
+
+  if (!messageId || !shortcode) {
+    util.error('Invalid reaction rollup input', 'Validation');
+  }
+
+  return {
+    operation: 'UpdateItem',
+    key: util.dynamodb.toMapValues({
+      PK: `MSG#${messageId}`,
+      SK: 'SUMMARY#REACTIONS'
+    }),
+    update: {
+      expression: 'ADD #count :delta SET #unicode = if_not_exists(#unicode, :unicode), #type = :type, #updatedAt = :now',
+      expressionNames: {
+        '#count': `count#${shortcode}`,
+        '#unicode': `unicode#${shortcode}`,
+        '#type': 'type',
+        '#updatedAt': 'updatedAt'
+      },
+      expressionValues: util.dynamodb.toMapValues({
+        ':delta': delta,
+        ':unicode': unicode || '',
+        ':type': 'ReactionRollup',
+        ':now': util.time.nowEpochMilliSeconds()
+      })
+    }
+  };
+}
+
+export function response(ctx) {
+  if (ctx.error) {
+    util.error(ctx.error.message, ctx.error.type);
+  }
+
+  return getInput(ctx);
+}
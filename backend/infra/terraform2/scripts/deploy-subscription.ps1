@@ -73,6 +73,10 @@ if (-not $PlanOnly) {
   foreach ($module in $moduleFiles) {
     Copy-Item -Path (Join-Path $ServicePath $module) -Destination $buildPath -Force
   }
+  # cognito.py imports the shared JWKS verifier from common/
+  $commonPath = Join-Path $buildPath "common"
+  New-Item -ItemType Directory -Path $commonPath -Force | Out-Null
+  Copy-Item -Path (Join-Path $ServicePath "..\common\jwks.py") -Destination $commonPath -Force
 
   Write-Log "Creating deployment archive at $zipPath" "INFO"
   Compress-Archive -Path (Join-Path $buildPath '*') -DestinationPath $zipPath -Force
@@ -1,2 +1,6 @@
 output "rest_api_id" { value = module.apigw.rest_api_id }
 output "invoke_url"  { value = module.apigw.invoke_url }
+output "api_key_value" {
+  value     = module.apigw.api_key_value
+  sensitive = true
+}
@@ -741,6 +741,35 @@ resource "aws_appsync_resolver" "query_messages" {
   TEMPLATE
 }
 
+resource "aws_appsync_resolver" "query_messageHistory" {
+  api_id      = module.appsync.api_id
+  type        = "Query"
+  field       = "messageHistory"
+  kind        = "UNIT"
+  data_source = aws_appsync_datasource.messages_batch_lambda.name
+  
+  # Lambda resolver uses request/response templates
+  request_template = <<-TEMPLATE
+    {
+      "version": "2018-05-29",
+      "operation": "Invoke",
+      "payload": {
+        "fieldName": "messageHistory",
+        "arguments": $util.toJson($context.arguments),
+        "identity": $util.toJson($context.identity),
+        "resolverContext": $util.toJson($context.resolverContext)
+      }
+    }
+  TEMPLATE
+  
+  response_template = <<-TEMPLATE
+    #if($ctx.error)
+      $util.error($ctx.error.message, $ctx.error.type)
+    #end
+    $util.toJson($ctx.result)
+  TEMPLATE
+}
+
 # Resolver for Message.reactions field - kept as fallback but should not be needed
 # since Lambda resolver returns reactions with messages. This is only used if reactions
 # are queried separately (not included in messages query).
@@ -825,6 +854,17 @@ resource "aws_appsync_function" "addReaction_updateSummary" {
   }
 }
 
+resource "aws_appsync_function" "reaction_updateRollup" {
+  api_id      = module.appsync.api_id
+  data_source = aws_appsync_datasource.messaging_ddb.name
+  name        = "reaction_updateRollup"
+  code        = file("${local.resolvers_path}/reaction_updateRollup.js")
+  runtime {
+    name            = "APPSYNC_JS"
+    runtime_version = "1.0.0"
+  }
+}
+
 resource "aws_appsync_function" "addReaction_fetchSummary" {
   api_id      = module.appsync.api_id
   data_source = aws_appsync_datasource.messaging_ddb.name
@@ -858,6 +898,7 @@ resource "aws_appsync_resolver" "mutation_addReaction" {
     functions = [
       aws_appsync_function.addReaction_put.function_id,
       aws_appsync_function.addReaction_updateSummary.function_id,
+      aws_appsync_function.reaction_updateRollup.function_id,
       aws_appsync_function.addReaction_fetchSummary.function_id,
     ]
   }
@@ -879,6 +920,7 @@ resource "aws_appsync_resolver" "mutation_removeReaction" {
     functions = [
       aws_appsync_function.removeReaction_delete.function_id,
       aws_appsync_function.addReaction_updateSummary.function_id,
+      aws_appsync_function.reaction_updateRollup.function_id,
       aws_appsync_function.addReaction_fetchSummary.function_id,
     ]
   }
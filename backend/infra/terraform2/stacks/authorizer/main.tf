@@ -38,6 +38,10 @@ module "subscription_auth_lambda" {
   timeout           = 10
   memory_size       = 256
   requirements_file = "requirements-subscription.txt"
+  # cognito.py verifies tokens through the shared JWKS cache in services/common
+  extra_files       = {
+    "common/jwks.py" = "../../../../services/common/jwks.py"
+  }
   exclude_globs = [
     ".git/**",
     ".venv/**",
@@ -70,6 +70,17 @@ resource "aws_dynamodb_table" "guild_table" {
     type = "S"
   }
 
+  # GSI6: Guild Directory Index (sparse: guild metadata by type + name/tag tokens)
+  attribute {
+    name = "GSI6PK"
+    type = "S"
+  }
+
+  attribute {
+    name = "GSI6SK"
+    type = "S"
+  }
+
   global_secondary_index {
     name            = "GSI1"
     hash_key        = "GSI1PK"
@@ -105,6 +116,13 @@ resource "aws_dynamodb_table" "guild_table" {
     projection_type = "ALL"
   }
 
+  global_secondary_index {
+    name            = "GSI6"
+    hash_key        = "GSI6PK"
+    range_key       = "GSI6SK"
+    projection_type = "ALL"
+  }
+
   # Enable point-in-time recovery
   point_in_time_recovery {
     enabled = true
@@ -17,6 +17,16 @@ data "terraform_remote_state" "s3" {
   config = merge(local.backend_s3, { key = "backend/s3/terraform.tfstate" })
 }
 
+# Messaging revoke endpoint is reached through API Gateway with the internal API key
+data "terraform_remote_state" "apigateway" {
+  backend = "s3"
+  config = merge(local.backend_s3, { key = "backend/apigateway/terraform.tfstate" })
+  defaults = {
+    invoke_url    = ""
+    api_key_value = ""
+  }
+}
+
 # Use existing ECR image directly (temporarily)
 locals {
   existing_image_uri = "838284111015.dkr.ecr.us-east-2.amazonaws.com/goalsguild_guild_service:v2"
@@ -31,9 +41,12 @@ module "guild_lambda" {
   memory_size   = 256
   environment   = var.environment
   environment_variables = {
-    ENVIRONMENT         = var.environment
-    SETTINGS_SSM_PREFIX = "/goalsguild/guild-service/"
-    GUILD_AVATAR_BUCKET = data.terraform_remote_state.s3.outputs.guild_avatar_bucket_name
+    ENVIRONMENT           = var.environment
+    SETTINGS_SSM_PREFIX   = "/goalsguild/guild-service/"
+    RATE_LIMIT_TABLE      = "gg_core"
+    MESSAGING_SERVICE_URL = var.messaging_service_url != "" ? var.messaging_service_url : data.terraform_remote_state.apigateway.outputs.invoke_url
+    MESSAGING_API_KEY     = data.terraform_remote_state.apigateway.outputs.api_key_value
+    GUILD_AVATAR_BUCKET   = data.terraform_remote_state.s3.outputs.guild_avatar_bucket_name
   }
   
   # Enable function URL for AppSync HTTP data source
@@ -72,6 +72,12 @@ variable "existing_lambda_exec_role_name" {
   default = ""
 }
 
+variable "messaging_service_url" {
+  description = "Override for the messaging service base URL (defaults to the API Gateway stage URL); guild-service calls it to revoke chat access of removed or blocked members"
+  type        = string
+  default     = ""
+}
+
 variable "guild_ranking_calculation_frequency" {
   description = "Frequency for guild ranking calculations (cron expression or rate)"
   type        = string
@@ -28,6 +28,7 @@ module "quest_lambda" {
   environment_variables = {
     ENVIRONMENT         = var.environment
     SETTINGS_SSM_PREFIX = "/goalsguild/quest-service/"
+    RATE_LIMIT_TABLE    = "gg_core"
   }
   
   # Enable function URL for AppSync HTTP data source
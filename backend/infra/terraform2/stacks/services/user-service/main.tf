@@ -28,6 +28,7 @@ module "user_lambda" {
   environment_variables = {
     ENVIRONMENT         = var.environment
     SETTINGS_SSM_PREFIX = "/goalsguild/user-service/"
+    RATE_LIMIT_TABLE    = "gg_core"
   }
 }
 
@@ -1,12 +1,13 @@
 # authorizer.py
 from __future__ import annotations
-import os, json, logging, time, base64
-from typing import Any, Dict
+import os, json, logging, time, base64, hashlib
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
 
 # ABSOLUTE imports (no leading dots)
 import security
 from security import verify_local_jwt
-# from cognito import verify_cognito_jwt  # DISABLED - requires cryptography
+from cognito import verify_cognito_jwt
 
 
 class Unauthorized(Exception):
@@ -22,6 +23,12 @@ def _to_bool(v: str | None, default=False) -> bool:
 AUTH_LOG_ENABLED = _to_bool(os.getenv("AUTH_LOG_ENABLED"), True)  # Enable logging by default
 LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG").upper()  # Use DEBUG level for more details
 ENABLE_LOCAL_JWT = _to_bool(os.getenv("ENABLE_LOCAL_JWT"), True)
+ENABLE_COGNITO_JWT = _to_bool(os.getenv("ENABLE_COGNITO_JWT"), True)
+# Verified tokens are remembered per container; entries never outlive the token's exp
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "1024"))
+AUTH_CACHE_TTL_SECONDS = int(os.getenv("AUTH_CACHE_TTL_SECONDS", "300"))
+# HTTP API authorizers either use simple responses or the IAM policy format
+HTTPAPI_SIMPLE_RESPONSES = _to_bool(os.getenv("HTTPAPI_SIMPLE_RESPONSES"), True)
 
 logger = logging.getLogger("authorizer")
 if not logger.handlers:
@@ -64,8 +71,6 @@ def _dbg(event_name: str, **fields: Any) -> None:
 
 
 def _extract_token(event: dict) -> str:
-    _dbg("extract_token_start", event_keys=list(event.keys()))
-    
     def _first_str(value: Any) -> str | None:
         if isinstance(value, str):
             return value
@@ -101,36 +106,21 @@ def _extract_token(event: dict) -> str:
     
     # REST TOKEN authorizer
     if "authorizationToken" in event:
-        raw = event["authorizationToken"]
-        token = _normalize_bearer(raw)
-        parts = str(raw).split()
-        _dbg("token_extracted", source="TOKEN", token=token, raw_length=len(str(raw)), parts_count=len(parts))
-        return token
+        return _normalize_bearer(event["authorizationToken"])
 
     # HTTP API (REQUEST/Lambda authorizer v2)
     headers = event.get("headers") or {}
-    _dbg("extract_token_headers", header_keys=list(headers.keys()))
-    
     for k in ("authorization", "Authorization"):
         if k in headers and headers[k]:
-            raw = headers[k]
-            token = _normalize_bearer(raw)
-            parts = str(raw).split()
-            _dbg("token_extracted", source="HEADER", header_key=k, token=token, raw_length=len(str(raw)), parts_count=len(parts))
-            return token
+            return _normalize_bearer(headers[k])
 
     multi_headers = event.get("multiValueHeaders") or {}
     if multi_headers:
-        _dbg("extract_token_multi_headers", header_keys=list(multi_headers.keys()))
         for k in ("authorization", "Authorization"):
             if k in multi_headers:
                 raw_values = multi_headers[k]
                 if raw_values:
-                    raw = raw_values[0]
-                    token = _normalize_bearer(raw)
-                    parts = str(raw).split()
-                    _dbg("token_extracted", source="MULTI_HEADER", header_key=k, token=token, raw_length=len(str(raw)), parts_count=len(parts))
-                    return token
+                    return _normalize_bearer(raw_values[0])
 
     # AppSync real-time connections pass headers as base64-encoded query params
     qs = event.get("queryStringParameters") or event.get("multiValueQueryStringParameters") or {}
@@ -138,20 +128,15 @@ def _extract_token(event: dict) -> str:
     if header_param:
         header_map = _decode_b64(header_param)
         if header_map:
-            _dbg("qs_header_decoded", keys=list(header_map.keys()))
             for k in ("authorization", "Authorization"):
                 raw = header_map.get(k)
                 if raw:
-                    token = _normalize_bearer(raw)
-                    parts = str(raw).split()
-                    _dbg("token_extracted", source="QS_HEADER", header_key=k, token=token, raw_length=len(str(raw)), parts_count=len(parts))
-                    return token
+                    return _normalize_bearer(raw)
 
     payload_param = qs.get("payload") or qs.get("Payload")
     if payload_param:
         payload = _decode_b64(payload_param)
         if isinstance(payload, dict):
-            _dbg("qs_payload_decoded", keys=list(payload.keys()))
             candidate_maps = [
                 payload,
                 payload.get("headers") if isinstance(payload.get("headers"), dict) else None,
@@ -163,26 +148,144 @@ def _extract_token(event: dict) -> str:
                 for k in ("authorization", "Authorization"):
                     raw = candidate.get(k)
                     if raw:
-                        token = _normalize_bearer(raw)
-                        parts = str(raw).split()
-                        _dbg("token_extracted", source="QS_PAYLOAD", token=token, raw_length=len(str(raw)), parts_count=len(parts))
-                        return token
+                        return _normalize_bearer(raw)
 
     _dbg("token_missing", available_keys=list(event.keys()), headers_available=bool(headers))
     raise Unauthorized("No token provided")
 
 
-def _allow_policy(principal: str, resource: str, context: Dict[str, Any]) -> dict:
+class _DecisionCache:
+    """
+    LRU of successful verifications for this container, keyed by the SHA-256 of
+    the token so raw tokens are never kept as keys. An entry lives until the
+    token's ``exp`` or ``ttl_seconds`` from now, whichever comes first.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any], str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Tuple[Dict[str, Any], str] | None:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= time.time():
+            del self._entries[key]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1], entry[2]
+
+    def put(self, token: str, claims: Dict[str, Any], provider: str) -> None:
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        if "exp" in claims:
+            try:
+                expires_at = min(expires_at, float(claims["exp"]))
+            except (TypeError, ValueError):
+                return
+        if expires_at <= now:
+            return
+        key = self._key(token)
+        self._entries[key] = (expires_at, claims, provider)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_decision_cache = _DecisionCache(AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS)
+
+
+def _verify_dev_token(token: str) -> Dict[str, Any] | None:
+    # Development escape hatch: unsigned alg 'none' tokens with a 'devsig' signature
+    try:
+        parts = token.split('.')
+        if len(parts) != 3 or parts[2] != 'devsig':
+            return None
+        header = json.loads(base64.urlsafe_b64decode(parts[0] + '==').decode('utf-8'))
+        if header.get('alg') != 'none':
+            return None
+        claims = json.loads(base64.urlsafe_b64decode(parts[1] + '==').decode('utf-8'))
+        exp = claims.get('exp', 0)
+        if exp > int(time.time()):
+            return claims
+        _dbg("dev_token_expired", exp=exp, now=int(time.time()))
+    except Exception as e_dev:
+        _dbg("dev_token_verify_failed", error_type=type(e_dev).__name__, error=str(e_dev))
+    return None
+
+
+def _verify_token(token: str) -> Tuple[Dict[str, Any], str] | None:
+    """Claims and provider for ``token``, or None when no verifier accepts it."""
+    # 1) Optional local HS256 (and the dev escape hatch)
+    if ENABLE_LOCAL_JWT:
+        try:
+            return verify_local_jwt(token), "local"
+        except Exception as e_local:
+            claims = _verify_dev_token(token)
+            if claims is not None:
+                return claims, "dev"
+            _dbg("local_verify_failed", error_type=type(e_local).__name__, error=str(e_local), token=token)
+
+    # 2) Cognito RS256 against the cached user pool JWKS
+    if ENABLE_COGNITO_JWT:
+        try:
+            return verify_cognito_jwt(token), "cognito"
+        except Exception as e_cognito:
+            _dbg("cognito_verify_failed", error_type=type(e_cognito).__name__, error=str(e_cognito), token=token)
+    return None
+
+
+def _policy(principal: str, effect: str, resource: str, context: Dict[str, Any]) -> dict:
     return {
         "principalId": principal,
         "policyDocument": {
             "Version": "2012-10-17",
-            "Statement": [{"Action": "execute-api:Invoke", "Effect": "Allow", "Resource": resource}],
+            "Statement": [{"Action": "execute-api:Invoke", "Effect": effect, "Resource": resource}],
         },
         "context": context,
     }
 
 
+def _allow_policy(principal: str, resource: str, context: Dict[str, Any]) -> dict:
+    return _policy(principal, "Allow", resource, context)
+
+
+def _policy_resource(event: dict) -> str:
+    """
+    Stage-wide resource for a policy response. API Gateway caches the policy by
+    identity source, not by route, so a policy scoped to the first request's
+    methodArn/routeArn would deny the caller's next route until the cache expired.
+    """
+    arn = event.get("methodArn") or event.get("routeArn")
+    if not arn:
+        return "*"
+    # arn:aws:execute-api:{region}:{account}:{apiId}/{stage}/{method}/{path}
+    parts = arn.split("/")
+    if len(parts) < 3:
+        return arn
+    return f"{parts[0]}/{parts[1]}/*"
+
+
 def _httpapi_simple_response(authorized: bool, context: Dict[str, Any]) -> dict:
     return {"isAuthorized": authorized, "context": context}
 
@@ -214,16 +317,45 @@ def _is_appsync_event(event: dict) -> bool:
     return False
 
 
-def _appsync_response(authorized: bool, context: dict) -> dict:
+def _appsync_response(authorized: bool, context: dict, ttl: int = 300) -> dict:
     if not authorized:
-        return {"isAuthorized": False, "resolverContext": context, "deniedFields": [], "ttlOverride": 300}
+        return {"isAuthorized": False, "resolverContext": context, "deniedFields": [], "ttlOverride": ttl}
     # Allow all operations for authenticated users (local or cognito)
     # Fine-grained permissions can be handled at the resolver level
     denied = []
-    return {"isAuthorized": True, "resolverContext": context, "deniedFields": denied, "ttlOverride": 300}
+    return {"isAuthorized": True, "resolverContext": context, "deniedFields": denied, "ttlOverride": ttl}
+
 
+def _cache_ttl(claims: Dict[str, Any], default: int = 300) -> int:
+    """Seconds a caller may cache this decision for without outliving the token."""
+    try:
+        remaining = int(float(claims["exp"]) - time.time())
+    except (KeyError, TypeError, ValueError):
+        return default
+    return max(0, min(default, remaining))
+
+
+def _deny_response(event: dict, is_httpapi: bool, is_appsync: bool) -> dict:
+    if is_httpapi:
+        if HTTPAPI_SIMPLE_RESPONSES:
+            return _httpapi_simple_response(False, {"error": "Unauthorized"})
+        return _policy("unauthorized", "Deny", _policy_resource(event), {"error": "Unauthorized"})
+    if is_appsync:
+        return _appsync_response(False, {"error": "Unauthorized"})
+    raise Unauthorized("Unauthorized")
 
 
+_dbg(
+    "auth_config",
+    enable_local_jwt=ENABLE_LOCAL_JWT,
+    enable_cognito_jwt=ENABLE_COGNITO_JWT,
+    jwt_alg_local=getattr(security, "JWT_ALGORITHM", None),
+    jwt_secret_is_default=(getattr(security, "JWT_SECRET", "") == "default_secret_change_me"),
+    cache_max_entries=AUTH_CACHE_MAX_ENTRIES,
+    cache_ttl_seconds=AUTH_CACHE_TTL_SECONDS,
+    httpapi_simple_responses=HTTPAPI_SIMPLE_RESPONSES,
+)
+
 
 def handler(event, context):
     req_meta = {
@@ -243,69 +375,21 @@ def handler(event, context):
             "typeName": rc.get("typeName"),
             "fieldName": rc.get("fieldName"),
         }
-    _dbg(
-        "auth_start",
-        **req_meta,
-        enable_local_jwt=ENABLE_LOCAL_JWT,
-        jwt_alg_local=getattr(security, "JWT_ALGORITHM", None),
-        jwt_secret_is_default=(getattr(security, "JWT_SECRET", "") == "default_secret_change_me"),
-    )
 
     try:
         token = _extract_token(event)
-        claims = None
-        provider = None
-
-        # 1) Optional local HS256
-        if ENABLE_LOCAL_JWT:
-            try:
-                _dbg("local_verify_attempt", token_length=len(token), token_prefix=token[:20] + "..." if len(token) > 20 else token)
-                claims = verify_local_jwt(token)
-                provider = "local"
-                _dbg("local_verify_ok", sub=claims.get("sub"), scope=claims.get("scope"), claims_keys=list(claims.keys()))
-            except Exception as e_local:
-                _dbg("local_verify_failed", error_type=type(e_local).__name__, error=str(e_local), token_length=len(token), token_prefix=token[:20] + "..." if len(token) > 20 else token)
-
-                # Development escape hatch: handle alg: 'none' tokens for dev mode
-                try:
-                    import base64
-                    parts = token.split('.')
-                    if len(parts) == 3 and parts[2] == 'devsig':
-                        # Decode header to check algorithm
-                        header_data = base64.urlsafe_b64decode(parts[0] + '==').decode('utf-8')
-                        header = json.loads(header_data)
-                        if header.get('alg') == 'none':
-                            # Decode payload
-                            payload_data = base64.urlsafe_b64decode(parts[1] + '==').decode('utf-8')
-                            claims = json.loads(payload_data)
-                            # Validate expiration
-                            exp = claims.get('exp', 0)
-                            if exp > int(time.time()):
-                                provider = "dev"
-                                _dbg("dev_token_verify_ok", sub=claims.get("sub"), exp=exp)
-                            else:
-                                _dbg("dev_token_expired", exp=exp, now=int(time.time()))
-                                claims = None
-                        else:
-                            _dbg("dev_token_wrong_alg", alg=header.get('alg'))
-                    else:
-                        _dbg("dev_token_wrong_format", parts_count=len(parts))
-                except Exception as e_dev:
-                    _dbg("dev_token_verify_failed", error_type=type(e_dev).__name__, error=str(e_dev))
-
-        # 2) Cognito RS256 - DISABLED (not implemented yet)
-        # Cognito verification requires cryptography library which has binary dependencies
-        # For now, we only support local HS256 JWT tokens
-        if claims is None:
-            _dbg("auth_deny_no_valid_token", reason="local_jwt_failed_cognito_disabled", **req_meta)
-            if is_httpapi:
-                _dbg("auth_deny_httpapi", reason="verify_failed", **req_meta)
-                return _httpapi_simple_response(False, {"error": "Unauthorized"})
-            if is_appsync:
-                _dbg("auth_deny_appsync", reason="verify_failed", **req_meta)
-                return _appsync_response(False, {"error": "Unauthorized"})
-            raise Unauthorized("Unauthorized")
-
+        verified = _decision_cache.get(token)
+        cached = verified is not None
+        if not cached:
+            verified = _verify_token(token)
+            if verified is not None:
+                _decision_cache.put(token, *verified)
+
+        if verified is None:
+            _dbg("auth_deny", reason="verify_failed", **req_meta)
+            return _deny_response(event, is_httpapi, is_appsync)
+
+        claims, provider = verified
         principal = claims.get("sub", "user")
         ctx = {
             "provider": provider,
@@ -313,29 +397,24 @@ def handler(event, context):
             "email": claims.get("email", ""),
             "scope": claims.get("scope", ""),
         }
+        _dbg("auth_allow", principal=principal, provider=provider, cached=cached, **req_meta)
 
-        _dbg("auth_success", principal=principal, provider=provider, context=ctx, **req_meta)
-
-        # HTTP API v2 simple response
+        # HTTP API v2: simple response, or a stage-wide policy when simple responses are off
         if is_httpapi:
-            _dbg("auth_allow_httpapi", principal=principal, **req_meta)
-            return _httpapi_simple_response(True, ctx)
+            if HTTPAPI_SIMPLE_RESPONSES:
+                return _httpapi_simple_response(True, ctx)
+            return _allow_policy(principal, _policy_resource(event), ctx)
 
         if is_appsync:
-            _dbg("auth_allow_appsync", principal=principal, **req_meta)
-            return _appsync_response(True, ctx)
+            return _appsync_response(True, ctx, ttl=_cache_ttl(claims))
 
         # REST authorizer policy response
-        method_arn = event.get("methodArn", "*")
-        req_meta_with_method = {**req_meta, "methodArn": method_arn}
-        _dbg("auth_allow_rest", principal=principal, **req_meta_with_method)
-        return _allow_policy(principal, method_arn, ctx)
+        return _allow_policy(principal, _policy_resource(event), ctx)
 
+    except Unauthorized:
+        if is_httpapi or is_appsync:
+            return _deny_response(event, is_httpapi, is_appsync)
+        raise
     except Exception as e:
         _dbg("auth_exception", error_type=type(e).__name__, error=str(e), **req_meta)
-        if is_httpapi:
-            return _httpapi_simple_response(False, {"error": "Unauthorized"})
-        if is_appsync:
-            return _appsync_response(False, {"error": "Unauthorized"})
-        raise Unauthorized("Unauthorized")
-
+        return _deny_response(event, is_httpapi, is_appsync)
@@ -1,53 +1,24 @@
-# cognito.py
 from __future__ import annotations
-import base64, json
+import base64, json, sys
 from functools import lru_cache
+from pathlib import Path
 from typing import Any, Dict
 import requests
-import jwt
-from jwt import PyJWKClient
 from ssm import settings
 
-@lru_cache(maxsize=1)
-def _cognito_issuer() -> str:
-    return f"https://cognito-idp.{settings.cognito_region}.amazonaws.com/{settings.cognito_user_pool_id}"
-
-@lru_cache(maxsize=1)
-def _jwks_url() -> str:
-    return f"{_cognito_issuer()}/.well-known/jwks.json"
+try:
+    from common.jwks import CognitoVerifier, cognito_verifier
+except ImportError:  # running from the repository: common/ sits next to this service
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from common.jwks import CognitoVerifier, cognito_verifier
 
 @lru_cache(maxsize=1)
-def _jwks_client() -> PyJWKClient:
-    return PyJWKClient(_jwks_url())
+def _verifier() -> CognitoVerifier:
+    # One verifier (and JWKS cache) per container; keys are fetched once and refreshed in the background
+    return cognito_verifier(settings.cognito_region, settings.cognito_user_pool_id, settings.cognito_client_id)
 
 def verify_cognito_jwt(token: str) -> dict:
-    signing_key = _jwks_client().get_signing_key_from_jwt(token).key
-    # Skip audience in the core verification so we can support both id/access tokens.
-    claims = jwt.decode(
-        token,
-        signing_key,
-        algorithms=["RS256"],
-        issuer=_cognito_issuer(),
-        options={"require": ["exp", "iat", "iss", "token_use"], "verify_aud": False},
-    )
-    token_use = claims.get("token_use")
-    if token_use == "id":
-        aud = claims.get("aud")
-        cid = settings.cognito_client_id
-        if isinstance(aud, str):
-            if aud != cid:
-                raise ValueError("Invalid audience")
-        elif isinstance(aud, list):
-            if cid not in aud:
-                raise ValueError("Invalid audience")
-        else:
-            raise ValueError("Missing audience")
-    elif token_use == "access":
-        if claims.get("client_id") != settings.cognito_client_id:
-            raise ValueError("Invalid client_id")
-    else:
-        raise ValueError("Invalid token_use")
-    return claims
+    return _verifier().verify(token)
 
 def exchange_auth_code_for_tokens(auth_code: str, redirect_uri: str) -> dict:
     token_url = f"https://{settings.cognito_domain}/oauth2/token"
@@ -4,10 +4,13 @@ set -euo pipefail
 rm -rf build authorizer.zip
 mkdir build
 
-pip3 install -r requirements.txt -t build/
+# cryptography ships native code: install the Lambda (manylinux) wheels whatever the build host
+pip3 install -r requirements.txt -t build/ --platform manylinux2014_x86_64 --only-binary=:all: --python-version 3.12
 
 # include all modules the handler imports
 cp authorizer.py cognito.py security.py ssm.py subscription_auth.py build/
+mkdir -p build/common
+cp ../common/jwks.py build/common/
 
 cd build
 zip -r ../authorizer.zip .
@@ -414,3 +414,144 @@ def test_debug_logging_with_token_peek():
         assert "token_hint" in logged_data
         assert logged_data["token_hint"]["kid"] == "test-kid"
         assert logged_data["token_hint"]["len"] == len(token)
+
+
+def _rest_event(token):
+    return {
+        "type": "TOKEN",
+        "authorizationToken": f"Bearer {token}",
+        "methodArn": "arn:aws:execute-api:us-east-1:123456789012:abc123/prod/GET/quests/42",
+    }
+
+
+def test_handler_caches_verified_tokens():
+    import authorizer
+
+    authorizer._decision_cache.clear()
+    claims = {"sub": "user-123", "email": "user@example.com", "scope": "", "exp": int(time.time()) + 600}
+    with patch.object(authorizer, 'verify_local_jwt', return_value=claims) as verify:
+        first = authorizer.handler(_rest_event("cached-token"), Mock())
+        second = authorizer.handler(_rest_event("cached-token"), Mock())
+
+    assert verify.call_count == 1
+    assert first == second
+    assert authorizer._decision_cache.hits == 1
+    assert "cached-token" not in authorizer._decision_cache._entries
+
+
+def test_decision_cache_is_bounded_by_token_exp():
+    import authorizer
+
+    cache = authorizer._DecisionCache(max_entries=10, ttl_seconds=300)
+    now = time.time()
+    cache.put("expired", {"sub": "a", "exp": now - 1}, "local")
+    cache.put("expiring", {"sub": "b", "exp": now + 60}, "local")
+
+    assert cache.get("expired") is None
+    assert cache.get("expiring") == ({"sub": "b", "exp": now + 60}, "local")
+    with patch.object(authorizer.time, 'time', return_value=now + 61):
+        assert cache.get("expiring") is None
+    assert len(cache) == 0
+
+
+def test_decision_cache_evicts_least_recently_used():
+    import authorizer
+
+    cache = authorizer._DecisionCache(max_entries=2, ttl_seconds=300)
+    exp = time.time() + 600
+    cache.put("a", {"sub": "a", "exp": exp}, "local")
+    cache.put("b", {"sub": "b", "exp": exp}, "local")
+    assert cache.get("a") is not None
+    cache.put("c", {"sub": "c", "exp": exp}, "local")
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_rest_policy_covers_the_whole_stage():
+    import authorizer
+
+    authorizer._decision_cache.clear()
+    claims = {"sub": "user-123", "exp": int(time.time()) + 600}
+    with patch.object(authorizer, 'verify_local_jwt', return_value=claims):
+        response = authorizer.handler(_rest_event("stage-token"), Mock())
+
+    # API Gateway reuses the cached policy for every route the caller hits next
+    statement = response["policyDocument"]["Statement"][0]
+    assert statement["Resource"] == "arn:aws:execute-api:us-east-1:123456789012:abc123/prod/*"
+
+
+def test_httpapi_policy_response_when_simple_responses_disabled():
+    import authorizer
+
+    authorizer._decision_cache.clear()
+    event = {
+        "version": "2.0",
+        "type": "REQUEST",
+        "routeKey": "GET /quests/{id}",
+        "routeArn": "arn:aws:execute-api:us-east-1:123456789012:abc123/$default/GET/quests/42",
+        "headers": {"authorization": "Bearer v2-token"},
+    }
+    claims = {"sub": "user-123", "exp": int(time.time()) + 600}
+    with patch.object(authorizer, 'HTTPAPI_SIMPLE_RESPONSES', False), \
+         patch.object(authorizer, 'verify_local_jwt', return_value=claims):
+        allowed = authorizer.handler(event, Mock())
+    with patch.object(authorizer, 'HTTPAPI_SIMPLE_RESPONSES', False), \
+         patch.object(authorizer, 'verify_local_jwt', side_effect=Exception("bad token")):
+        denied = authorizer.handler({**event, "headers": {"authorization": "Bearer other-token"}}, Mock())
+
+    assert allowed["principalId"] == "user-123"
+    assert allowed["policyDocument"]["Statement"][0]["Effect"] == "Allow"
+    assert allowed["policyDocument"]["Statement"][0]["Resource"] == "arn:aws:execute-api:us-east-1:123456789012:abc123/$default/*"
+    assert allowed["context"]["sub"] == "user-123"
+    assert denied["policyDocument"]["Statement"][0]["Effect"] == "Deny"
+
+
+def test_appsync_ttl_does_not_outlive_the_token():
+    import authorizer
+
+    authorizer._decision_cache.clear()
+    event = {"requestContext": {"apiId": "test-api"}, "headers": {"authorization": "Bearer short-token"}}
+    claims = {"sub": "user-123", "exp": int(time.time()) + 90}
+    with patch.object(authorizer, 'verify_local_jwt', return_value=claims):
+        response = authorizer.handler(event, Mock())
+
+    assert response["isAuthorized"] is True
+    assert 0 < response["ttlOverride"] <= 90
+
+def test_handler_verifies_cognito_rs256_tokens_from_cached_jwks():
+    import authorizer
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from jwt.algorithms import RSAAlgorithm
+    from common.jwks import CognitoVerifier, JWKSCache
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_jwk = RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    public_jwk.update({"kid": "pool-key", "alg": "RS256", "use": "sig"})
+    fetches = []
+    jwks = JWKSCache("https://example.test/jwks.json", fetch=lambda url: fetches.append(url) or {"keys": [public_jwk]})
+    verifier = CognitoVerifier("us-east-1", "test-pool", "test-client", jwks=jwks)
+
+    now = int(time.time())
+    token = jwt.encode(
+        {"sub": "cognito-user", "iss": verifier.issuer, "iat": now, "exp": now + 600,
+         "token_use": "access", "client_id": "test-client"},
+        private_key, algorithm="RS256", headers={"kid": "pool-key"},
+    )
+    event = {
+        "version": "2.0",
+        "routeKey": "GET /test",
+        "headers": {"authorization": f"Bearer {token}"},
+    }
+
+    authorizer._decision_cache.clear()
+    with patch.object(authorizer, 'verify_cognito_jwt', verifier.verify):
+        response = authorizer.handler(event, Mock())
+        authorizer._decision_cache.clear()
+        authorizer.handler(event, Mock())
+
+    assert response["isAuthorized"] is True
+    assert response["context"]["provider"] == "cognito"
+    assert response["context"]["sub"] == "cognito-user"
+    assert len(fetches) == 1
@@ -0,0 +1,143 @@
+"""
+Runs inside a fresh interpreter for one service: imports the entry point,
+invokes it once cold and then repeatedly warm, and prints the timings as a
+JSON line prefixed with ``PROBE_RESULT``.
+
+Only ``sys``, ``time``, ``json`` and ``importlib`` are imported before the
+service so that ``-X importtime`` attributes everything else to it.
+"""
+
+import importlib
+import json
+import sys
+import time
+
+RESULT_MARKER = "PROBE_RESULT "
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+def main() -> None:
+    config = json.loads(sys.argv[1])
+
+    started = time.perf_counter()
+    module = importlib.import_module(config["module"])
+    import_ms = _elapsed_ms(started)
+    target = getattr(module, config["attribute"])
+
+    import asyncio
+
+    if config["kind"] == "asgi":
+        result = asyncio.run(_run_asgi(target, config))
+    else:
+        result = _run_lambda(target, config)
+
+    result["importMs"] = import_ms
+    print(RESULT_MARKER + json.dumps(result), flush=True)
+
+
+def _run_lambda(handler, config) -> dict:
+    event = config["event"]
+
+    started = time.perf_counter()
+    response = handler(event, None)
+    first_ms = _elapsed_ms(started)
+
+    warm = []
+    for _ in range(config["warmRequests"]):
+        started = time.perf_counter()
+        handler(event, None)
+        warm.append(_elapsed_ms(started))
+
+    status = response.get("principalId") if isinstance(response, dict) else None
+    return {"startupMs": 0.0, "firstInvocationMs": first_ms, "firstStatus": status, "warmMs": warm}
+
+
+async def _run_asgi(app, config) -> dict:
+    import asyncio
+
+    started = time.perf_counter()
+    lifespan = await _start_lifespan(app)
+    startup_ms = _elapsed_ms(started)
+
+    started = time.perf_counter()
+    status = await _request(app, config)
+    first_ms = _elapsed_ms(started)
+
+    warm = []
+    for _ in range(config["warmRequests"]):
+        started = time.perf_counter()
+        await _request(app, config)
+        warm.append(_elapsed_ms(started))
+
+    if lifespan is not None:
+        lifespan.cancel()
+        try:
+            await lifespan
+        except (asyncio.CancelledError, Exception):
+            pass
+
+    return {"startupMs": startup_ms, "firstInvocationMs": first_ms, "firstStatus": status, "warmMs": warm}
+
+
+async def _start_lifespan(app):
+    """Run ASGI lifespan startup the way uvicorn does before serving traffic."""
+    import asyncio
+
+    messages: asyncio.Queue = asyncio.Queue()
+    await messages.put({"type": "lifespan.startup"})
+    started = asyncio.get_running_loop().create_future()
+
+    async def receive():
+        return await messages.get()
+
+    async def send(message):
+        if message["type"].startswith("lifespan.startup") and not started.done():
+            started.set_result(message)
+
+    task = asyncio.create_task(app({"type": "lifespan", "asgi": {"version": "3.0"}}, receive, send))
+    done, _ = await asyncio.wait({task, started}, return_when=asyncio.FIRST_COMPLETED)
+    if started in done and started.result()["type"] == "lifespan.startup.failed":
+        raise RuntimeError(started.result().get("message") or "lifespan startup failed")
+    return None if task in done else task
+
+
+async def _request(app, config) -> int:
+    path = config["path"]
+    headers = [(key.lower().encode("latin-1"), value.encode("latin-1")) for key, value in config["headers"].items()]
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": config["method"],
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("latin-1"),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"localhost")] + headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 8080),
+    }
+    request_sent = False
+    status = []
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await app(scope, receive, send)
+    return status[0] if status else None
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the service Lambdas.
+
+Every service is started in a fresh interpreter (``python -X importtime``)
+against a local AWS stand-in that serves DynamoDB and SSM, so module-level
+work such as ``boto3.resource(...)`` or loading settings from SSM runs for
+real. For each service the benchmark records:
+
+* import time of the entry point, with a ``-X importtime`` breakdown by
+  package and the slowest modules, plus the time spent in the service's own
+  module bodies
+* ASGI startup time (lifespan hooks) where applicable
+* first-invocation latency and warm-invocation latency (p50/p95)
+
+Results are written as JSON and can be compared against a saved baseline to
+catch regressions.
+
+Usage:
+    python cold_start.py [--services quest-service guild-service] [--runs 3]
+                         [--endpoint-url http://localhost:8000]
+                         [--output results/latest.json]
+                         [--baseline results/baseline.json] [--save-baseline]
+
+Without ``--endpoint-url`` a moto server is started in-process (requires
+``moto[server]``). Any DynamoDB Local or LocalStack endpoint that also serves
+SSM works as well.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+SERVICES_DIR = BENCHMARKS_DIR.parent
+PROBE = BENCHMARKS_DIR / "_probe.py"
+RESULTS_DIR = BENCHMARKS_DIR / "results"
+
+sys.path.insert(0, str(BENCHMARKS_DIR))
+
+from _probe import RESULT_MARKER  # noqa: E402
+from services import (  # noqa: E402
+    BENCH_USER_ID, JWT_AUDIENCE, JWT_ISSUER, JWT_SECRET, SERVICES, SHARED_SSM_PARAMETERS, TABLES, ServiceSpec
+)
+
+REGION = "us-east-1"
+COMPARED_METRICS = ("importMs", "startupMs", "firstInvocationMs", "warmP50Ms")
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+class BenchmarkError(Exception):
+    """Raised when a service cannot be benchmarked."""
+
+
+# ---------- -X importtime parsing ----------
+
+def parse_importtime(stderr: str) -> List[dict]:
+    """Parse ``-X importtime`` output into ``{module, selfUs, cumulativeUs, depth}`` rows."""
+    rows = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        rows.append({
+            "module": module,
+            "selfUs": int(self_us),
+            "cumulativeUs": int(cumulative_us),
+            "depth": max(0, (len(indent) - 1) // 2),
+        })
+    return rows
+
+
+def summarize_imports(rows: Iterable[dict], own_packages: Iterable[str], top: int = 15) -> dict:
+    """Group import self-time by top-level package and list the slowest modules."""
+    rows = list(rows)
+    own_packages = set(own_packages)
+    by_package: Dict[str, int] = {}
+    own_modules = []
+    for row in rows:
+        package = row["module"].split(".", 1)[0]
+        by_package[package] = by_package.get(package, 0) + row["selfUs"]
+        if package in own_packages:
+            own_modules.append(row)
+
+    def _ms(value_us: int) -> float:
+        return round(value_us / 1000, 3)
+
+    packages = sorted(by_package.items(), key=lambda item: item[1], reverse=True)
+    slowest = sorted(rows, key=lambda row: row["selfUs"], reverse=True)[:top]
+    return {
+        "totalMs": _ms(sum(row["selfUs"] for row in rows)),
+        # Time spent executing the service's own module bodies (clients, settings, app wiring)
+        "ownModuleBodiesMs": _ms(sum(row["selfUs"] for row in own_modules)),
+        "byPackageMs": {package: _ms(value) for package, value in packages[:top]},
+        "slowestModules": [
+            {"module": row["module"], "selfMs": _ms(row["selfUs"]), "cumulativeMs": _ms(row["cumulativeUs"])}
+            for row in slowest
+        ],
+    }
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile; ``None`` for an empty list."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+# ---------- local AWS stand-in ----------
+
+class LocalStandIn:
+    """Local DynamoDB/SSM endpoint seeded with the tables and parameters the services expect."""
+
+    def __init__(self, endpoint_url: Optional[str] = None):
+        self.endpoint_url = endpoint_url
+        self.kind = "external" if endpoint_url else "moto-server"
+        self._server = None
+
+    def __enter__(self) -> "LocalStandIn":
+        if self.endpoint_url is None:
+            try:
+                from moto.server import ThreadedMotoServer
+            except ImportError as exc:
+                raise BenchmarkError(
+                    "moto[server] is required for the built-in stand-in; install it or pass --endpoint-url"
+                ) from exc
+            # The moto server logs every request through werkzeug
+            logging.getLogger("werkzeug").setLevel(logging.ERROR)
+            self._server = ThreadedMotoServer(ip_address="127.0.0.1", port=0, verbose=False)
+            self._server.start()
+            host, port = self._server.get_host_and_port()
+            self.endpoint_url = f"http://{host}:{port}"
+        self._seed()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._server is not None:
+            self._server.stop()
+
+    def _client(self, service: str):
+        import boto3
+
+        return boto3.client(
+            service,
+            region_name=REGION,
+            endpoint_url=self.endpoint_url,
+            aws_access_key_id="benchmark",
+            aws_secret_access_key="benchmark",
+        )
+
+    def _seed(self) -> None:
+        dynamodb = self._client("dynamodb")
+        existing = set(dynamodb.list_tables().get("TableNames", []))
+        for table_name, indexes in TABLES:
+            if table_name in existing:
+                continue
+            attributes = {"PK", "SK"}
+            kwargs = {}
+            if indexes:
+                kwargs["GlobalSecondaryIndexes"] = [
+                    {
+                        "IndexName": index,
+                        "KeySchema": [
+                            {"AttributeName": f"{index}PK", "KeyType": "HASH"},
+                            {"AttributeName": f"{index}SK", "KeyType": "RANGE"},
+                        ],
+                        "Projection": {"ProjectionType": "ALL"},
+                    }
+                    for index in indexes
+                ]
+                attributes.update(f"{index}{suffix}" for index in indexes for suffix in ("PK", "SK"))
+            dynamodb.create_table(
+                TableName=table_name,
+                KeySchema=[{"AttributeName": "PK", "KeyType": "HASH"}, {"AttributeName": "SK", "KeyType": "RANGE"}],
+                AttributeDefinitions=[{"AttributeName": name, "AttributeType": "S"} for name in sorted(attributes)],
+                BillingMode="PAY_PER_REQUEST",
+                **kwargs,
+            )
+
+        ssm = self._client("ssm")
+        parameters = dict(SHARED_SSM_PARAMETERS)
+        for spec in SERVICES.values():
+            parameters.update(spec.ssm_parameters)
+        for name, value in parameters.items():
+            # env_vars are read without decryption, so only secrets are stored encrypted
+            parameter_type = "SecureString" if "secret" in name.lower() else "String"
+            ssm.put_parameter(Name=name, Value=value, Type=parameter_type, Overwrite=True)
+
+    def environment(self) -> Dict[str, str]:
+        return {
+            "AWS_ENDPOINT_URL": self.endpoint_url,
+            "AWS_ACCESS_KEY_ID": "benchmark",
+            "AWS_SECRET_ACCESS_KEY": "benchmark",
+            "AWS_REGION": REGION,
+            "AWS_DEFAULT_REGION": REGION,
+            "AWS_EC2_METADATA_DISABLED": "true",
+        }
+
+
+# ---------- running services ----------
+
+def _bench_token() -> str:
+    import jwt
+
+    now = int(time.time())
+    claims = {
+        "sub": BENCH_USER_ID,
+        "iat": now,
+        "nbf": now,
+        "exp": now + 3600,
+        "aud": JWT_AUDIENCE,
+        "iss": JWT_ISSUER,
+        "scope": "user",
+        "role": "user",
+    }
+    return jwt.encode(claims, JWT_SECRET, algorithm="HS256")
+
+
+def _probe_config(spec: ServiceSpec, warm_requests: int) -> dict:
+    headers = {}
+    event = dict(spec.event or {})
+    if spec.authenticated:
+        token = _bench_token()
+        headers["Authorization"] = f"Bearer {token}"
+        if spec.kind == "lambda":
+            event["authorizationToken"] = f"Bearer {token}"
+    return {
+        "module": spec.module,
+        "attribute": spec.attribute,
+        "kind": spec.kind,
+        "method": spec.method,
+        "path": spec.path,
+        "headers": headers,
+        "event": event,
+        "warmRequests": warm_requests,
+    }
+
+
+def run_probe(spec: ServiceSpec, stand_in: LocalStandIn, warm_requests: int, timeout: float = 120.0) -> dict:
+    """Cold-start one service in a fresh interpreter and return its raw timings."""
+    service_dir = SERVICES_DIR / spec.directory
+    env = {
+        **os.environ,
+        **stand_in.environment(),
+        **spec.env,
+        "PYTHONPATH": os.pathsep.join([str(service_dir), str(SERVICES_DIR)]),
+        "PYTHONDONTWRITEBYTECODE": "",
+    }
+    command = [sys.executable, "-X", "importtime", str(PROBE), json.dumps(_probe_config(spec, warm_requests))]
+    started = time.perf_counter()
+    completed = subprocess.run(command, cwd=service_dir, env=env, capture_output=True, text=True, timeout=timeout)
+    process_ms = round((time.perf_counter() - started) * 1000, 3)
+
+    result_lines = [line for line in completed.stdout.splitlines() if line.startswith(RESULT_MARKER)]
+    if completed.returncode != 0 or not result_lines:
+        errors = [line for line in completed.stderr.splitlines() if not line.startswith("import time:")]
+        raise BenchmarkError(f"{spec.name} failed (exit {completed.returncode}): " + "\n".join(errors[-15:]))
+
+    result = json.loads(result_lines[-1][len(RESULT_MARKER):])
+    result["processMs"] = process_ms
+    result["importRows"] = parse_importtime(completed.stderr)
+    return result
+
+
+def benchmark_service(spec: ServiceSpec, stand_in: LocalStandIn, runs: int, warm_requests: int) -> dict:
+    """Run several cold starts and report medians, with the import breakdown of the median run."""
+    samples = [run_probe(spec, stand_in, warm_requests) for _ in range(runs)]
+    samples.sort(key=lambda sample: sample["importMs"])
+    median_sample = samples[len(samples) // 2]
+    warm = [value for sample in samples for value in sample["warmMs"]]
+
+    def _median(key: str) -> float:
+        return round(statistics.median(sample[key] for sample in samples), 3)
+
+    return {
+        "runs": runs,
+        "importMs": _median("importMs"),
+        "startupMs": _median("startupMs"),
+        "firstInvocationMs": _median("firstInvocationMs"),
+        "firstStatus": median_sample["firstStatus"],
+        "warmP50Ms": percentile(warm, 50),
+        "warmP95Ms": percentile(warm, 95),
+        "processMs": _median("processMs"),
+        "imports": summarize_imports(median_sample["importRows"], spec.packages),
+    }
+
+
+def run_benchmarks(
+    names: Iterable[str],
+    runs: int = 3,
+    warm_requests: int = 20,
+    endpoint_url: Optional[str] = None,
+) -> dict:
+    results: Dict[str, dict] = {}
+    with LocalStandIn(endpoint_url) as stand_in:
+        for name in names:
+            spec = SERVICES[name]
+            print(f"benchmarking {name} ...", file=sys.stderr, flush=True)
+            try:
+                results[name] = benchmark_service(spec, stand_in, runs, warm_requests)
+            except (BenchmarkError, subprocess.TimeoutExpired) as exc:
+                results[name] = {"error": str(exc)}
+    return {
+        "generatedAt": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "standIn": stand_in.kind,
+        "services": results,
+    }
+
+
+# ---------- regression comparison ----------
+
+def compare_results(current: dict, baseline: dict, tolerance: float = 0.2, min_delta_ms: float = 5.0) -> List[dict]:
+    """
+    Compare current results with a baseline.
+
+    A metric regresses when it is more than ``tolerance`` (relative) and more
+    than ``min_delta_ms`` (absolute) slower than the baseline; both thresholds
+    must be exceeded so noise on tiny numbers does not fail the run.
+    """
+    rows = []
+    for name, result in current.get("services", {}).items():
+        previous = baseline.get("services", {}).get(name)
+        if not previous or "error" in result or "error" in previous:
+            continue
+        for metric in COMPARED_METRICS:
+            now, before = result.get(metric), previous.get(metric)
+            if now is None or before is None:
+                continue
+            delta = now - before
+            regressed = delta > min_delta_ms and now > before * (1 + tolerance)
+            rows.append({
+                "service": name,
+                "metric": metric,
+                "baselineMs": before,
+                "currentMs": now,
+                "deltaMs": round(delta, 3),
+                "regressed": regressed,
+            })
+    return rows
+
+
+def format_report(results: dict, comparison: Optional[List[dict]] = None) -> str:
+    lines = [f"{'service':<24}{'import':>10}{'startup':>10}{'first':>10}{'warm p50':>10}{'warm p95':>10}  status"]
+    for name, result in results["services"].items():
+        if "error" in result:
+            lines.append(f"{name:<24}  ERROR: {result['error'].splitlines()[-1]}")
+            continue
+        lines.append(
+            f"{name:<24}{result['importMs']:>10.1f}{result['startupMs']:>10.1f}{result['firstInvocationMs']:>10.1f}"
+            f"{result['warmP50Ms']:>10.2f}{result['warmP95Ms']:>10.2f}  {result['firstStatus']}"
+        )
+        top = ", ".join(f"{pkg} {ms:.0f}" for pkg, ms in list(result["imports"]["byPackageMs"].items())[:5])
+        lines.append(f"{'':<24}imports (ms): {top}; own module bodies {result['imports']['ownModuleBodiesMs']:.0f}")
+    if comparison:
+        regressions = [row for row in comparison if row["regressed"]]
+        lines.append("")
+        lines.append(f"{len(regressions)} regression(s) against baseline")
+        for row in regressions:
+            lines.append(
+                f"  {row['service']} {row['metric']}: {row['baselineMs']:.1f} -> {row['currentMs']:.1f} ms"
+            )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure service import time and cold/warm invocation latency")
+    parser.add_argument("--services", nargs="+", choices=sorted(SERVICES), default=list(SERVICES))
+    parser.add_argument("--runs", type=int, default=3, help="Cold starts per service (median is reported)")
+    parser.add_argument("--warm-requests", type=int, default=20, help="Warm invocations per cold start")
+    parser.add_argument("--endpoint-url", help="Existing local DynamoDB/SSM endpoint instead of a moto server")
+    parser.add_argument("--output", type=Path, default=RESULTS_DIR / "latest.json")
+    parser.add_argument("--baseline", type=Path, default=RESULTS_DIR / "baseline.json")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown before failing")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.services, args.runs, args.warm_requests, args.endpoint_url)
+
+    comparison = None
+    if args.baseline.exists() and not args.save_baseline:
+        comparison = compare_results(results, json.loads(args.baseline.read_text()), args.tolerance)
+        results["comparison"] = comparison
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2))
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2))
+
+    print(format_report(results, comparison))
+    failed = any("error" in result for result in results["services"].values())
+    regressed = any(row["regressed"] for row in comparison or [])
+    return 1 if failed or regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the messaging service's connection bookkeeping.
+
+Fills a ``ConnectionManager`` with simulated WebSockets (tens of thousands by
+default) spread over a fixed number of rooms, so rooms get larger as the
+socket count grows (a busy guild chat), then times connect, room and user
+lookups, and disconnect. With dict/set indexes the cost per operation stays
+flat as the number of sockets grows, while scanning a room's or a user's
+connections grows linearly.
+
+Usage:
+    python messaging_connections.py [--sizes 1000 10000 50000]
+                                    [--rooms 20]
+                                    [--sockets-per-user 2]
+                                    [--max-growth 3.0]
+
+Exits with status 1 when the per-operation cost at the largest size is more
+than ``--max-growth`` times the cost at the smallest size.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+MESSAGING_APP_DIR = BENCHMARKS_DIR.parent / "messaging-service" / "app"
+
+OPERATIONS = ("connectUs", "roomLookupUs", "userLookupUs", "disconnectUs")
+
+
+class SimulatedSocket:
+    """Just enough of a WebSocket for ConnectionManager.connect/disconnect."""
+
+    __slots__ = ("index",)
+
+    def __init__(self, index: int):
+        self.index = index
+
+    async def accept(self):
+        pass
+
+
+def load_connection_manager():
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+    if str(MESSAGING_APP_DIR) not in sys.path:
+        sys.path.insert(0, str(MESSAGING_APP_DIR))
+    from main import ConnectionManager
+
+    # connect/disconnect log every call at INFO
+    logging.getLogger("main").setLevel(logging.WARNING)
+    return ConnectionManager
+
+
+async def _drain(manager) -> None:
+    # disconnect() hands backplane bookkeeping to background tasks
+    while manager._background_tasks:
+        await asyncio.gather(*list(manager._background_tasks))
+
+
+async def measure(manager_class, sockets: int, rooms: int, sockets_per_user: int,
+                  probes: int = 2000) -> Dict[str, float]:
+    """Average microseconds per operation with ``sockets`` connections open."""
+    manager = manager_class()
+    rooms = max(1, min(rooms, sockets))
+    users = max(1, sockets // sockets_per_user)
+    connections = [SimulatedSocket(i) for i in range(sockets)]
+
+    started = time.perf_counter()
+    for i, websocket in enumerate(connections):
+        await manager.connect(websocket, f"ROOM-{i % rooms}", f"user-{i % users}")
+    connect_us = (time.perf_counter() - started) * 1e6 / sockets
+
+    probes = min(probes, sockets)
+    step = max(1, sockets // probes)
+    probe_indexes = range(0, step * probes, step)
+
+    started = time.perf_counter()
+    for i in probe_indexes:
+        manager.get_room_connections(f"ROOM-{i % rooms}")
+    room_lookup_us = (time.perf_counter() - started) * 1e6 / probes
+
+    started = time.perf_counter()
+    for i in probe_indexes:
+        manager.get_user_connections(f"user-{i % users}")
+    user_lookup_us = (time.perf_counter() - started) * 1e6 / probes
+
+    # Only the synchronous bookkeeping is timed; backplane work runs afterwards
+    started = time.perf_counter()
+    for i in probe_indexes:
+        manager.disconnect(connections[i])
+    disconnect_us = (time.perf_counter() - started) * 1e6 / probes
+    await _drain(manager)
+
+    return {
+        "sockets": sockets,
+        "rooms": rooms,
+        "users": users,
+        "connectUs": round(connect_us, 3),
+        "roomLookupUs": round(room_lookup_us, 3),
+        "userLookupUs": round(user_lookup_us, 3),
+        "disconnectUs": round(disconnect_us, 3),
+    }
+
+
+def growth(results: List[Dict[str, float]]) -> Dict[str, float]:
+    """Per-operation cost at the largest size relative to the smallest."""
+    smallest, largest = results[0], results[-1]
+    return {
+        operation: round(largest[operation] / smallest[operation], 2) if smallest[operation] else 0.0
+        for operation in OPERATIONS
+    }
+
+
+def format_report(results: List[Dict[str, float]], ratios: Dict[str, float]) -> str:
+    header = f"{'sockets':>9} {'rooms':>7} {'users':>7} " + " ".join(f"{op:>13}" for op in OPERATIONS)
+    lines = [header]
+    for row in results:
+        lines.append(
+            f"{row['sockets']:>9} {row['rooms']:>7} {row['users']:>7} "
+            + " ".join(f"{row[op]:>13.3f}" for op in OPERATIONS)
+        )
+    lines.append(f"{'growth':>25} " + " ".join(f"{ratios[op]:>12.2f}x" for op in OPERATIONS))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Time messaging ConnectionManager bookkeeping at scale")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--rooms", type=int, default=20, help="Rooms the sockets are spread over")
+    parser.add_argument("--sockets-per-user", type=int, default=2)
+    parser.add_argument("--max-growth", type=float, default=3.0,
+                        help="Allowed per-operation slowdown from the smallest to the largest size")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    manager_class = load_connection_manager()
+    sizes = sorted(args.sizes)
+    results = []
+    for size in sizes:
+        # As timeit does: keep collector pauses out of the per-operation numbers
+        gc.collect()
+        gc.disable()
+        try:
+            results.append(asyncio.run(measure(manager_class, size, args.rooms, args.sockets_per_user)))
+        finally:
+            gc.enable()
+    ratios = growth(results)
+
+    if args.json:
+        print(json.dumps({"results": results, "growth": ratios}, indent=2))
+    else:
+        print(format_report(results, ratios))
+
+    regressed = [op for op, ratio in ratios.items() if ratio > args.max_growth]
+    if regressed:
+        print(f"\nPer-operation cost grew more than {args.max_growth}x: {', '.join(regressed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
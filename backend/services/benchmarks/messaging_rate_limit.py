@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the messaging service's per-user rate limiter.
+
+Simulates ``--users`` users (100k by default) each sending a few messages and
+reports, for the GCRA limiter and for the previous list-of-timestamps
+limiter:
+
+* the average cost of one check-and-record
+* the memory held by the limiter's state (tracemalloc), in total and per user
+* how many entries remain once every user has gone idle (the previous limiter
+  never forgot a user)
+
+Usage:
+    python messaging_rate_limit.py [--users 100000] [--messages-per-user 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+MESSAGING_APP_DIR = BENCHMARKS_DIR.parent / "messaging-service" / "app"
+
+
+class ListWindowLimiter:
+    """The limiter messaging-service used before: a list of datetimes per user, rebuilt on each check."""
+
+    def __init__(self):
+        self.user_limits: Dict[str, List[datetime]] = {}
+        self.max_messages_per_minute = 30
+
+    def is_allowed(self, user_id: str) -> bool:
+        now = datetime.now()
+        minute_ago = now - timedelta(minutes=1)
+        if user_id not in self.user_limits:
+            self.user_limits[user_id] = []
+        self.user_limits[user_id] = [ts for ts in self.user_limits[user_id] if ts > minute_ago]
+        return len(self.user_limits[user_id]) < self.max_messages_per_minute
+
+    def record_message(self, user_id: str):
+        if user_id not in self.user_limits:
+            self.user_limits[user_id] = []
+        self.user_limits[user_id].append(datetime.now())
+
+
+class ManualClock:
+    def __init__(self):
+        self.now = time.monotonic()
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def load_rate_limiter():
+    if str(MESSAGING_APP_DIR) not in sys.path:
+        sys.path.insert(0, str(MESSAGING_APP_DIR))
+    from rate_limit import RateLimiter
+
+    return RateLimiter
+
+
+def _send(limiter, user_ids: List[str], messages_per_user: int) -> None:
+    for _ in range(messages_per_user):
+        for user_id in user_ids:
+            if limiter.is_allowed(user_id):
+                limiter.record_message(user_id)
+
+
+def run(name: str, make_limiter: Callable[[], object], users: int, messages_per_user: int,
+        go_idle: Optional[Callable[[object], None]] = None) -> Dict[str, float]:
+    """Time one limiter, then measure a fresh one's memory (tracemalloc slows it down too much to time)."""
+    user_ids = [f"user-{i}" for i in range(users)]
+    checks = users * messages_per_user
+
+    limiter = make_limiter()
+    gc.collect()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        _send(limiter, user_ids, messages_per_user)
+        elapsed = time.perf_counter() - started
+    finally:
+        gc.enable()
+
+    limiter = make_limiter()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        _send(limiter, user_ids, messages_per_user)
+        held = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+
+    if go_idle is not None:
+        go_idle(limiter)
+
+    return {
+        "limiter": name,
+        "users": users,
+        "checks": checks,
+        "checkNs": round(elapsed * 1e9 / checks, 1),
+        "stateBytes": held,
+        "bytesPerUser": round(held / users, 1),
+        "entriesAfterIdle": len(limiter.user_limits),
+    }
+
+
+def format_report(results: List[Dict[str, float]]) -> str:
+    columns = ("limiter", "users", "checkNs", "stateBytes", "bytesPerUser", "entriesAfterIdle")
+    lines = [" ".join(f"{column:>16}" for column in columns)]
+    for row in results:
+        lines.append(" ".join(f"{row[column]!s:>16}" for column in columns))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Time and size the messaging rate limiter at scale")
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--messages-per-user", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    rate_limiter_class = load_rate_limiter()
+    clock = ManualClock()
+
+    def make_gcra():
+        return rate_limiter_class(max_messages_per_minute=30, max_keys=max(args.users, 1), clock=clock)
+
+    def go_idle(limiter):
+        # Every user's TAT is now in the past; the next write triggers the sweep
+        clock.now += 60 + limiter.cleanup_interval
+        limiter.record_message("still-active")
+
+    results = [
+        run("gcra", make_gcra, args.users, args.messages_per_user, go_idle),
+        # It has no eviction, so every user is still held after going idle
+        run("list-window", ListWindowLimiter, args.users, args.messages_per_user),
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(format_report(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
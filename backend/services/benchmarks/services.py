@@ -0,0 +1,168 @@
+"""
+Service definitions for the cold-start benchmark.
+
+Each entry says how to import a service's Lambda entry point, which request
+to send it, and which SSM parameters and DynamoDB tables the local stand-in
+must provide so the module imports the same way it does in AWS.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+BENCH_USER_ID = "0b3e5f1a-7c2d-4e8f-9a6b-1d2c3e4f5a6b"
+JWT_SECRET = "benchmark-jwt-secret-0123456789abcdef"
+JWT_AUDIENCE = "api://default"
+JWT_ISSUER = "https://auth.local"
+CORE_TABLE = "gg_core"
+GUILD_TABLE = "gg_guild"
+USERS_TABLE = "gg_users"
+LOGIN_ATTEMPTS_TABLE = "gg_login_attempts"
+
+_COGNITO = {
+    "COGNITO_REGION": "us-east-1",
+    "COGNITO_USER_POOL_ID": "us-east-1_bench",
+    "COGNITO_CLIENT_ID": "bench-client",
+    "COGNITO_DOMAIN": "bench.auth.local",
+}
+
+_USER_SERVICE_ENV_VARS = {
+    "DYNAMODB_USERS_TABLE": USERS_TABLE,
+    "CORE_TABLE": CORE_TABLE,
+    "LOGIN_ATTEMPTS_TABLE": LOGIN_ATTEMPTS_TABLE,
+    "JWT_ISSUER": JWT_ISSUER,
+    "JWT_AUDIENCE": JWT_AUDIENCE,
+    "COGNITO_CLIENT_SECRET": "bench-secret",
+    "SES_SENDER_EMAIL": "bench@example.com",
+    "APP_BASE_URL": "http://localhost:8080",
+    "FRONTEND_BASE_URL": "http://localhost:8080",
+    **_COGNITO,
+}
+
+
+def _service_env_vars(**extra: str) -> str:
+    return json.dumps({
+        "CORE_TABLE": CORE_TABLE,
+        "JWT_ISSUER": JWT_ISSUER,
+        "JWT_AUDIENCE": JWT_AUDIENCE,
+        "JWT_SECRET_PARAM": "/goalsguild/user-service/JWT_SECRET",
+        "ALLOWED_ORIGINS": ["http://localhost:8080"],
+        "ENVIRONMENT": "dev",
+        **_COGNITO,
+        **extra,
+    })
+
+
+SHARED_SSM_PARAMETERS: Dict[str, str] = {
+    "/goalsguild/user-service/JWT_SECRET": JWT_SECRET,
+    "/goalsguild/user-service/env_vars": json.dumps(_USER_SERVICE_ENV_VARS),
+    "/goalsguild/user-service/email_token_secret": "benchmark-email-token-secret",
+}
+
+# (table name, GSI names); every key is a string PK/SK pair
+TABLES: List[Tuple[str, Tuple[str, ...]]] = [
+    (CORE_TABLE, ("GSI1", "GSI2", "GSI3", "GSI4")),
+    (GUILD_TABLE, ("GSI1", "GSI2", "GSI3", "GSI4", "GSI5", "GSI6")),
+    (USERS_TABLE, ("GSI1", "GSI2")),
+    (LOGIN_ATTEMPTS_TABLE, ()),
+]
+
+
+@dataclass(frozen=True)
+class ServiceSpec:
+    """How to cold-start and invoke one service."""
+
+    name: str
+    directory: str
+    module: str
+    attribute: str
+    # "asgi" apps run behind the Lambda Web Adapter; "lambda" is a plain handler(event, context)
+    kind: str = "asgi"
+    method: str = "GET"
+    path: str = "/health"
+    authenticated: bool = False
+    event: Optional[dict] = None
+    # Top-level modules that belong to the service, used to report its own import work
+    packages: Tuple[str, ...] = ("app", "common")
+    ssm_parameters: Dict[str, str] = field(default_factory=dict)
+    env: Dict[str, str] = field(default_factory=dict)
+
+
+SERVICES: Dict[str, ServiceSpec] = {
+    spec.name: spec
+    for spec in [
+        ServiceSpec(
+            name="quest-service",
+            directory="quest-service",
+            module="app.main",
+            attribute="app",
+            path="/quests/progress",
+            authenticated=True,
+            ssm_parameters={"/goalsguild/quest-service/env_vars": _service_env_vars()},
+            env={"QUEST_SERVICE_ROOT_PATH": ""},
+        ),
+        ServiceSpec(
+            name="guild-service",
+            directory="guild-service",
+            module="app.main",
+            attribute="app",
+            path="/guilds",
+            authenticated=True,
+            ssm_parameters={
+                "/goalsguild/guild-service/core-table": CORE_TABLE,
+                "/goalsguild/guild-service/jwt-audience": JWT_AUDIENCE,
+                "/goalsguild/guild-service/jwt-issuer": JWT_ISSUER,
+            },
+            env={"GUILD_TABLE_NAME": GUILD_TABLE},
+        ),
+        ServiceSpec(
+            name="user-service",
+            directory="user-service",
+            module="app.main",
+            attribute="app",
+        ),
+        ServiceSpec(
+            name="gamification-service",
+            directory="gamification-service",
+            module="app.main",
+            attribute="app",
+            ssm_parameters={"/goalsguild/gamification-service/env_vars": _service_env_vars()},
+        ),
+        ServiceSpec(
+            name="collaboration-service",
+            directory="collaboration-service",
+            module="app.main",
+            attribute="app",
+            ssm_parameters={"/goalsguild/collaboration-service/env_vars": _service_env_vars()},
+        ),
+        ServiceSpec(
+            name="subscription-service",
+            directory="subscription-service",
+            module="app.main",
+            attribute="app",
+            env={"ENVIRONMENT": "dev", "CORE_TABLE": CORE_TABLE},
+        ),
+        ServiceSpec(
+            name="connect-service",
+            directory="connect-service",
+            module="app.main",
+            attribute="app",
+            ssm_parameters={"/goalsguild/connect-service/env_vars": _service_env_vars()},
+        ),
+        ServiceSpec(
+            name="authorizer-service",
+            directory="authorizer-service",
+            module="authorizer",
+            attribute="handler",
+            kind="lambda",
+            authenticated=True,
+            event={
+                "type": "TOKEN",
+                "methodArn": "arn:aws:execute-api:us-east-1:000000000000:bench/dev/GET/quests",
+            },
+            packages=("authorizer", "security", "ssm", "cognito", "subscription_auth"),
+        ),
+    ]
+}
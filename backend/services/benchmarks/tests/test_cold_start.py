@@ -0,0 +1,70 @@
+"""
+Tests for the cold-start benchmark's parsing and regression comparison.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cold_start import compare_results, parse_importtime, percentile, summarize_imports
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      3000 |       3000 |     botocore.model
+import time:      1500 |       4500 |   botocore
+import time:      2000 |       6500 | boto3
+import time:     40000 |      40000 |   app.settings
+import time:     10000 |      56500 | app.main
+Traceback (most recent call last):
+"""
+
+
+class TestImportBreakdown:
+    def test_parse_importtime_rows(self):
+        rows = parse_importtime(IMPORTTIME_OUTPUT)
+
+        assert [row["module"] for row in rows] == [
+            "_io", "botocore.model", "botocore", "boto3", "app.settings", "app.main"
+        ]
+        assert rows[1] == {"module": "botocore.model", "selfUs": 3000, "cumulativeUs": 3000, "depth": 2}
+        assert rows[-1]["depth"] == 0
+
+    def test_summary_groups_by_package_and_own_modules(self):
+        summary = summarize_imports(parse_importtime(IMPORTTIME_OUTPUT), ("app", "common"), top=2)
+
+        assert summary["totalMs"] == 56.62
+        assert summary["ownModuleBodiesMs"] == 50.0
+        assert summary["byPackageMs"] == {"app": 50.0, "botocore": 4.5}
+        assert summary["slowestModules"][0] == {"module": "app.settings", "selfMs": 40.0, "cumulativeMs": 40.0}
+
+    def test_percentile(self):
+        values = [5.0, 1.0, 3.0, 2.0, 4.0]
+
+        assert percentile(values, 50) == 3.0
+        assert percentile(values, 95) == 5.0
+        assert percentile([], 50) is None
+
+
+class TestCompareResults:
+    @staticmethod
+    def _results(import_ms, warm_ms=1.0, error=None):
+        service = {"error": error} if error else {
+            "importMs": import_ms, "startupMs": 0.5, "firstInvocationMs": 20.0, "warmP50Ms": warm_ms
+        }
+        return {"services": {"quest-service": service}}
+
+    def test_flags_relative_and_absolute_slowdown(self):
+        rows = compare_results(self._results(900.0), self._results(600.0))
+
+        regressed = [row for row in rows if row["regressed"]]
+        assert [(row["metric"], row["deltaMs"]) for row in regressed] == [("importMs", 300.0)]
+
+    def test_small_absolute_changes_are_noise(self):
+        rows = compare_results(self._results(600.0, warm_ms=3.0), self._results(600.0, warm_ms=1.0))
+
+        assert not any(row["regressed"] for row in rows)
+
+    def test_failed_services_are_skipped(self):
+        assert compare_results(self._results(0, error="boom"), self._results(600.0)) == []
@@ -0,0 +1,29 @@
+"""
+Tests for the messaging connection bookkeeping micro-benchmark.
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from messaging_connections import OPERATIONS, growth, load_connection_manager, measure
+
+
+def test_measure_reports_every_operation():
+    manager_class = load_connection_manager()
+
+    result = asyncio.run(measure(manager_class, sockets=200, rooms=4, sockets_per_user=2, probes=50))
+
+    assert (result["sockets"], result["rooms"], result["users"]) == (200, 4, 100)
+    assert all(result[operation] >= 0 for operation in OPERATIONS)
+
+
+def test_growth_compares_largest_to_smallest_size():
+    small = {"connectUs": 1.0, "roomLookupUs": 0.5, "userLookupUs": 0.5, "disconnectUs": 2.0}
+    large = {"connectUs": 1.5, "roomLookupUs": 0.5, "userLookupUs": 2.0, "disconnectUs": 0.0}
+
+    assert growth([small, large]) == {
+        "connectUs": 1.5, "roomLookupUs": 1.0, "userLookupUs": 4.0, "disconnectUs": 0.0
+    }
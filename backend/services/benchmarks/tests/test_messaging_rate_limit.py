@@ -0,0 +1,26 @@
+"""
+Tests for the messaging rate limiter benchmark.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from messaging_rate_limit import ListWindowLimiter, ManualClock, load_rate_limiter, run
+
+
+def test_gcra_forgets_idle_users_and_list_window_does_not():
+    rate_limiter_class = load_rate_limiter()
+    clock = ManualClock()
+
+    def go_idle(limiter):
+        clock.now += 60 + limiter.cleanup_interval
+        limiter.record_message("still-active")
+
+    gcra = run("gcra", lambda: rate_limiter_class(clock=clock), users=50, messages_per_user=2, go_idle=go_idle)
+    list_window = run("list-window", ListWindowLimiter, users=50, messages_per_user=2)
+
+    assert gcra["checks"] == list_window["checks"] == 100
+    assert gcra["entriesAfterIdle"] == 1
+    assert list_window["entriesAfterIdle"] == 50
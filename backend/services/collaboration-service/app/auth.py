@@ -3,14 +3,14 @@ Authentication utilities for collaboration service.
 """
 
 import logging
-from functools import lru_cache
 from typing import Dict, Tuple, Any
 
 import jwt
-from jwt import PyJWKClient, PyJWTError
+from jwt import PyJWTError
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+from common.jwks import CognitoTokenError, cognito_verifier
 from .settings import Settings
 
 logger = logging.getLogger("collaboration-service.auth")
@@ -26,15 +26,6 @@ class TokenVerifier:
     def __init__(self, settings: Settings):
         self.settings = settings
 
-    @property
-    def cognito_issuer(self) -> str:
-        return f"https://cognito-idp.{self.settings.cognito_region}.amazonaws.com/{self.settings.cognito_user_pool_id}"
-
-    @lru_cache(maxsize=1)
-    def _jwks_client(self) -> PyJWKClient:
-        jwks_url = f"{self.cognito_issuer}/.well-known/jwks.json"
-        return PyJWKClient(jwks_url)
-
     def verify(self, token: str) -> Tuple[Dict, str]:
         """Return (claims, provider) or raise TokenVerificationError."""
         logger.info(f"collaboration.auth.verify_token_start - token_length={len(token)}, token_prefix={token[:20] + '...' if len(token) > 20 else token}")
@@ -82,39 +73,13 @@ class TokenVerifier:
             raise
 
     def _verify_cognito(self, token: str) -> Dict:
-        logger.info(f"collaboration.auth.verify_cognito_start - cognito_issuer={self.cognito_issuer}, cognito_client_id={self.settings.cognito_client_id}")
-        
         try:
-            # Decode header to check algorithm and kid
-            header = jwt.get_unverified_header(token)
-            logger.info(f"collaboration.auth.cognito_token_header - algorithm={header.get('alg')}, kid={header.get('kid')}")
-            
-            signing_key = self._jwks_client().get_signing_key_from_jwt(token).key
-        except Exception as e:
-            logger.error(f"collaboration.auth.cognito_signing_key_failed - error={str(e)}, error_type={type(e).__name__}")
-            raise
-        claims = jwt.decode(
-            token,
-            signing_key,
-            algorithms=["RS256"],
-            issuer=self.cognito_issuer,
-            options={"require": ["exp", "iat", "iss", "token_use"], "verify_aud": False},
-        )
-        token_use = claims.get("token_use")
-        if token_use == "id":
-            audience = claims.get("aud")
-            client_id = self.settings.cognito_client_id
-            if isinstance(audience, list):
-                if client_id not in audience:
-                    raise TokenVerificationError("Invalid Cognito audience")
-            elif audience != client_id:
-                raise TokenVerificationError("Invalid Cognito audience")
-        elif token_use == "access":
-            if claims.get("client_id") != self.settings.cognito_client_id:
-                raise TokenVerificationError("Invalid Cognito client_id")
-        else:
-            raise TokenVerificationError("Unsupported Cognito token_use")
-        return claims
+            verifier = cognito_verifier(
+                self.settings.cognito_region, self.settings.cognito_user_pool_id, self.settings.cognito_client_id
+            )
+            return verifier.verify(token)
+        except CognitoTokenError as exc:
+            raise TokenVerificationError(str(exc)) from exc
 
 
 # Global settings instance
@@ -629,7 +629,8 @@ def list_user_collaborations(user_id: str, resource_type: Optional[str] = None)
         raise CollaborationDBError(f"Failed to list user collaborations: {str(e)}")
 
 
-def add_collaborator(resource_type: str, resource_id: str, user_id: str, role: str = "collaborator") -> None:
+def add_collaborator(resource_type: str, resource_id: str, user_id: str, role: str = "collaborator",
+                     owner_id: Optional[str] = None) -> None:
     """
     Add a collaborator to a resource (used internally when invites are accepted).
 
@@ -638,6 +639,8 @@ def add_collaborator(resource_type: str, resource_id: str, user_id: str, role: s
         resource_id: ID of the resource
         user_id: ID of the user to add as collaborator
         role: Role of the collaborator (default: collaborator)
+        owner_id: ID of the resource owner. Stored on the record so readers can
+            fetch the resource directly (USER#{owner_id}) instead of searching for it.
 
     Raises:
         CollaborationDBError: If database operation fails
@@ -667,6 +670,8 @@ def add_collaborator(resource_type: str, resource_id: str, user_id: str, role: s
             "joinedAt": datetime.now(UTC).isoformat(),
             "lastSeenAt": datetime.now(UTC).isoformat()
         }
+        if owner_id:
+            collaborator_item["ownerId"] = owner_id
 
         # Add user profile data if available
         if "Item" in user_profile:
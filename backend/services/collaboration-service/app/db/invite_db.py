@@ -982,7 +982,8 @@ def accept_invite(user_id: str, invite_id: str) -> InviteResponse:
         
         # Create collaborator item
         from .collaborator_db import add_collaborator
-        add_collaborator(invite.resource_type, invite.resource_id, user_id)
+        add_collaborator(invite.resource_type, invite.resource_id, user_id,
+                         owner_id=invite.owner_id or invite.inviter_id)
         
         logger.info('collaboration_invite.accept_success', 
                    user_id=user_id, 
@@ -164,6 +164,24 @@ class TestInviteDatabaseOperations:
             with pytest.raises(CollaborationInviteValidationError):
                 accept_invite("user-456", "inv-123")
     
+    def test_accept_invite_records_resource_owner(self, mock_settings, mock_table):
+        """Test accepting an invite stores the resource owner on the collaborator record."""
+        mock_invite = Mock()
+        mock_invite.invitee_id = "user-456"
+        mock_invite.inviter_id = "user-123"
+        mock_invite.owner_id = "user-123"
+        mock_invite.resource_type = "goal"
+        mock_invite.resource_id = "goal-123"
+        mock_invite.status = "pending"
+        mock_invite.expires_at = datetime.now(UTC) + timedelta(days=30)
+        
+        with patch('app.db.invite_db.get_invite', return_value=mock_invite), \
+                patch('app.db.invite_db._ddb_call'), \
+                patch('app.db.collaborator_db.add_collaborator') as mock_add:
+            accept_invite("user-456", "inv-123")
+        
+        mock_add.assert_called_once_with("goal", "goal-123", "user-456", owner_id="user-123")
+    
     def test_decline_invite_success(self, mock_settings, mock_table):
         """Test successful invite decline."""
         # Mock get_invite response
@@ -0,0 +1,147 @@
+"""
+Shared non-blocking DynamoDB access for async FastAPI handlers.
+
+boto3 is synchronous: calling ``table.query`` inside an ``async def`` blocks
+the event loop and serializes every other in-flight request in the
+container. This module offloads DynamoDB calls to a dedicated thread pool and
+bounds how many run at once, so one worker can overlap many requests without
+exhausting threads or the HTTP connection pool.
+
+Usage::
+
+    from common.async_dynamodb import run_dynamodb
+
+    response = await run_dynamodb(table.get_item, Key={"PK": pk, "SK": sk})
+
+Any callable can be offloaded, including helpers that make several boto3
+calls (``await run_dynamodb(_write_items, table, items)``). The limit is read
+from ``DYNAMODB_MAX_CONCURRENCY`` (default 32); use ``dynamodb_client_config``
+when creating boto3 resources so the connection pool matches it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from botocore.config import Config
+
+T = TypeVar("T")
+
+DEFAULT_MAX_CONCURRENCY = 32
+
+
+def _env_max_concurrency() -> int:
+    try:
+        value = int(os.getenv("DYNAMODB_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY))
+    except ValueError:
+        value = DEFAULT_MAX_CONCURRENCY
+    return max(1, value)
+
+
+def dynamodb_client_config(max_concurrency: Optional[int] = None) -> Config:
+    """botocore Config whose connection pool matches the concurrency limit."""
+    return Config(max_pool_connections=max_concurrency or _env_max_concurrency())
+
+
+@functools.lru_cache(maxsize=None)
+def get_dynamodb_resource(region_name: Optional[str] = None):
+    """Process-wide DynamoDB resource per region, sized for the concurrency limit."""
+    import boto3
+
+    kwargs: dict[str, Any] = {"config": dynamodb_client_config()}
+    if region_name:
+        kwargs["region_name"] = region_name
+    return boto3.resource("dynamodb", **kwargs)
+
+
+class AsyncDynamoDB:
+    """Runs blocking DynamoDB calls on a bounded thread pool.
+
+    At most ``max_concurrency`` calls run at the same time; further callers
+    wait on a per-event-loop semaphore instead of queueing threads.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None) -> None:
+        self.max_concurrency = max_concurrency or _env_max_concurrency()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._in_flight = 0
+        self._peak_in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Number of DynamoDB calls currently executing."""
+        return self._in_flight
+
+    @property
+    def peak_in_flight(self) -> int:
+        """Highest number of concurrent calls observed since creation."""
+        return self._peak_in_flight
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_concurrency, thread_name_prefix="dynamodb"
+                    )
+        return self._executor
+
+    def _get_semaphore(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``fn(*args, **kwargs)`` off the event loop, respecting the limit."""
+        loop = asyncio.get_running_loop()
+        async with self._get_semaphore(loop):
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+            try:
+                return await loop.run_in_executor(
+                    self._get_executor(), functools.partial(fn, *args, **kwargs)
+                )
+            finally:
+                self._in_flight -= 1
+
+    async def gather(self, *calls: Callable[[], T]) -> list[T]:
+        """Run zero-argument callables concurrently (still bounded) and return their results in order."""
+        return list(await asyncio.gather(*(self.run(call) for call in calls)))
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker threads (mainly for tests and graceful shutdown)."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+
+_default: Optional[AsyncDynamoDB] = None
+_default_lock = threading.Lock()
+
+
+def get_async_dynamodb() -> AsyncDynamoDB:
+    """Process-wide AsyncDynamoDB instance."""
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = AsyncDynamoDB()
+    return _default
+
+
+async def run_dynamodb(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking DynamoDB call on the shared bounded pool."""
+    return await get_async_dynamodb().run(fn, *args, **kwargs)
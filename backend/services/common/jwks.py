@@ -0,0 +1,232 @@
+"""
+Shared Cognito (RS256) token verification with a cached JWKS.
+
+``JWKSCache`` fetches a JSON Web Key Set once, parses every key into a
+``PyJWK`` up front, and serves keys from memory, so verifying a token costs
+one RSA signature check and no network round trip:
+
+* Keys older than ``max_age`` are refreshed on a background thread while the
+  current keys keep serving requests.
+* A token signed with an unknown ``kid`` (Cognito rotated its keys) triggers
+  a synchronous refresh, at most once per ``min_refresh_interval`` so tokens
+  with made-up ``kid`` values can't turn into a fetch per request.
+* A failed refresh keeps the previous keys.
+
+``cognito_verifier`` returns one ``CognitoVerifier`` per user pool and client
+for the whole process, so every caller shares the same key cache::
+
+    from common.jwks import CognitoTokenError, cognito_verifier
+
+    claims = cognito_verifier(region, user_pool_id, client_id).verify(token)
+
+``COGNITO_JWKS_URL`` overrides where the keys are loaded from (``file://``
+URLs work), for local development against a JWKS fixture.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import urllib.request
+from typing import Any, Callable, Dict, Optional
+
+import jwt
+from jwt import PyJWK, PyJWTError
+
+logger = logging.getLogger("common.jwks")
+
+ALGORITHM = "RS256"
+
+
+class JWKSError(Exception):
+    """Raised when the key set can't be loaded or has no key for a ``kid``."""
+
+
+class CognitoTokenError(ValueError):
+    """Raised when a Cognito token fails verification."""
+
+
+def fetch_jwks(url: str, timeout: float = 3.0) -> Dict[str, Any]:
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+class JWKSCache:
+    """Parsed signing keys from ``url`` by ``kid``, refreshed as described in the module docstring."""
+
+    def __init__(
+        self,
+        url: str,
+        max_age: float = 3600.0,
+        min_refresh_interval: float = 60.0,
+        fetch: Optional[Callable[[str], Dict[str, Any]]] = None,
+    ):
+        self.url = url
+        self.max_age = max_age
+        self.min_refresh_interval = min_refresh_interval
+        self._fetch = fetch or fetch_jwks
+        self._keys: Dict[str, PyJWK] = {}
+        self._fetched_at: Optional[float] = None
+        self._attempted_at: Optional[float] = None
+        self._lock = threading.Lock()  # guards the swap of _keys/_fetched_at
+        self._thread_lock = threading.Lock()  # guards _refresh_thread bookkeeping
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    @property
+    def kids(self) -> list:
+        return sorted(self._keys)
+
+    def get_signing_key(self, kid: str) -> PyJWK:
+        key = self._keys.get(kid)
+        if key is not None:
+            if self._is_stale():
+                self.refresh_in_background()
+            return key
+
+        if self._may_refresh():
+            self.refresh()
+            key = self._keys.get(kid)
+        if key is None:
+            raise JWKSError(f"No signing key for kid {kid!r}")
+        return key
+
+    def refresh(self) -> None:
+        """Fetch and parse the key set now; the previous keys are kept if that fails."""
+        # The fetch runs unlocked so requests holding a cached key never wait on the network;
+        # only the swap of the parsed keys is serialised.
+        self._attempted_at = time.monotonic()
+        try:
+            jwks = self._fetch(self.url)
+        except Exception as exc:
+            if self._fetched_at is None:
+                raise JWKSError(f"Could not load JWKS from {self.url}") from exc
+            logger.warning("jwks.refresh_failed", extra={"url": self.url, "error": str(exc)})
+            return
+        keys = self._parse(jwks)
+        with self._lock:
+            if not keys and self._keys:
+                logger.warning("jwks.refresh_empty", extra={"url": self.url})
+                return
+            self._keys = keys
+            self._fetched_at = time.monotonic()
+
+    def refresh_in_background(self) -> None:
+        """Start a refresh on a daemon thread unless one is already running."""
+        with self._thread_lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            if not self._may_refresh():
+                return
+            self._refresh_thread = threading.Thread(target=self._background_refresh, name="jwks-refresh", daemon=True)
+            self._refresh_thread.start()
+
+    def _background_refresh(self) -> None:
+        try:
+            self.refresh()
+        except JWKSError as exc:
+            logger.warning("jwks.background_refresh_failed", extra={"url": self.url, "error": str(exc)})
+
+    def _is_stale(self) -> bool:
+        return self._fetched_at is None or time.monotonic() - self._fetched_at >= self.max_age
+
+    def _may_refresh(self) -> bool:
+        return self._attempted_at is None or time.monotonic() - self._attempted_at >= self.min_refresh_interval
+
+    @staticmethod
+    def _parse(jwks: Dict[str, Any]) -> Dict[str, PyJWK]:
+        keys: Dict[str, PyJWK] = {}
+        for data in jwks.get("keys", []) if isinstance(jwks, dict) else []:
+            kid = data.get("kid")
+            if not kid or data.get("use", "sig") != "sig":
+                continue
+            try:
+                keys[kid] = PyJWK(data, algorithm=data.get("alg", ALGORITHM))
+            except PyJWTError as exc:
+                logger.warning("jwks.key_skipped", extra={"kid": kid, "error": str(exc)})
+        return keys
+
+
+class CognitoVerifier:
+    """
+    Verifies Cognito id and access tokens for one user pool. ``client_id``
+    is checked against ``aud`` (id tokens) or ``client_id`` (access tokens);
+    pass ``None`` to accept tokens issued to any client of the pool.
+    """
+
+    def __init__(
+        self,
+        region: str,
+        user_pool_id: str,
+        client_id: Optional[str] = None,
+        jwks: Optional[JWKSCache] = None,
+        leeway: float = 0,
+    ):
+        self.issuer = f"https://cognito-idp.{region}.amazonaws.com/{user_pool_id}"
+        self.client_id = client_id
+        self.jwks = jwks or JWKSCache(f"{self.issuer}/.well-known/jwks.json")
+        self.leeway = leeway
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        try:
+            header = jwt.get_unverified_header(token)
+        except PyJWTError as exc:
+            raise CognitoTokenError("Malformed token") from exc
+        if header.get("alg") != ALGORITHM:
+            raise CognitoTokenError("Unsupported algorithm")
+        kid = header.get("kid")
+        if not kid:
+            raise CognitoTokenError("Token has no kid")
+
+        try:
+            key = self.jwks.get_signing_key(kid)
+            claims = jwt.decode(
+                token,
+                key.key,
+                algorithms=[ALGORITHM],
+                issuer=self.issuer,
+                leeway=self.leeway,
+                options={"require": ["exp", "iat", "iss", "token_use"], "verify_aud": False},
+            )
+        except JWKSError as exc:
+            raise CognitoTokenError(str(exc)) from exc
+        except PyJWTError as exc:
+            raise CognitoTokenError(f"Invalid token: {exc}") from exc
+
+        token_use = claims.get("token_use")
+        if token_use == "id":
+            audience = claims.get("aud")
+            if not audience:
+                raise CognitoTokenError("Missing audience")
+            if self.client_id is not None:
+                audiences = audience if isinstance(audience, list) else [audience]
+                if self.client_id not in audiences:
+                    raise CognitoTokenError("Invalid audience")
+        elif token_use == "access":
+            if self.client_id is not None and claims.get("client_id") != self.client_id:
+                raise CognitoTokenError("Invalid client_id")
+        else:
+            raise CognitoTokenError("Invalid token_use")
+        return claims
+
+
+@functools.lru_cache(maxsize=16)
+def cognito_verifier(region: str, user_pool_id: str, client_id: Optional[str] = None) -> CognitoVerifier:
+    """Process-wide verifier (and key cache) for a user pool and client."""
+    if not region or not user_pool_id:
+        raise CognitoTokenError("Cognito not configured")
+    jwks_url = os.getenv("COGNITO_JWKS_URL")
+    return CognitoVerifier(region, user_pool_id, client_id, jwks=JWKSCache(jwks_url) if jwks_url else None)
+
+
+__all__ = [
+    "CognitoTokenError",
+    "CognitoVerifier",
+    "JWKSCache",
+    "JWKSError",
+    "cognito_verifier",
+    "fetch_jwks",
+]
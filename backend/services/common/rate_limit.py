@@ -0,0 +1,328 @@
+"""
+Shared rate limiting for the service Lambdas.
+
+Limits are enforced with GCRA (the generic cell rate algorithm, equivalent to
+a token bucket): each key keeps a single "theoretical arrival time" (TAT).
+A request is allowed when the TAT is at most the burst tolerance ahead of
+now, and pushes the TAT forward by one emission interval
+(``period_seconds / limit``).
+
+Two backends keep that state:
+
+* ``DynamoDBRateLimitBackend``: one item per key in a shared table, updated
+  with a conditional write so concurrent Lambdas can't both spend the same
+  slot. Items carry a ``ttl`` so DynamoDB removes idle keys.
+* ``LocalRateLimitBackend``: per process, bounded by ``max_keys`` and swept
+  of idle keys.
+
+``RateLimiter`` uses the DynamoDB backend when ``RATE_LIMIT_TABLE`` is set
+and falls back to the local one (for ``fallback_seconds``) when DynamoDB
+fails, so an outage degrades to per-process limits instead of errors.
+
+Usage::
+
+    from common.rate_limit import RateLimit, RateLimiter, install_rate_limit_headers
+
+    contact_limiter = RateLimiter("contact", RateLimit(limit=3, period_seconds=300))
+    install_rate_limit_headers(app)
+
+    @app.post("/contact")
+    async def contact(request: Request):
+        await contact_limiter.enforce(client_ip, detail="Too many submissions")
+
+``enforce`` raises a 429 ``HTTPException`` with ``Retry-After`` when the limit
+is exceeded; with ``install_rate_limit_headers`` every response also carries
+``X-RateLimit-Limit``, ``X-RateLimit-Remaining`` and ``X-RateLimit-Reset``.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import logging
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("common.rate_limit")
+
+KEY_PREFIX = "RATELIMIT#"
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """``limit`` requests per ``period_seconds``, in bursts of up to ``burst`` (default ``limit``)."""
+
+    limit: int
+    period_seconds: float
+    burst: Optional[int] = None
+
+    @property
+    def emission_interval(self) -> float:
+        return self.period_seconds / self.limit
+
+    @property
+    def burst_tolerance(self) -> float:
+        return self.emission_interval * ((self.burst or self.limit) - 1)
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    # Seconds until the key is back to a full burst
+    reset_after: float
+    # Seconds until the next request would be allowed (0 when allowed)
+    retry_after: float
+
+    def headers(self, now: Optional[float] = None) -> Dict[str, str]:
+        now = time.time() if now is None else now
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(int(math.ceil(now + self.reset_after))),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, int(math.ceil(self.retry_after))))
+        return headers
+
+
+def gcra(tat: Optional[float], now: float, rate: RateLimit) -> Tuple[RateLimitDecision, Optional[float]]:
+    """
+    Decide one request. Returns the decision and the new TAT to store
+    (``None`` when the request was denied and nothing changes).
+    """
+    tat = now if tat is None or tat < now else tat
+    limit = rate.burst or rate.limit
+    if tat - now > rate.burst_tolerance:
+        return RateLimitDecision(
+            allowed=False,
+            limit=limit,
+            remaining=0,
+            reset_after=tat - now,
+            retry_after=tat - now - rate.burst_tolerance,
+        ), None
+    new_tat = tat + rate.emission_interval
+    remaining = int(math.floor((rate.burst_tolerance - (new_tat - now)) / rate.emission_interval + 1e-9)) + 1
+    return RateLimitDecision(
+        allowed=True,
+        limit=limit,
+        remaining=max(0, remaining),
+        reset_after=new_tat - now,
+        retry_after=0.0,
+    ), new_tat
+
+
+class LocalRateLimitBackend:
+    """Per-process GCRA state, bounded to ``max_keys`` and swept of idle keys."""
+
+    kind = "local"
+
+    def __init__(self, max_keys: int = 100000, sweep_interval: float = 60.0, clock: Callable[[], float] = time.time):
+        self.max_keys = max_keys
+        self.sweep_interval = sweep_interval
+        self._clock = clock
+        self._tats: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._next_sweep = clock() + sweep_interval
+
+    def acquire(self, key: str, rate: RateLimit) -> RateLimitDecision:
+        with self._lock:
+            now = self._clock()
+            if now >= self._next_sweep:
+                self._sweep(now)
+            decision, new_tat = gcra(self._tats.get(key), now, rate)
+            if new_tat is not None:
+                if key not in self._tats and len(self._tats) >= self.max_keys:
+                    self._sweep(now)
+                    if len(self._tats) >= self.max_keys:
+                        # Forgetting a key only makes its limit more lenient
+                        del self._tats[next(iter(self._tats))]
+                self._tats[key] = new_tat
+            return decision
+
+    def _sweep(self, now: float) -> None:
+        self._next_sweep = now + self.sweep_interval
+        # A TAT in the past carries no state: the key is back to a full burst
+        for key in [key for key, tat in self._tats.items() if tat <= now]:
+            del self._tats[key]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tats.clear()
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+
+class DynamoDBRateLimitBackend:
+    """
+    GCRA state in DynamoDB, one item per key::
+
+        PK = RATELIMIT#{key}, SK = RATELIMIT, tat = <epoch seconds>, ttl = <epoch seconds>
+
+    Each request reads the item and writes the new TAT conditioned on the TAT
+    it read (or on the item not existing), retrying when another writer got
+    there first.
+    """
+
+    kind = "dynamodb"
+
+    def __init__(self, table: Any, max_attempts: int = 4, clock: Callable[[], float] = time.time):
+        self.table = table
+        self.max_attempts = max_attempts
+        self._clock = clock
+
+    def acquire(self, key: str, rate: RateLimit) -> RateLimitDecision:
+        item_key = {"PK": f"{KEY_PREFIX}{key}", "SK": "RATELIMIT"}
+        decision = None
+        for _ in range(self.max_attempts):
+            item = self.table.get_item(Key=item_key, ConsistentRead=True).get("Item")
+            stored = item.get("tat") if item else None
+            now = self._clock()
+            decision, new_tat = gcra(float(stored) if stored is not None else None, now, rate)
+            if new_tat is None:
+                return decision
+            new_item = {
+                **item_key,
+                "type": "RateLimit",
+                "tat": Decimal(f"{new_tat:.3f}"),
+                # Past this point the key is back to a full burst, so DynamoDB may drop it
+                "ttl": int(math.ceil(new_tat)) + 1,
+            }
+            try:
+                if stored is None:
+                    self.table.put_item(Item=new_item, ConditionExpression="attribute_not_exists(PK)")
+                else:
+                    self.table.put_item(
+                        Item=new_item,
+                        ConditionExpression="#tat = :stored",
+                        ExpressionAttributeNames={"#tat": "tat"},
+                        ExpressionAttributeValues={":stored": stored},
+                    )
+                return decision
+            except Exception as e:
+                if _error_code(e) != "ConditionalCheckFailedException":
+                    raise
+        # Still contended after every attempt: the key is hot, so deny rather than guess
+        return RateLimitDecision(
+            allowed=False,
+            limit=rate.burst or rate.limit,
+            remaining=0,
+            reset_after=decision.reset_after if decision else rate.emission_interval,
+            retry_after=rate.emission_interval,
+        )
+
+
+def _error_code(error: Exception) -> Optional[str]:
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        return response.get("Error", {}).get("Code")
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def default_backend():
+    """DynamoDB backend on ``RATE_LIMIT_TABLE`` when set, otherwise the process-local backend."""
+    table_name = os.getenv("RATE_LIMIT_TABLE")
+    if not table_name:
+        return LocalRateLimitBackend()
+    from common.async_dynamodb import get_dynamodb_resource
+
+    return DynamoDBRateLimitBackend(get_dynamodb_resource().Table(table_name))
+
+
+# Decisions made while handling the current request, read by install_rate_limit_headers
+_request_decisions: contextvars.ContextVar[Optional[List[RateLimitDecision]]] = contextvars.ContextVar(
+    "rate_limit_decisions", default=None
+)
+
+
+def _record(decision: RateLimitDecision) -> RateLimitDecision:
+    decisions = _request_decisions.get()
+    if decisions is not None:
+        decisions.append(decision)
+    return decision
+
+
+class RateLimiter:
+    """A named limit applied per identifier (user id, client IP, ...)."""
+
+    def __init__(
+        self,
+        name: str,
+        rate: RateLimit,
+        backend: Any = None,
+        fallback: Optional[LocalRateLimitBackend] = None,
+        fallback_seconds: float = 30.0,
+    ):
+        self.name = name
+        self.rate = rate
+        self._backend = backend
+        self.fallback = fallback or LocalRateLimitBackend()
+        self.fallback_seconds = fallback_seconds
+        self._backend_down_until = 0.0
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = default_backend()
+        return self._backend
+
+    def check(self, identifier: str) -> RateLimitDecision:
+        """Count one request for ``identifier`` and return the decision (blocking)."""
+        return _record(self._decide(identifier))
+
+    def _decide(self, identifier: str) -> RateLimitDecision:
+        key = f"{self.name}#{identifier}"
+        backend = self.backend
+        if backend is not self.fallback and time.monotonic() >= self._backend_down_until:
+            try:
+                return backend.acquire(key, self.rate)
+            except Exception as e:
+                self._backend_down_until = time.monotonic() + self.fallback_seconds
+                logger.warning(
+                    "rate_limit.backend_unavailable",
+                    extra={"limiter": self.name, "backend": getattr(backend, "kind", None), "error": str(e)},
+                )
+        return self.fallback.acquire(key, self.rate)
+
+    async def check_async(self, identifier: str) -> RateLimitDecision:
+        """``check`` without blocking the event loop on a DynamoDB round trip."""
+        if isinstance(self.backend, LocalRateLimitBackend):
+            return self.check(identifier)
+        from common.async_dynamodb import run_dynamodb
+
+        return _record(await run_dynamodb(self._decide, identifier))
+
+    async def enforce(self, identifier: str, detail: Any = "Rate limit exceeded") -> RateLimitDecision:
+        """Count a request and raise HTTP 429 (with ``Retry-After``) when it is over the limit."""
+        decision = await self.check_async(identifier)
+        if not decision.allowed:
+            from fastapi import HTTPException
+
+            raise HTTPException(status_code=429, detail=detail, headers=decision.headers())
+        return decision
+
+
+def install_rate_limit_headers(app) -> None:
+    """Add ``X-RateLimit-*`` headers for the most restrictive limit checked while handling each request."""
+
+    @app.middleware("http")
+    async def rate_limit_headers_middleware(request, call_next):
+        decisions: List[RateLimitDecision] = []
+        token = _request_decisions.set(decisions)
+        try:
+            response = await call_next(request)
+        finally:
+            _request_decisions.reset(token)
+        if decisions:
+            tightest = min(decisions, key=lambda decision: (decision.remaining, -decision.reset_after))
+            for name, value in tightest.headers().items():
+                response.headers.setdefault(name, value)
+        return response
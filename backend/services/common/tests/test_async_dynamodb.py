@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from common.async_dynamodb import AsyncDynamoDB, dynamodb_client_config
+
+
+class TestAsyncDynamoDB:
+    def test_run_returns_result_off_the_event_loop(self):
+        runner = AsyncDynamoDB(max_concurrency=2)
+        loop_thread = threading.get_ident()
+
+        def call(value, *, offset):
+            return value + offset, threading.get_ident()
+
+        async def main():
+            return await runner.run(call, 1, offset=2)
+
+        result, worker_thread = asyncio.run(main())
+        runner.shutdown()
+
+        assert result == 3
+        assert worker_thread != loop_thread
+
+    def test_concurrency_is_bounded(self):
+        runner = AsyncDynamoDB(max_concurrency=3)
+
+        def slow_call():
+            time.sleep(0.02)
+            return runner.in_flight
+
+        async def main():
+            return await runner.gather(*([slow_call] * 12))
+
+        results = asyncio.run(main())
+        runner.shutdown()
+
+        assert len(results) == 12
+        assert max(results) <= 3
+        assert runner.peak_in_flight == 3
+        assert runner.in_flight == 0
+
+    def test_calls_overlap_instead_of_serializing(self):
+        runner = AsyncDynamoDB(max_concurrency=8)
+
+        async def main():
+            started = time.perf_counter()
+            await runner.gather(*([lambda: time.sleep(0.05)] * 8))
+            return time.perf_counter() - started
+
+        elapsed = asyncio.run(main())
+        runner.shutdown()
+
+        assert elapsed < 0.05 * 4
+
+    def test_exceptions_propagate(self):
+        runner = AsyncDynamoDB(max_concurrency=1)
+
+        def failing_call():
+            raise ValueError("boom")
+
+        async def main():
+            await runner.run(failing_call)
+
+        with pytest.raises(ValueError, match="boom"):
+            asyncio.run(main())
+        assert runner.in_flight == 0
+        runner.shutdown()
+
+    def test_client_config_matches_limit(self, monkeypatch):
+        monkeypatch.setenv("DYNAMODB_MAX_CONCURRENCY", "7")
+
+        assert AsyncDynamoDB().max_concurrency == 7
+        assert dynamodb_client_config().max_pool_connections == 7
@@ -0,0 +1,201 @@
+import json
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("cryptography")
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+from common.jwks import CognitoTokenError, CognitoVerifier, JWKSCache, JWKSError, cognito_verifier
+
+REGION = "us-east-2"
+POOL_ID = "us-east-2_TestPool"
+CLIENT_ID = "test-client"
+ISSUER = f"https://cognito-idp.{REGION}.amazonaws.com/{POOL_ID}"
+
+
+def _signing_key(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_jwk = RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    public_jwk.update({"kid": kid, "alg": "RS256", "use": "sig"})
+    return private_key, public_jwk
+
+
+@pytest.fixture(scope="module")
+def keys():
+    return {kid: _signing_key(kid) for kid in ("key-1", "key-2")}
+
+
+class FakeJWKSEndpoint:
+    """Serves a mutable key set and counts fetches."""
+
+    def __init__(self, *jwks):
+        self.keys = list(jwks)
+        self.fetches = 0
+        self.fail = False
+
+    def __call__(self, url):
+        self.fetches += 1
+        if self.fail:
+            raise OSError("JWKS endpoint unavailable")
+        return {"keys": list(self.keys)}
+
+
+def _token(private_key, kid, **overrides):
+    now = int(time.time())
+    claims = {
+        "sub": "user-1",
+        "iss": ISSUER,
+        "iat": now,
+        "exp": now + 600,
+        "token_use": "access",
+        "client_id": CLIENT_ID,
+        **overrides,
+    }
+    return jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+def _verifier(endpoint, **cache_kwargs):
+    return CognitoVerifier(REGION, POOL_ID, CLIENT_ID, jwks=JWKSCache("https://example.test/jwks.json", fetch=endpoint, **cache_kwargs))
+
+
+def test_verifies_against_a_local_jwks_file(keys, tmp_path):
+    private_key, public_jwk = keys["key-1"]
+    jwks_file = tmp_path / "jwks.json"
+    jwks_file.write_text(json.dumps({"keys": [public_jwk]}))
+    verifier = CognitoVerifier(REGION, POOL_ID, CLIENT_ID, jwks=JWKSCache(jwks_file.as_uri()))
+
+    claims = verifier.verify(_token(private_key, "key-1", token_use="id", aud=CLIENT_ID))
+
+    assert claims["sub"] == "user-1"
+    assert verifier.jwks.kids == ["key-1"]
+
+
+def test_keys_are_fetched_once(keys):
+    private_key, public_jwk = keys["key-1"]
+    endpoint = FakeJWKSEndpoint(public_jwk)
+    verifier = _verifier(endpoint)
+
+    for _ in range(50):
+        verifier.verify(_token(private_key, "key-1"))
+
+    assert endpoint.fetches == 1
+
+
+@pytest.mark.parametrize(
+    "overrides, kid",
+    [
+        ({"client_id": "other-client"}, "key-1"),
+        ({"token_use": "id", "aud": "other-client"}, "key-1"),
+        ({"token_use": "id"}, "key-1"),
+        ({"token_use": "refresh"}, "key-1"),
+        ({"iss": "https://cognito-idp.us-east-2.amazonaws.com/other-pool"}, "key-1"),
+        ({"exp": int(time.time()) - 10}, "key-1"),
+        ({}, "key-2"),  # signed with key-1 but claims to be key-2
+    ],
+)
+def test_rejects_invalid_tokens(keys, overrides, kid):
+    private_key, public_jwk = keys["key-1"]
+    endpoint = FakeJWKSEndpoint(public_jwk, keys["key-2"][1])
+
+    with pytest.raises(CognitoTokenError):
+        _verifier(endpoint).verify(_token(private_key, kid, **overrides))
+
+
+def test_rejects_hs256_tokens_without_fetching_keys():
+    endpoint = FakeJWKSEndpoint()
+    token = jwt.encode({"sub": "user-1"}, "x" * 32, algorithm="HS256", headers={"kid": "key-1"})
+
+    with pytest.raises(CognitoTokenError):
+        _verifier(endpoint).verify(token)
+    assert endpoint.fetches == 0
+
+
+def test_unknown_kid_refetches_after_rotation(keys):
+    endpoint = FakeJWKSEndpoint(keys["key-1"][1])
+    verifier = _verifier(endpoint, min_refresh_interval=0)
+    verifier.verify(_token(keys["key-1"][0], "key-1"))
+
+    endpoint.keys = [keys["key-2"][1]]
+    claims = verifier.verify(_token(keys["key-2"][0], "key-2"))
+
+    assert claims["sub"] == "user-1"
+    assert endpoint.fetches == 2
+    assert verifier.jwks.kids == ["key-2"]
+
+
+def test_unknown_kids_do_not_refetch_within_the_refresh_interval(keys):
+    endpoint = FakeJWKSEndpoint(keys["key-1"][1])
+    verifier = _verifier(endpoint, min_refresh_interval=60)
+    verifier.verify(_token(keys["key-1"][0], "key-1"))
+
+    for _ in range(5):
+        with pytest.raises(CognitoTokenError):
+            verifier.verify(_token(keys["key-2"][0], "key-2"))
+
+    assert endpoint.fetches == 1
+
+
+def test_stale_keys_refresh_in_the_background(keys):
+    endpoint = FakeJWKSEndpoint(keys["key-1"][1])
+    cache = JWKSCache("https://example.test/jwks.json", max_age=0, min_refresh_interval=0, fetch=endpoint)
+    cache.refresh()
+
+    assert cache.get_signing_key("key-1") is not None
+    cache._refresh_thread.join(timeout=5)
+
+    assert endpoint.fetches == 2
+
+
+def test_a_slow_refresh_does_not_block_cached_keys_or_background_refresh(keys):
+    release = threading.Event()
+    endpoint = FakeJWKSEndpoint(keys["key-1"][1])
+    cache = JWKSCache("https://example.test/jwks.json", max_age=0, min_refresh_interval=0, fetch=endpoint)
+    cache.refresh()
+
+    def slow_fetch(url):
+        release.wait(timeout=5)
+        return endpoint(url)
+
+    cache._fetch = slow_fetch
+    foreground = threading.Thread(target=cache.refresh)
+    foreground.start()
+    try:
+        started = time.monotonic()
+        assert cache.get_signing_key("key-1") is not None
+        assert time.monotonic() - started < 1
+    finally:
+        release.set()
+        foreground.join(timeout=5)
+        cache._refresh_thread.join(timeout=5)
+
+    assert cache.kids == ["key-1"]
+
+
+def test_failed_refresh_keeps_previous_keys(keys):
+    endpoint = FakeJWKSEndpoint(keys["key-1"][1])
+    cache = JWKSCache("https://example.test/jwks.json", fetch=endpoint)
+    cache.refresh()
+
+    endpoint.fail = True
+    cache.refresh()
+
+    assert cache.kids == ["key-1"]
+
+
+def test_first_load_failure_raises():
+    endpoint = FakeJWKSEndpoint()
+    endpoint.fail = True
+
+    with pytest.raises(JWKSError):
+        JWKSCache("https://example.test/jwks.json", fetch=endpoint).get_signing_key("key-1")
+
+
+def test_cognito_verifier_is_shared_per_pool():
+    assert cognito_verifier(REGION, POOL_ID, CLIENT_ID) is cognito_verifier(REGION, POOL_ID, CLIENT_ID)
+    assert cognito_verifier(REGION, POOL_ID, CLIENT_ID).issuer == ISSUER
+    with pytest.raises(CognitoTokenError):
+        cognito_verifier("", "", CLIENT_ID)
@@ -0,0 +1,140 @@
+import threading
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from common.rate_limit import (
+    DynamoDBRateLimitBackend, LocalRateLimitBackend, RateLimit, RateLimiter, gcra, install_rate_limit_headers,
+)
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+PER_MINUTE_3 = RateLimit(limit=3, period_seconds=60)
+
+
+class TestGCRA:
+    def test_burst_then_one_request_per_interval(self):
+        now, tat, decisions = 1000.0, None, []
+        for _ in range(4):
+            decision, new_tat = gcra(tat, now, PER_MINUTE_3)
+            decisions.append(decision)
+            tat = new_tat if new_tat is not None else tat
+
+        assert [d.allowed for d in decisions] == [True, True, True, False]
+        assert [d.remaining for d in decisions] == [2, 1, 0, 0]
+        assert decisions[-1].retry_after == pytest.approx(20.0)
+
+        decision, _ = gcra(tat, now + 20.0, PER_MINUTE_3)
+        assert decision.allowed
+
+    def test_headers(self):
+        decision, _ = gcra(None, 1000.0, PER_MINUTE_3)
+        assert decision.headers(now=1000.0) == {
+            "X-RateLimit-Limit": "3",
+            "X-RateLimit-Remaining": "2",
+            "X-RateLimit-Reset": "1020",
+        }
+
+        denied, _ = gcra(1060.0, 1000.0, PER_MINUTE_3)
+        assert denied.headers(now=1000.0)["Retry-After"] == "20"
+
+
+class TestLocalBackend:
+    def test_idle_keys_are_swept_and_memory_is_capped(self):
+        clock = FakeClock()
+        backend = LocalRateLimitBackend(max_keys=5, clock=clock)
+        for i in range(20):
+            backend.acquire(f"user-{i}", PER_MINUTE_3)
+        assert len(backend) == 5
+
+        clock.now += 120
+        backend.acquire("active", PER_MINUTE_3)
+        assert len(backend) == 1
+
+
+@pytest.fixture
+def rate_limit_table():
+    moto = pytest.importorskip("moto")
+    import boto3
+
+    with moto.mock_aws():
+        dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+        table = dynamodb.create_table(
+            TableName="gg_core",
+            KeySchema=[{"AttributeName": "PK", "KeyType": "HASH"}, {"AttributeName": "SK", "KeyType": "RANGE"}],
+            AttributeDefinitions=[
+                {"AttributeName": "PK", "AttributeType": "S"},
+                {"AttributeName": "SK", "AttributeType": "S"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        yield table
+
+
+class TestDynamoDBBackend:
+    def test_limit_is_shared_between_instances(self, rate_limit_table):
+        clock = FakeClock()
+        lambda_a = RateLimiter("contact", PER_MINUTE_3, backend=DynamoDBRateLimitBackend(rate_limit_table, clock=clock))
+        lambda_b = RateLimiter("contact", PER_MINUTE_3, backend=DynamoDBRateLimitBackend(rate_limit_table, clock=clock))
+
+        allowed = [limiter.check("1.2.3.4").allowed for limiter in (lambda_a, lambda_b, lambda_a, lambda_b)]
+
+        assert allowed == [True, True, True, False]
+        item = rate_limit_table.get_item(Key={"PK": "RATELIMIT#contact#1.2.3.4", "SK": "RATELIMIT"})["Item"]
+        assert item["ttl"] == int(clock.now) + 61
+
+    def test_concurrent_writers_never_overspend(self, rate_limit_table):
+        limiter = RateLimiter(
+            "burst", RateLimit(limit=5, period_seconds=60), backend=DynamoDBRateLimitBackend(rate_limit_table, max_attempts=20)
+        )
+        results = []
+
+        def worker():
+            results.append(limiter.check("user-1").allowed)
+
+        threads = [threading.Thread(target=worker) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results.count(True) <= 5
+
+    def test_falls_back_to_local_limit_when_dynamodb_fails(self):
+        class BrokenTable:
+            def get_item(self, **kwargs):
+                raise RuntimeError("service unavailable")
+
+        limiter = RateLimiter("contact", PER_MINUTE_3, backend=DynamoDBRateLimitBackend(BrokenTable()))
+
+        assert [limiter.check("1.2.3.4").allowed for _ in range(4)] == [True, True, True, False]
+
+
+class TestHeaders:
+    def test_responses_carry_rate_limit_headers(self):
+        app = FastAPI()
+        install_rate_limit_headers(app)
+        limiter = RateLimiter("ping", RateLimit(limit=2, period_seconds=60), backend=LocalRateLimitBackend())
+
+        @app.get("/ping")
+        async def ping(request: Request):
+            await limiter.enforce(request.client.host, detail="Too many pings")
+            return {"ok": True}
+
+        client = TestClient(app)
+        first, second, third = (client.get("/ping") for _ in range(3))
+
+        assert first.headers["X-RateLimit-Remaining"] == "1"
+        assert second.headers["X-RateLimit-Remaining"] == "0"
+        assert third.status_code == 429
+        assert third.json() == {"detail": "Too many pings"}
+        assert third.headers["Retry-After"] == "30"
+        assert third.headers["X-RateLimit-Limit"] == "2"
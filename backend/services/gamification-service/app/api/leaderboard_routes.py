@@ -2,28 +2,66 @@
 Leaderboard API routes.
 """
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import List, Optional
 
+from ..models.leaderboard import LeaderboardItem, LeaderboardPage
+from .xp_routes import authenticate
+
 # Lazy loading of heavy imports
 router = APIRouter(prefix="/leaderboard", tags=["Leaderboard"])
 
 
+def _entry_to_dict(entry) -> dict:
+    return {
+        "userId": entry.userId,
+        "rank": entry.rank,
+        "value": entry.value,
+        "metadata": entry.metadata
+    }
+
+
+def _get_board_page(board: str, limit: int, next_token: Optional[str]) -> LeaderboardPage:
+    from ..db.leaderboard_db import InvalidLeaderboardCursor, get_leaderboard_page
+
+    try:
+        entries, token = get_leaderboard_page(board, limit=limit, cursor=next_token)
+    except InvalidLeaderboardCursor as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return LeaderboardPage(items=[_entry_to_dict(entry) for entry in entries], nextToken=token)
+
+
+def _get_my_entry(board: str, user_id: str) -> dict:
+    from ..db.leaderboard_db import get_user_rank
+
+    entry = get_user_rank(user_id, board=board)
+    if not entry:
+        raise HTTPException(status_code=404, detail="User is not on the leaderboard")
+    return _entry_to_dict(entry)
+
+
 @router.get("/global", response_model=List[dict])
 async def get_global_leaderboard(limit: int = Query(100, ge=1, le=1000)):
     """Get global XP leaderboard."""
     from ..db.leaderboard_db import get_global_xp_leaderboard
     
     entries = get_global_xp_leaderboard(limit=limit)
-    return [
-        {
-            "userId": entry.userId,
-            "rank": entry.rank,
-            "value": entry.value,
-            "metadata": entry.metadata
-        }
-        for entry in entries
-    ]
+    return [_entry_to_dict(entry) for entry in entries]
+
+
+@router.get("/global/page", response_model=LeaderboardPage)
+async def get_global_leaderboard_page(
+    limit: int = Query(100, ge=1, le=1000),
+    next_token: Optional[str] = Query(default=None, alias="nextToken"),
+):
+    """Get one page of the global XP leaderboard."""
+    return _get_board_page("global", limit, next_token)
+
+
+@router.get("/global/me", response_model=LeaderboardItem)
+async def get_my_global_rank(user_id: str = Depends(authenticate)):
+    """Get the authenticated user's global XP rank."""
+    return _get_my_entry("global", user_id)
 
 
 @router.get("/level", response_model=List[dict])
@@ -32,15 +70,22 @@ async def get_level_leaderboard(limit: int = Query(100, ge=1, le=1000)):
     from ..db.leaderboard_db import get_level_leaderboard as get_level_leaderboard_db
     
     entries = get_level_leaderboard_db(limit=limit)
-    return [
-        {
-            "userId": entry.userId,
-            "rank": entry.rank,
-            "value": entry.value,
-            "metadata": entry.metadata
-        }
-        for entry in entries
-    ]
+    return [_entry_to_dict(entry) for entry in entries]
+
+
+@router.get("/level/page", response_model=LeaderboardPage)
+async def get_level_leaderboard_page(
+    limit: int = Query(100, ge=1, le=1000),
+    next_token: Optional[str] = Query(default=None, alias="nextToken"),
+):
+    """Get one page of the level leaderboard."""
+    return _get_board_page("level", limit, next_token)
+
+
+@router.get("/level/me", response_model=LeaderboardItem)
+async def get_my_level_rank(user_id: str = Depends(authenticate)):
+    """Get the authenticated user's level rank."""
+    return _get_my_entry("level", user_id)
 
 
 @router.get("/badges", response_model=List[dict])
@@ -49,13 +94,19 @@ async def get_badge_leaderboard(limit: int = Query(100, ge=1, le=1000)):
     from ..db.leaderboard_db import get_badge_leaderboard as get_badge_leaderboard_db
     
     entries = get_badge_leaderboard_db(limit=limit)
-    return [
-        {
-            "userId": entry.userId,
-            "rank": entry.rank,
-            "value": entry.value,
-            "metadata": entry.metadata
-        }
-        for entry in entries
-    ]
+    return [_entry_to_dict(entry) for entry in entries]
+
+
+@router.get("/badges/page", response_model=LeaderboardPage)
+async def get_badge_leaderboard_page(
+    limit: int = Query(100, ge=1, le=1000),
+    next_token: Optional[str] = Query(default=None, alias="nextToken"),
+):
+    """Get one page of the badge leaderboard."""
+    return _get_board_page("badges", limit, next_token)
+
 
+@router.get("/badges/me", response_model=LeaderboardItem)
+async def get_my_badge_rank(user_id: str = Depends(authenticate)):
+    """Get the authenticated user's badge rank."""
+    return _get_my_entry("badges", user_id)
@@ -8,7 +8,14 @@ from fastapi import APIRouter, Depends, HTTPException, Header
 from typing import Optional
 
 # Import models at module level (needed for response_model decorators)
-from ..models.xp import XPSummary, XPHistoryResponse, XPAwardRequest, XPAwardResponse
+from ..models.xp import (
+    XPSummary,
+    XPHistoryResponse,
+    XPAwardRequest,
+    XPAwardResponse,
+    XPAwardBatchRequest,
+    XPAwardBatchResponse,
+)
 
 # Lazy loading of heavy imports
 router = APIRouter(prefix="/xp", tags=["XP"])
@@ -115,3 +122,23 @@ async def award_xp_endpoint(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to award XP: {str(e)}")
 
+
+@router.post("/award-batch", response_model=XPAwardBatchResponse)
+async def award_xp_batch_endpoint(
+    request: XPAwardBatchRequest,
+    x_internal_key: Optional[str] = Header(None, alias="X-Internal-Key")
+):
+    """
+    Award XP for several events in one call (internal endpoint).
+    
+    Each user's awards are applied with a single summary update. Results are
+    returned in request order; if a user's write fails only that user's
+    awards report ``success: false``. Requires X-Internal-Key header for security.
+    """
+    from ..services.xp_service import award_xp_batch
+    _validate_internal_key(x_internal_key)
+    
+    try:
+        return XPAwardBatchResponse(results=award_xp_batch(request.awards))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to award XP: {str(e)}")
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
 import logging
-from functools import lru_cache
 from typing import Dict, Tuple
 
 import jwt
-from jwt import PyJWKClient, PyJWTError
+from jwt import PyJWTError
 
+from common.jwks import CognitoTokenError, cognito_verifier
 from .settings import Settings
 
 logger = logging.getLogger("gamification-service.auth")
@@ -20,15 +20,6 @@ class TokenVerifier:
     def __init__(self, settings: Settings):
         self.settings = settings
 
-    @property
-    def cognito_issuer(self) -> str:
-        return f"https://cognito-idp.{self.settings.cognito_region}.amazonaws.com/{self.settings.cognito_user_pool_id}"
-
-    @lru_cache(maxsize=1)
-    def _jwks_client(self) -> PyJWKClient:
-        jwks_url = f"{self.cognito_issuer}/.well-known/jwks.json"
-        return PyJWKClient(jwks_url)
-
     def verify(self, token: str) -> Tuple[Dict, str]:
         """Return (claims, provider) or raise TokenVerificationError."""
         try:
@@ -60,26 +51,11 @@ class TokenVerifier:
         )
 
     def _verify_cognito(self, token: str) -> Dict:
-        signing_key = self._jwks_client().get_signing_key_from_jwt(token).key
-        claims = jwt.decode(
-            token,
-            signing_key,
-            algorithms=["RS256"],
-            issuer=self.cognito_issuer,
-            options={"require": ["exp", "iat", "iss", "token_use"], "verify_aud": False},
-        )
-        token_use = claims.get("token_use")
-        if token_use == "id":
-            audience = claims.get("aud")
-            # For id tokens, we accept any valid audience
-            if not audience:
-                raise TokenVerificationError("Invalid Cognito audience")
-        elif token_use == "access":
-            # For access tokens, we accept any valid token
-            pass
-        else:
-            raise TokenVerificationError("Unsupported Cognito token_use")
-        return claims
+        # No client_id: id and access tokens from any app client of the pool are accepted
+        try:
+            return cognito_verifier(self.settings.cognito_region, self.settings.cognito_user_pool_id).verify(token)
+        except CognitoTokenError as exc:
+            raise TokenVerificationError(str(exc)) from exc
 
 
 __all__ = ["TokenVerifier", "TokenVerificationError"]
@@ -41,6 +41,7 @@ from common.logging import get_structured_logger
 
 from ..models.badge import BadgeDefinition, UserBadge
 from ..settings import Settings
+from .leaderboard_db import BADGE_SUMMARY_SK, BADGE_SUMMARY_TYPE, badge_leaderboard_keys
 
 logger = get_structured_logger("badge-db", env_flag="GAMIFICATION_LOG_ENABLED", default_enabled=True)
 
@@ -67,6 +68,59 @@ class BadgeDBError(Exception):
     pass
 
 
+_BADGE_COUNT_ATTEMPTS = 5
+
+
+def _put_badge_and_count(table, user_id: str, badge_item: dict, now_ms: int) -> bool:
+    """
+    Write a user badge and bump the user's badge summary in one transaction.
+
+    The summary's leaderboard sort key encodes the count, so the new count is
+    computed from the current one and the write is conditioned on it being
+    unchanged; a concurrent assignment makes the transaction retry.
+
+    Returns:
+        False if the badge was already assigned
+    """
+    from botocore.exceptions import ClientError
+
+    summary_key = {"PK": f"USER#{user_id}", "SK": BADGE_SUMMARY_SK}
+    for _ in range(_BADGE_COUNT_ATTEMPTS):
+        current = table.get_item(Key=summary_key, ConsistentRead=True).get("Item")
+        count = int(current.get("badgeCount", 0)) if current else 0
+        summary_put = {
+            "TableName": table.name,
+            "Item": {
+                **summary_key,
+                "type": BADGE_SUMMARY_TYPE,
+                "userId": user_id,
+                "badgeCount": count + 1,
+                "updatedAt": now_ms,
+                **badge_leaderboard_keys(user_id, count + 1),
+            },
+        }
+        if current:
+            summary_put["ConditionExpression"] = "badgeCount = :count"
+            summary_put["ExpressionAttributeValues"] = {":count": count}
+        else:
+            summary_put["ConditionExpression"] = "attribute_not_exists(PK)"
+
+        try:
+            table.meta.client.transact_write_items(TransactItems=[
+                {"Put": {"TableName": table.name, "Item": badge_item, "ConditionExpression": "attribute_not_exists(PK)"}},
+                {"Put": summary_put},
+            ])
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "TransactionCanceledException":
+                raise
+            reasons = e.response.get("CancellationReasons") or []
+            if reasons and reasons[0].get("Code") == "ConditionalCheckFailed":
+                return False
+            # The summary changed underneath us; re-read the count and retry
+    raise BadgeDBError("Badge count changed on every attempt")
+
+
 def create_badge_definition(badge: BadgeDefinition) -> BadgeDefinition:
     """
     Create or update a badge definition.
@@ -188,6 +242,32 @@ def list_badge_definitions(category: Optional[str] = None, rarity: Optional[str]
         raise BadgeDBError(f"Failed to list badge definitions: {str(e)}") from e
 
 
+def _get_assigned_badge(table, user_id: str, badge_id: str) -> Optional[UserBadge]:
+    """Strongly consistent read of a user's badge; read errors raise BadgeDBError."""
+    try:
+        response = table.get_item(
+            Key={
+                "PK": f"USER#{user_id}",
+                "SK": f"BADGE#{badge_id}"
+            },
+            ConsistentRead=True
+        )
+    except Exception as e:
+        logger.error("badge.assigned_read_error", user_id=user_id, badge_id=badge_id, error=str(e), exc_info=True)
+        raise BadgeDBError(f"Failed to read assigned badge: {str(e)}") from e
+    
+    item = response.get("Item")
+    if not item:
+        return None
+    return UserBadge(
+        userId=user_id,
+        badgeId=badge_id,
+        earnedAt=item.get("earnedAt", int(time.time() * 1000)),
+        progress=item.get("progress"),
+        metadata=item.get("metadata")
+    )
+
+
 def assign_badge(user_id: str, badge_id: str, metadata: Optional[dict] = None) -> UserBadge:
     """
     Assign a badge to a user.
@@ -203,26 +283,10 @@ def assign_badge(user_id: str, badge_id: str, metadata: Optional[dict] = None) -
     table = _get_dynamodb_table()
     now_ms = int(time.time() * 1000)
     
-    # Check if badge already assigned
-    try:
-        existing = table.get_item(
-            Key={
-                "PK": f"USER#{user_id}",
-                "SK": f"BADGE#{badge_id}"
-            }
-        )
-        if "Item" in existing:
-            # Badge already assigned, return existing
-            item = existing["Item"]
-            return UserBadge(
-                userId=user_id,
-                badgeId=badge_id,
-                earnedAt=item.get("earnedAt", now_ms),
-                progress=item.get("progress"),
-                metadata=item.get("metadata")
-            )
-    except Exception:
-        pass
+    # Badge already assigned: return it
+    existing = _get_assigned_badge(table, user_id, badge_id)
+    if existing:
+        return existing
     
     definition = get_badge_definition(badge_id)
 
@@ -250,8 +314,15 @@ def assign_badge(user_id: str, badge_id: str, metadata: Optional[dict] = None) -
             badge_item["definitionIcon"] = definition.icon
     
     try:
-        table.put_item(Item=badge_item)
+        if not _put_badge_and_count(table, user_id, badge_item, now_ms):
+            # Assigned concurrently; return the stored badge
+            existing = _get_assigned_badge(table, user_id, badge_id)
+            if not existing:
+                raise BadgeDBError("Badge assignment conflicted but no assigned badge was found")
+            return existing
         logger.info("badge.assigned", user_id=user_id, badge_id=badge_id)
+    except BadgeDBError:
+        raise
     except Exception as e:
         logger.error("badge.assign_error", user_id=user_id, badge_id=badge_id, error=str(e), exc_info=True)
         raise BadgeDBError(f"Failed to assign badge: {str(e)}") from e
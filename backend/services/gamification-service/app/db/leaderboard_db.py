@@ -2,7 +2,12 @@
 Leaderboard database operations for the gamification service.
 """
 
-from typing import Dict, List, Optional
+import base64
+import heapq
+import itertools
+import json
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
 # Lazy import of boto3 components to reduce cold start
 # from boto3.dynamodb.conditions import Key
 # from botocore.exceptions import BotoCoreError, ClientError
@@ -38,6 +43,7 @@ _add_common_to_path()
 from common.logging import get_structured_logger
 
 from ..settings import Settings
+from ..services.level_service import calculate_level, get_level_thresholds
 
 logger = get_structured_logger("leaderboard-db", env_flag="GAMIFICATION_LOG_ENABLED", default_enabled=True)
 
@@ -68,6 +74,298 @@ class LeaderboardEntry:
         self.metadata = metadata or {}
 
 
+XP_LEADERBOARD_PK_PREFIX = "XP#SHARD#"
+LEGACY_XP_LEADERBOARD_PK = "XP#ALL"
+XP_SUMMARY_TYPE = "XPSummary"
+
+BADGE_LEADERBOARD_PK_PREFIX = "BADGES#SHARD#"
+BADGE_SUMMARY_SK = "BADGES#SUMMARY"
+BADGE_SUMMARY_TYPE = "BadgeSummary"
+
+BOARD_GLOBAL = "global"
+BOARD_LEVEL = "level"
+BOARD_BADGES = "badges"
+
+
+class InvalidLeaderboardCursor(ValueError):
+    """Raised when a leaderboard cursor can't be decoded."""
+
+
+def _sort_key(value: int, user_id: str = "") -> str:
+    """GSI1SK for a leaderboard summary; zero-padded so string order is value order."""
+    return f"{value:020d}#{user_id}" if user_id else f"{value:020d}"
+
+
+def xp_leaderboard_shard(user_id: str, shards: Optional[int] = None) -> int:
+    """Stable shard for a user (CRC32, so every process agrees)."""
+    shards = shards or _get_settings().xp_leaderboard_shards
+    return zlib.crc32(user_id.encode("utf-8")) % shards
+
+
+def xp_leaderboard_keys(user_id: str, total_xp: int) -> Dict[str, str]:
+    """
+    GSI1 keys that place an XP summary on the leaderboard.
+
+    Summaries are spread over ``xp_leaderboard_shards`` partitions by user so
+    XP writes don't all land on one GSI partition; readers merge the shards.
+    """
+    return {
+        "GSI1PK": f"{XP_LEADERBOARD_PK_PREFIX}{xp_leaderboard_shard(user_id)}",
+        "GSI1SK": _sort_key(total_xp, user_id),
+    }
+
+
+def badge_leaderboard_keys(user_id: str, badge_count: int) -> Dict[str, str]:
+    """GSI1 keys that place a badge summary on the badge leaderboard, sharded like the XP board."""
+    return {
+        "GSI1PK": f"{BADGE_LEADERBOARD_PK_PREFIX}{xp_leaderboard_shard(user_id)}",
+        "GSI1SK": _sort_key(badge_count, user_id),
+    }
+
+
+def _leaderboard_partitions(board: str) -> List[str]:
+    """
+    GSI1 partitions that hold a board's summaries.
+
+    XP boards also read the pre-sharding ``XP#ALL`` partition: summaries not
+    yet moved by an XP update or the backfill stay ranked. A summary lives
+    in exactly one partition, so merging it in never counts a user twice.
+    """
+    if board == BOARD_BADGES:
+        return [f"{BADGE_LEADERBOARD_PK_PREFIX}{shard}" for shard in range(_get_settings().xp_leaderboard_shards)]
+    shards = [f"{XP_LEADERBOARD_PK_PREFIX}{shard}" for shard in range(_get_settings().xp_leaderboard_shards)]
+    return shards + [LEGACY_XP_LEADERBOARD_PK]
+
+
+def _summary_type(board: str) -> str:
+    return BADGE_SUMMARY_TYPE if board == BOARD_BADGES else XP_SUMMARY_TYPE
+
+
+def _board_value(board: str, item: dict) -> int:
+    if board == BOARD_BADGES:
+        return int(item.get("badgeCount", 0))
+    total_xp = int(item.get("totalXp", 0))
+    return calculate_level(total_xp) if board == BOARD_LEVEL else total_xp
+
+
+def _board_metadata(board: str, item: dict) -> dict:
+    if board == BOARD_BADGES:
+        return {}
+    total_xp = int(item.get("totalXp", 0))
+    if board == BOARD_LEVEL:
+        return {"totalXp": total_xp}
+    return {"level": calculate_level(total_xp)}
+
+
+def _encode_cursor(sort_key: str, value: int, rank: int, position: int) -> str:
+    payload = {"s": sort_key, "v": value, "r": rank, "n": position}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("utf-8")
+
+
+def _decode_cursor(cursor: str) -> dict:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("utf-8")).decode("utf-8"))
+        sort_key = payload["s"]
+        if not isinstance(sort_key, str) or not sort_key[:20].isdigit():
+            raise ValueError("cursor is not for this leaderboard")
+        return {"sort_key": sort_key, "value": int(payload["v"]), "rank": int(payload["r"]), "position": int(payload["n"])}
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidLeaderboardCursor("Invalid leaderboard cursor") from e
+
+
+def _iter_partition(table, partition: str, item_type: str, below: Optional[str], page_size: int) -> Iterator[dict]:
+    """Summaries in one shard, highest value first, fetched ``page_size`` at a time."""
+    from boto3.dynamodb.conditions import Key
+
+    condition = Key("GSI1PK").eq(partition)
+    if below:
+        condition = condition & Key("GSI1SK").lt(below)
+    query_args = {
+        "IndexName": "GSI1",
+        "KeyConditionExpression": condition,
+        "ScanIndexForward": False,
+        "Limit": page_size,
+    }
+    while True:
+        response = table.query(**query_args)
+        for item in response.get("Items", []):
+            if item.get("type") == item_type:
+                yield item
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return
+        query_args["ExclusiveStartKey"] = last_key
+
+
+def get_leaderboard_page(
+    board: str = BOARD_GLOBAL,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Tuple[List[LeaderboardEntry], Optional[str]]:
+    """
+    Get one page of a leaderboard.
+
+    The global and level boards read the XP summaries on GSI1 in descending
+    XP order; since level only grows with XP, that order is also level
+    order. The badge board reads the per-user badge summaries that
+    ``badge_db.assign_badge`` keeps. On the global and badge boards users
+    with equal values share a rank and the next user's rank skips past them
+    (1, 1, 3). On the level board ranks are dense (1, 1, 2), so a rank is the
+    position of the user's level among the levels reached.
+
+    Each shard is read in descending order and the shards are merged into
+    one top-``limit`` list. The cursor carries the sort key of the last entry
+    and the rank state, so ranks stay correct across pages and ties that
+    straddle a page boundary.
+
+    Args:
+        board: ``"global"`` (total XP), ``"level"`` (level) or ``"badges"`` (badge count)
+        limit: Maximum number of entries to return
+        cursor: Opaque cursor from a previous page
+
+    Returns:
+        Tuple of (entries, next cursor or None when the board is exhausted)
+
+    Raises:
+        InvalidLeaderboardCursor: If the cursor can't be decoded
+    """
+    state = _decode_cursor(cursor) if cursor else {"sort_key": None, "value": None, "rank": 0, "position": 0}
+    last_value, rank, position = state["value"], state["rank"], state["position"]
+
+    table = _get_dynamodb_table()
+    partitions = _leaderboard_partitions(board)
+    item_type = _summary_type(board)
+    # Users are spread evenly, so each shard holds about 1/N of any top-K;
+    # fetch twice that per round trip and let skewed shards page further.
+    page_size = min(limit + 1, 2 * -(-limit // len(partitions)) + 1)
+    merged = heapq.merge(
+        *(_iter_partition(table, partition, item_type, state["sort_key"], page_size) for partition in partitions),
+        key=lambda item: item["GSI1SK"],
+        reverse=True,
+    )
+
+    entries: List[LeaderboardEntry] = []
+    last_sort_key = state["sort_key"]
+    for item in itertools.islice(merged, limit):
+        value = _board_value(board, item)
+        position += 1
+        if value != last_value:
+            rank = rank + 1 if board == BOARD_LEVEL else position
+            last_value = value
+        last_sort_key = item["GSI1SK"]
+        entries.append(LeaderboardEntry(
+            user_id=item["userId"],
+            rank=rank,
+            value=value,
+            metadata=_board_metadata(board, item)
+        ))
+
+    has_more = bool(entries) and next(merged, None) is not None
+    next_cursor = _encode_cursor(last_sort_key, last_value, rank, position) if has_more else None
+    return entries, next_cursor
+
+
+def _count_users_from(table, board: str, min_value: int) -> int:
+    """Count summaries with a value of at least ``min_value``, across shards, without returning the items."""
+    from boto3.dynamodb.conditions import Key
+
+    count = 0
+    for partition in _leaderboard_partitions(board):
+        query_args = {
+            "IndexName": "GSI1",
+            "KeyConditionExpression": Key("GSI1PK").eq(partition) & Key("GSI1SK").gte(_sort_key(min_value)),
+            "Select": "COUNT",
+        }
+        while True:
+            response = table.query(**query_args)
+            count += response.get("Count", 0)
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                break
+            query_args["ExclusiveStartKey"] = last_key
+    return count
+
+
+def _lowest_xp_from(table, min_xp: int) -> Optional[int]:
+    """Lowest total XP of at least ``min_xp`` on the board, or None."""
+    from boto3.dynamodb.conditions import Key
+
+    lowest = None
+    for partition in _leaderboard_partitions(BOARD_GLOBAL):
+        response = table.query(
+            IndexName="GSI1",
+            KeyConditionExpression=Key("GSI1PK").eq(partition) & Key("GSI1SK").gte(_sort_key(min_xp)),
+            ScanIndexForward=True,
+            Limit=1,
+        )
+        items = response.get("Items", [])
+        if items:
+            total_xp = int(items[0].get("totalXp", 0))
+            lowest = total_xp if lowest is None else min(lowest, total_xp)
+    return lowest
+
+
+def _count_levels_above(table, level: int) -> int:
+    """
+    Count the distinct levels above ``level`` that some user has reached.
+
+    Each step asks every shard for its lowest XP at or past the next level
+    threshold (one item each), then jumps to the threshold after that
+    user's level, so the cost is one small query per shard per occupied
+    level rather than one read per user.
+    """
+    count = 0
+    _, min_xp = get_level_thresholds(level)
+    while True:
+        total_xp = _lowest_xp_from(table, min_xp)
+        if total_xp is None:
+            return count
+        count += 1
+        _, min_xp = get_level_thresholds(calculate_level(total_xp))
+
+
+def get_user_rank(user_id: str, board: str = BOARD_GLOBAL) -> Optional[LeaderboardEntry]:
+    """
+    Get a user's own leaderboard entry without reading the board.
+
+    The rank matches what ``get_leaderboard_page`` assigns: on the global and
+    badge boards it is one plus the number of users with a higher value; on
+    the level board it is one plus the number of higher levels that have
+    been reached.
+
+    Args:
+        user_id: User ID
+        board: ``"global"``, ``"level"`` or ``"badges"``
+
+    Returns:
+        LeaderboardEntry, or None if the user is not on the board
+    """
+    table = _get_dynamodb_table()
+    summary_sk = BADGE_SUMMARY_SK if board == BOARD_BADGES else "XP#SUMMARY"
+
+    try:
+        response = table.get_item(Key={"PK": f"USER#{user_id}", "SK": summary_sk})
+        item = response.get("Item")
+        if not item:
+            return None
+
+        value = _board_value(board, item)
+        if board == BOARD_LEVEL:
+            rank = _count_levels_above(table, value) + 1
+        else:
+            rank = _count_users_from(table, board, value + 1) + 1
+
+        return LeaderboardEntry(
+            user_id=user_id,
+            rank=rank,
+            value=value,
+            metadata=_board_metadata(board, item)
+        )
+    except Exception as e:
+        logger.error("leaderboard.user_rank.error", user_id=user_id, board=board, error=str(e), exc_info=True)
+        return None
+
+
 def get_global_xp_leaderboard(limit: int = 100) -> List[LeaderboardEntry]:
     """
     Get global XP leaderboard.
@@ -78,31 +376,8 @@ def get_global_xp_leaderboard(limit: int = 100) -> List[LeaderboardEntry]:
     Returns:
         List of LeaderboardEntry objects
     """
-    from boto3.dynamodb.conditions import Key
-    
-    table = _get_dynamodb_table()
-    
     try:
-        # Query GSI1 for XP summaries sorted by total XP
-        response = table.query(
-            IndexName="GSI1",
-            KeyConditionExpression=Key("GSI1PK").eq("XP#ALL"),
-            ScanIndexForward=False,  # Descending order
-            Limit=limit
-        )
-        
-        entries = []
-        rank = 1
-        for item in response.get("Items", []):
-            if item.get("type") == "XPSummary":
-                entries.append(LeaderboardEntry(
-                    user_id=item["userId"],
-                    rank=rank,
-                    value=item.get("totalXp", 0),
-                    metadata={"level": item.get("currentLevel", 1)}
-                ))
-                rank += 1
-        
+        entries, _ = get_leaderboard_page(BOARD_GLOBAL, limit=limit)
         return entries
     except Exception as e:
         logger.error("leaderboard.global_xp.error", error=str(e), exc_info=True)
@@ -119,51 +394,9 @@ def get_level_leaderboard(limit: int = 100) -> List[LeaderboardEntry]:
     Returns:
         List of LeaderboardEntry objects
     """
-    from boto3.dynamodb.conditions import Key
-    
-    table = _get_dynamodb_table()
-    
     try:
-        # Query GSI1 for XP summaries, sort by level then XP
-        response = table.query(
-            IndexName="GSI1",
-            KeyConditionExpression=Key("GSI1PK").eq("XP#ALL"),
-            ScanIndexForward=False,
-            Limit=limit * 2  # Get more to sort by level
-        )
-        
-        # Group by level and sort
-        level_groups = {}
-        for item in response.get("Items", []):
-            if item.get("type") == "XPSummary":
-                level = item.get("currentLevel", 1)
-                if level not in level_groups:
-                    level_groups[level] = []
-                level_groups[level].append({
-                    "userId": item["userId"],
-                    "level": level,
-                    "totalXp": item.get("totalXp", 0)
-                })
-        
-        # Sort by level descending, then XP descending
-        entries = []
-        rank = 1
-        for level in sorted(level_groups.keys(), reverse=True):
-            level_users = sorted(level_groups[level], key=lambda x: x["totalXp"], reverse=True)
-            for user in level_users[:limit]:
-                entries.append(LeaderboardEntry(
-                    user_id=user["userId"],
-                    rank=rank,
-                    value=user["level"],
-                    metadata={"totalXp": user["totalXp"]}
-                ))
-                rank += 1
-                if rank > limit:
-                    break
-            if rank > limit:
-                break
-        
-        return entries[:limit]
+        entries, _ = get_leaderboard_page(BOARD_LEVEL, limit=limit)
+        return entries
     except Exception as e:
         logger.error("leaderboard.level.error", error=str(e), exc_info=True)
         return []
@@ -179,36 +412,9 @@ def get_badge_leaderboard(limit: int = 100) -> List[LeaderboardEntry]:
     Returns:
         List of LeaderboardEntry objects
     """
-    from boto3.dynamodb.conditions import Attr
-    
-    table = _get_dynamodb_table()
-    
     try:
-        # Scan for all user badges and count
-        response = table.scan(
-            FilterExpression=Attr("type").eq("UserBadge"),
-            ProjectionExpression="userId"
-        )
-        
-        badge_counts = {}
-        for item in response.get("Items", []):
-            user_id = item["userId"]
-            badge_counts[user_id] = badge_counts.get(user_id, 0) + 1
-        
-        # Sort by badge count
-        sorted_users = sorted(badge_counts.items(), key=lambda x: x[1], reverse=True)
-        
-        entries = []
-        for rank, (user_id, badge_count) in enumerate(sorted_users[:limit], 1):
-            entries.append(LeaderboardEntry(
-                user_id=user_id,
-                rank=rank,
-                value=badge_count,
-                metadata={}
-            ))
-        
+        entries, _ = get_leaderboard_page(BOARD_BADGES, limit=limit)
         return entries
     except Exception as e:
         logger.error("leaderboard.badge.error", error=str(e), exc_info=True)
         return []
-
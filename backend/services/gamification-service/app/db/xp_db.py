@@ -49,8 +49,9 @@ _add_common_to_path()
 from common.logging import get_structured_logger
 
 # Import models at module level (needed for type hints)
-from ..models.xp import XPTransaction, XPSummary, LevelEvent
+from ..models.xp import XPTransaction, XPSummary, LevelEvent, XPAwardRequest
 from ..services.level_service import get_level_info
+from .leaderboard_db import xp_leaderboard_keys
 
 # Initialize logger (lightweight)
 logger = get_structured_logger("xp-db", env_flag="GAMIFICATION_LOG_ENABLED", default_enabled=True)
@@ -88,6 +89,69 @@ class XPDBError(Exception):
     pass
 
 
+# Idempotency records outlive any realistic retry of the same award
+XP_EVENT_TTL_SECONDS = 30 * 24 * 60 * 60
+# TransactWriteItems takes 100 items: two per award plus the summary and a level event
+MAX_AWARDS_PER_WRITE = 49
+_XP_AWARD_ATTEMPTS = 5
+
+
+def _event_record_put(table_name: str, user_id: str, event_id: str, now_ms: int) -> dict:
+    """TransactWriteItems Put that claims ``event_id``; it fails if the event was already applied."""
+    return {
+        "Put": {
+            "TableName": table_name,
+            "Item": {
+                "PK": f"EVENT#{event_id}",
+                "SK": f"EVENT#{event_id}",
+                "type": "XPEvent",
+                "userId": user_id,
+                "eventId": event_id,
+                "createdAt": now_ms,
+                "ttl": now_ms // 1000 + XP_EVENT_TTL_SECONDS,
+            },
+            "ConditionExpression": "attribute_not_exists(PK)",
+        }
+    }
+
+
+def _xp_transaction_item(user_id: str, amount: int, source: str, source_id: Optional[str],
+                         description: str, event_id: str, now_ms: int) -> dict:
+    # SK with zero-padded timestamp and event_id for uniqueness
+    item = {
+        "PK": f"USER#{user_id}",
+        "SK": f"XP#{now_ms:020d}#{event_id}",
+        "type": "XPTransaction",
+        "userId": user_id,
+        "amount": amount,
+        "source": source,
+        "description": description,
+        "timestamp": now_ms,
+        "eventId": event_id,
+        "createdAt": now_ms,
+    }
+    if source_id:
+        item["sourceId"] = source_id
+    return item
+
+
+def _level_event_item(user_id: str, level: int, total_xp: int, source: Optional[str], now_ms: int) -> dict:
+    return {
+        "PK": f"USER#{user_id}",
+        "SK": f"LEVEL#EVENT#{now_ms:020d}",
+        "type": "LevelEvent",
+        "userId": user_id,
+        "level": level,
+        "totalXp": total_xp,
+        "source": source,
+        "awardedAt": now_ms,
+    }
+
+
+def _cancellation_codes(error) -> List[Optional[str]]:
+    return [reason.get("Code") for reason in error.response.get("CancellationReasons") or []]
+
+
 def create_xp_summary(user_id: str, initial_xp: int = 0) -> XPSummary:
     """
     Create or update XP summary for a user.
@@ -117,8 +181,7 @@ def create_xp_summary(user_id: str, initial_xp: int = 0) -> XPSummary:
         "updatedAt": now_ms,
         "createdAt": now_ms,
         # GSI for leaderboard queries
-        "GSI1PK": "XP#ALL",
-        "GSI1SK": f"{initial_xp:020d}#{user_id}",  # Zero-padded for sorting
+        **xp_leaderboard_keys(user_id, initial_xp),
     }
     
     try:
@@ -187,6 +250,7 @@ def update_xp_summary(user_id: str, total_xp: int, level: int, xp_for_current: i
     """
     table = _get_dynamodb_table()
     now_ms = int(time.time() * 1000)
+    leaderboard_keys = xp_leaderboard_keys(user_id, total_xp)
     
     try:
         table.update_item(
@@ -197,7 +261,7 @@ def update_xp_summary(user_id: str, total_xp: int, level: int, xp_for_current: i
             UpdateExpression="SET totalXp = :xp, currentLevel = :level, "
                            "xpForCurrentLevel = :current, xpForNextLevel = :next, "
                            "xpProgress = :progress, updatedAt = :updated, "
-                           "GSI1SK = :gsi1sk",
+                           "GSI1PK = :gsi1pk, GSI1SK = :gsi1sk",
             ExpressionAttributeValues={
                 ":xp": total_xp,
                 ":level": level,
@@ -205,7 +269,8 @@ def update_xp_summary(user_id: str, total_xp: int, level: int, xp_for_current: i
                 ":next": xp_for_next,
                 ":progress": Decimal(str(xp_progress)),
                 ":updated": now_ms,
-                ":gsi1sk": f"{total_xp:020d}#{user_id}"  # Zero-padded for sorting
+                ":gsi1pk": leaderboard_keys["GSI1PK"],
+                ":gsi1sk": leaderboard_keys["GSI1SK"]
             }
         )
         
@@ -225,6 +290,166 @@ def update_xp_summary(user_id: str, total_xp: int, level: int, xp_for_current: i
         raise XPDBError(f"Failed to update XP summary: {str(e)}") from e
 
 
+def apply_xp_awards(user_id: str, awards: List[XPAwardRequest]) -> tuple[int, Optional[XPSummary], List[bool]]:
+    """
+    Apply one or more XP awards for a user in a single TransactWriteItems.
+
+    The transaction claims the idempotency record for each award's
+    ``eventId`` (if given), writes one XP transaction per award, makes one
+    summary update for the combined amount and, on a level up, appends the
+    level event, so the awards are either fully applied or not at all.
+
+    Idempotency is enforced by the transaction itself: each event claim is a
+    conditional put, and a ``ConditionalCheckFailed`` cancellation reason at
+    its position marks that award as a duplicate. Duplicates (including an
+    event ID repeated earlier in ``awards``) are dropped and the rest are
+    retried. No event record is read beforehand.
+
+    The one read is the summary. DynamoDB update expressions can add to
+    ``totalXp`` but cannot derive the level fields or the leaderboard
+    ``GSI1SK`` from the result. So the summary is read (consistently), the
+    new values are computed here, and the update is conditioned on the
+    total being unchanged. A concurrent award makes it re-read and retry.
+
+    Each award costs up to two transaction items, so keep ``awards`` under
+    ``MAX_AWARDS_PER_WRITE``.
+
+    Args:
+        user_id: User ID
+        awards: Awards for ``user_id``
+
+    Returns:
+        Tuple of (previous level, updated XPSummary or None if nothing was
+        applied, whether each award was applied)
+    """
+    from botocore.exceptions import ClientError
+
+    table = _get_dynamodb_table()
+    summary_key = {"PK": f"USER#{user_id}", "SK": "XP#SUMMARY"}
+    applied = [False] * len(awards)
+    transaction_ids = [award.eventId or str(uuid4()) for award in awards]
+
+    seen_events = set()
+    pending = []
+    for index, award in enumerate(awards):
+        if award.eventId and award.eventId in seen_events:
+            continue
+        seen_events.add(award.eventId)
+        pending.append(index)
+
+    previous_level = 1
+    for _ in range(_XP_AWARD_ATTEMPTS + len(awards)):
+        if not pending:
+            return previous_level, None, applied
+
+        now_ms = int(time.time() * 1000)
+        # Level fields and GSI1SK can't be computed in an update expression, hence the read
+        try:
+            current = table.get_item(Key=summary_key, ConsistentRead=True).get("Item")
+        except Exception as e:
+            logger.error("xp.award.summary_read_error", user_id=user_id, error=str(e), exc_info=True)
+            raise XPDBError(f"Failed to read XP summary: {str(e)}") from e
+
+        previous_xp = int(current.get("totalXp", 0)) if current else 0
+        previous_level = int(current.get("currentLevel", 1)) if current else 1
+        total_xp = previous_xp + sum(awards[index].amount for index in pending)
+        level, xp_current, xp_next, progress = get_level_info(total_xp)
+        leaderboard_keys = xp_leaderboard_keys(user_id, total_xp)
+
+        summary_update = {
+            "TableName": table.name,
+            "Key": summary_key,
+            "UpdateExpression": "SET #type = :type, userId = :user, totalXp = :xp, currentLevel = :level, "
+                                "xpForCurrentLevel = :current, xpForNextLevel = :next, "
+                                "xpProgress = :progress, updatedAt = :updated, "
+                                "createdAt = if_not_exists(createdAt, :updated), "
+                                "GSI1PK = :gsi1pk, GSI1SK = :gsi1sk",
+            "ExpressionAttributeNames": {"#type": "type"},
+            "ExpressionAttributeValues": {
+                ":type": "XPSummary",
+                ":user": user_id,
+                ":xp": total_xp,
+                ":level": level,
+                ":current": xp_current,
+                ":next": xp_next,
+                ":progress": Decimal(str(progress)),
+                ":updated": now_ms,
+                ":gsi1pk": leaderboard_keys["GSI1PK"],
+                ":gsi1sk": leaderboard_keys["GSI1SK"],
+            },
+        }
+        if current:
+            summary_update["ConditionExpression"] = "totalXp = :previous"
+            summary_update["ExpressionAttributeValues"][":previous"] = previous_xp
+        else:
+            summary_update["ConditionExpression"] = "attribute_not_exists(PK)"
+
+        # Event claims first, so a cancellation reason's position maps back to its award
+        transact_items = []
+        claimed = []
+        for index in pending:
+            if awards[index].eventId:
+                transact_items.append(_event_record_put(table.name, user_id, awards[index].eventId, now_ms))
+                claimed.append(index)
+        transact_items.append({"Update": summary_update})
+        for index in pending:
+            award = awards[index]
+            transact_items.append({"Put": {
+                "TableName": table.name,
+                "Item": _xp_transaction_item(user_id, award.amount, award.source, award.sourceId,
+                                             award.description, transaction_ids[index], now_ms),
+            }})
+        if level > previous_level:
+            transact_items.append({"Put": {
+                "TableName": table.name,
+                "Item": _level_event_item(user_id, level, total_xp, awards[pending[-1]].source, now_ms),
+            }})
+
+        try:
+            table.meta.client.transact_write_items(TransactItems=transact_items)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "TransactionCanceledException":
+                logger.error("xp.award.write_error", user_id=user_id, error=str(e), exc_info=True)
+                raise XPDBError(f"Failed to apply XP award: {str(e)}") from e
+            codes = _cancellation_codes(e)
+            duplicates = {index for index, code in zip(claimed, codes) if code == "ConditionalCheckFailed"}
+            if duplicates:
+                pending = [index for index in pending if index not in duplicates]
+            else:
+                # The summary changed underneath us; re-read it and retry
+                logger.info("xp.award.summary_conflict", user_id=user_id, reasons=codes)
+            continue
+
+        for index in pending:
+            applied[index] = True
+        logger.info("xp.award.applied", user_id=user_id, awards=len(pending), total_xp=total_xp)
+        return previous_level, XPSummary(
+            userId=user_id,
+            totalXp=total_xp,
+            currentLevel=level,
+            xpForCurrentLevel=xp_current,
+            xpForNextLevel=xp_next,
+            xpProgress=progress,
+            updatedAt=now_ms
+        ), applied
+
+    raise XPDBError("XP summary changed on every attempt")
+
+
+def apply_xp_award(user_id: str, amount: int, source: str, source_id: Optional[str] = None,
+                   description: str = "", event_id: Optional[str] = None) -> Optional[tuple[int, XPSummary]]:
+    """
+    Apply a single XP award; see ``apply_xp_awards``.
+
+    Returns:
+        Tuple of (previous level, updated XPSummary), or None if the event was already applied
+    """
+    award = XPAwardRequest(userId=user_id, amount=amount, source=source, sourceId=source_id,
+                           description=description, eventId=event_id)
+    previous_level, summary, _ = apply_xp_awards(user_id, [award])
+    return (previous_level, summary) if summary else None
+
+
 def create_xp_transaction(user_id: str, amount: int, source: str, source_id: Optional[str] = None,
                          description: str = "", event_id: Optional[str] = None) -> XPTransaction:
     """
@@ -244,33 +469,20 @@ def create_xp_transaction(user_id: str, amount: int, source: str, source_id: Opt
     table = _get_dynamodb_table()
     now_ms = int(time.time() * 1000)
     
-    # Use event_id if provided, otherwise generate one
-    if not event_id:
-        event_id = str(uuid4())
-    
-    # Create SK with timestamp and event_id for uniqueness
-    timestamp_str = f"{now_ms:020d}"  # Zero-padded timestamp
-    sk = f"XP#{timestamp_str}#{event_id}"
-    
-    transaction_item = {
-        "PK": f"USER#{user_id}",
-        "SK": sk,
-        "type": "XPTransaction",
-        "userId": user_id,
-        "amount": amount,
-        "source": source,
-        "description": description,
-        "timestamp": now_ms,
-        "eventId": event_id,
-        "createdAt": now_ms,
-    }
-    
-    if source_id:
-        transaction_item["sourceId"] = source_id
+    transaction_item = _xp_transaction_item(user_id, amount, source, source_id, description,
+                                            event_id or str(uuid4()), now_ms)
     
     try:
-        table.put_item(Item=transaction_item)
-        logger.info("xp.transaction.created", user_id=user_id, amount=amount, source=source, event_id=event_id)
+        if event_id:
+            # Claim the event in the same write so check_event_id_exists sees it
+            table.meta.client.transact_write_items(TransactItems=[
+                _event_record_put(table.name, user_id, event_id, now_ms),
+                {"Put": {"TableName": table.name, "Item": transaction_item}},
+            ])
+        else:
+            table.put_item(Item=transaction_item)
+        logger.info("xp.transaction.created", user_id=user_id, amount=amount, source=source,
+                    event_id=transaction_item["eventId"])
     except Exception as e:
         logger.error("xp.transaction.create_error", user_id=user_id, error=str(e), exc_info=True)
         raise XPDBError(f"Failed to create XP transaction: {str(e)}") from e
@@ -281,7 +493,7 @@ def create_xp_transaction(user_id: str, amount: int, source: str, source_id: Opt
         sourceId=source_id,
         description=description,
         timestamp=now_ms,
-        eventId=event_id
+        eventId=transaction_item["eventId"]
     )
 
 
@@ -291,17 +503,7 @@ def record_level_event(user_id: str, level: int, total_xp: int, source: Optional
     """
     table = _get_dynamodb_table()
     now_ms = int(time.time() * 1000)
-    sk = f"LEVEL#EVENT#{now_ms:020d}"
-    item = {
-        "PK": f"USER#{user_id}",
-        "SK": sk,
-        "type": "LevelEvent",
-        "userId": user_id,
-        "level": level,
-        "totalXp": total_xp,
-        "source": source,
-        "awardedAt": now_ms,
-    }
+    item = _level_event_item(user_id, level, total_xp, source, now_ms)
     try:
         table.put_item(Item=item)
         logger.info("xp.level_event.recorded", user_id=user_id, level=level, total_xp=total_xp)
@@ -375,20 +577,14 @@ def check_event_id_exists(event_id: str) -> bool:
     Returns:
         True if event ID exists, False otherwise
     """
-    from boto3.dynamodb.conditions import Attr
-    
     table = _get_dynamodb_table()
     
     try:
-        # Query GSI1 for event ID (if we add it) or scan
-        # For now, we'll use a simple approach: check if any transaction has this event_id
-        # This is not optimal but works for idempotency checks
-        response = table.scan(
-            FilterExpression=Attr("eventId").eq(event_id) & Attr("type").eq("XPTransaction"),
-            Limit=1
+        response = table.get_item(
+            Key={"PK": f"EVENT#{event_id}", "SK": f"EVENT#{event_id}"},
+            ProjectionExpression="PK"
         )
-        
-        return len(response.get("Items", [])) > 0
+        return "Item" in response
     except Exception as e:
         logger.warning("xp.event_id.check_error", event_id=event_id, error=str(e))
         # If check fails, assume it doesn't exist to allow the transaction
@@ -0,0 +1,20 @@
+"""
+Leaderboard models.
+"""
+
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+
+class LeaderboardItem(BaseModel):
+    """Ranked leaderboard entry."""
+    userId: str = Field(..., description="User ID")
+    rank: int = Field(..., ge=1, description="Rank; tied values share a rank")
+    value: int = Field(..., description="Ranked value (total XP, level or badge count)")
+    metadata: dict = Field(default_factory=dict, description="Board-specific extra fields")
+
+
+class LeaderboardPage(BaseModel):
+    """Paginated leaderboard response."""
+    items: List[LeaderboardItem] = Field(default_factory=list, description="Entries in rank order")
+    nextToken: Optional[str] = Field(None, description="Opaque pagination token for fetching the next page")
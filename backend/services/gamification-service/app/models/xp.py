@@ -51,10 +51,21 @@ class XPAwardRequest(BaseModel):
 class XPAwardResponse(BaseModel):
     """Response from XP award."""
     success: bool = Field(..., description="Whether the award was successful")
-    totalXp: int = Field(..., description="New total XP")
-    level: int = Field(..., description="Current level")
+    totalXp: Optional[int] = Field(None, description="New total XP (unset if the award failed)")
+    level: Optional[int] = Field(None, description="Current level (unset if the award failed)")
     levelUp: bool = Field(False, description="Whether user leveled up")
     previousLevel: Optional[int] = Field(None, description="Previous level if leveled up")
+    error: Optional[str] = Field(None, description="Why the award failed; it was not applied and can be retried")
+
+
+class XPAwardBatchRequest(BaseModel):
+    """Several XP awards in one request (internal use)."""
+    awards: List[XPAwardRequest] = Field(..., min_length=1, max_length=500, description="Awards to apply")
+
+
+class XPAwardBatchResponse(BaseModel):
+    """Per-award results, in request order."""
+    results: List[XPAwardResponse] = Field(default_factory=list)
 
 
 class LevelProgress(BaseModel):
@@ -5,19 +5,16 @@ Handles XP awards, level calculations, and integration with other services.
 """
 
 import time
-from typing import Optional
+from typing import Dict, List, Optional
 
 from ..db.xp_db import (
+    MAX_AWARDS_PER_WRITE,
+    apply_xp_awards,
     create_xp_summary,
     get_xp_summary,
-    update_xp_summary,
-    create_xp_transaction,
-    check_event_id_exists,
     XPDBError,
-    record_level_event,
     get_level_events,
 )
-from ..services.level_service import get_level_info
 from ..models.xp import (
     XPAwardRequest,
     XPAwardResponse,
@@ -74,98 +71,98 @@ def award_xp(request: XPAwardRequest) -> XPAwardResponse:
         
     Returns:
         XP award response with updated totals and level info
+        
+    Raises:
+        XPDBError: If the award could not be stored
     """
-    # Check for idempotency
-    if request.eventId and check_event_id_exists(request.eventId):
-        logger.info("xp.award.duplicate_event", user_id=request.userId, event_id=request.eventId)
-        # Return existing state
-        summary = get_xp_summary(request.userId)
-        if summary:
-            return XPAwardResponse(
-                success=True,
-                totalXp=summary.totalXp,
-                level=summary.currentLevel,
-                levelUp=False,
-                previousLevel=None
-            )
-        # If no summary exists, create one
-        summary = create_xp_summary(request.userId, 0)
-        return XPAwardResponse(
-            success=True,
-            totalXp=0,
-            level=1,
-            levelUp=False,
-            previousLevel=None
-        )
-    
-    # Get or create XP summary
-    summary = get_xp_summary(request.userId)
-    if not summary:
-        summary = create_xp_summary(request.userId, 0)
-    
-    previous_level = summary.currentLevel
-    previous_xp = summary.totalXp
-    
-    # Calculate new totals
-    new_total_xp = previous_xp + request.amount
-    
-    # Calculate new level
-    level, xp_for_current, xp_for_next, progress = get_level_info(new_total_xp)
-    
-    # Update summary
-    updated_summary = update_xp_summary(
-        request.userId,
-        new_total_xp,
-        level,
-        xp_for_current,
-        xp_for_next,
-        progress
-    )
-    
-    # Create transaction record
-    try:
-        create_xp_transaction(
-            user_id=request.userId,
-            amount=request.amount,
-            source=request.source,
-            source_id=request.sourceId,
-            description=request.description,
-            event_id=request.eventId
-        )
-    except Exception as e:
-        logger.error("xp.award.transaction_error", user_id=request.userId, error=str(e), exc_info=True)
-        # Continue even if transaction record fails
-    
-    level_up = level > previous_level
-    metadata = request.metadata or {}
-    
-    logger.info(
-        "xp.award.success",
-        user_id=request.userId,
-        amount=request.amount,
-        total_xp=new_total_xp,
-        user_level=level,
-        level_up=level_up,
-        source=request.source
-    )
+    response = award_xp_batch([request])[0]
+    if not response.success:
+        raise XPDBError(response.error or "Failed to award XP")
+    return response
 
-    if level_up:
-        record_level_event(request.userId, level, new_total_xp, request.source)
-        check_and_assign_badges(
-            request.userId,
-            "level_up",
-            {"level": level}
-        )
 
-    _maybe_trigger_activity_badges(request.userId, request.source, metadata)
+def award_xp_batch(requests: List[XPAwardRequest]) -> List[XPAwardResponse]:
+    """
+    Award XP for several events at once.
     
-    return XPAwardResponse(
-        success=True,
-        totalXp=new_total_xp,
-        level=level,
-        levelUp=level_up,
-        previousLevel=previous_level if level_up else None
-    )
+    Awards are grouped by user and each user's awards are applied with one
+    summary update (see ``apply_xp_awards``), so a burst of completions costs
+    one write per user rather than one per award. Every applied award for a
+    user reports the user's total after the whole group; an award whose
+    event was already applied reports the current totals with no level up.
+    
+    Each group is written in its own transaction, so a failure only affects
+    that group: its awards report ``success=False`` and were not applied,
+    while the other users' awards are committed and report success.
+    
+    Args:
+        requests: XP award requests
+        
+    Returns:
+        XP award responses, in request order
+    """
+    responses: List[Optional[XPAwardResponse]] = [None] * len(requests)
+    by_user: Dict[str, List[int]] = {}
+    for index, request in enumerate(requests):
+        by_user.setdefault(request.userId, []).append(index)
+    
+    for user_id, indices in by_user.items():
+        for start in range(0, len(indices), MAX_AWARDS_PER_WRITE):
+            chunk = indices[start:start + MAX_AWARDS_PER_WRITE]
+            try:
+                # Dedupe, transaction records, summary and level event are one write
+                previous_level, summary, applied = apply_xp_awards(user_id, [requests[index] for index in chunk])
+                if summary is None:
+                    # Every event was a duplicate; return existing state
+                    summary = get_xp_summary(user_id) or create_xp_summary(user_id, 0)
+            except Exception as e:
+                logger.error("xp.award.failed", user_id=user_id, awards=len(chunk), error=str(e), exc_info=True)
+                for index in chunk:
+                    responses[index] = XPAwardResponse(success=False, error=str(e))
+                continue
+            level_up = any(applied) and summary.currentLevel > previous_level
+            
+            for index, was_applied in zip(chunk, applied):
+                if not was_applied:
+                    logger.info("xp.award.duplicate_event", user_id=user_id, event_id=requests[index].eventId)
+                responses[index] = XPAwardResponse(
+                    success=True,
+                    totalXp=summary.totalXp,
+                    level=summary.currentLevel,
+                    levelUp=level_up and was_applied,
+                    previousLevel=previous_level if level_up and was_applied else None
+                )
+            
+            if not any(applied):
+                continue
+            
+            logger.info(
+                "xp.award.success",
+                user_id=user_id,
+                amount=sum(requests[index].amount for index, was_applied in zip(chunk, applied) if was_applied),
+                awards=sum(applied),
+                total_xp=summary.totalXp,
+                user_level=summary.currentLevel,
+                level_up=level_up,
+                source=",".join(sorted({requests[index].source for index in chunk}))
+            )
+            
+            # The awards are committed; badge checks must not turn them into failures
+            try:
+                if level_up:
+                    check_and_assign_badges(
+                        user_id,
+                        "level_up",
+                        {"level": summary.currentLevel}
+                    )
+                
+                for index, was_applied in zip(chunk, applied):
+                    if was_applied:
+                        _maybe_trigger_activity_badges(user_id, requests[index].source, requests[index].metadata or {})
+            except Exception as e:
+                logger.error("xp.award.badge_check_failed", user_id=user_id, error=str(e), exc_info=True)
+    
+    return responses
 
 
 def get_user_xp_summary(user_id: str) -> Optional[XPSummary]:
@@ -126,6 +126,15 @@ class Settings:
         except (TypeError, ValueError):
             return 100
 
+    @property
+    def xp_leaderboard_shards(self) -> int:
+        """Partitions the XP leaderboard index is spread over; only ever increase it."""
+        value = self._get("XP_LEADERBOARD_SHARDS", os.getenv("XP_LEADERBOARD_SHARDS", "8"))
+        try:
+            return max(1, int(value))
+        except (TypeError, ValueError):
+            return 8
+
     @property
     def internal_api_key(self) -> str:
         """Shared secret for internal service-to-service calls."""
@@ -2,11 +2,17 @@
 XP Award Utility
 
 Helper functions for awarding XP from other services (quest-service, etc.)
+
+``award_xp_async`` sends one award per request. For bursts (e.g. a quest
+completing many tasks at once) queue awards on an ``XPAwardBatcher``, which
+sends them to ``/xp/award-batch`` together.
 """
 
+import asyncio
+import hashlib
 import os
 import httpx
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from common.logging import get_structured_logger
 
 logger = get_structured_logger("xp-award-util", env_flag="GAMIFICATION_LOG_ENABLED", default_enabled=True)
@@ -99,6 +105,203 @@ async def award_xp_async(
         return False
 
 
+async def award_xp_batch_async(awards: List[dict]) -> List[bool]:
+    """
+    Award XP for several events in one call to ``/xp/award-batch``.
+    
+    Args:
+        awards: Award payloads (``userId``, ``amount``, ``source``, ``description``
+            and optionally ``sourceId``, ``eventId``, ``metadata``)
+        
+    Returns:
+        Whether each award succeeded, in order
+    """
+    if not awards:
+        return []
+    
+    try:
+        url = f"{get_gamification_service_url()}/xp/award-batch"
+        
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            response = await client.post(
+                url,
+                json={"awards": awards},
+                headers={"X-Internal-Key": os.getenv("INTERNAL_API_KEY", "")}
+            )
+        
+        if response.status_code == 200:
+            results = [bool(result.get("success")) for result in response.json().get("results", [])]
+            logger.info("xp.award_batch.success", awards=len(awards), users=len({a["userId"] for a in awards}))
+            return results + [False] * (len(awards) - len(results))
+        
+        logger.warning(
+            "xp.award_batch.failed",
+            awards=len(awards),
+            status_code=response.status_code,
+            response_text=response.text[:200]
+        )
+        return [False] * len(awards)
+    except Exception as e:
+        logger.error("xp.award_batch.error", awards=len(awards), error=str(e), exc_info=True)
+        return [False] * len(awards)
+
+
+def _award_payload(user_id: str, amount: int, source: str, source_id: Optional[str],
+                   description: str, event_id: Optional[str], metadata: Optional[dict]) -> dict:
+    payload = {
+        "userId": user_id,
+        "amount": amount,
+        "source": source,
+        "description": description,
+    }
+    if source_id:
+        payload["sourceId"] = source_id
+    if event_id:
+        payload["eventId"] = event_id
+    if metadata:
+        payload["metadata"] = metadata
+    return payload
+
+
+class XPAwardBatcher:
+    """
+    Collects XP awards and sends them to ``/xp/award-batch`` together.
+    
+    Awards are flushed when ``max_batch`` are queued or ``max_delay`` seconds
+    after the first one, whichever comes first. Before sending, awards are
+    coalesced per user (see ``coalesce_awards``), so the gamification
+    service makes one summary update per user.
+    
+    Call ``flush()`` before a Lambda invocation returns so nothing is left
+    queued::
+    
+        batcher = XPAwardBatcher()
+        futures = [batcher.award(user_id, 10, "task_completion", task_id) for user_id in users]
+        await batcher.flush()
+        results = await asyncio.gather(*futures)
+    """
+    
+    def __init__(self, max_batch: int = 100, max_delay: float = 0.05):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._pending: List[Tuple[dict, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: set = set()
+    
+    def __len__(self) -> int:
+        return len(self._pending)
+    
+    def award(
+        self,
+        user_id: str,
+        amount: int,
+        source: str,
+        source_id: Optional[str] = None,
+        description: str = "",
+        event_id: Optional[str] = None,
+        metadata: Optional[dict] = None
+    ) -> "asyncio.Future[bool]":
+        """Queue an award; the returned future resolves to whether it succeeded."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((_award_payload(user_id, amount, source, source_id, description, event_id, metadata), future))
+        
+        if len(self._pending) >= self.max_batch:
+            self._schedule_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._schedule_flush)
+        return future
+    
+    async def flush(self) -> None:
+        """Send everything queued and wait for in-flight batches."""
+        self._schedule_flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes)
+    
+    def _schedule_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        task = asyncio.get_running_loop().create_task(self._send(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+    
+    async def _send(self, batch: List[Tuple[dict, asyncio.Future]]) -> None:
+        awards, owners = coalesce_awards([payload for payload, _ in batch])
+        results = await award_xp_batch_async(awards)
+        for (_, future), owner in zip(batch, owners):
+            if not future.done():
+                future.set_result(results[owner])
+
+
+def coalesced_event_id(user_id: str, source: str, source_ids: List[str]) -> str:
+    """
+    Event ID for a coalesced award.
+    
+    Derived from the user, source and the merged awards' source IDs, so
+    sending the same coalesced award again (a retried batch) is deduped by
+    the gamification service instead of being applied twice.
+    """
+    digest = hashlib.sha256("\n".join([user_id, source, *sorted(source_ids)]).encode()).hexdigest()
+    return f"xp-batch:{digest[:40]}"
+
+
+def coalesce_awards(awards: List[dict]) -> Tuple[List[dict], List[int]]:
+    """
+    Coalesce award payloads per user.
+    
+    Awards for the same user and source that have a ``sourceId`` but no
+    ``eventId`` or ``metadata`` are summed into one award carrying a
+    deterministic ``eventId`` (see ``coalesced_event_id``). Awards with an
+    ``eventId`` or ``metadata`` are kept as they are, and so are awards
+    without a ``sourceId``, which have nothing to derive an event ID from.
+    Each user's awards are sent next to each other.
+    
+    Args:
+        awards: Award payloads
+        
+    Returns:
+        Tuple of (coalesced awards grouped by user, index into them for each input award)
+    """
+    by_user: Dict[str, List[int]] = {}
+    for index, award in enumerate(awards):
+        by_user.setdefault(award["userId"], []).append(index)
+    
+    coalesced: List[dict] = []
+    owners = [0] * len(awards)
+    for user_id, indices in by_user.items():
+        merged: Dict[str, int] = {}
+        merged_source_ids: Dict[str, List[str]] = {}
+        for index in indices:
+            award = awards[index]
+            if award.get("eventId") or award.get("metadata") or not award.get("sourceId"):
+                owners[index] = len(coalesced)
+                coalesced.append(dict(award))
+                continue
+            source = award["source"]
+            if source in merged:
+                target = coalesced[merged[source]]
+                target["amount"] += award["amount"]
+                target["description"] = f"{target['description']}; {award['description']}".strip("; ")
+            else:
+                merged[source] = len(coalesced)
+                merged_source_ids[source] = []
+                coalesced.append(dict(award))
+            merged_source_ids[source].append(award["sourceId"])
+            owners[index] = merged[source]
+        
+        for source, position in merged.items():
+            source_ids = merged_source_ids[source]
+            target = coalesced[position]
+            if len(source_ids) > 1:
+                target.pop("sourceId", None)
+            target["eventId"] = coalesced_event_id(user_id, source, source_ids)
+    return coalesced, owners
+
+
 def award_xp_sync(
     user_id: str,
     amount: int,
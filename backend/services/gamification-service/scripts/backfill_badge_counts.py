@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Backfill Badge Counts
+
+The badge leaderboard reads one summary item per user
+(``PK = USER#<id>, SK = BADGES#SUMMARY``) that ``assign_badge`` keeps up to
+date. Users who earned badges before the summary existed only have their
+``UserBadge`` items; this script builds their summaries from those.
+Summaries are overwritten with the counted total, so it is safe to re-run.
+
+Usage:
+    python backfill_badge_counts.py [--table-name gg_core] [--region us-east-2] [--shards 8] [--dry-run]
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+import boto3
+from boto3.dynamodb.conditions import Attr
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.leaderboard_db import (  # noqa: E402
+    BADGE_LEADERBOARD_PK_PREFIX,
+    BADGE_SUMMARY_SK,
+    BADGE_SUMMARY_TYPE,
+    xp_leaderboard_shard,
+)
+
+
+def count_badges(table):
+    """Scan the user badges and count them by user."""
+    counts = Counter()
+    scan_kwargs = {"FilterExpression": Attr("type").eq("UserBadge"), "ProjectionExpression": "userId"}
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response.get("Items", []):
+            counts[item["userId"]] += 1
+
+        last_evaluated_key = response.get("LastEvaluatedKey")
+        if not last_evaluated_key:
+            return counts
+        scan_kwargs["ExclusiveStartKey"] = last_evaluated_key
+
+
+def backfill(table_name: str, region: str, shards: int, dry_run: bool = False) -> int:
+    """Write a badge summary for every user with badges. Returns the number of users."""
+    dynamodb = boto3.resource("dynamodb", region_name=region)
+    table = dynamodb.Table(table_name)
+    counts = count_badges(table)
+
+    if dry_run:
+        for user_id, count in counts.most_common():
+            print(f"{user_id}: {count}")
+        return len(counts)
+
+    now = int(time.time() * 1000)
+    with table.batch_writer() as batch:
+        for user_id, count in counts.items():
+            shard = xp_leaderboard_shard(user_id, shards)
+            batch.put_item(Item={
+                "PK": f"USER#{user_id}",
+                "SK": BADGE_SUMMARY_SK,
+                "type": BADGE_SUMMARY_TYPE,
+                "userId": user_id,
+                "badgeCount": count,
+                "updatedAt": now,
+                "GSI1PK": f"{BADGE_LEADERBOARD_PK_PREFIX}{shard}",
+                "GSI1SK": f"{count:020d}#{user_id}",
+            })
+    return len(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build per-user badge summaries for the badge leaderboard")
+    parser.add_argument("--table-name", default=os.getenv("CORE_TABLE", "gg_core"))
+    parser.add_argument("--region", default=os.getenv("AWS_REGION", "us-east-2"))
+    parser.add_argument("--shards", type=int, default=int(os.getenv("XP_LEADERBOARD_SHARDS", "8")),
+                        help="Must match the service's XP_LEADERBOARD_SHARDS")
+    parser.add_argument("--dry-run", action="store_true", help="Print the counts instead of writing them")
+    args = parser.parse_args()
+
+    count = backfill(args.table_name, args.region, args.shards, dry_run=args.dry_run)
+    print(f"{'Would write' if args.dry_run else 'Wrote'} badge summaries for {count} users")
+
+
+if __name__ == "__main__":
+    main()
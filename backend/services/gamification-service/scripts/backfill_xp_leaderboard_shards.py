@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Backfill XP Leaderboard Shards
+
+XP summaries used to share one leaderboard partition (``GSI1PK = XP#ALL``);
+they are now spread over ``XP#SHARD#<n>`` partitions by user. Summaries move
+to their shard the next time they are updated; this script moves the ones
+that haven't been. Only ``GSI1PK`` is rewritten, so it is safe to re-run.
+
+Usage:
+    python backfill_xp_leaderboard_shards.py [--table-name gg_core] [--region us-east-2] [--shards 8] [--dry-run]
+"""
+
+import argparse
+import os
+import sys
+
+import boto3
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.leaderboard_db import (  # noqa: E402
+    LEGACY_XP_LEADERBOARD_PK,
+    XP_LEADERBOARD_PK_PREFIX,
+    xp_leaderboard_shard,
+)
+
+
+def backfill(table_name: str, region: str, shards: int, dry_run: bool = False) -> int:
+    """Move every summary still on the legacy partition to its shard. Returns the number moved."""
+    dynamodb = boto3.resource("dynamodb", region_name=region)
+    table = dynamodb.Table(table_name)
+    query_args = {
+        "IndexName": "GSI1",
+        "KeyConditionExpression": Key("GSI1PK").eq(LEGACY_XP_LEADERBOARD_PK),
+        "ProjectionExpression": "PK, SK, userId",
+    }
+    moved = 0
+    while True:
+        response = table.query(**query_args)
+        for item in response.get("Items", []):
+            partition = f"{XP_LEADERBOARD_PK_PREFIX}{xp_leaderboard_shard(item['userId'], shards)}"
+            if dry_run:
+                print(f"{item['PK']}: {partition}")
+                moved += 1
+                continue
+            try:
+                table.update_item(
+                    Key={"PK": item["PK"], "SK": item["SK"]},
+                    UpdateExpression="SET GSI1PK = :partition",
+                    ConditionExpression="GSI1PK = :legacy",
+                    ExpressionAttributeValues={":partition": partition, ":legacy": LEGACY_XP_LEADERBOARD_PK},
+                )
+                moved += 1
+            except ClientError as exc:
+                # An XP award moved it first
+                if exc.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                    raise
+
+        last_evaluated_key = response.get("LastEvaluatedKey")
+        if not last_evaluated_key:
+            return moved
+        query_args["ExclusiveStartKey"] = last_evaluated_key
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move XP summaries from the XP#ALL leaderboard partition to shards")
+    parser.add_argument("--table-name", default=os.getenv("CORE_TABLE", "gg_core"))
+    parser.add_argument("--region", default=os.getenv("AWS_REGION", "us-east-2"))
+    parser.add_argument("--shards", type=int, default=int(os.getenv("XP_LEADERBOARD_SHARDS", "8")),
+                        help="Must match the service's XP_LEADERBOARD_SHARDS")
+    parser.add_argument("--dry-run", action="store_true", help="Print the target shards instead of writing them")
+    args = parser.parse_args()
+
+    count = backfill(args.table_name, args.region, args.shards, dry_run=args.dry_run)
+    print(f"{'Would move' if args.dry_run else 'Moved'} {count} XP summaries to leaderboard shards")
+
+
+if __name__ == "__main__":
+    main()
@@ -189,6 +189,37 @@ class TestUserBadges:
         
         assert badge1.earnedAt == badge2.earnedAt
     
+    def test_assign_badge_lost_race_returns_the_stored_badge(self, dynamodb_table, monkeypatch):
+        """Test that losing the conditional put returns the concurrently stored badge without retrying."""
+        import app.db.badge_db as badge_db
+        
+        real_put = badge_db._put_badge_and_count
+        puts = []
+        
+        def racing_put(table, user_id, badge_item, now_ms):
+            puts.append(badge_item["SK"])
+            # Another request assigns the badge between our check and our write
+            real_put(table, user_id, {**badge_item, "earnedAt": 1}, now_ms)
+            return real_put(table, user_id, badge_item, now_ms)
+        
+        monkeypatch.setattr(badge_db, "_put_badge_and_count", racing_put)
+        badge = assign_badge("user-123", "badge-123")
+        
+        assert badge.earnedAt == 1
+        assert puts == ["BADGE#badge-123"]
+    
+    def test_assign_badge_read_errors_are_raised(self, dynamodb_table, monkeypatch):
+        """Test that a failed existence check raises instead of assigning blindly."""
+        import app.db.badge_db as badge_db
+        
+        class FailingTable:
+            def get_item(self, **kwargs):
+                raise RuntimeError("throttled")
+        
+        monkeypatch.setattr(badge_db, "_get_dynamodb_table", lambda: FailingTable())
+        with pytest.raises(BadgeDBError):
+            assign_badge("user-123", "badge-123")
+    
     def test_get_user_badges(self, dynamodb_table):
         """Test getting all badges for a user."""
         badge_def1 = BadgeDefinition(
@@ -262,4 +262,23 @@ class TestLeaderboardAPI:
             assert "rank" in entry
             assert "value" in entry
             assert "metadata" in entry
-
+    
+    def test_leaderboard_pages_follow_next_token(self, app_client):
+        """Test paging the global leaderboard with nextToken."""
+        from app.db.xp_db import create_xp_summary
+        
+        for i in range(5):
+            create_xp_summary(f"page-user-{i}", initial_xp=100 * i)
+        
+        first = app_client.get("/leaderboard/global/page?limit=3").json()
+        second = app_client.get(f"/leaderboard/global/page?limit=3&nextToken={first['nextToken']}").json()
+        
+        assert [e["rank"] for e in first["items"] + second["items"]] == [1, 2, 3, 4, 5]
+        assert second["nextToken"] is None
+        assert app_client.get("/leaderboard/level/page?nextToken=bogus").status_code == 400
+    
+    def test_my_rank_requires_authentication(self, app_client):
+        """Test that the rank lookup needs a bearer token."""
+        response = app_client.get("/leaderboard/global/me")
+        
+        assert response.status_code == 401
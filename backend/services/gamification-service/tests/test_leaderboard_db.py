@@ -16,10 +16,11 @@ os.environ['JWT_AUDIENCE'] = 'api://default'
 os.environ['JWT_ISSUER'] = 'https://auth.local'
 
 from app.db.leaderboard_db import (
-    get_global_xp_leaderboard, get_level_leaderboard, get_badge_leaderboard
+    get_global_xp_leaderboard, get_level_leaderboard, get_badge_leaderboard,
+    get_leaderboard_page, get_user_rank, InvalidLeaderboardCursor, xp_leaderboard_shard
 )
 from app.db.xp_db import create_xp_summary, update_xp_summary
-from app.db.badge_db import create_badge_definition, assign_badge
+from app.db.badge_db import create_badge_definition, assign_badge, get_user_badges
 from app.models.badge import BadgeDefinition
 
 
@@ -157,3 +158,201 @@ class TestBadgeLeaderboard:
         # User 1 should have the most badges
         assert leaderboard[0].userId == "user-1"
         assert leaderboard[0].value == 3
+
+
+class TestXPLeaderboardPaging:
+    """Tests for the paginated XP-ordered leaderboards and rank lookup."""
+    
+    def _walk(self, board, limit):
+        entries, cursor, pages = [], None, 0
+        while True:
+            page, cursor = get_leaderboard_page(board, limit=limit, cursor=cursor)
+            entries.extend(page)
+            pages += 1
+            if not cursor:
+                return entries, pages
+    
+    def test_pages_cover_the_whole_board(self, dynamodb_table):
+        """Test that following cursors returns every user exactly once, in XP order."""
+        for i in range(25):
+            create_xp_summary(f"user-{i:02d}", initial_xp=i * 10)
+        
+        entries, pages = self._walk("global", limit=10)
+        
+        assert [e.userId for e in entries] == [f"user-{i:02d}" for i in reversed(range(25))]
+        assert [e.rank for e in entries] == list(range(1, 26))
+        assert pages == 3
+    
+    def test_ties_share_a_rank_across_page_boundaries(self, dynamodb_table):
+        """Test competition ranks on the global board when ties straddle pages."""
+        for user_id, xp in [("a", 500), ("b", 400), ("c", 400), ("d", 400), ("e", 100)]:
+            create_xp_summary(user_id, initial_xp=xp)
+        
+        entries, _ = self._walk("global", limit=2)
+        
+        assert [(e.value, e.rank) for e in entries] == [(500, 1), (400, 2), (400, 2), (400, 2), (100, 5)]
+    
+    def test_level_board_uses_dense_ranks_beyond_the_first_window(self, dynamodb_table):
+        """Test that level ranks are dense and computed from XP for every page."""
+        xp_by_user = {"u1": 1600, "u2": 1000, "u3": 950, "u4": 450, "u5": 420, "u6": 50, "u7": 0}
+        for user_id, xp in xp_by_user.items():
+            create_xp_summary(user_id, initial_xp=xp)
+        
+        entries, _ = self._walk("level", limit=3)
+        
+        assert [(e.userId, e.value, e.rank) for e in entries] == [
+            ("u1", 5, 1), ("u2", 4, 2), ("u3", 4, 2), ("u4", 3, 3), ("u5", 3, 3), ("u6", 1, 4), ("u7", 1, 4)
+        ]
+        assert entries[0].metadata == {"totalXp": 1600}
+    
+    def test_user_rank_matches_board_rank(self, dynamodb_table):
+        """Test that the rank lookup agrees with the paged boards."""
+        for user_id, xp in [("a", 1600), ("b", 1000), ("c", 1000), ("d", 450), ("e", 50)]:
+            create_xp_summary(user_id, initial_xp=xp)
+        
+        for board in ("global", "level"):
+            entries, _ = self._walk(board, limit=100)
+            for entry in entries:
+                mine = get_user_rank(entry.userId, board=board)
+                assert (mine.rank, mine.value) == (entry.rank, entry.value)
+        
+        assert get_user_rank("nobody") is None
+    
+    def test_invalid_cursor_is_rejected(self, dynamodb_table):
+        """Test that a tampered cursor raises instead of restarting the board."""
+        with pytest.raises(InvalidLeaderboardCursor):
+            get_leaderboard_page("global", cursor="not-a-cursor")
+
+
+class TestShardedXPLeaderboard:
+    """Tests for the write-sharded XP leaderboard index."""
+    
+    def test_summaries_are_spread_over_shards(self, dynamodb_table, monkeypatch):
+        """Test that XP summaries land on several leaderboard partitions."""
+        monkeypatch.setenv("XP_LEADERBOARD_SHARDS", "4")
+        for i in range(20):
+            create_xp_summary(f"user-{i}", initial_xp=i)
+        
+        items = boto3.resource("dynamodb", region_name="us-east-2").Table("gg_core").scan()["Items"]
+        partitions = {item["GSI1PK"] for item in items}
+        
+        assert partitions <= {f"XP#SHARD#{n}" for n in range(4)}
+        assert len(partitions) > 1
+        assert all(item["GSI1PK"] == f"XP#SHARD#{xp_leaderboard_shard(item['userId'])}" for item in items)
+    
+    def test_merged_pages_match_a_single_ordered_board(self, dynamodb_table, monkeypatch):
+        """Test that the scatter-gather reader returns the global order and ranks."""
+        monkeypatch.setenv("XP_LEADERBOARD_SHARDS", "4")
+        xp_by_user = {f"user-{i:02d}": (i * 37) % 200 for i in range(30)}
+        for user_id, xp in xp_by_user.items():
+            create_xp_summary(user_id, initial_xp=xp)
+        
+        entries, cursor = [], None
+        while True:
+            page, cursor = get_leaderboard_page("global", limit=7, cursor=cursor)
+            entries.extend(page)
+            if not cursor:
+                break
+        
+        expected = sorted(xp_by_user.items(), key=lambda kv: (kv[1], kv[0]), reverse=True)
+        assert [(e.userId, e.value) for e in entries] == expected
+        for entry in entries:
+            assert entry.rank == 1 + sum(1 for xp in xp_by_user.values() if xp > entry.value)
+            assert get_user_rank(entry.userId).rank == entry.rank
+    
+    @staticmethod
+    def _move_to_legacy_partition(user_id):
+        table = boto3.resource("dynamodb", region_name="us-east-2").Table("gg_core")
+        table.update_item(
+            Key={"PK": f"USER#{user_id}", "SK": "XP#SUMMARY"},
+            UpdateExpression="SET GSI1PK = :legacy",
+            ExpressionAttributeValues={":legacy": "XP#ALL"},
+        )
+    
+    def test_update_moves_legacy_summary_to_its_shard(self, dynamodb_table):
+        """Test that summaries written under XP#ALL move to their shard on their next update."""
+        create_xp_summary("legacy-user", initial_xp=10)
+        self._move_to_legacy_partition("legacy-user")
+        
+        update_xp_summary("legacy-user", 150, 2, 100, 400, 0.1)
+        
+        table = boto3.resource("dynamodb", region_name="us-east-2").Table("gg_core")
+        item = table.get_item(Key={"PK": "USER#legacy-user", "SK": "XP#SUMMARY"})["Item"]
+        assert item["GSI1PK"] == f"XP#SHARD#{xp_leaderboard_shard('legacy-user')}"
+        leaderboard = get_global_xp_leaderboard(limit=10)
+        assert [(e.userId, e.value) for e in leaderboard] == [("legacy-user", 150)]
+    
+    def test_legacy_summaries_stay_ranked_until_moved(self, dynamodb_table, monkeypatch):
+        """Test that boards and rank lookups merge XP#ALL with the shards."""
+        monkeypatch.setenv("XP_LEADERBOARD_SHARDS", "4")
+        xp_by_user = {f"user-{i:02d}": i * 60 for i in range(12)}
+        for user_id, xp in xp_by_user.items():
+            create_xp_summary(user_id, initial_xp=xp)
+        for user_id in ("user-11", "user-05", "user-00"):
+            self._move_to_legacy_partition(user_id)
+        
+        entries, cursor = [], None
+        while True:
+            page, cursor = get_leaderboard_page("global", limit=5, cursor=cursor)
+            entries.extend(page)
+            if not cursor:
+                break
+        
+        expected = sorted(xp_by_user.items(), key=lambda kv: kv[1], reverse=True)
+        assert [(e.userId, e.value) for e in entries] == expected
+        assert get_user_rank("user-11").rank == 1
+        assert get_user_rank("user-06").rank == 6
+        level_board = get_level_leaderboard(limit=20)
+        assert len(level_board) == len(xp_by_user)
+        for entry in level_board:
+            assert get_user_rank(entry.userId, board="level").rank == entry.rank
+
+
+class TestBadgeLeaderboardSummaries:
+    """Tests for the materialized badge leaderboard."""
+    
+    def _badges(self, count):
+        for i in range(count):
+            create_badge_definition(BadgeDefinition(
+                id=f"badge-{i}",
+                name=f"Badge {i}",
+                description="Test",
+                category="quest",
+                rarity="common",
+                createdAt=int(time.time() * 1000)
+            ))
+    
+    def test_reassigning_a_badge_does_not_count_twice(self, dynamodb_table):
+        """Test that the badge summary counts each badge once."""
+        self._badges(2)
+        assign_badge("user-1", "badge-0")
+        assign_badge("user-1", "badge-0")
+        assign_badge("user-1", "badge-1")
+        
+        summary = boto3.resource("dynamodb", region_name="us-east-2").Table("gg_core").get_item(
+            Key={"PK": "USER#user-1", "SK": "BADGES#SUMMARY"}
+        )["Item"]
+        
+        assert summary["badgeCount"] == 2
+        assert summary["GSI1SK"] == f"{2:020d}#user-1"
+        assert [b.badgeId for b in get_user_badges("user-1")] == ["badge-0", "badge-1"]
+    
+    def test_badge_board_pages_with_ties_and_rank_lookup(self, dynamodb_table):
+        """Test paging the badge board and looking up a user's badge rank."""
+        self._badges(3)
+        counts = {"a": 3, "b": 2, "c": 2, "d": 1, "e": 1}
+        for user_id, count in counts.items():
+            for i in range(count):
+                assign_badge(user_id, f"badge-{i}")
+        
+        entries, cursor = [], None
+        while True:
+            page, cursor = get_leaderboard_page("badges", limit=2, cursor=cursor)
+            entries.extend(page)
+            if not cursor:
+                break
+        
+        assert [(e.value, e.rank) for e in entries] == [(3, 1), (2, 2), (2, 2), (1, 4), (1, 4)]
+        assert {e.userId: e.value for e in entries} == counts
+        assert get_user_rank("d", board="badges").rank == 4
+        assert get_user_rank("nobody", board="badges") is None
@@ -200,6 +200,33 @@ class TestXPAPI:
         response = app_client.post("/xp/award", json=payload)
         assert response.status_code == 403
 
+    def test_award_xp_batch_internal(self, app_client):
+        """Batch endpoint applies each user's awards together and skips duplicate events."""
+        awards = [
+            {"userId": "user-1", "amount": 60, "source": "task_completion", "description": "Task 1", "eventId": "t1"},
+            {"userId": "user-2", "amount": 10, "source": "task_completion", "description": "Task 2"},
+            {"userId": "user-1", "amount": 50, "source": "task_completion", "description": "Task 3", "eventId": "t3"},
+            {"userId": "user-1", "amount": 60, "source": "task_completion", "description": "Task 1", "eventId": "t1"},
+        ]
+
+        response = app_client.post("/xp/award-batch", json={"awards": awards}, headers={"X-Internal-Key": "test-key"})
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["totalXp"] for r in results] == [110, 10, 110, 110]
+        assert [r["levelUp"] for r in results] == [True, False, True, False]
+        assert results[0]["previousLevel"] == 1
+
+        from app.db.xp_db import get_xp_transactions
+        assert sorted(t.amount for t in get_xp_transactions("user-1")) == [50, 60]
+
+    def test_award_xp_batch_rejects_missing_key(self, app_client):
+        """Verify internal key is enforced on the batch endpoint."""
+        awards = [{"userId": "user-1", "amount": 10, "source": "task_completion", "description": "Task"}]
+
+        response = app_client.post("/xp/award-batch", json={"awards": awards})
+        assert response.status_code == 403
+
     def test_get_level_progress(self, app_client):
         """Fetch level progress snapshot."""
         token = _issue_token()
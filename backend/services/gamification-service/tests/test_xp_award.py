@@ -0,0 +1,155 @@
+"""
+Unit tests for the XP award client helpers.
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import httpx
+import pytest
+
+# xp_award imports common directly (it has no path helper of its own)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.utils import xp_award
+from app.utils.xp_award import XPAwardBatcher, award_xp_batch_async, coalesce_awards, coalesced_event_id
+
+
+def _award(user_id, amount, source="task_completion", description="", **extra):
+    return {"userId": user_id, "amount": amount, "source": source, "description": description, **extra}
+
+
+@pytest.fixture
+def gamification_api(monkeypatch):
+    api = {"requests": [], "status": 200, "results": None}
+
+    def handler(request):
+        awards = json.loads(request.content)["awards"]
+        api["requests"].append(awards)
+        results = api["results"] or [{"success": True} for _ in awards]
+        return httpx.Response(api["status"], json={"results": results})
+
+    transport = httpx.MockTransport(handler)
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(xp_award.httpx, "AsyncClient", lambda **kwargs: real_client(transport=transport, **kwargs))
+    return api
+
+
+class TestAwardXPBatchAsync:
+    """Tests for sending awards to /xp/award-batch."""
+
+    def test_sends_every_award_in_one_request(self, gamification_api):
+        awards = [_award("user-1", 10, eventId="e1"), _award("user-2", 25, source="goal_completion")]
+
+        results = asyncio.run(award_xp_batch_async(awards))
+
+        assert results == [True, True]
+        assert gamification_api["requests"] == [awards]
+
+    def test_reports_per_award_failures(self, gamification_api):
+        gamification_api["results"] = [{"success": True}, {"success": False, "error": "throttled"}]
+
+        results = asyncio.run(award_xp_batch_async([_award("user-1", 10), _award("user-2", 10)]))
+
+        assert results == [True, False]
+
+    def test_error_response_fails_every_award(self, gamification_api):
+        gamification_api["status"] = 500
+
+        results = asyncio.run(award_xp_batch_async([_award("user-1", 10), _award("user-2", 10)]))
+
+        assert results == [False, False]
+
+    def test_empty_batch_makes_no_request(self, gamification_api):
+        assert asyncio.run(award_xp_batch_async([])) == []
+        assert gamification_api["requests"] == []
+
+
+class TestCoalesceAwards:
+    """Tests for per-user coalescing."""
+
+    def test_awards_are_summed_per_user_and_source_under_a_deterministic_event_id(self):
+        awards = [
+            _award("user-1", 10, description="Task 1", sourceId="t1"),
+            _award("user-2", 10, sourceId="t9"),
+            _award("user-1", 10, description="Task 2", sourceId="t2"),
+            _award("user-1", 25, source="goal_completion", sourceId="g1"),
+        ]
+
+        coalesced, owners = coalesce_awards(awards)
+
+        assert coalesced == [
+            _award("user-1", 20, description="Task 1; Task 2",
+                   eventId=coalesced_event_id("user-1", "task_completion", ["t1", "t2"])),
+            _award("user-1", 25, source="goal_completion", sourceId="g1",
+                   eventId=coalesced_event_id("user-1", "goal_completion", ["g1"])),
+            _award("user-2", 10, sourceId="t9", eventId=coalesced_event_id("user-2", "task_completion", ["t9"])),
+        ]
+        assert owners == [0, 2, 0, 1]
+
+    def test_coalesced_event_id_is_stable_across_retries(self):
+        first, _ = coalesce_awards([_award("user-1", 10, sourceId="t1"), _award("user-1", 10, sourceId="t2")])
+        retried, _ = coalesce_awards([_award("user-1", 10, sourceId="t2"), _award("user-1", 10, sourceId="t1")])
+        other, _ = coalesce_awards([_award("user-1", 10, sourceId="t1"), _award("user-1", 10, sourceId="t3")])
+
+        assert first[0]["eventId"] == retried[0]["eventId"]
+        assert first[0]["eventId"] != other[0]["eventId"]
+
+    def test_awards_with_event_ids_metadata_or_no_source_id_are_kept(self):
+        awards = [
+            _award("user-1", 10, sourceId="t1", eventId="e1"),
+            _award("user-1", 10, sourceId="t2", metadata={"questCount": 3}),
+            _award("user-1", 10),
+        ]
+
+        coalesced, owners = coalesce_awards(awards)
+
+        assert coalesced == awards
+        assert owners == [0, 1, 2]
+
+
+class TestXPAwardBatcher:
+    """Tests for batching awards into /xp/award-batch calls."""
+
+    def test_burst_is_sent_as_one_coalesced_request(self, gamification_api):
+        async def run():
+            batcher = XPAwardBatcher(max_delay=60)
+            futures = [batcher.award("user-1", 10, "task_completion", f"t{i}", description=f"Task {i}") for i in range(5)]
+            futures.append(batcher.award("user-2", 10, "task_completion", event_id="e1"))
+            await batcher.flush()
+            return await asyncio.gather(*futures)
+
+        results = asyncio.run(run())
+
+        assert results == [True] * 6
+        assert len(gamification_api["requests"]) == 1
+        sent = gamification_api["requests"][0]
+        assert [(a["userId"], a["amount"]) for a in sent] == [("user-1", 50), ("user-2", 10)]
+        assert sent[0]["eventId"].startswith("xp-batch:")
+
+    def test_flushes_when_the_batch_is_full_or_the_delay_passes(self, gamification_api):
+        async def run():
+            batcher = XPAwardBatcher(max_batch=2, max_delay=0.01)
+            first = [batcher.award(f"user-{i}", 10, "task_completion", "t1") for i in range(3)]
+            results = await asyncio.gather(*first)
+            return results, len(batcher)
+
+        results, queued = asyncio.run(run())
+
+        assert results == [True, True, True]
+        assert queued == 0
+        assert [len(awards) for awards in gamification_api["requests"]] == [2, 1]
+
+    def test_failed_award_fails_every_award_coalesced_into_it(self, gamification_api):
+        gamification_api["results"] = [{"success": False, "error": "throttled"}, {"success": True}]
+
+        async def run():
+            batcher = XPAwardBatcher(max_delay=60)
+            futures = [batcher.award("user-1", 10, "task_completion", f"t{i}") for i in range(2)]
+            futures.append(batcher.award("user-2", 10, "task_completion", "t1"))
+            await batcher.flush()
+            return await asyncio.gather(*futures)
+
+        assert asyncio.run(run()) == [False, False, True]
@@ -15,9 +15,10 @@ os.environ['JWT_SECRET'] = 'test-secret'
 os.environ['JWT_AUDIENCE'] = 'api://default'
 os.environ['JWT_ISSUER'] = 'https://auth.local'
 
-from app.services.xp_service import award_xp, get_user_xp_summary, get_xp_award_amount
+from app.services.xp_service import award_xp, award_xp_batch, get_user_xp_summary, get_xp_award_amount
 from app.models.xp import XPAwardRequest, XPAwardResponse
-from app.db.xp_db import create_xp_summary
+from app.db.xp_db import XPDBError, create_xp_summary, check_event_id_exists
+from boto3.dynamodb.conditions import Key
 
 
 @pytest.fixture(scope='function')
@@ -129,6 +130,102 @@ class TestXPAward:
         assert response2.success is True
         assert response2.totalXp == 10  # Should be same, not 20
     
+    def test_award_xp_idempotency_is_checked_by_the_transaction(self, dynamodb_table, monkeypatch):
+        """Test that a repeated event is caught by the transaction's claim, not by reading the event record."""
+        import app.db.xp_db as xp_db
+        
+        table = xp_db._get_dynamodb_table()
+        real_get_item = table.get_item
+        read_keys = []
+        
+        def recording_get_item(**kwargs):
+            read_keys.append(kwargs["Key"]["SK"])
+            return real_get_item(**kwargs)
+        
+        monkeypatch.setattr(table, "get_item", recording_get_item)
+        monkeypatch.setattr(xp_db, "_get_dynamodb_table", lambda: table)
+        request = XPAwardRequest(userId="user-123", amount=10, source="task_completion", description="Task", eventId="task-7")
+        
+        award_xp(request)
+        assert award_xp(request).totalXp == 10
+        assert read_keys and all(key == "XP#SUMMARY" for key in read_keys)
+    
+    def test_award_xp_writes_everything_in_one_transaction(self, dynamodb_table):
+        """Test that an award stores the idempotency record, transaction, summary and level event."""
+        award_xp(XPAwardRequest(
+            userId="user-123",
+            amount=150,
+            source="quest_completion",
+            description="Finished a quest",
+            eventId="quest-42"
+        ))
+        
+        table = boto3.resource("dynamodb", region_name="us-east-2").Table("gg_core")
+        event = table.get_item(Key={"PK": "EVENT#quest-42", "SK": "EVENT#quest-42"})["Item"]
+        items = table.query(KeyConditionExpression=Key("PK").eq("USER#user-123"))["Items"]
+        types = sorted(item["type"] for item in items)
+        
+        assert event["userId"] == "user-123"
+        assert event["ttl"] > time.time()
+        assert check_event_id_exists("quest-42") is True
+        assert types == ["LevelEvent", "XPSummary", "XPTransaction"]
+    
+    def test_award_xp_retries_when_summary_changes_concurrently(self, dynamodb_table, monkeypatch):
+        """Test that a concurrent summary update makes the award re-read instead of losing XP."""
+        import app.db.xp_db as xp_db
+        
+        create_xp_summary("user-123", initial_xp=50)
+        real_get_level_info = xp_db.get_level_info
+        calls = []
+        
+        def racing_get_level_info(total_xp):
+            calls.append(total_xp)
+            if len(calls) == 1:
+                # Another award lands between our read and our write
+                award_xp(XPAwardRequest(userId="user-123", amount=5, source="daily_login", description="Login", eventId="login-1"))
+            return real_get_level_info(total_xp)
+        
+        monkeypatch.setattr(xp_db, "get_level_info", racing_get_level_info)
+        response = award_xp(XPAwardRequest(userId="user-123", amount=10, source="task_completion", description="Task", eventId="task-1"))
+        
+        assert response.totalXp == 65
+        assert calls == [60, 55, 65]
+    
+    def test_award_xp_batch_fails_only_the_affected_user(self, dynamodb_table, monkeypatch):
+        """Test that a failed write for one user doesn't fail awards already committed for others."""
+        import app.services.xp_service as xp_service
+        
+        real_apply = xp_service.apply_xp_awards
+        
+        def failing_for_user_2(user_id, awards):
+            if user_id == "user-2":
+                raise XPDBError("Failed to apply XP award: throttled")
+            return real_apply(user_id, awards)
+        
+        monkeypatch.setattr(xp_service, "apply_xp_awards", failing_for_user_2)
+        responses = award_xp_batch([
+            XPAwardRequest(userId="user-1", amount=10, source="task_completion", description="Task 1"),
+            XPAwardRequest(userId="user-2", amount=10, source="task_completion", description="Task 2"),
+            XPAwardRequest(userId="user-3", amount=10, source="task_completion", description="Task 3"),
+        ])
+        
+        assert [r.success for r in responses] == [True, False, True]
+        assert responses[0].totalXp == 10
+        assert responses[1].totalXp is None
+        assert "throttled" in responses[1].error
+        assert get_user_xp_summary("user-3").totalXp == 10
+    
+    def test_award_xp_raises_when_the_write_fails(self, dynamodb_table, monkeypatch):
+        """Test that the single-award path still reports a failed write as an error."""
+        import app.services.xp_service as xp_service
+        
+        def failing(user_id, awards):
+            raise XPDBError("Failed to apply XP award: throttled")
+        
+        monkeypatch.setattr(xp_service, "apply_xp_awards", failing)
+        with pytest.raises(XPDBError):
+            award_xp(XPAwardRequest(userId="user-1", amount=10, source="task_completion", description="Task"))
+    
     def test_get_xp_award_amount_task(self):
         """Test getting XP award amount for task completion."""
         amount = get_xp_award_amount("task_completion")
@@ -39,7 +39,7 @@ from ..db.guild_db import (
     join_guild,
     leave_guild,
     remove_user_from_guild,
-    get_guild_rankings,
+    get_guild_rankings_page,
     create_guild_quest,
     get_guild_quest,
     list_guild_quests,
@@ -60,6 +60,7 @@ from ..db.guild_db import (
 from ..security.authentication import authenticate
 from ..security.auth_models import AuthContext
 from ..security.rate_limiter import rate_limit
+from ..utils.messaging import notify_membership_revoked
 
 router = APIRouter(prefix="/guilds", tags=["guilds"])
 security = HTTPBearer()
@@ -103,13 +104,18 @@ async def create_guild_endpoint(
 
 @router.get("/rankings")
 async def get_guild_rankings_endpoint(
-    limit: int = Query(50, description="Maximum number of rankings to return"),
+    limit: int = Query(50, ge=1, le=100, description="Maximum number of rankings to return"),
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
     auth: AuthContext = Depends(authenticate)
 ):
-    """Get guild rankings."""
+    """Get guild rankings from the latest materialized snapshot."""
     try:
-        rankings = await get_guild_rankings(limit=limit)
-        return {"rankings": rankings}
+        return await get_guild_rankings_page(limit=limit, cursor=cursor)
+    except GuildValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except GuildDBError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -246,7 +252,8 @@ async def list_guilds_endpoint(
     guild_type: Optional[str] = Query(None, description="Filter by guild type"),
     tags: Optional[List[str]] = Query(None, description="Filter by tags"),
     limit: int = Query(20, ge=1, le=100, description="Number of guilds to return"),
-    offset: int = Query(0, ge=0, description="Number of guilds to skip")
+    offset: int = Query(0, ge=0, description="Number of guilds to skip"),
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page")
 ):
     """List guilds with optional filtering."""
     try:
@@ -255,9 +262,15 @@ async def list_guilds_endpoint(
             guild_type=guild_type,
             tags=tags,
             limit=limit,
-            offset=offset
+            offset=offset,
+            cursor=cursor
         )
         return result
+    except GuildValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except GuildDBError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -377,6 +390,9 @@ async def remove_user_from_guild_endpoint(
             detail="Failed to remove user from guild"
         )
 
+    # Close the removed member's chat sockets now rather than after the cache TTL
+    await notify_membership_revoked(guild_id, user_id)
+
 
 # ============================================================================
 # GUILD QUEST ENDPOINTS (Exclusive to guilds - quantitative and percentual only)
@@ -18,13 +18,11 @@ from ..db.guild_db import (
 )
 from ..security.authentication import authenticate
 from ..security.auth_models import AuthContext
-from ..security.rate_limiter import rate_limit
 
 router = APIRouter(prefix="/guilds", tags=["guild-members"])
 security = HTTPBearer()
 
 @router.get("/{guild_id}/members", response_model=List[GuildMemberResponse])
-@rate_limit(requests_per_hour=60)
 async def get_guild_members(
     guild_id: str,
     auth: AuthContext = Depends(authenticate),
@@ -69,7 +67,6 @@ async def get_guild_members(
         )
 
 @router.get("/{guild_id}/members/{user_id}", response_model=GuildMemberResponse)
-@rate_limit(requests_per_hour=60)
 async def get_guild_member(
     guild_id: str,
     user_id: str,
@@ -113,7 +110,6 @@ async def get_guild_member(
         )
 
 @router.get("/{guild_id}/members/me", response_model=GuildMemberResponse)
-@rate_limit(requests_per_hour=60)
 async def get_my_guild_membership(
     guild_id: str,
     auth: AuthContext = Depends(authenticate)
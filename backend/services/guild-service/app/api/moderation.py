@@ -26,7 +26,7 @@ from ..db.guild_db import (
     transfer_guild_ownership,
     assign_moderator as db_assign_moderator,
     remove_moderator as db_remove_moderator,
-    perform_moderation_action,
+    perform_moderation_action as db_perform_moderation_action,
     GuildDBError,
     GuildNotFoundError,
     GuildPermissionError,
@@ -36,6 +36,7 @@ from ..db.guild_db import (
 from ..security.authentication import authenticate
 from ..security.auth_models import AuthContext
 from ..security.rate_limiter import rate_limit
+from ..utils.messaging import notify_membership_revoked
 
 router = APIRouter(prefix="/guilds", tags=["guild-moderation"])
 security = HTTPBearer()
@@ -349,12 +350,13 @@ async def perform_moderation_action(
     auth: AuthContext = Depends(authenticate)
 ):
     """Perform a moderation action."""
+    target_user_id = payload.target_user_id
     try:
-        await perform_moderation_action(
+        await db_perform_moderation_action(
             guild_id=guild_id,
             action=payload.action,
-            target_user_id=payload.target_user_id or payload.targetUserId,
-            comment_id=payload.comment_id or payload.commentId,
+            target_user_id=target_user_id,
+            comment_id=payload.comment_id,
             reason=payload.reason,
             performed_by=auth.user_id
         )
@@ -379,3 +381,7 @@ async def perform_moderation_action(
             detail="Failed to perform moderation action"
         )
 
+    if payload.action == "block_user" and target_user_id:
+        # Blocked members lose chat access immediately, not after the cache TTL
+        await notify_membership_revoked(guild_id, target_user_id)
+
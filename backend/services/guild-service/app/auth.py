@@ -1,12 +1,12 @@
 from __future__ import annotations
 
 import logging
-from functools import lru_cache
 from typing import Dict, Tuple
 
 import jwt
-from jwt import PyJWKClient, PyJWTError
+from jwt import PyJWTError
 
+from common.jwks import CognitoTokenError, cognito_verifier
 from .settings import Settings
 
 logger = logging.getLogger("guild-service.auth")
@@ -20,15 +20,6 @@ class TokenVerifier:
     def __init__(self, settings: Settings):
         self.settings = settings
 
-    @property
-    def cognito_issuer(self) -> str:
-        return f"https://cognito-idp.{self.settings.cognito_region}.amazonaws.com/{self.settings.cognito_user_pool_id}"
-
-    @lru_cache(maxsize=1)
-    def _jwks_client(self) -> PyJWKClient:
-        jwks_url = f"{self.cognito_issuer}/.well-known/jwks.json"
-        return PyJWKClient(jwks_url)
-
     def verify(self, token: str) -> Tuple[Dict, str]:
         """Return (claims, provider) or raise TokenVerificationError."""
         try:
@@ -70,29 +61,13 @@ class TokenVerifier:
             logger.warning("Cognito not configured, skipping Cognito verification")
             raise TokenVerificationError("Cognito not configured")
         
-        signing_key = self._jwks_client().get_signing_key_from_jwt(token).key
-        claims = jwt.decode(
-            token,
-            signing_key,
-            algorithms=["RS256"],
-            issuer=self.cognito_issuer,
-            options={"require": ["exp", "iat", "iss", "token_use"], "verify_aud": False},
-        )
-        token_use = claims.get("token_use")
-        if token_use == "id":
-            audience = claims.get("aud")
-            client_id = self.settings.cognito_client_id
-            if isinstance(audience, list):
-                if client_id not in audience:
-                    raise TokenVerificationError("Invalid Cognito audience")
-            elif audience != client_id:
-                raise TokenVerificationError("Invalid Cognito audience")
-        elif token_use == "access":
-            if claims.get("client_id") != self.settings.cognito_client_id:
-                raise TokenVerificationError("Invalid Cognito client_id")
-        else:
-            raise TokenVerificationError("Unsupported Cognito token_use")
-        return claims
+        try:
+            verifier = cognito_verifier(
+                self.settings.cognito_region, self.settings.cognito_user_pool_id, self.settings.cognito_client_id
+            )
+            return verifier.verify(token)
+        except CognitoTokenError as exc:
+            raise TokenVerificationError(str(exc)) from exc
 
 
 __all__ = ["TokenVerifier", "TokenVerificationError"]
@@ -6,6 +6,8 @@ including CRUD operations, membership management, and guild discovery.
 """
 
 import os
+import time
+import asyncio
 import boto3
 import logging
 from boto3.dynamodb.conditions import Key, Attr
@@ -22,9 +24,17 @@ from ..models.guild import (
 from ..models.analytics import GuildAnalyticsResponse, MemberLeaderboardItem
 from ..models.join_request import GuildJoinRequestResponse, JoinRequestStatus
 from ..models.comment import GuildCommentResponse
+from .guild_directory import (
+    DIRECTORY_PREFIX, SEARCH_PREFIX, TAG_PREFIX, SEARCH_SK_PREFIX, TAG_SK_PREFIX,
+    DIRECTORY_GUILD_TYPES, DirectoryCursorError, build_token_items, decode_cursor,
+    directory_attributes, encode_cursor, normalize_tag, query_directory,
+    query_fingerprint, search_terms, tokenize
+)
+from common.async_dynamodb import dynamodb_client_config, run_dynamodb
 
-# Initialize DynamoDB
-dynamodb = boto3.resource('dynamodb')
+# Initialize DynamoDB. Handlers are async, so every boto3 call below is
+# offloaded with ``run_dynamodb`` instead of blocking the event loop.
+dynamodb = boto3.resource('dynamodb', config=dynamodb_client_config())
 table_name = os.getenv('GUILD_TABLE_NAME', 'gg_guild')
 table = dynamodb.Table(table_name)
 
@@ -54,19 +64,30 @@ def generate_avatar_signed_url(avatar_key: Optional[str]) -> Optional[str]:
 def build_guild_response(item: Dict[str, Any], members: Optional[List[GuildMemberResponse]] = None, 
                         goals: Optional[List[Dict[str, Any]]] = None, 
                         quests: Optional[List[Dict[str, Any]]] = None,
-                        current_user_id: Optional[str] = None) -> GuildResponse:
-    """Build a GuildResponse object from a DynamoDB item with signed avatar URL."""
+                        current_user_id: Optional[str] = None,
+                        current_member: Optional[GuildMemberResponse] = None,
+                        membership_resolved: bool = False) -> GuildResponse:
+    """
+    Build a GuildResponse object from a DynamoDB item with signed avatar URL.
+    
+    User permissions are computed from ``members`` or, when
+    ``membership_resolved`` is set, from ``current_member`` (the caller's own
+    membership, None if they are not a member) without needing the member list.
+    """
     # Generate signed URL for avatar if it exists
     avatar_key = item.get('avatar_key')
     avatar_url = generate_avatar_signed_url(avatar_key)
     
     # Compute user permissions if current_user_id is provided
     user_permissions = None
-    if current_user_id and members:
+    if current_user_id and (members or membership_resolved):
         from ..models.guild import GuildUserPermissions
         
         # Find user's role in the guild
-        user_member = next((member for member in members if member.user_id == current_user_id), None)
+        if membership_resolved:
+            user_member = current_member
+        else:
+            user_member = next((member for member in members if member.user_id == current_user_id), None)
         user_role = user_member.role if user_member else None
         
         # Determine permissions
@@ -126,6 +147,84 @@ def build_guild_response(item: Dict[str, Any], members: Optional[List[GuildMembe
         user_permissions=user_permissions
     )
 
+MEMBER_PROJECTION = 'user_id, username, nickname, email, avatar_url, #r, joined_at, last_seen_at, invited_by, is_blocked, blocked_at, blocked_by, can_comment'
+
+def _parse_member_timestamp(value: Any) -> Optional[datetime]:
+    """Parse an ISO timestamp stored on a member item, with or without a Z suffix."""
+    if not value:
+        return None
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.replace('Z', '+00:00') if value.endswith('Z') else value)
+    return value
+
+def build_member_response(item: Dict[str, Any]) -> GuildMemberResponse:
+    """Build a GuildMemberResponse from a MEMBER# item."""
+    return GuildMemberResponse(
+        user_id=item['user_id'],
+        username=item.get('username', item.get('nickname', 'Unknown')),
+        nickname=item.get('nickname'),
+        email=item.get('email'),
+        avatar_url=item.get('avatar_url'),
+        role=item.get('role', 'member'),  # Default to 'member' if missing
+        joined_at=_parse_member_timestamp(item.get('joined_at')) or datetime.utcnow(),
+        last_seen_at=_parse_member_timestamp(item.get('last_seen_at')),
+        invited_by=item.get('invited_by'),
+        is_blocked=item.get('is_blocked', False),
+        blocked_at=_parse_member_timestamp(item.get('blocked_at')),
+        blocked_by=item.get('blocked_by'),
+        can_comment=item.get('can_comment', True)
+    )
+
+def _query_guild_members(guild_id: str) -> List[GuildMemberResponse]:
+    """Load every member of a guild, skipping items that fail to parse."""
+    query_kwargs = {
+        'KeyConditionExpression': Key('PK').eq(f'GUILD#{guild_id}') & Key('SK').begins_with('MEMBER#'),
+        'ProjectionExpression': MEMBER_PROJECTION,
+        'ExpressionAttributeNames': {'#r': 'role'}
+    }
+    members = []
+    while True:
+        members_response = table.query(**query_kwargs)
+        for item in members_response['Items']:
+            try:
+                members.append(build_member_response(item))
+            except Exception as e:
+                logger.error(f"Error parsing member {item.get('user_id', 'unknown')}: {str(e)}", exc_info=True)
+                # Skip this member but continue processing others
+                continue
+        last_evaluated_key = members_response.get('LastEvaluatedKey')
+        if not last_evaluated_key:
+            return members
+        query_kwargs['ExclusiveStartKey'] = last_evaluated_key
+
+def resolve_user_memberships(guild_ids: List[str], user_id: str) -> Dict[str, GuildMemberResponse]:
+    """
+    Fetch one user's MEMBER# rows for many guilds with BatchGetItem.
+    
+    Returns a mapping of guild_id to the user's membership; guilds the user
+    does not belong to are absent. A page of up to 100 guilds costs a single
+    round trip (plus retries of unprocessed keys).
+    """
+    memberships: Dict[str, GuildMemberResponse] = {}
+    unique_ids = list(dict.fromkeys(guild_ids))
+    for start in range(0, len(unique_ids), 100):
+        request_items = {
+            table.name: {
+                'Keys': [{'PK': f'GUILD#{guild_id}', 'SK': f'MEMBER#{user_id}'} for guild_id in unique_ids[start:start + 100]],
+                'ProjectionExpression': 'guild_id, ' + MEMBER_PROJECTION,
+                'ExpressionAttributeNames': {'#r': 'role'}
+            }
+        }
+        while request_items:
+            response = dynamodb.batch_get_item(RequestItems=request_items)
+            for item in response.get('Responses', {}).get(table.name, []):
+                try:
+                    memberships[item['guild_id']] = build_member_response(item)
+                except Exception as e:
+                    logger.error(f"Error parsing membership in guild {item.get('guild_id', 'unknown')}: {str(e)}", exc_info=True)
+            request_items = response.get('UnprocessedKeys') or None
+    return memberships
+
 class GuildDBError(Exception):
     """Base exception for guild database operations."""
     pass
@@ -195,6 +294,7 @@ async def create_guild(
             'settings': settings.dict(),
             'TTL': int((now.timestamp() + (365 * 24 * 60 * 60)))  # 1 year TTL for inactive guilds
         }
+        guild_item.update(directory_attributes(guild_item))
         
         # Create owner member item
         owner_member_item = {
@@ -214,9 +314,7 @@ async def create_guild(
         }
         
         # Use batch write for atomic operation
-        with table.batch_writer() as batch:
-            batch.put_item(Item=guild_item)
-            batch.put_item(Item=owner_member_item)
+        await run_dynamodb(_batch_write, [guild_item, owner_member_item, *build_token_items(guild_item)])
         
         # Return guild response
         return GuildResponse(
@@ -251,7 +349,7 @@ async def get_guild(
     """Get guild details."""
     try:
         # Get guild metadata
-        response = table.get_item(
+        response = await run_dynamodb(table.get_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': 'METADATA'
@@ -266,65 +364,7 @@ async def get_guild(
         # Get members if requested
         members = None
         if include_members:
-            members_response = table.query(
-                KeyConditionExpression=Key('PK').eq(f'GUILD#{guild_id}') & Key('SK').begins_with('MEMBER#'),
-                ProjectionExpression='user_id, username, nickname, email, avatar_url, #r, joined_at, last_seen_at, invited_by, is_blocked, blocked_at, blocked_by, can_comment',
-                ExpressionAttributeNames={'#r': 'role'}
-            )
-            members = []
-            for item in members_response['Items']:
-                try:
-                    # Parse joined_at safely
-                    joined_at_str = item.get('joined_at')
-                    if joined_at_str:
-                        if isinstance(joined_at_str, str):
-                            # Handle ISO format strings, with or without timezone
-                            joined_at = datetime.fromisoformat(joined_at_str.replace('Z', '+00:00') if joined_at_str.endswith('Z') else joined_at_str)
-                        else:
-                            # If it's already a datetime object
-                            joined_at = joined_at_str
-                    else:
-                        # Default to current time if missing
-                        joined_at = datetime.utcnow()
-                    
-                    # Parse last_seen_at safely
-                    last_seen_at = None
-                    last_seen_at_str = item.get('last_seen_at')
-                    if last_seen_at_str:
-                        if isinstance(last_seen_at_str, str):
-                            last_seen_at = datetime.fromisoformat(last_seen_at_str.replace('Z', '+00:00') if last_seen_at_str.endswith('Z') else last_seen_at_str)
-                        else:
-                            last_seen_at = last_seen_at_str
-                    
-                    # Parse blocked_at safely
-                    blocked_at = None
-                    blocked_at_str = item.get('blocked_at')
-                    if blocked_at_str:
-                        if isinstance(blocked_at_str, str):
-                            blocked_at = datetime.fromisoformat(blocked_at_str.replace('Z', '+00:00') if blocked_at_str.endswith('Z') else blocked_at_str)
-                        else:
-                            blocked_at = blocked_at_str
-                    
-                    member = GuildMemberResponse(
-                        user_id=item['user_id'],
-                        username=item.get('username', item.get('nickname', 'Unknown')),
-                        nickname=item.get('nickname'),
-                        email=item.get('email'),
-                        avatar_url=item.get('avatar_url'),
-                        role=item.get('role', 'member'),  # Default to 'member' if missing
-                        joined_at=joined_at,
-                        last_seen_at=last_seen_at,
-                        invited_by=item.get('invited_by'),
-                        is_blocked=item.get('is_blocked', False),
-                        blocked_at=blocked_at,
-                        blocked_by=item.get('blocked_by'),
-                        can_comment=item.get('can_comment', True)
-                    )
-                    members.append(member)
-                except Exception as e:
-                    logger.error(f"Error parsing member {item.get('user_id', 'unknown')}: {str(e)}", exc_info=True)
-                    # Skip this member but continue processing others
-                    continue
+            members = await run_dynamodb(_query_guild_members, guild_id)
         
         # Get goals if requested (placeholder - would need integration with goals service)
         goals = None
@@ -349,7 +389,7 @@ async def update_guild(
     """Update guild details."""
     try:
         # Check if user has permission to update guild
-        member_response = table.get_item(
+        member_response = await run_dynamodb(table.get_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': f'MEMBER#{updated_by}'
@@ -364,7 +404,7 @@ async def update_guild(
             raise GuildPermissionError("Insufficient permissions to update guild")
         
         # Get current guild data for validation
-        current_guild_response = table.get_item(
+        current_guild_response = await run_dynamodb(table.get_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': 'METADATA'
@@ -414,6 +454,16 @@ async def update_guild(
                 else:
                     remove_attributes.append(key)
         
+        # Keep the guild directory index in step with name, tags and type
+        directory_changed = any(kwargs.get(key) is not None for key in ('name', 'tags', 'guild_type'))
+        if directory_changed:
+            updated_guild = dict(current_guild)
+            updated_guild.update({key: value for key, value in kwargs.items() if value is not None})
+            updated_guild['guild_type'] = GuildType(updated_guild['guild_type']).value
+            for key, value in directory_attributes(updated_guild).items():
+                update_expression += f", {key} = :dir_{key}"
+                expression_values[f':dir_{key}'] = value
+        
         # Add REMOVE clause if there are attributes to remove
         if remove_attributes:
             update_expression += f" REMOVE {', '.join(remove_attributes)}"
@@ -433,19 +483,40 @@ async def update_guild(
         if expression_names:
             update_params['ExpressionAttributeNames'] = expression_names
         
-        response = table.update_item(**update_params)
+        response = await run_dynamodb(table.update_item, **update_params)
         updated_item = response['Attributes']
         
+        if directory_changed:
+            await run_dynamodb(_replace_guild_token_items, current_guild, updated_item)
+        
         return build_guild_response(updated_item)
         
     except ClientError as e:
         raise GuildDBError(f"Failed to update guild: {str(e)}")
 
+def _replace_guild_token_items(previous_item: Dict[str, Any], current_item: Dict[str, Any]) -> None:
+    """Rewrite a guild's directory token items after its name, tags or type changed."""
+    new_items = build_token_items(current_item)
+    new_keys = {item['SK'] for item in new_items}
+    stale_keys = set()
+    if previous_item.get('name') and previous_item.get('created_at'):
+        stale_keys = {item['SK'] for item in build_token_items(previous_item)} - new_keys
+    
+    _batch_write(new_items, [{'PK': current_item['PK'], 'SK': sort_key} for sort_key in stale_keys])
+
+def _batch_write(put_items: List[Dict[str, Any]], delete_keys: Optional[List[Dict[str, Any]]] = None) -> None:
+    """Write and delete items through a single batch writer (blocking; offload from async code)."""
+    with table.batch_writer() as batch:
+        for key in delete_keys or []:
+            batch.delete_item(Key=key)
+        for item in put_items:
+            batch.put_item(Item=item)
+
 async def delete_guild(guild_id: str, deleted_by: str) -> None:
     """Delete a guild."""
     try:
         # Check if user has permission to delete guild
-        member_response = table.get_item(
+        member_response = await run_dynamodb(table.get_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': f'MEMBER#{deleted_by}'
@@ -460,19 +531,12 @@ async def delete_guild(guild_id: str, deleted_by: str) -> None:
             raise GuildPermissionError("Only guild owner can delete the guild")
         
         # Get all items for this guild
-        response = table.query(
+        response = await run_dynamodb(table.query,
             KeyConditionExpression=Key('PK').eq(f'GUILD#{guild_id}')
         )
         
         # Delete all items
-        with table.batch_writer() as batch:
-            for item in response['Items']:
-                batch.delete_item(
-                    Key={
-                        'PK': item['PK'],
-                        'SK': item['SK']
-                    }
-                )
+        await run_dynamodb(_batch_write, [], [{'PK': item['PK'], 'SK': item['SK']} for item in response['Items']])
         
     except ClientError as e:
         raise GuildDBError(f"Failed to delete guild: {str(e)}")
@@ -488,7 +552,7 @@ async def check_user_comment_permissions(guild_id: str, user_id: str) -> tuple[b
     """
     try:
         # Get the user's member record
-        response = table.get_item(
+        response = await run_dynamodb(table.get_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': f'MEMBER#{user_id}'
@@ -549,7 +613,8 @@ async def create_guild_comment(
         }
         
         # Put item in DynamoDB
-        table.put_item(Item=comment_item)
+        await run_dynamodb(table.put_item, Item=comment_item)
+        await run_dynamodb(_increment_guild_score_counters, guild_id, at=now, comments=1)
         
         return GuildCommentResponse(
             comment_id=comment_id,
@@ -578,7 +643,7 @@ async def get_guild_comments(guild_id: str, current_user_id: str = None) -> List
         # Check if user is blocked (only if current_user_id is provided and user is a member)
         if current_user_id:
             # First check if user is a member
-            member_response = table.get_item(
+            member_response = await run_dynamodb(table.get_item,
                 Key={
                     'PK': f'GUILD#{guild_id}',
                     'SK': f'MEMBER#{current_user_id}'
@@ -594,7 +659,7 @@ async def get_guild_comments(guild_id: str, current_user_id: str = None) -> List
                     raise GuildPermissionError("You have been blocked from viewing comments in this guild")
         
         # Query comments for the guild
-        response = table.query(
+        response = await run_dynamodb(table.query,
             KeyConditionExpression=Key('PK').eq(f"GUILD#{guild_id}") & Key('SK').begins_with("COMMENT#"),
             ScanIndexForward=False  # Sort by creation time descending (newest first)
         )
@@ -663,7 +728,7 @@ async def update_guild_comment(
         now = datetime.utcnow()
         
         # Update the comment
-        response = table.update_item(
+        response = await run_dynamodb(table.update_item,
             Key={
                 'PK': f"GUILD#{guild_id}",
                 'SK': f"COMMENT#{comment_id}"
@@ -703,7 +768,7 @@ async def update_guild_comment(
 async def delete_guild_comment(guild_id: str, comment_id: str) -> None:
     """Delete a guild comment from DynamoDB."""
     try:
-        table.delete_item(
+        await run_dynamodb(table.delete_item,
             Key={
                 'PK': f"GUILD#{guild_id}",
                 'SK': f"COMMENT#{comment_id}"
@@ -723,7 +788,7 @@ async def like_guild_comment(guild_id: str, comment_id: str, user_id: str) -> di
             raise GuildPermissionError("You have been blocked from interacting with comments in this guild")
         
         # First, check if the comment exists
-        response = table.get_item(
+        response = await run_dynamodb(table.get_item,
             Key={
                 'PK': f"GUILD#{guild_id}",
                 'SK': f"COMMENT#{comment_id}"
@@ -750,7 +815,7 @@ async def like_guild_comment(guild_id: str, comment_id: str, user_id: str) -> di
             is_liked = True
         
         # Update the comment with new like status
-        table.update_item(
+        await run_dynamodb(table.update_item,
             Key={
                 'PK': f"GUILD#{guild_id}",
                 'SK': f"COMMENT#{comment_id}"
@@ -761,6 +826,7 @@ async def like_guild_comment(guild_id: str, comment_id: str, user_id: str) -> di
                 ':liked_users': list(liked_users)
             }
         )
+        await run_dynamodb(_increment_guild_score_counters, guild_id, likes=1 if is_liked else -1)
         
         return {
             'likes': new_likes,
@@ -776,134 +842,152 @@ async def list_guilds(
     tags: Optional[List[str]] = None,
     limit: int = 50,
     offset: int = 0,
-    current_user_id: Optional[str] = None
+    current_user_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_members: bool = False
 ) -> GuildListResponse:
-    """List guilds with optional filtering, search, and pagination."""
+    """
+    List guilds with optional filtering, search, and pagination.
+    
+    Guilds are read newest-first from the guild directory index (GSI6):
+    type partitions when browsing, name-prefix/tag token partitions when
+    searching. Pass the returned ``next_cursor`` back as ``cursor`` to fetch
+    the next page; ``offset`` is still honoured for the first page but reads
+    every skipped entry.
+    
+    Caller permissions come from one BatchGetItem of the caller's own
+    MEMBER# rows. Member lists are left out unless ``include_members`` is
+    set; clients load them per guild from ``/guilds/{guild_id}/members``.
+    """
     try:
         # Validate parameters
         if limit <= 0:
             limit = 50  # Default limit
         if offset < 0:
             offset = 0  # Default offset
-            
-        # Build filter expression
-        filter_expression = Attr('SK').eq('METADATA')
-        
-        # Add search filter
-        if search:
-            search_lower = search.lower()
-            filter_expression = filter_expression & (
-                Attr('#name').contains(search_lower) | 
-                Attr('description').contains(search_lower)
-            )
         
-        # Add guild type filter
-        if guild_type:
-            filter_expression = filter_expression & Attr('guild_type').eq(guild_type)
-        
-        # Add tags filter
-        if tags:
-            for tag in tags:
-                filter_expression = filter_expression & Attr('tags').contains(tag)
-        
-        # Build expression attribute names
-        expr_names = {'#name': 'name'} if search else {}
-        
-        # Calculate pagination - we need to scan enough items to cover offset + limit
-        scan_limit = limit + offset  # We need to scan more to account for offset
-        
-        # Perform scan with pagination
-        all_guilds = []
-        last_evaluated_key = None
-        scanned_count = 0
-        
-        # Only scan if we need to get items
-        if scan_limit > 0:
-            while len(all_guilds) < scan_limit:
-                remaining_needed = scan_limit - len(all_guilds)
-                if remaining_needed <= 0:
-                    break
-                    
-                # DynamoDB requires limit to be at least 1 and at most 100
-                scan_limit_value = min(100, max(1, remaining_needed))
-                
-                scan_kwargs = {
-                    'FilterExpression': filter_expression,
-                    'ExpressionAttributeNames': expr_names,
-                    'Limit': scan_limit_value
-                }
-                
-                if last_evaluated_key:
-                    scan_kwargs['ExclusiveStartKey'] = last_evaluated_key
-                
-                response = table.scan(**scan_kwargs)
-                
-                all_guilds.extend(response['Items'])
-                scanned_count += response.get('ScannedCount', 0)
-                
-                last_evaluated_key = response.get('LastEvaluatedKey')
-                if not last_evaluated_key:
-                    break
+        guild_types = [guild_type] if guild_type else list(DIRECTORY_GUILD_TYPES)
+        tag_filters = sorted({normalize_tag(tag) for tag in tags or [] if normalize_tag(tag)})
+        terms = search_terms(search)
+        
+        # Pick the most selective index partition and filter the rest
+        filter_expression = None
+        if terms:
+            partitions = [f'{SEARCH_PREFIX}{terms[0]}']
+            for term in terms[1:]:
+                filter_expression = _and_filter(filter_expression, Attr('name_lower').contains(term))
+        elif tag_filters:
+            partitions = [f'{TAG_PREFIX}{tag_filters[0]}']
+        else:
+            partitions = [f'{DIRECTORY_PREFIX}{gt}' for gt in guild_types]
+        
+        if not terms:
+            # Search words too short for the token index: match on the name
+            for word in tokenize(search):
+                filter_expression = _and_filter(filter_expression, Attr('name_lower').contains(word))
+        
+        if terms or tag_filters:
+            if guild_type:
+                filter_expression = _and_filter(filter_expression, Attr('guild_type').eq(guild_type))
+            remaining_tags = tag_filters if terms else tag_filters[1:]
+            for tag in remaining_tags:
+                filter_expression = _and_filter(filter_expression, Attr('tag_tokens').contains(tag))
+        
+        fingerprint = query_fingerprint(search=search, guild_type=guild_type, tags=tag_filters)
+        try:
+            state = decode_cursor(cursor, fingerprint) if cursor else None
+        except DirectoryCursorError as e:
+            raise GuildValidationError(str(e))
         
-        # Apply offset and limit
-        paginated_guilds = all_guilds[offset:offset + limit]
+        if state is None and offset:
+            # Legacy offset paging: walk the index past the skipped entries
+            skipped, state = await run_dynamodb(query_directory, table, partitions, offset, None, filter_expression)
+            if state is None or len(skipped) < offset:
+                # Skipped to (or past) the end of the index: nothing left to return
+                state = {}
+        
+        entries, next_state = ([], None) if state == {} else await run_dynamodb(
+            query_directory, table, partitions, limit, state, filter_expression
+        )
+        
+        # Token entries only carry the guild id; fetch METADATA for the page
+        if terms or tag_filters:
+            paginated_guilds = await run_dynamodb(_batch_get_guild_metadata, [entry['guild_id'] for entry in entries])
+        else:
+            paginated_guilds = entries
+        
+        # Resolve the caller's membership for the whole page in one batch
+        memberships = {}
+        if current_user_id and paginated_guilds:
+            try:
+                memberships = await run_dynamodb(
+                    resolve_user_memberships, [item['guild_id'] for item in paginated_guilds], current_user_id
+                )
+            except ClientError as e:
+                # If we can't resolve memberships, continue without permissions
+                logger.warning(f"Failed to resolve guild memberships: {str(e)}")
+                memberships = None
         
         # Build guild responses with user permissions
+        member_lists = [None] * len(paginated_guilds)
+        if include_members:
+            member_lists = await asyncio.gather(*(
+                run_dynamodb(_query_guild_members, item['guild_id']) for item in paginated_guilds
+            ))
         guilds = []
-        for item in paginated_guilds:
-            # Get members if we need to compute permissions
-            members = None
-            if current_user_id:
-                try:
-                    members_response = table.query(
-                        KeyConditionExpression=Key('PK').eq(f'GUILD#{item["guild_id"]}') & Key('SK').begins_with('MEMBER#'),
-                        ProjectionExpression='user_id, username, nickname, email, avatar_url, #r, joined_at, last_seen_at, invited_by, is_blocked, blocked_at, blocked_by, can_comment',
-                        ExpressionAttributeNames={'#r': 'role'}
-                    )
-                    members = [
-                        GuildMemberResponse(
-                            user_id=member_item['user_id'],
-                            username=member_item.get('username', member_item.get('nickname', 'Unknown')),
-                            nickname=member_item.get('nickname'),
-                            email=member_item.get('email'),
-                            avatar_url=member_item.get('avatar_url'),
-                            role=member_item['role'],
-                            joined_at=datetime.fromisoformat(member_item['joined_at']),
-                            last_seen_at=datetime.fromisoformat(member_item['last_seen_at']) if member_item.get('last_seen_at') else None,
-                            invited_by=member_item.get('invited_by'),
-                            is_blocked=member_item.get('is_blocked', False),
-                            blocked_at=datetime.fromisoformat(member_item['blocked_at']) if member_item.get('blocked_at') else None,
-                            blocked_by=member_item.get('blocked_by'),
-                            can_comment=member_item.get('can_comment', True)
-                        )
-                        for member_item in members_response['Items']
-                    ]
-                except Exception:
-                    # If we can't get members, continue without permissions
-                    members = None
-            
-            guild = build_guild_response(item, members=members, current_user_id=current_user_id)
+        for item, members in zip(paginated_guilds, member_lists):
+            guild = build_guild_response(
+                item,
+                members=members,
+                current_user_id=current_user_id,
+                current_member=(memberships or {}).get(item['guild_id']),
+                membership_resolved=memberships is not None and bool(current_user_id)
+            )
             guilds.append(guild)
         
-        # Calculate total count (approximate for performance)
-        total_count = len(all_guilds)
-        has_more = len(all_guilds) > offset + limit
+        next_cursor = encode_cursor(next_state, fingerprint) if next_state else None
         
         return GuildListResponse(
             guilds=guilds,
-            total=total_count,
+            total=offset + len(guilds),
             limit=limit,
             offset=offset,
-            has_more=has_more
+            has_more=next_cursor is not None,
+            next_cursor=next_cursor
         )
         
     except ClientError as e:
         raise GuildDBError(f"Failed to list guilds: {str(e)}")
 
+def _and_filter(expression, condition):
+    """Combine an optional filter expression with another condition."""
+    return condition if expression is None else expression & condition
+
+def _batch_get_guild_metadata(guild_ids: List[str]) -> List[Dict[str, Any]]:
+    """Fetch guild METADATA items with BatchGetItem, preserving the given order."""
+    if not guild_ids:
+        return []
+    
+    unique_ids = list(dict.fromkeys(guild_ids))
+    items_by_id: Dict[str, Dict[str, Any]] = {}
+    for start in range(0, len(unique_ids), 100):
+        request_items = {
+            table.name: {
+                'Keys': [{'PK': f'GUILD#{guild_id}', 'SK': 'METADATA'} for guild_id in unique_ids[start:start + 100]]
+            }
+        }
+        while request_items:
+            response = dynamodb.batch_get_item(RequestItems=request_items)
+            for item in response.get('Responses', {}).get(table.name, []):
+                items_by_id[item['guild_id']] = item
+            request_items = response.get('UnprocessedKeys') or None
+    
+    return [items_by_id[guild_id] for guild_id in unique_ids if guild_id in items_by_id]
+
 async def list_user_guilds(user_id: str) -> GuildListResponse:
     """List guilds for a specific user."""
     try:
-        response = table.query(
+        response = await run_dynamodb(table.query,
             IndexName='GSI3',
             KeyConditionExpression=Key('GSI3PK').eq(f'USER#{user_id}'),
             ProjectionExpression='guild_id'
@@ -945,7 +1029,7 @@ async def join_guild(guild_id: str, user_id: str, username: Optional[str] = None
     """Join a guild."""
     try:
         # Get guild details
-        guild_response = table.get_item(
+        guild_response = await run_dynamodb(table.get_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': 'METADATA'
@@ -959,7 +1043,7 @@ async def join_guild(guild_id: str, user_id: str, username: Optional[str] = None
         guild_type = guild_item['guild_type']
         
         # Check if user is already a member
-        member_response = table.get_item(
+        member_response = await run_dynamodb(table.get_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': f'MEMBER#{user_id}'
@@ -994,8 +1078,8 @@ async def join_guild(guild_id: str, user_id: str, username: Optional[str] = None
         }
         
         # Update member count
-        table.put_item(Item=member_item)
-        table.update_item(
+        await run_dynamodb(table.put_item, Item=member_item)
+        await run_dynamodb(table.update_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': 'METADATA'
@@ -1014,7 +1098,7 @@ async def leave_guild(guild_id: str, user_id: str, username: Optional[str] = Non
     """Leave a guild."""
     try:
         # Check if user is a member
-        member_response = table.get_item(
+        member_response = await run_dynamodb(table.get_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': f'MEMBER#{user_id}'
@@ -1033,7 +1117,7 @@ async def leave_guild(guild_id: str, user_id: str, username: Optional[str] = Non
         member_nickname = nickname or member_response['Item'].get('nickname') or member_username
         
         # Remove member
-        table.delete_item(
+        await run_dynamodb(table.delete_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': f'MEMBER#{user_id}'
@@ -1041,7 +1125,7 @@ async def leave_guild(guild_id: str, user_id: str, username: Optional[str] = Non
         )
         
         # Update member count
-        table.update_item(
+        await run_dynamodb(table.update_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': 'METADATA'
@@ -1060,7 +1144,7 @@ async def remove_user_from_guild(guild_id: str, user_id: str, removed_by: str) -
     """Remove a user from a guild."""
     try:
         # Check if remover has permission
-        remover_response = table.get_item(
+        remover_response = await run_dynamodb(table.get_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': f'MEMBER#{removed_by}'
@@ -1075,7 +1159,7 @@ async def remove_user_from_guild(guild_id: str, user_id: str, removed_by: str) -
             raise GuildPermissionError("Insufficient permissions to remove users")
         
         # Check if target user is a member
-        target_response = table.get_item(
+        target_response = await run_dynamodb(table.get_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': f'MEMBER#{user_id}'
@@ -1093,7 +1177,7 @@ async def remove_user_from_guild(guild_id: str, user_id: str, removed_by: str) -
             raise GuildPermissionError("Moderators cannot remove other moderators")
         
         # Remove member
-        table.delete_item(
+        await run_dynamodb(table.delete_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': f'MEMBER#{user_id}'
@@ -1101,7 +1185,7 @@ async def remove_user_from_guild(guild_id: str, user_id: str, removed_by: str) -
         )
         
         # Update member count
-        table.update_item(
+        await run_dynamodb(table.update_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': 'METADATA'
@@ -1121,7 +1205,7 @@ async def create_join_request(guild_id: str, user_id: str, username: str, messag
     """Create a join request for an approval-required guild."""
     try:
         # Check if guild exists and requires approval
-        guild_response = table.get_item(
+        guild_response = await run_dynamodb(table.get_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': 'METADATA'
@@ -1139,7 +1223,7 @@ async def create_join_request(guild_id: str, user_id: str, username: str, messag
             raise GuildPermissionError("This guild does not require approval to join")
         
         # Check if user already has a pending request
-        existing_request = table.get_item(
+        existing_request = await run_dynamodb(table.get_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': f'JOIN_REQUEST#{user_id}'
@@ -1152,7 +1236,7 @@ async def create_join_request(guild_id: str, user_id: str, username: str, messag
                 raise GuildConflictError("You already have a pending join request for this guild")
         
         # Check if user is already a member
-        member_response = table.get_item(
+        member_response = await run_dynamodb(table.get_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': f'MEMBER#{user_id}'
@@ -1176,7 +1260,7 @@ async def create_join_request(guild_id: str, user_id: str, username: str, messag
             'TTL': int((now.timestamp() + (30 * 24 * 60 * 60)))  # 30 days TTL
         }
 
-        table.put_item(Item=join_request_item)
+        await run_dynamodb(table.put_item, Item=join_request_item)
 
         return GuildJoinRequestResponse(
             guild_id=guild_id,
@@ -1199,7 +1283,7 @@ async def get_guild_join_requests(guild_id: str) -> List[GuildJoinRequestRespons
     """Get all pending join requests for a guild."""
     try:
         # Query for all join requests for this guild
-        response = table.query(
+        response = await run_dynamodb(table.query,
             KeyConditionExpression=Key('PK').eq(f'GUILD#{guild_id}') & Key('SK').begins_with('JOIN_REQUEST#'),
             FilterExpression=Attr('status').eq('pending')
         )
@@ -1250,7 +1334,7 @@ async def update_join_request_status(
             update_expression += ", review_reason = :review_reason"
             expression_values[":review_reason"] = review_reason
         
-        table.update_item(
+        await run_dynamodb(table.update_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': f'JOIN_REQUEST#{user_id}'
@@ -1268,7 +1352,7 @@ async def approve_join_request(guild_id: str, user_id: str, approved_by: str, re
     """Approve a join request and add user to guild."""
     try:
         # First, get the join request to verify it exists and is pending
-        join_request_response = table.get_item(
+        join_request_response = await run_dynamodb(table.get_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': f'JOIN_REQUEST#{user_id}'
@@ -1313,10 +1397,10 @@ async def approve_join_request(guild_id: str, user_id: str, approved_by: str, re
         )
         
         # Add user as member
-        table.put_item(Item=member_item)
+        await run_dynamodb(table.put_item, Item=member_item)
         
         # Update member count
-        table.update_item(
+        await run_dynamodb(table.update_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': 'METADATA'
@@ -1333,7 +1417,7 @@ async def reject_join_request(guild_id: str, user_id: str, rejected_by: str, rea
     """Reject a join request."""
     try:
         # First, get the join request to verify it exists and is pending
-        join_request_response = table.get_item(
+        join_request_response = await run_dynamodb(table.get_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': f'JOIN_REQUEST#{user_id}'
@@ -1371,7 +1455,7 @@ async def perform_moderation_action(
     """Perform a moderation action on a guild."""
     try:
         # Verify guild exists
-        guild_response = table.get_item(
+        guild_response = await run_dynamodb(table.get_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': 'METADATA'
@@ -1383,7 +1467,7 @@ async def perform_moderation_action(
         
         # Verify user has moderation permissions
         # Check if user is owner or moderator
-        member_response = table.get_item(
+        member_response = await run_dynamodb(table.get_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': f'MEMBER#{performed_by}'
@@ -1405,7 +1489,7 @@ async def perform_moderation_action(
                 raise ValueError("target_user_id is required for block_user action")
             
             # Block the user
-            table.update_item(
+            await run_dynamodb(table.update_item,
                 Key={
                     'PK': f'GUILD#{guild_id}',
                     'SK': f'MEMBER#{target_user_id}'
@@ -1424,7 +1508,7 @@ async def perform_moderation_action(
                 raise ValueError("target_user_id is required for unblock_user action")
             
             # Unblock the user
-            table.update_item(
+            await run_dynamodb(table.update_item,
                 Key={
                     'PK': f'GUILD#{guild_id}',
                     'SK': f'MEMBER#{target_user_id}'
@@ -1437,7 +1521,7 @@ async def perform_moderation_action(
                 raise ValueError("target_user_id is required for toggle_comment_permission action")
             
             # Toggle comment permission
-            table.update_item(
+            await run_dynamodb(table.update_item,
                 Key={
                     'PK': f'GUILD#{guild_id}',
                     'SK': f'MEMBER#{target_user_id}'
@@ -1485,7 +1569,7 @@ async def assign_moderator(
     try:
         # Verify guild exists
         logger.info(f"DEBUG: Checking if guild {guild_id} exists")
-        guild_response = table.get_item(
+        guild_response = await run_dynamodb(table.get_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': 'METADATA'
@@ -1500,7 +1584,7 @@ async def assign_moderator(
         
         # Verify the assigner has permission (must be owner)
         logger.info(f"DEBUG: Checking assigner {assigned_by} permissions")
-        assigner_response = table.get_item(
+        assigner_response = await run_dynamodb(table.get_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': f'MEMBER#{assigned_by}'
@@ -1521,7 +1605,7 @@ async def assign_moderator(
         
         # Verify target user is a member of the guild
         logger.info(f"DEBUG: Checking if target user {user_id} is a member of guild {guild_id}")
-        target_member_response = table.get_item(
+        target_member_response = await run_dynamodb(table.get_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': f'MEMBER#{user_id}'
@@ -1543,7 +1627,7 @@ async def assign_moderator(
         
         # Update user's role to moderator
         logger.info(f"DEBUG: Updating user {user_id} role to moderator")
-        table.update_item(
+        await run_dynamodb(table.update_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': f'MEMBER#{user_id}'
@@ -1562,7 +1646,7 @@ async def assign_moderator(
         # Add user to moderators list in guild metadata
         logger.info(f"DEBUG: Adding user {user_id} to moderators list in guild metadata")
         # Add to a String Set; when attribute doesn't exist, DynamoDB will create it
-        table.update_item(
+        await run_dynamodb(table.update_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': 'METADATA'
@@ -1595,7 +1679,7 @@ async def remove_moderator(
     try:
         # Verify guild exists
         logger.info(f"DEBUG: Checking if guild {guild_id} exists")
-        guild_response = table.get_item(
+        guild_response = await run_dynamodb(table.get_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': 'METADATA'
@@ -1610,7 +1694,7 @@ async def remove_moderator(
         
         # Verify the remover has permission (must be owner)
         logger.info(f"DEBUG: Checking remover {removed_by} permissions")
-        remover_response = table.get_item(
+        remover_response = await run_dynamodb(table.get_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': f'MEMBER#{removed_by}'
@@ -1631,7 +1715,7 @@ async def remove_moderator(
         
         # Verify target user is a member of the guild
         logger.info(f"DEBUG: Checking if target user {user_id} is a member of guild {guild_id}")
-        target_member_response = table.get_item(
+        target_member_response = await run_dynamodb(table.get_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': f'MEMBER#{user_id}'
@@ -1653,7 +1737,7 @@ async def remove_moderator(
         
         # Update user's role back to member
         logger.info(f"DEBUG: Updating user {user_id} role back to member")
-        table.update_item(
+        await run_dynamodb(table.update_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': f'MEMBER#{user_id}'
@@ -1670,7 +1754,7 @@ async def remove_moderator(
         # Remove user from moderators list in guild metadata
         logger.info(f"DEBUG: Removing user {user_id} from moderators list in guild metadata")
         # Remove from a String Set; must pass a String Set type
-        table.update_item(
+        await run_dynamodb(table.update_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': 'METADATA'
@@ -1696,7 +1780,7 @@ async def _get_guild_goals_completed_score(guild_id: str, since_date: datetime)
     """Get the number of goals completed by guild members in the last 30 days."""
     try:
         # Get all guild members
-        members_response = table.query(
+        members_response = await run_dynamodb(table.query,
             KeyConditionExpression=Key('PK').eq(f'GUILD#{guild_id}') & Key('SK').begins_with('MEMBER#'),
             ProjectionExpression='user_id'
         )
@@ -1720,7 +1804,7 @@ async def _get_guild_goals_completed_score(guild_id: str, since_date: datetime)
         for user_id in member_user_ids:
             try:
                 # Query for completed goals by this user since the cutoff date
-                response = core_table.query(
+                response = await run_dynamodb(core_table.query,
                     KeyConditionExpression=Key('PK').eq(f'USER#{user_id}') & Key('SK').begins_with('GOAL#'),
                     FilterExpression=Attr('status').eq('completed') & Attr('updatedAt').gte(since_timestamp),
                     ProjectionExpression='id, status, updatedAt'
@@ -1740,139 +1824,227 @@ async def _get_guild_goals_completed_score(guild_id: str, since_date: datetime)
         return 0
 
 
-async def _get_guild_quests_completed_score(guild_id: str, since_date: datetime) -> int:
-    """Get the number of guild quests with status 'completed' (not 'failed') finished since the given date."""
+GUILD_SCORE_WINDOW_DAYS = 30
+GUILD_SCORE_COUNTER_TTL_DAYS = GUILD_SCORE_WINDOW_DAYS + 10
+GUILD_SCORE_COUNTERS = ('quests_completed', 'comments', 'likes')
+
+
+def _increment_guild_score_counters(guild_id: str, at: Optional[datetime] = None, **deltas: int) -> None:
+    """
+    Atomically add to a guild's per-day activity counters.
+    
+    Counters live on ``SCORE#<YYYY-MM-DD>`` items in the guild partition and
+    expire after the scoring window. Failures are logged, never raised, so a
+    counter problem cannot fail the user action that triggered it.
+    """
+    deltas = {name: value for name, value in deltas.items() if value}
+    if not deltas:
+        return
+    day = (at or datetime.utcnow()).date()
+    expires_at = int(datetime(day.year, day.month, day.day).timestamp()) + GUILD_SCORE_COUNTER_TTL_DAYS * 24 * 60 * 60
+    
+    expression_values = {f':{name}': value for name, value in deltas.items()}
+    expression_values[':ttl'] = expires_at
+    expression_values[':day'] = day.isoformat()
     try:
-        # Convert since_date to timestamp for comparison
-        since_timestamp = int(since_date.timestamp() * 1000)
-        
-        # Query for completed quests (status='completed', not 'failed') finished since the cutoff date
-        quests_response = table.query(
-            KeyConditionExpression=Key('PK').eq(f'GUILD#{guild_id}') & Key('SK').begins_with('QUEST#'),
-            FilterExpression=Attr('status').eq('completed') & Attr('finishedAt').gte(since_timestamp)
+        table.update_item(
+            Key={'PK': f'GUILD#{guild_id}', 'SK': f'SCORE#{day.isoformat()}'},
+            UpdateExpression='ADD ' + ', '.join(f'{name} :{name}' for name in deltas) +
+                             ' SET #ttl = if_not_exists(#ttl, :ttl), bucket_date = :day',
+            ExpressionAttributeNames={'#ttl': 'TTL'},
+            ExpressionAttributeValues=expression_values
         )
-        
-        completed_quests_count = len(quests_response.get('Items', []))
-        
-        # Return score: 50 points per completed quest (higher than goals because quests are guild-level achievements)
-        return completed_quests_count * 50
-        
-    except Exception as e:
-        logger.error(f"Failed to get guild quests completed score: {str(e)}")
-        return 0
+    except ClientError as e:
+        logger.warning(f"Failed to update score counters for guild {guild_id}: {str(e)}")
 
 
-async def _get_guild_social_engagement_score(guild_id: str, since_date: datetime) -> int:
-    """Get social engagement score from comments and likes in the last 30 days."""
-    try:
-        # Convert since_date to timestamp for comparison
-        since_timestamp = int(since_date.timestamp() * 1000)
-        
-        # Query for comments created since the cutoff date
-        comments_response = table.query(
-            KeyConditionExpression=Key('PK').eq(f'GUILD#{guild_id}') & Key('SK').begins_with('COMMENT#'),
-            FilterExpression=Attr('createdAt').gte(since_timestamp),
-            ProjectionExpression='id, createdAt, likes'
+def get_guild_activity_counters(guild_id: str, since_date: datetime, until_date: Optional[datetime] = None) -> Dict[str, int]:
+    """Sum a guild's daily activity counters over a date window with one query."""
+    until_date = until_date or datetime.utcnow()
+    response = table.query(
+        KeyConditionExpression=Key('PK').eq(f'GUILD#{guild_id}') & Key('SK').between(
+            f'SCORE#{since_date.date().isoformat()}', f'SCORE#{until_date.date().isoformat()}'
         )
-        
-        comments_count = len(comments_response.get('Items', []))
-        
-        # Count total likes on all comments (including older ones)
-        total_likes = 0
-        for comment in comments_response.get('Items', []):
-            likes = comment.get('likes', 0)
-            if isinstance(likes, int):
-                total_likes += likes
-            elif isinstance(likes, list):
-                total_likes += len(likes)
-        
-        # Return score: 1 point per comment + 1 point per like
-        return comments_count + total_likes
-        
-    except Exception as e:
-        logger.error(f"Failed to get guild social engagement score: {str(e)}")
-        return 0
+    )
+    totals = {name: 0 for name in GUILD_SCORE_COUNTERS}
+    for bucket in response.get('Items', []):
+        for name in GUILD_SCORE_COUNTERS:
+            totals[name] += int(bucket.get(name, 0))
+    return totals
 
 
-async def get_guild_rankings(limit: int = 50) -> List[Dict[str, Any]]:
-    """Get guild rankings based on member count, activity, and goals completed in last 30 days."""
+def _quests_completed_score(counters: Dict[str, int]) -> int:
+    # 50 points per completed quest (higher than goals because quests are guild-level achievements)
+    return counters['quests_completed'] * 50
+
+
+def _social_engagement_score(counters: Dict[str, int]) -> int:
+    # 1 point per comment + 1 point per (net) like
+    return counters['comments'] + max(0, counters['likes'])
+
+
+RANKING_POINTER_KEY = {'PK': 'GUILD_RANKING', 'SK': 'CURRENT'}
+RANKING_SNAPSHOT_TTL_SECONDS = 2 * 24 * 60 * 60  # Keep superseded snapshots long enough for open cursors
+RANKING_POINTER_CACHE_SECONDS = 60
+RANKING_SCORE_CONCURRENCY = 10
+
+_ranking_pointer_cache: Dict[str, Any] = {'item': None, 'expires_at': 0.0}
+
+
+async def _compute_guild_ranking_scores(guild: Dict[str, Any], now: datetime, since_date: datetime) -> Dict[str, Any]:
+    """Compute the ranking score breakdown for one guild METADATA item."""
+    # Calculate activity score based on member count and guild age
+    member_count = int(guild.get('member_count', 0))
+    created_at = datetime.fromisoformat(guild['created_at'].replace('Z', '+00:00'))
+    days_old = (now - created_at.replace(tzinfo=None)).days
+    
+    # Base score from member count
+    activity_score = member_count * 10
+    
+    # Growth bonus for newer guilds
+    growth_bonus = (30 - days_old) * 2 if days_old < 30 else 0
+    
+    goals_completed_score = await _get_guild_goals_completed_score(guild['guild_id'], since_date)
     try:
-        # Get all guilds with their metadata
-        response = table.scan(
-            FilterExpression=Attr('SK').eq('METADATA'),
-            ProjectionExpression='guild_id, #name, member_count, created_at, avatar_key, guild_type',
-            ExpressionAttributeNames={
-                '#name': 'name'
-            }
-        )
-        
-        guilds = response['Items']
-        
-        # Calculate ranking scores based on member count, age, and goals completed
-        now = datetime.utcnow()
-        thirty_days_ago = now - timedelta(days=30)
-        rankings = []
-        
-        for guild in guilds:
-            # Calculate activity score based on member count and guild age
-            member_count = guild.get('member_count', 0)
-            created_at = datetime.fromisoformat(guild['created_at'].replace('Z', '+00:00'))
-            days_old = (now - created_at.replace(tzinfo=None)).days
-            
-            # Base score from member count
-            activity_score = member_count * 10
-            
-            # Growth bonus for newer guilds
-            if days_old < 30:
-                growth_bonus = (30 - days_old) * 2
-            else:
-                growth_bonus = 0
-            
-            # Get goals completed in the last 30 days for this guild
-            goals_completed_score = await _get_guild_goals_completed_score(guild['guild_id'], thirty_days_ago)
-            
-            # Get quests completed (not failed) in the last 30 days for this guild
-            quests_completed_score = await _get_guild_quests_completed_score(guild['guild_id'], thirty_days_ago)
-            
-            # Get social engagement score from comments and likes
-            social_engagement_score = await _get_guild_social_engagement_score(guild['guild_id'], thirty_days_ago)
-            
-            # Total score
-            total_score = activity_score + growth_bonus + goals_completed_score + quests_completed_score + social_engagement_score
-            
-            # Generate signed S3 URL for avatar if it exists
-            avatar_key = guild.get('avatar_key')
-            avatar_url = generate_avatar_signed_url(avatar_key)
-            
-            rankings.append({
-                'guild_id': guild['guild_id'],
-                'name': guild['name'],
-                'avatar_url': avatar_url,
-                'position': 0,  # Will be set after sorting
-                'total_score': total_score,
-                'activity_score': activity_score,
-                'growth_rate': growth_bonus,
-                'goals_completed_score': goals_completed_score,
-                'quests_completed_score': quests_completed_score,
-                'social_engagement_score': social_engagement_score,
-                'member_count': member_count,
-                'badges': [],
-                'trend': 'stable'
-            })
-        
-        # Sort by total score (descending)
-        rankings.sort(key=lambda x: x['total_score'], reverse=True)
+        counters = await run_dynamodb(get_guild_activity_counters, guild['guild_id'], since_date, now)
+    except ClientError as e:
+        logger.error(f"Failed to read activity counters for guild {guild['guild_id']}: {str(e)}")
+        counters = {name: 0 for name in GUILD_SCORE_COUNTERS}
+    quests_completed_score = _quests_completed_score(counters)
+    social_engagement_score = _social_engagement_score(counters)
+    
+    return {
+        'guild_id': guild['guild_id'],
+        'name': guild['name'],
+        'avatar_key': guild.get('avatar_key'),
+        'total_score': activity_score + growth_bonus + goals_completed_score + quests_completed_score + social_engagement_score,
+        'activity_score': activity_score,
+        'growth_rate': growth_bonus,
+        'goals_completed_score': goals_completed_score,
+        'quests_completed_score': quests_completed_score,
+        'social_engagement_score': social_engagement_score,
+        'member_count': member_count,
+        'badges': list(guild.get('badges', [])),
+    }
+
+
+def _iter_directory_guilds(projection: str, names: Dict[str, str]):
+    """Yield every guild METADATA item by walking the directory index partitions."""
+    for guild_type in DIRECTORY_GUILD_TYPES:
+        query_kwargs = {
+            'IndexName': 'GSI6',
+            'KeyConditionExpression': Key('GSI6PK').eq(f'{DIRECTORY_PREFIX}{guild_type}'),
+            'ProjectionExpression': projection,
+            'ExpressionAttributeNames': names
+        }
+        while True:
+            response = table.query(**query_kwargs)
+            yield from response.get('Items', [])
+            last_evaluated_key = response.get('LastEvaluatedKey')
+            if not last_evaluated_key:
+                break
+            query_kwargs['ExclusiveStartKey'] = last_evaluated_key
+
+
+def _ranking_trend(position: int, previous_position: Optional[int]) -> str:
+    if previous_position is None or previous_position == position:
+        return 'stable'
+    return 'up' if position < previous_position else 'down'
+
+
+def _build_ranking_entry(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a rankings API entry from a snapshot item."""
+    return {
+        'guild_id': item['guild_id'],
+        'name': item['name'],
+        'avatar_url': generate_avatar_signed_url(item.get('avatar_key')),
+        'position': int(item['position']),
+        'previous_position': int(item['previous_position']) if item.get('previous_position') is not None else None,
+        'total_score': int(item.get('total_score', 0)),
+        'activity_score': int(item.get('activity_score', 0)),
+        'growth_rate': int(item.get('growth_rate', 0)),
+        'goals_completed_score': int(item.get('goals_completed_score', 0)),
+        'quests_completed_score': int(item.get('quests_completed_score', 0)),
+        'social_engagement_score': int(item.get('social_engagement_score', 0)),
+        'member_count': int(item.get('member_count', 0)),
+        'badges': list(item.get('badges', [])),
+        'trend': item.get('trend', 'stable')
+    }
+
+
+def _get_ranking_pointer() -> Optional[Dict[str, Any]]:
+    """Return the pointer to the current ranking snapshot, cached briefly per container."""
+    now = time.monotonic()
+    if _ranking_pointer_cache['expires_at'] > now:
+        return _ranking_pointer_cache['item']
+    response = table.get_item(Key=RANKING_POINTER_KEY)
+    item = response.get('Item')
+    _ranking_pointer_cache['item'] = item
+    _ranking_pointer_cache['expires_at'] = now + RANKING_POINTER_CACHE_SECONDS
+    return item
+
+
+async def get_guild_rankings_page(limit: int = 50, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Read one page of the materialized guild rankings.
+    
+    Rankings are precomputed by ``calculate_guild_rankings``; a page is a
+    single query on the current snapshot partition. Cursors stay on the
+    snapshot they were issued for, so paging is stable across recalculations.
+    
+    Returns:
+        Dict with ``rankings``, ``next_cursor`` and ``generated_at``
+    """
+    try:
+        if limit <= 0:
+            limit = 50
         
-        # Set positions and limit results
-        for i, ranking in enumerate(rankings[:limit]):
-            ranking['position'] = i + 1
+        if cursor:
+            try:
+                state = decode_cursor(cursor, 'guild_rankings')
+                run_id = state['run_id']
+                start_key = state.get('key')
+            except (DirectoryCursorError, KeyError, TypeError) as e:
+                raise GuildValidationError('Invalid cursor') from e
+            generated_at = state.get('generated_at')
+        else:
+            pointer = await run_dynamodb(_get_ranking_pointer)
+            if not pointer:
+                logger.warning("No guild ranking snapshot available yet")
+                return {'rankings': [], 'next_cursor': None, 'generated_at': None}
+            run_id = pointer['run_id']
+            start_key = None
+            generated_at = pointer.get('generated_at')
+        
+        query_kwargs = {
+            'KeyConditionExpression': Key('PK').eq(f'GUILD_RANKING#{run_id}') & Key('SK').begins_with('POSITION#'),
+            'Limit': limit
+        }
+        if start_key:
+            query_kwargs['ExclusiveStartKey'] = start_key
+        response = await run_dynamodb(table.query, **query_kwargs)
+        
+        rankings = [_build_ranking_entry(item) for item in response.get('Items', [])]
+        last_evaluated_key = response.get('LastEvaluatedKey')
+        next_cursor = None
+        if last_evaluated_key:
+            next_cursor = encode_cursor(
+                {'run_id': run_id, 'key': last_evaluated_key, 'generated_at': generated_at},
+                'guild_rankings'
+            )
         
-        return rankings[:limit]
+        return {'rankings': rankings, 'next_cursor': next_cursor, 'generated_at': generated_at}
         
     except ClientError as e:
         raise GuildDBError(f"Failed to get guild rankings: {str(e)}")
 
 
+async def get_guild_rankings(limit: int = 50) -> List[Dict[str, Any]]:
+    """Get the top guilds from the materialized rankings snapshot."""
+    page = await get_guild_rankings_page(limit=limit)
+    return page['rankings']
+
+
 async def get_guild_analytics(guild_id: str) -> GuildAnalyticsResponse:
     """Return basic analytics for a guild."""
     guild = await get_guild(guild_id)
@@ -1909,7 +2081,7 @@ async def get_guild_analytics(guild_id: str) -> GuildAnalyticsResponse:
         
         try:
             # Query completed goals from gg_core, only those completed after joining
-            response = core_table.query(
+            response = await run_dynamodb(core_table.query,
                 KeyConditionExpression=Key('PK').eq(f'USER#{member.user_id}') & Key('SK').begins_with('GOAL#'),
                 FilterExpression=Attr('status').eq('completed')
             )
@@ -1930,7 +2102,7 @@ async def get_guild_analytics(guild_id: str) -> GuildAnalyticsResponse:
     completed_quests = 0
     try:
         # Count quests with status 'completed' (not 'failed')
-        quests_response = table.query(
+        quests_response = await run_dynamodb(table.query,
             KeyConditionExpression=Key('PK').eq(f'GUILD#{guild_id}') & Key('SK').begins_with('QUEST#'),
             FilterExpression=Attr('status').eq('completed')
         )
@@ -1969,7 +2141,7 @@ async def get_guild_analytics(guild_id: str) -> GuildAnalyticsResponse:
     if total_members > 0:
         # Get actual members if available
         try:
-            members_response = table.query(
+            members_response = await run_dynamodb(table.query,
                 KeyConditionExpression=Key('PK').eq(f'GUILD#{guild_id}') & Key('SK').begins_with('MEMBER#'),
                 ProjectionExpression='user_id, username, nickname, joined_at, last_seen_at',
                 Limit=10
@@ -2035,11 +2207,14 @@ async def get_guild_analytics(guild_id: str) -> GuildAnalyticsResponse:
         memberLeaderboard=leaderboard,
     )
 
-async def update_guild_ranking(guild_id: str) -> None:
-    """Update ranking data for a specific guild."""
+async def update_guild_ranking(guild_id: str) -> Dict[str, Any]:
+    """Recompute and store the ranking scores for a specific guild.
+    
+    Positions are only assigned by ``calculate_guild_rankings``.
+    """
     try:
         # Get guild metadata
-        response = table.get_item(
+        response = await run_dynamodb(table.get_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': 'METADATA'
@@ -2049,53 +2224,110 @@ async def update_guild_ranking(guild_id: str) -> None:
         if 'Item' not in response:
             raise GuildNotFoundError("Guild not found")
         
-        guild = response['Item']
-        
-        # Calculate new ranking data
-        member_count = guild.get('member_count', 0)
-        created_at = datetime.fromisoformat(guild['created_at'].replace('Z', '+00:00'))
         now = datetime.utcnow()
-        days_old = (now - created_at.replace(tzinfo=None)).days
-        
-        # Calculate scores
-        activity_score = member_count * 10
-        if days_old < 30:
-            growth_bonus = (30 - days_old) * 2
-        else:
-            growth_bonus = 0
-        
-        total_score = activity_score + growth_bonus
+        scores = await _compute_guild_ranking_scores(response['Item'], now, now - timedelta(days=GUILD_SCORE_WINDOW_DAYS - 1))
         
         # Update guild with ranking data
-        table.update_item(
+        await run_dynamodb(table.update_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': 'METADATA'
             },
             UpdateExpression='SET total_score = :score, activity_score = :activity, growth_rate = :growth, ranking_updated_at = :updated',
             ExpressionAttributeValues={
-                ':score': total_score,
-                ':activity': activity_score,
-                ':growth': growth_bonus,
+                ':score': scores['total_score'],
+                ':activity': scores['activity_score'],
+                ':growth': scores['growth_rate'],
                 ':updated': now.isoformat()
             }
         )
+        return scores
         
     except ClientError as e:
         raise GuildDBError(f"Failed to update guild ranking: {str(e)}")
 
-async def calculate_guild_rankings() -> None:
-    """Calculate rankings for all guilds."""
+async def calculate_guild_rankings() -> Dict[str, Any]:
+    """
+    Materialize a ranking snapshot for all guilds.
+    
+    Scores every guild (bounded concurrency), writes one item per position
+    under ``GUILD_RANKING#<run_id>``, stores position/score fields on each
+    guild's METADATA item and finally flips the ``GUILD_RANKING/CURRENT``
+    pointer so readers switch to the complete snapshot at once. Run on a
+    schedule via the ``calculate_rankings`` event.
+    """
     try:
-        # Get all guilds
-        response = table.scan(
-            FilterExpression=Attr('SK').eq('METADATA'),
-            ProjectionExpression='guild_id'
-        )
+        now = datetime.utcnow()
+        since_date = now - timedelta(days=GUILD_SCORE_WINDOW_DAYS - 1)
+        guilds = await run_dynamodb(lambda: list(_iter_directory_guilds(
+            'guild_id, #name, member_count, created_at, avatar_key, badges, #pos',
+            {'#name': 'name', '#pos': 'position'}
+        )))
+        
+        semaphore = asyncio.Semaphore(RANKING_SCORE_CONCURRENCY)
+        
+        async def score(guild: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                scores = await _compute_guild_ranking_scores(guild, now, since_date)
+            previous = guild.get('position')
+            scores['previous_position'] = int(previous) if previous is not None else None
+            return scores
+        
+        rankings = await asyncio.gather(*(score(guild) for guild in guilds))
+        rankings.sort(key=lambda r: (-r['total_score'], r['guild_id']))
+        
+        run_id = f"{now.strftime('%Y%m%dT%H%M%S')}-{uuid4().hex[:8]}"
+        expires_at = int(now.timestamp()) + RANKING_SNAPSHOT_TTL_SECONDS
+        
+        snapshot_items = []
+        for position, ranking in enumerate(rankings, start=1):
+            ranking['position'] = position
+            ranking['trend'] = _ranking_trend(position, ranking['previous_position'])
+            snapshot_items.append({
+                'PK': f'GUILD_RANKING#{run_id}',
+                'SK': f'POSITION#{position:06d}',
+                'TTL': expires_at,
+                **{key: value for key, value in ranking.items() if value is not None}
+            })
+        await run_dynamodb(_batch_write, snapshot_items)
+        
+        for ranking in rankings:
+            update_expression = 'SET #pos = :position, total_score = :score, activity_score = :activity, growth_rate = :growth, ranking_updated_at = :updated'
+            expression_values = {
+                ':position': ranking['position'],
+                ':score': ranking['total_score'],
+                ':activity': ranking['activity_score'],
+                ':growth': ranking['growth_rate'],
+                ':updated': now.isoformat()
+            }
+            if ranking['previous_position'] is not None:
+                update_expression += ', previous_position = :previous'
+                expression_values[':previous'] = ranking['previous_position']
+            try:
+                await run_dynamodb(table.update_item,
+                    Key={'PK': f"GUILD#{ranking['guild_id']}", 'SK': 'METADATA'},
+                    UpdateExpression=update_expression,
+                    ConditionExpression='attribute_exists(PK)',
+                    ExpressionAttributeNames={'#pos': 'position'},
+                    ExpressionAttributeValues=expression_values
+                )
+            except ClientError as e:
+                # Guild deleted while the rankings were being calculated
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+        
+        pointer = {
+            **RANKING_POINTER_KEY,
+            'run_id': run_id,
+            'generated_at': now.isoformat(),
+            'guild_count': len(rankings)
+        }
+        await run_dynamodb(table.put_item, Item=pointer)
+        _ranking_pointer_cache['item'] = pointer
+        _ranking_pointer_cache['expires_at'] = time.monotonic() + RANKING_POINTER_CACHE_SECONDS
         
-        # Update rankings for each guild
-        for guild in response['Items']:
-            await update_guild_ranking(guild['guild_id'])
+        logger.info(f"Materialized guild rankings run {run_id} for {len(rankings)} guilds")
+        return {'run_id': run_id, 'generated_at': pointer['generated_at'], 'guild_count': len(rankings)}
         
     except ClientError as e:
         raise GuildDBError(f"Failed to calculate guild rankings: {str(e)}")
@@ -2129,7 +2361,7 @@ async def check_guild_name_availability(name: str) -> bool:
         print(f"DEBUG: FilterExpression dir: {dir(filter_expr)}")
         
         # Try using the expression string directly
-        response = table.scan(
+        response = await run_dynamodb(table.scan,
             FilterExpression='#name = :name',
             ExpressionAttributeNames=expr_names,
             ExpressionAttributeValues=expr_values
@@ -2159,7 +2391,7 @@ async def check_guild_name_availability(name: str) -> bool:
 async def has_pending_join_request(guild_id: str, user_id: str) -> bool:
     """Check if a user has a pending join request for a guild."""
     try:
-        response = table.get_item(
+        response = await run_dynamodb(table.get_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': f'JOIN_REQUEST#{user_id}'
@@ -2304,10 +2536,10 @@ async def create_guild_quest(guild_id: str, payload: GuildQuestCreatePayload, cr
                 quest_item['membersCompletedCount'] = 0
         
         # Store in DynamoDB
-        table.put_item(Item=quest_item)
+        await run_dynamodb(table.put_item, Item=quest_item)
         
         # Increment quest_count in guild metadata
-        table.update_item(
+        await run_dynamodb(table.update_item,
             Key={'PK': f'GUILD#{guild_id}', 'SK': 'METADATA'},
             UpdateExpression='ADD quest_count :inc',
             ExpressionAttributeValues={':inc': 1}
@@ -2333,7 +2565,7 @@ async def create_guild_quest(guild_id: str, payload: GuildQuestCreatePayload, cr
 async def get_guild_quest(guild_id: str, quest_id: str, user_id: Optional[str] = None) -> GuildQuestResponse:
     """Get a specific guild quest with optional user progress."""
     try:
-        response = table.get_item(
+        response = await run_dynamodb(table.get_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': f'QUEST#{quest_id}'
@@ -2384,7 +2616,7 @@ async def list_guild_quests(
         if status:
             query_params['FilterExpression'] = Attr('status').eq(status)
         
-        response = table.query(**query_params)
+        response = await run_dynamodb(table.query, **query_params)
         
         quest_items = response.get('Items', [])[offset:offset + limit]
         
@@ -2399,7 +2631,7 @@ async def list_guild_quests(
             quests.append(_build_guild_quest_response(item, user_completion, user_progress))
         
         # Get total count (separate query for accurate count)
-        count_response = table.query(
+        count_response = await run_dynamodb(table.query,
             KeyConditionExpression=Key('PK').eq(f'GUILD#{guild_id}') & Key('SK').begins_with('QUEST#'),
             Select='COUNT'
         )
@@ -2606,7 +2838,7 @@ async def update_guild_quest(
             'ConditionExpression': 'attribute_exists(PK) AND #status = :currentStatus'
         }
         
-        table.update_item(**update_kwargs)
+        await run_dynamodb(table.update_item, **update_kwargs)
         
         # Refresh quest data
         return await get_guild_quest(guild_id, quest_id, updated_by)
@@ -2642,21 +2874,21 @@ async def delete_guild_quest(guild_id: str, quest_id: str, deleted_by: str, acti
                 raise GuildValidationError("Only draft quests can be deleted")
             
             # Delete quest
-            table.delete_item(
+            await run_dynamodb(table.delete_item,
                 Key={'PK': f'GUILD#{guild_id}', 'SK': f'QUEST#{quest_id}'}
             )
             
             # Delete all completion records
-            completions_response = table.query(
+            completions_response = await run_dynamodb(table.query,
                 KeyConditionExpression=Key('PK').eq(f'GUILD#{guild_id}') & Key('SK').begins_with('MEMBER#')
             )
             for item in completions_response.get('Items', []):
                 sk = item.get('SK', '')
                 if f'QUEST#{quest_id}' in sk and item.get('type') == 'GuildQuestCompletion':
-                    table.delete_item(Key={'PK': item['PK'], 'SK': item['SK']})
+                    await run_dynamodb(table.delete_item, Key={'PK': item['PK'], 'SK': item['SK']})
             
             # Decrement quest_count
-            table.update_item(
+            await run_dynamodb(table.update_item,
                 Key={'PK': f'GUILD#{guild_id}', 'SK': 'METADATA'},
                 UpdateExpression='ADD quest_count :dec',
                 ExpressionAttributeValues={':dec': -1}
@@ -2665,7 +2897,7 @@ async def delete_guild_quest(guild_id: str, quest_id: str, deleted_by: str, acti
         elif action == "archive":
             # Archive active quests
             now_ms = int(datetime.utcnow().timestamp() * 1000)
-            table.update_item(
+            await run_dynamodb(table.update_item,
                 Key={'PK': f'GUILD#{guild_id}', 'SK': f'QUEST#{quest_id}'},
                 UpdateExpression='SET #status = :status, archivedAt = :archivedAt, updatedAt = :updatedAt',
                 ExpressionAttributeNames={'#status': 'status'},
@@ -2743,7 +2975,7 @@ async def activate_guild_quest(
         # Add current status to expression values for condition
         expr_attr_values[':currentStatus'] = 'draft'
         
-        table.update_item(
+        await run_dynamodb(table.update_item,
             Key={'PK': f'GUILD#{guild_id}', 'SK': f'QUEST#{quest_id}'},
             UpdateExpression=update_expr,
             ExpressionAttributeNames=expr_attr_names,
@@ -2874,13 +3106,15 @@ async def finish_guild_quest(
         # Add current status to expression values for condition
         expr_attr_values[':currentStatus'] = 'active'
         
-        table.update_item(
+        await run_dynamodb(table.update_item,
             Key={'PK': f'GUILD#{guild_id}', 'SK': f'QUEST#{quest_id}'},
             UpdateExpression=update_expr,
             ExpressionAttributeNames=expr_attr_names,
             ExpressionAttributeValues=expr_attr_values,
             ConditionExpression='attribute_exists(PK) AND #status = :currentStatus'
         )
+        if goals_reached:
+            await run_dynamodb(_increment_guild_score_counters, guild_id, quests_completed=1)
         
         # Create activity record
         activity_type = "quest_completed" if goals_reached else "quest_failed"
@@ -2980,10 +3214,10 @@ async def complete_guild_quest(
         if payload and payload.linkedTaskIds:
             completion_item['linkedTaskIds'] = payload.linkedTaskIds
         
-        table.put_item(Item=completion_item)
+        await run_dynamodb(table.put_item, Item=completion_item)
         
         # Update quest stats
-        table.update_item(
+        await run_dynamodb(table.update_item,
             Key={'PK': f'GUILD#{guild_id}', 'SK': f'QUEST#{quest_id}'},
             UpdateExpression='ADD totalCompletions :inc, completedByCount :inc SET lastCompletedAt = :lastCompleted',
             ExpressionAttributeValues={
@@ -2994,7 +3228,7 @@ async def complete_guild_quest(
         
         # Update percentual member_completion count if applicable
         if quest.kind == "percentual" and quest.percentualType == "member_completion":
-            table.update_item(
+            await run_dynamodb(table.update_item,
                 Key={'PK': f'GUILD#{guild_id}', 'SK': f'QUEST#{quest_id}'},
                 UpdateExpression='ADD membersCompletedCount :inc',
                 ExpressionAttributeValues={':inc': 1}
@@ -3030,7 +3264,7 @@ async def complete_guild_quest(
             now_ms_finish = int(datetime.utcnow().timestamp() * 1000)
             logger.info(f"DEBUG: complete_guild_quest - Quest objectives reached, auto-completing quest {quest_id}")
             
-            table.update_item(
+            await run_dynamodb(table.update_item,
                 Key={'PK': f'GUILD#{guild_id}', 'SK': f'QUEST#{quest_id}'},
                 UpdateExpression='SET #status = :status, finishedAt = :finishedAt, updatedAt = :updatedAt',
                 ExpressionAttributeNames={'#status': 'status'},
@@ -3042,6 +3276,7 @@ async def complete_guild_quest(
                 },
                 ConditionExpression='attribute_exists(PK) AND #status = :currentStatus'
             )
+            await run_dynamodb(_increment_guild_score_counters, guild_id, quests_completed=1)
             
             # Create activity record for auto-completion
             # Use provided nickname or fallback to member's nickname/username
@@ -3099,7 +3334,7 @@ async def get_guild_quest_completions(
         # Query completions - need to scan for completion records
         # Completion records: SK = MEMBER#{userId}#QUEST#{questId}
         # We need to scan for all members, then filter by quest
-        completions_response = table.query(
+        completions_response = await run_dynamodb(table.query,
             KeyConditionExpression=Key('PK').eq(f'GUILD#{guild_id}') & Key('SK').begins_with('MEMBER#')
         )
         
@@ -3280,7 +3515,7 @@ async def _get_user_quest_completion(
 ) -> Optional[GuildQuestCompletionResponse]:
     """Get user's completion record for a quest."""
     try:
-        response = table.get_item(
+        response = await run_dynamodb(table.get_item,
             Key={
                 'PK': f'GUILD#{guild_id}',
                 'SK': f'MEMBER#{user_id}#QUEST#{quest_id}'
@@ -3421,7 +3656,7 @@ async def _calculate_goal_task_completion_percentage(
             total_count += len(linked_goal_ids)
             for goal_id in linked_goal_ids:
                 try:
-                    response = core_table.get_item(
+                    response = await run_dynamodb(core_table.get_item,
                         Key={
                             'PK': f'USER#{user_id}',
                             'SK': f'GOAL#{goal_id}'
@@ -3489,7 +3724,7 @@ async def _update_quantitative_quest_count(guild_id: str, quest_id: str) -> None
             if quest.countScope == "goals":
                 # Query completed goals
                 try:
-                    response = core_table.query(
+                    response = await run_dynamodb(core_table.query,
                         KeyConditionExpression=Key('PK').eq(f'USER#{member.user_id}') & Key('SK').begins_with('GOAL#'),
                         FilterExpression=Attr('status').eq('completed')
                     )
@@ -3506,7 +3741,7 @@ async def _update_quantitative_quest_count(guild_id: str, quest_id: str) -> None
                 pass
         
         # Update quest count
-        table.update_item(
+        await run_dynamodb(table.update_item,
             Key={'PK': f'GUILD#{guild_id}', 'SK': f'QUEST#{quest_id}'},
             UpdateExpression='SET currentCount = :count',
             ExpressionAttributeValues={':count': total_count}
@@ -3555,7 +3790,7 @@ async def _create_guild_activity(
             'details': details
         }
         
-        table.put_item(Item=activity_item)
+        await run_dynamodb(table.put_item, Item=activity_item)
         
     except Exception as e:
         logger.error(f"Error creating guild activity: {str(e)}", exc_info=True)
@@ -3566,7 +3801,7 @@ async def get_guild_activities(guild_id: str, limit: int = 50) -> List[Dict[str,
     """Get recent guild activities."""
     try:
         # Query activities sorted by timestamp descending
-        response = table.query(
+        response = await run_dynamodb(table.query,
             KeyConditionExpression=Key('PK').eq(f'GUILD#{guild_id}') & Key('SK').begins_with('ACTIVITY#'),
             ScanIndexForward=False,  # Descending order
             Limit=limit
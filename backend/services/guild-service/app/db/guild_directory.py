@@ -0,0 +1,242 @@
+"""
+Guild directory index helpers for the guild service.
+
+Guild discovery is served from a sparse global secondary index (GSI6)
+instead of table scans. Two kinds of items populate it:
+
+- Guild METADATA items, partitioned by guild type
+  (``GSI6PK = GUILD_DIRECTORY#<type>``) and ordered by creation time.
+- Token items stored under the guild partition (``SK = SEARCH#<token>`` and
+  ``SK = TAG#<tag>``) that index lowercase name prefixes and tags
+  (``GSI6PK = GUILD_SEARCH#<token>`` / ``GUILD_TAG#<tag>``).
+
+Every partition is read newest-first with ``Limit`` sized to the page, and
+pagination uses opaque cursors holding the ``ExclusiveStartKey`` of each
+partition, so the cost of a page does not depend on its depth or on the
+total number of guilds.
+"""
+
+import base64
+import hashlib
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from boto3.dynamodb.conditions import Key
+
+DIRECTORY_INDEX = 'GSI6'
+DIRECTORY_PREFIX = 'GUILD_DIRECTORY#'
+SEARCH_PREFIX = 'GUILD_SEARCH#'
+TAG_PREFIX = 'GUILD_TAG#'
+SEARCH_SK_PREFIX = 'SEARCH#'
+TAG_SK_PREFIX = 'TAG#'
+
+DIRECTORY_GUILD_TYPES = ('public', 'approval', 'private')
+
+MIN_PREFIX_LENGTH = 2
+MAX_PREFIX_LENGTH = 20
+
+# Upper bound on index reads per partition for a single page. Filtered
+# partitions may return sparse pages; this keeps the worst case bounded.
+MAX_QUERY_ROUNDS = 10
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+_INDEX_KEY_ATTRIBUTES = ('PK', 'SK', 'GSI6PK', 'GSI6SK')
+
+
+class DirectoryCursorError(ValueError):
+    """Raised when a directory cursor cannot be decoded or does not match the query."""
+    pass
+
+
+def normalize_tag(tag: str) -> str:
+    """Normalize a tag for indexing and lookup."""
+    return tag.strip().lower()
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase alphanumeric words."""
+    if not text:
+        return []
+    return _WORD_RE.findall(text.lower())
+
+
+def name_prefix_tokens(name: str, tags: Optional[Iterable[str]] = None) -> List[str]:
+    """Return the search tokens for a guild: name word prefixes plus normalized tags."""
+    tokens = set()
+    for word in tokenize(name):
+        word = word[:MAX_PREFIX_LENGTH]
+        for length in range(MIN_PREFIX_LENGTH, len(word) + 1):
+            tokens.add(word[:length])
+    for tag in tags or []:
+        normalized = normalize_tag(tag)
+        if normalized:
+            tokens.add(normalized[:MAX_PREFIX_LENGTH])
+    return sorted(tokens)
+
+
+def search_terms(search: Optional[str]) -> List[str]:
+    """Return usable search terms, longest (most selective) first."""
+    terms = [word[:MAX_PREFIX_LENGTH] for word in tokenize(search) if len(word) >= MIN_PREFIX_LENGTH]
+    return sorted(set(terms), key=lambda term: (-len(term), term))
+
+
+def directory_sort_key(created_at: str, guild_id: str) -> str:
+    """Sort key ordering directory entries by creation time."""
+    return f'{created_at}#{guild_id}'
+
+
+def directory_attributes(guild_item: Dict[str, Any]) -> Dict[str, Any]:
+    """Directory index attributes to store on a guild METADATA item."""
+    return {
+        'GSI6PK': f"{DIRECTORY_PREFIX}{guild_item['guild_type']}",
+        'GSI6SK': directory_sort_key(guild_item['created_at'], guild_item['guild_id']),
+        'name_lower': guild_item['name'].lower(),
+        'tag_tokens': sorted({normalize_tag(tag) for tag in guild_item.get('tags') or [] if normalize_tag(tag)}),
+    }
+
+
+def build_token_items(guild_item: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Build the search and tag token items for a guild METADATA item."""
+    guild_id = guild_item['guild_id']
+    sort_key = directory_sort_key(guild_item['created_at'], guild_id)
+    tag_tokens = sorted({normalize_tag(tag) for tag in guild_item.get('tags') or [] if normalize_tag(tag)})
+    common = {
+        'guild_id': guild_id,
+        'guild_type': guild_item['guild_type'],
+        'name_lower': guild_item['name'].lower(),
+        'tag_tokens': tag_tokens,
+        'GSI6SK': sort_key,
+    }
+    if guild_item.get('TTL'):
+        common['TTL'] = guild_item['TTL']
+
+    items = []
+    for token in name_prefix_tokens(guild_item['name'], tag_tokens):
+        items.append({
+            'PK': f'GUILD#{guild_id}',
+            'SK': f'{SEARCH_SK_PREFIX}{token}',
+            'GSI6PK': f'{SEARCH_PREFIX}{token}',
+            **common,
+        })
+    for tag in tag_tokens:
+        items.append({
+            'PK': f'GUILD#{guild_id}',
+            'SK': f'{TAG_SK_PREFIX}{tag}',
+            'GSI6PK': f'{TAG_PREFIX}{tag}',
+            **common,
+        })
+    return items
+
+
+def query_fingerprint(**params: Any) -> str:
+    """Short digest of the query parameters a cursor was issued for."""
+    payload = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def encode_cursor(state: Dict[str, Optional[Dict[str, Any]]], fingerprint: str) -> str:
+    """Encode per-partition positions into an opaque cursor string."""
+    payload = json.dumps({'f': fingerprint, 'p': state}, separators=(',', ':'), sort_keys=True)
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, fingerprint: str) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Decode a cursor produced by ``encode_cursor`` for the same query."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+        state = payload['p']
+        cursor_fingerprint = payload['f']
+    except (ValueError, KeyError, TypeError) as e:
+        raise DirectoryCursorError('Invalid cursor') from e
+    if cursor_fingerprint != fingerprint or not isinstance(state, dict):
+        raise DirectoryCursorError('Cursor does not match the requested filters')
+    return state
+
+
+def _index_key(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {name: item[name] for name in _INDEX_KEY_ATTRIBUTES}
+
+
+def query_directory(
+    table,
+    partitions: List[str],
+    limit: int,
+    state: Optional[Dict[str, Optional[Dict[str, Any]]]] = None,
+    filter_expression=None,
+) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Optional[Dict[str, Any]]]]]:
+    """
+    Read one page of directory entries, newest first, across index partitions.
+
+    Each partition is queried from its stored position and results are merged
+    by ``GSI6SK``. ``state`` maps a partition key to the index key of the last
+    entry consumed from it (``None`` for "from the start"); partitions missing
+    from a non-empty state are exhausted.
+
+    Returns:
+        (items, next_state) where next_state is None when every partition is
+        exhausted.
+    """
+    if state is None:
+        state = {partition: None for partition in partitions}
+
+    buffers: Dict[str, List[Dict[str, Any]]] = {}
+    next_keys: Dict[str, Optional[Dict[str, Any]]] = {}
+    exhausted: Dict[str, bool] = {}
+    rounds: Dict[str, int] = {}
+    for partition in partitions:
+        if partition not in state:
+            continue
+        buffers[partition] = []
+        next_keys[partition] = state[partition]
+        exhausted[partition] = False
+        rounds[partition] = 0
+
+    def fill(partition: str) -> None:
+        while not buffers[partition] and not exhausted[partition]:
+            if rounds[partition] >= MAX_QUERY_ROUNDS:
+                return
+            rounds[partition] += 1
+            query_kwargs = {
+                'IndexName': DIRECTORY_INDEX,
+                'KeyConditionExpression': Key('GSI6PK').eq(partition),
+                'ScanIndexForward': False,
+                'Limit': limit + 1,
+            }
+            if filter_expression is not None:
+                query_kwargs['FilterExpression'] = filter_expression
+            if next_keys[partition]:
+                query_kwargs['ExclusiveStartKey'] = next_keys[partition]
+            response = table.query(**query_kwargs)
+            buffers[partition].extend(response.get('Items', []))
+            next_keys[partition] = response.get('LastEvaluatedKey')
+            if not next_keys[partition]:
+                exhausted[partition] = True
+
+    positions = {partition: state[partition] for partition in buffers}
+    page: List[Dict[str, Any]] = []
+    stalled = False
+    while len(page) < limit:
+        for partition in buffers:
+            fill(partition)
+        # A partition that still has unread entries but no buffered match hit
+        # the round budget; stop here so ordering stays correct.
+        if any(not buffers[p] and not exhausted[p] for p in buffers):
+            stalled = True
+        candidates = [p for p in buffers if buffers[p]]
+        if not candidates or stalled:
+            break
+        partition = max(candidates, key=lambda p: buffers[p][0]['GSI6SK'])
+        item = buffers[partition].pop(0)
+        positions[partition] = _index_key(item)
+        page.append(item)
+
+    next_state = {}
+    for partition in buffers:
+        if buffers[partition] or not exhausted[partition]:
+            next_state[partition] = positions[partition]
+            if not buffers[partition] and next_keys[partition]:
+                # Nothing buffered was skipped; resume after the last read key.
+                next_state[partition] = next_keys[partition]
+    return page, (next_state or None)
@@ -28,7 +28,7 @@ from .models import (
 from .db.guild_db import (
     create_guild, get_guild, update_guild, delete_guild, list_user_guilds,
     list_guilds, join_guild, leave_guild, remove_user_from_guild,
-    get_guild_rankings, update_guild_ranking, calculate_guild_rankings,
+    get_guild_rankings, get_guild_rankings_page, update_guild_ranking, calculate_guild_rankings,
     check_guild_name_availability, create_guild_comment, get_guild_comments,
     update_guild_comment, delete_guild_comment, like_guild_comment,
     create_join_request, get_guild_join_requests, approve_join_request, reject_join_request,
@@ -46,7 +46,9 @@ from .api.comments import router as comments_router
 from .api.members import router as members_router
 from .api.moderation import router as moderation_router
 from .api.guild import router as guild_router
+from .utils.messaging import notify_membership_revoked
 from common.logging import log_event
+from common.rate_limit import install_rate_limit_headers
 # TODO: Implement these modules
 # from .db.guild_member_db import (
 #     get_guild_members, add_guild_member, remove_guild_member, update_member_role,
@@ -516,6 +518,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# X-RateLimit-* headers for the per-endpoint limits in security.rate_limiter
+install_rate_limit_headers(app)
+
 # Include routers
 app.include_router(guild_router)
 app.include_router(avatar_router)
@@ -647,14 +652,16 @@ async def create_guild_endpoint(
 # Guild rankings - must be before /guilds/{guild_id} route
 @app.get("/guilds/rankings")
 async def get_guild_rankings_endpoint(
-    limit: int = 50,
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
     auth: AuthContext = Depends(authenticate)
 ):
-    """Get guild rankings."""
+    """Get guild rankings from the latest materialized snapshot."""
     try:
-        rankings = await get_guild_rankings(limit=limit)
-        return {"rankings": rankings}
+        return await get_guild_rankings_page(limit=limit, cursor=cursor)
         
+    except GuildValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except GuildDBError as e:
         logger.error("Database error getting guild rankings", extra={"error": str(e)})
         raise HTTPException(status_code=500, detail="Failed to get guild rankings")
@@ -906,6 +913,7 @@ async def remove_user_from_guild_endpoint(
                 details={"removed_user_id": user_id}
             )
         
+        await notify_membership_revoked(guild_id, user_id)
         return {"message": "User removed from guild successfully"}
         
     except GuildNotFoundError:
@@ -927,6 +935,7 @@ async def list_guilds_endpoint(
     tags: Optional[str] = Query(None, description="Filter by tags (comma-separated)"),
     limit: int = Query(50, ge=1, le=100, description="Number of guilds to return"),
     offset: int = Query(0, ge=0, description="Number of guilds to skip"),
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
     auth: AuthContext = Depends(authenticate)
 ):
     """List guilds with optional filtering, search, and pagination."""
@@ -940,11 +949,14 @@ async def list_guilds_endpoint(
             tags=tag_list,
             limit=limit,
             offset=offset,
-            current_user_id=auth.user_id
+            current_user_id=auth.user_id,
+            cursor=cursor
         )
         
         return guilds
         
+    except GuildValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except GuildDBError as e:
         logger.error("Database error listing guilds", extra={"error": str(e)})
         raise HTTPException(status_code=500, detail="Failed to list guilds")
@@ -981,8 +993,8 @@ async def calculate_guild_rankings_endpoint(
 ):
     """Calculate guild rankings (admin only)."""
     try:
-        await calculate_guild_rankings()
-        return {"message": "Guild rankings calculated successfully"}
+        summary = await calculate_guild_rankings()
+        return {"message": "Guild rankings calculated successfully", **summary}
         
     except GuildDBError as e:
         logger.error("Database error calculating guild rankings", extra={"error": str(e)})
@@ -991,6 +1003,32 @@ async def calculate_guild_rankings_endpoint(
         logger.error("Unexpected error calculating guild rankings", extra={"error": str(e)}, exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error")
 
+# Scheduled events (EventBridge payloads forwarded by the Lambda Web Adapter pass-through path)
+def _is_pass_through_event(request: Request) -> bool:
+    """
+    True when the Lambda Web Adapter forwarded a non-HTTP invocation. The
+    adapter adds x-amzn-lambda-context to every request it forwards, and
+    x-amzn-request-context only to API Gateway, function URL and ALB
+    requests, so HTTP callers can't reach the scheduled jobs.
+    """
+    headers = request.headers
+    return "x-amzn-lambda-context" in headers and "x-amzn-request-context" not in headers
+
+@app.post("/events")
+async def scheduled_event_endpoint(request: Request):
+    """Run scheduled jobs such as the hourly guild ranking materialization."""
+    if not _is_pass_through_event(request):
+        raise HTTPException(status_code=403, detail="Forbidden")
+    event = await request.json()
+    action = event.get("action") if isinstance(event, dict) else None
+    if action != "calculate_rankings":
+        raise HTTPException(status_code=400, detail="Unsupported event")
+    try:
+        return await calculate_guild_rankings()
+    except GuildDBError as e:
+        logger.error("Database error materializing guild rankings", extra={"error": str(e)})
+        raise HTTPException(status_code=500, detail="Failed to calculate guild rankings")
+
 ## Avatar routes handled by avatar_router (streaming from S3). Removed duplicates here to avoid conflicts.
 
 # Join request operations
@@ -1330,6 +1368,7 @@ async def block_user_endpoint(
             blocked_by=auth.user_id
         )
         
+        await notify_membership_revoked(guild_id, user_id)
         return {"message": "User blocked successfully"}
         
     except GuildNotFoundError:
@@ -101,6 +101,7 @@ class GuildListResponse(BaseModel):
     limit: int = Field(..., description="Limit applied")
     offset: int = Field(..., description="Offset applied")
     has_more: bool = Field(..., description="Whether there are more results")
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page")
 
 class GuildNameCheckRequest(BaseModel):
     name: str = Field(..., min_length=1, max_length=100, description="Guild name to check")
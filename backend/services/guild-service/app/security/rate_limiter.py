@@ -1,29 +1,43 @@
 """
 Rate limiting utilities for the guild service.
 
-This module provides rate limiting functionality for API endpoints.
-Currently implements a no-op rate limiter for development purposes.
+This module provides rate limiting functionality for API endpoints. Each
+decorated endpoint gets its own GCRA limiter from ``common.rate_limit``,
+keyed by the authenticated user, so limits hold across Lambda instances when
+``RATE_LIMIT_TABLE`` is configured.
 """
 
 from functools import wraps
 from typing import Callable, Any
 
+from common.rate_limit import RateLimit, RateLimiter
+
 
 def rate_limit(requests_per_hour: int = 100) -> Callable:
     """
     Rate limiting decorator for API endpoints.
-    
+
     Args:
         requests_per_hour: Maximum number of requests per hour
-        
+
     Returns:
         Callable: Decorated function with rate limiting applied
+
+    Raises:
+        HTTPException: 429 with ``Retry-After`` when the caller is over the limit
     """
     def decorator(func: Callable) -> Callable:
+        limiter = RateLimiter(
+            f"guild:{func.__name__}", RateLimit(limit=requests_per_hour, period_seconds=3600)
+        )
+
         @wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
-            # TODO: Implement actual rate limiting logic
-            # For now, this is a no-op decorator
+            auth = kwargs.get("auth")
+            identifier = getattr(auth, "user_id", None) or "anonymous"
+            await limiter.enforce(identifier, detail="Rate limit exceeded")
             return await func(*args, **kwargs)
+
+        wrapper.limiter = limiter
         return wrapper
     return decorator
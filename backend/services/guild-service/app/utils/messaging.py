@@ -0,0 +1,79 @@
+"""
+Messaging service notifications (Guild Service)
+
+When a member is removed from or blocked in a guild, the messaging service
+still holds their WebSocket connections and a cached membership verdict for
+the guild room. Calling its revoke endpoint makes it re-check the member and
+drop both right away instead of waiting for the cache TTL.
+
+The endpoint sits behind API Gateway (``MESSAGING_SERVICE_URL`` is the stage
+URL, ``MESSAGING_API_KEY`` its API key) and only accepts service tokens: a
+short-lived HS256 JWT signed with the shared user-service JWT secret.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import urllib.error
+import urllib.request
+from functools import lru_cache
+from urllib.parse import quote
+
+import jwt
+
+from ..settings import Settings
+
+logger = logging.getLogger(__name__)
+
+REVOKE_TIMEOUT_SECONDS = 2.0
+SERVICE_TOKEN_TTL_SECONDS = 60
+
+
+@lru_cache(maxsize=1)
+def _jwt_secret() -> str:
+    return os.getenv("JWT_SECRET") or Settings().jwt_secret or ""
+
+
+def service_token() -> str:
+    """Token identifying guild-service to the messaging service."""
+    now = int(time.time())
+    claims = {"sub": "guild-service", "token_use": "service", "iat": now, "exp": now + SERVICE_TOKEN_TTL_SECONDS}
+    return jwt.encode(claims, _jwt_secret(), algorithm="HS256")
+
+
+def _post(url: str, headers: dict) -> int:
+    request = urllib.request.Request(url, data=b"", method="POST", headers=headers)
+    with urllib.request.urlopen(request, timeout=REVOKE_TIMEOUT_SECONDS) as response:
+        return response.status
+
+
+async def notify_membership_revoked(guild_id: str, user_id: str) -> bool:
+    """
+    Ask the messaging service to revoke a guild member's room access.
+
+    Best effort: the membership change is already stored, so failures are
+    logged and never raised.
+
+    Returns:
+        bool: True if the messaging service accepted the request
+    """
+    base_url = os.getenv("MESSAGING_SERVICE_URL", "").rstrip("/")
+    if not base_url:
+        logger.warning("MESSAGING_SERVICE_URL is not set; revoked guild members keep chat access until the cache TTL")
+        return False
+
+    url = f"{base_url}/messaging/guilds/{quote(guild_id, safe='')}/members/{quote(user_id, safe='')}/revoke"
+    try:
+        headers = {
+            "Authorization": f"Bearer {await asyncio.to_thread(service_token)}",
+            "x-api-key": os.getenv("MESSAGING_API_KEY", ""),
+        }
+        await asyncio.to_thread(_post, url, headers)
+        return True
+    except (urllib.error.URLError, OSError, ValueError, jwt.PyJWTError) as e:
+        logger.warning(
+            "Failed to notify messaging service of revoked guild member",
+            extra={"guild_id": guild_id, "user_id": user_id, "error": str(e)},
+        )
+        return False
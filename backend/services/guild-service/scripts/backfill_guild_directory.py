@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Backfill the Guild Directory Index
+
+Guilds created before the directory index (GSI6) existed have no directory
+attributes or token items, so they do not appear in guild discovery. This
+script scans guild METADATA items once and writes the missing attributes and
+name/tag token items. It is safe to re-run.
+
+Usage:
+    python backfill_guild_directory.py [--table-name gg_guild] [--region us-east-2] [--dry-run]
+"""
+
+import argparse
+import os
+import sys
+
+import boto3
+from boto3.dynamodb.conditions import Attr
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.guild_directory import build_token_items, directory_attributes  # noqa: E402
+
+
+def backfill(table_name: str, region: str, dry_run: bool = False) -> int:
+    """
+    Write directory attributes and token items for every guild.
+
+    Returns:
+        Number of guilds processed
+    """
+    dynamodb = boto3.resource("dynamodb", region_name=region)
+    table = dynamodb.Table(table_name)
+
+    processed = 0
+    scan_kwargs = {"FilterExpression": Attr("SK").eq("METADATA")}
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response.get("Items", []):
+            if not item.get("guild_id") or not item.get("name") or not item.get("created_at"):
+                continue
+            attributes = directory_attributes(item)
+            token_items = build_token_items(item)
+            processed += 1
+            if dry_run:
+                print(f"{item['guild_id']}: {len(token_items)} token items")
+                continue
+
+            table.update_item(
+                Key={"PK": item["PK"], "SK": item["SK"]},
+                UpdateExpression="SET " + ", ".join(f"{key} = :{key}" for key in attributes),
+                ExpressionAttributeValues={f":{key}": value for key, value in attributes.items()},
+            )
+            with table.batch_writer() as batch:
+                for token_item in token_items:
+                    batch.put_item(Item=token_item)
+
+        last_evaluated_key = response.get("LastEvaluatedKey")
+        if not last_evaluated_key:
+            break
+        scan_kwargs["ExclusiveStartKey"] = last_evaluated_key
+
+    return processed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill the guild directory index")
+    parser.add_argument("--table-name", default=os.getenv("GUILD_TABLE_NAME", "gg_guild"))
+    parser.add_argument("--region", default=os.getenv("AWS_REGION", "us-east-2"))
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be written")
+    args = parser.parse_args()
+
+    count = backfill(args.table_name, args.region, args.dry_run)
+    print(f"Processed {count} guilds")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Backfill Guild Score Counters
+
+Guild ranking scores are read from per-day ``SCORE#<YYYY-MM-DD>`` counter
+items that are incremented as quests complete, comments are posted and likes
+are recorded. This script rebuilds those counters for the current scoring
+window from existing quest and comment items. Counters are overwritten (not
+added to), so it is safe to re-run.
+
+Usage:
+    python backfill_guild_score_counters.py [--table-name gg_guild] [--region us-east-2] [--dry-run]
+"""
+
+import argparse
+import os
+import sys
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import boto3
+from boto3.dynamodb.conditions import Attr
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.guild_db import GUILD_SCORE_COUNTER_TTL_DAYS, GUILD_SCORE_WINDOW_DAYS  # noqa: E402
+
+
+def collect_counters(table, since: datetime):
+    """Scan quest and comment items and bucket them per guild and day."""
+    counters = defaultdict(lambda: defaultdict(int))
+    since_ms = int(since.timestamp() * 1000)
+    scan_kwargs = {
+        "FilterExpression": Attr("SK").begins_with("QUEST#") | Attr("SK").begins_with("COMMENT#"),
+    }
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response.get("Items", []):
+            guild_id = item["PK"].split("#", 1)[1]
+            if item["SK"].startswith("QUEST#"):
+                finished_at = int(item.get("finishedAt") or 0)
+                if item.get("status") == "completed" and finished_at >= since_ms:
+                    day = datetime.utcfromtimestamp(finished_at / 1000).date().isoformat()
+                    counters[(guild_id, day)]["quests_completed"] += 1
+            elif item.get("created_at"):
+                created_at = datetime.fromisoformat(item["created_at"].replace("Z", "+00:00")).replace(tzinfo=None)
+                if created_at >= since:
+                    day = created_at.date().isoformat()
+                    counters[(guild_id, day)]["comments"] += 1
+                    counters[(guild_id, day)]["likes"] += int(item.get("likes", 0))
+
+        last_evaluated_key = response.get("LastEvaluatedKey")
+        if not last_evaluated_key:
+            return counters
+        scan_kwargs["ExclusiveStartKey"] = last_evaluated_key
+
+
+def backfill(table_name: str, region: str, dry_run: bool = False) -> int:
+    """Write score counter items for the scoring window. Returns the number of buckets."""
+    dynamodb = boto3.resource("dynamodb", region_name=region)
+    table = dynamodb.Table(table_name)
+    since = datetime.combine(datetime.utcnow().date() - timedelta(days=GUILD_SCORE_WINDOW_DAYS - 1), datetime.min.time())
+
+    counters = collect_counters(table, since)
+    for (guild_id, day), values in sorted(counters.items()):
+        if dry_run:
+            print(f"{guild_id} {day}: {dict(values)}")
+            continue
+        expires_at = int(datetime.fromisoformat(day).timestamp()) + GUILD_SCORE_COUNTER_TTL_DAYS * 24 * 60 * 60
+        table.put_item(Item={
+            "PK": f"GUILD#{guild_id}",
+            "SK": f"SCORE#{day}",
+            "bucket_date": day,
+            "quests_completed": values["quests_completed"],
+            "comments": values["comments"],
+            "likes": values["likes"],
+            "TTL": expires_at,
+        })
+    return len(counters)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill guild score counters")
+    parser.add_argument("--table-name", default=os.getenv("GUILD_TABLE_NAME", "gg_guild"))
+    parser.add_argument("--region", default=os.getenv("AWS_REGION", "us-east-2"))
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be written")
+    args = parser.parse_args()
+
+    count = backfill(args.table_name, args.region, args.dry_run)
+    print(f"Wrote {count} counter buckets")
+
+
+if __name__ == "__main__":
+    main()
@@ -119,3 +119,49 @@ def minimal_mocks_session() -> None:
     except Exception:
         pass
 
+
+
+@pytest.fixture
+def guild_table():
+    """Moto-backed gg_guild table (with the GSI6 directory index) wired into guild_db."""
+    import boto3
+    from moto import mock_aws
+    from unittest.mock import patch
+    from app.db import guild_db
+
+    with mock_aws():
+        dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+        table = dynamodb.create_table(
+            TableName='gg_guild',
+            KeySchema=[
+                {'AttributeName': 'PK', 'KeyType': 'HASH'},
+                {'AttributeName': 'SK', 'KeyType': 'RANGE'}
+            ],
+            AttributeDefinitions=[
+                {'AttributeName': 'PK', 'AttributeType': 'S'},
+                {'AttributeName': 'SK', 'AttributeType': 'S'},
+                {'AttributeName': 'GSI6PK', 'AttributeType': 'S'},
+                {'AttributeName': 'GSI6SK', 'AttributeType': 'S'}
+            ],
+            GlobalSecondaryIndexes=[
+                {
+                    'IndexName': 'GSI6',
+                    'KeySchema': [
+                        {'AttributeName': 'GSI6PK', 'KeyType': 'HASH'},
+                        {'AttributeName': 'GSI6SK', 'KeyType': 'RANGE'}
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'}
+                }
+            ],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        with patch.object(guild_db, 'table', table), patch.object(guild_db, 'dynamodb', dynamodb):
+            yield table
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits() -> None:
+    """Every test authenticates as the same user, so start each one with full rate limits."""
+    from common.rate_limit import default_backend
+
+    default_backend().reset()
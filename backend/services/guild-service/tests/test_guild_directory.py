@@ -0,0 +1,238 @@
+"""
+Tests for guild discovery through the guild directory index (GSI6).
+
+Uses the moto-backed ``guild_table`` fixture from conftest.
+"""
+
+import os
+import sys
+
+import pytest
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db import guild_db
+from app.db.guild_db import create_guild, list_guilds, update_guild, GuildValidationError
+from app.db.guild_directory import name_prefix_tokens, search_terms, encode_cursor, decode_cursor, DirectoryCursorError
+from app.models.guild import GuildType
+
+
+async def _create(name, guild_type=GuildType.PUBLIC, tags=None):
+    return await create_guild(
+        name=name,
+        description=None,
+        guild_type=guild_type,
+        tags=tags or [],
+        created_by='user_1',
+        created_by_username='owner'
+    )
+
+
+class TestDirectoryTokens:
+    def test_name_prefix_tokens_include_prefixes_and_tags(self):
+        tokens = name_prefix_tokens('Dragon Slayers', ['Fantasy'])
+        assert 'dr' in tokens
+        assert 'dragon' in tokens
+        assert 'slay' in tokens
+        assert 'fantasy' in tokens
+        assert 'd' not in tokens
+
+    def test_search_terms_longest_first(self):
+        assert search_terms('a Dragon fit') == ['dragon', 'fit']
+
+    def test_cursor_round_trip_and_fingerprint(self):
+        state = {'GUILD_DIRECTORY#public': {'PK': 'GUILD#g1', 'SK': 'METADATA'}}
+        cursor = encode_cursor(state, 'abc')
+        assert decode_cursor(cursor, 'abc') == state
+        with pytest.raises(DirectoryCursorError):
+            decode_cursor(cursor, 'other')
+        with pytest.raises(DirectoryCursorError):
+            decode_cursor('not-a-cursor', 'abc')
+
+
+class TestListGuildsDirectory:
+    @pytest.mark.asyncio
+    async def test_cursor_pagination_across_types(self, guild_table):
+        names = ['Alpha', 'Bravo', 'Charlie', 'Delta', 'Echo']
+        types = [GuildType.PUBLIC, GuildType.APPROVAL, GuildType.PRIVATE, GuildType.PUBLIC, GuildType.APPROVAL]
+        for name, guild_type in zip(names, types):
+            await _create(name, guild_type)
+
+        seen = []
+        cursor = None
+        while True:
+            page = await list_guilds(limit=2, cursor=cursor)
+            seen.extend(guild.name for guild in page.guilds)
+            assert len(page.guilds) <= 2
+            if not page.has_more:
+                assert page.next_cursor is None
+                break
+            cursor = page.next_cursor
+
+        assert seen == list(reversed(names))
+
+    @pytest.mark.asyncio
+    async def test_guild_type_filter(self, guild_table):
+        await _create('Alpha', GuildType.PUBLIC)
+        await _create('Bravo', GuildType.PRIVATE)
+
+        result = await list_guilds(guild_type='private')
+
+        assert [guild.name for guild in result.guilds] == ['Bravo']
+
+    @pytest.mark.asyncio
+    async def test_search_by_name_prefix(self, guild_table):
+        await _create('Dragon Slayers')
+        await _create('Morning Runners')
+
+        result = await list_guilds(search='drag')
+
+        assert [guild.name for guild in result.guilds] == ['Dragon Slayers']
+
+    @pytest.mark.asyncio
+    async def test_search_multiple_terms_and_type(self, guild_table):
+        await _create('Dragon Slayers', GuildType.PUBLIC)
+        await _create('Dragon Riders', GuildType.PUBLIC)
+        await _create('Dragon Slayers Elite', GuildType.PRIVATE)
+
+        result = await list_guilds(search='dragon slay', guild_type='public')
+
+        assert [guild.name for guild in result.guilds] == ['Dragon Slayers']
+
+    @pytest.mark.asyncio
+    async def test_tags_filter_is_case_insensitive(self, guild_table):
+        await _create('Runners', tags=['Fitness', 'outdoors'])
+        await _create('Readers', tags=['books'])
+
+        result = await list_guilds(tags=['fitness', 'OUTDOORS'])
+
+        assert [guild.name for guild in result.guilds] == ['Runners']
+
+    @pytest.mark.asyncio
+    async def test_offset_is_still_supported(self, guild_table):
+        for name in ['Alpha', 'Bravo', 'Charlie']:
+            await _create(name)
+
+        result = await list_guilds(limit=1, offset=1)
+
+        assert [guild.name for guild in result.guilds] == ['Bravo']
+        assert result.has_more is True
+
+    @pytest.mark.asyncio
+    async def test_offset_at_the_end_returns_an_empty_page(self, guild_table):
+        for name in ['Alpha', 'Bravo', 'Charlie']:
+            await _create(name)
+
+        result = await list_guilds(limit=3, offset=3)
+
+        assert result.guilds == []
+        assert result.total == 3
+        assert result.has_more is False
+
+    @pytest.mark.asyncio
+    async def test_update_reindexes_name(self, guild_table):
+        guild = await _create('Old Name')
+
+        await update_guild(guild.guild_id, 'user_1', name='Fresh Start')
+
+        assert (await list_guilds(search='old')).guilds == []
+        assert [g.name for g in (await list_guilds(search='fresh')).guilds] == ['Fresh Start']
+
+    @pytest.mark.asyncio
+    async def test_cursor_for_other_filters_is_rejected(self, guild_table):
+        for name in ['Alpha', 'Bravo']:
+            await _create(name)
+        page = await list_guilds(limit=1)
+
+        with pytest.raises(GuildValidationError):
+            await list_guilds(limit=1, guild_type='public', cursor=page.next_cursor)
+
+    @pytest.mark.asyncio
+    async def test_page_reads_do_not_grow_with_depth(self, guild_table):
+        for index in range(12):
+            await _create(f'Guild {index}')
+
+        query_calls = []
+        original_query = guild_table.query
+
+        def counting_query(**kwargs):
+            query_calls.append(kwargs)
+            return original_query(**kwargs)
+
+        with patch.object(guild_table, 'query', side_effect=counting_query):
+            first = await list_guilds(limit=2, guild_type='public')
+            first_calls = len(query_calls)
+            query_calls.clear()
+            cursor = first.next_cursor
+            for _ in range(4):
+                page = await list_guilds(limit=2, guild_type='public', cursor=cursor)
+                cursor = page.next_cursor
+
+        assert first_calls == 1
+        assert len(query_calls) == 4
+        assert all(call['Limit'] == 3 for call in query_calls)
+
+
+class TestListGuildsMemberships:
+    @staticmethod
+    def _add_member(table, guild_id, user_id, role='member'):
+        table.put_item(Item={
+            'PK': f'GUILD#{guild_id}',
+            'SK': f'MEMBER#{user_id}',
+            'guild_id': guild_id,
+            'user_id': user_id,
+            'username': user_id,
+            'role': role,
+            'joined_at': '2024-01-01T00:00:00'
+        })
+
+    @pytest.mark.asyncio
+    async def test_permissions_resolved_with_one_batch_get(self, guild_table):
+        owned = await _create('Owned')
+        joined = await _create('Joined')
+        await _create('Stranger', GuildType.APPROVAL)
+        self._add_member(guild_table, joined.guild_id, 'user_2')
+
+        batch_calls = []
+        original_batch_get = guild_db.dynamodb.batch_get_item
+
+        def counting_batch_get(**kwargs):
+            batch_calls.append(kwargs)
+            return original_batch_get(**kwargs)
+
+        with patch.object(guild_db.dynamodb, 'batch_get_item', side_effect=counting_batch_get), \
+                patch.object(guild_table, 'query', wraps=guild_table.query) as query_spy:
+            result = await list_guilds(current_user_id='user_2')
+
+        assert len(batch_calls) == 1
+        # Only the directory partitions are queried; no per-guild member queries
+        assert all(call.kwargs.get('IndexName') == 'GSI6' for call in query_spy.call_args_list)
+
+        permissions = {guild.name: guild.user_permissions for guild in result.guilds}
+        assert permissions['Joined'].is_member is True
+        assert permissions['Joined'].can_leave is True
+        assert permissions['Owned'].is_member is False
+        assert permissions['Owned'].can_join is True
+        assert permissions['Stranger'].can_request_join is True
+        assert all(guild.members is None for guild in result.guilds)
+        assert owned.guild_id in {guild.guild_id for guild in result.guilds}
+
+    @pytest.mark.asyncio
+    async def test_owner_permissions(self, guild_table):
+        await _create('Owned')
+
+        result = await list_guilds(current_user_id='user_1')
+
+        assert result.guilds[0].user_permissions.is_owner is True
+        assert result.guilds[0].user_permissions.can_manage is True
+
+    @pytest.mark.asyncio
+    async def test_include_members_loads_member_lists(self, guild_table):
+        guild = await _create('Owned')
+        self._add_member(guild_table, guild.guild_id, 'user_2')
+
+        result = await list_guilds(current_user_id='user_2', include_members=True)
+
+        assert {member.user_id for member in result.guilds[0].members} == {'user_1', 'user_2'}
+        assert result.guilds[0].user_permissions.is_member is True
@@ -0,0 +1,139 @@
+"""
+Tests for the materialized guild rankings pipeline.
+
+Uses the moto-backed ``guild_table`` fixture from conftest.
+"""
+
+import os
+import sys
+
+import pytest
+from unittest.mock import patch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db import guild_db
+from app.db.guild_db import (
+    create_guild, calculate_guild_rankings, get_guild_rankings, get_guild_rankings_page,
+    GuildValidationError
+)
+from app.models.guild import GuildType
+
+
+@pytest.fixture(autouse=True)
+def reset_pointer_cache():
+    guild_db._ranking_pointer_cache.update({'item': None, 'expires_at': 0.0})
+    yield
+    guild_db._ranking_pointer_cache.update({'item': None, 'expires_at': 0.0})
+
+
+async def _create_with_members(table, name, member_count):
+    guild = await create_guild(
+        name=name,
+        description=None,
+        guild_type=GuildType.PUBLIC,
+        tags=[],
+        created_by='user_1',
+        created_by_username='owner'
+    )
+    table.update_item(
+        Key={'PK': f'GUILD#{guild.guild_id}', 'SK': 'METADATA'},
+        UpdateExpression='SET member_count = :count',
+        ExpressionAttributeValues={':count': member_count}
+    )
+    return guild
+
+
+class TestGuildRankings:
+    @pytest.mark.asyncio
+    async def test_no_snapshot_returns_empty_page(self, guild_table):
+        page = await get_guild_rankings_page()
+
+        assert page == {'rankings': [], 'next_cursor': None, 'generated_at': None}
+
+    @pytest.mark.asyncio
+    async def test_calculate_materializes_ordered_snapshot(self, guild_table):
+        await _create_with_members(guild_table, 'Small', 1)
+        await _create_with_members(guild_table, 'Large', 9)
+        await _create_with_members(guild_table, 'Medium', 4)
+
+        summary = await calculate_guild_rankings()
+        rankings = await get_guild_rankings(limit=10)
+
+        assert summary['guild_count'] == 3
+        assert [r['name'] for r in rankings] == ['Large', 'Medium', 'Small']
+        assert [r['position'] for r in rankings] == [1, 2, 3]
+        assert rankings[0]['activity_score'] == 90
+
+        metadata = guild_table.get_item(Key={'PK': f"GUILD#{rankings[0]['guild_id']}", 'SK': 'METADATA'})['Item']
+        assert metadata['position'] == 1
+
+    @pytest.mark.asyncio
+    async def test_read_is_a_single_query_and_pages_with_cursor(self, guild_table):
+        for index in range(5):
+            await _create_with_members(guild_table, f'Guild {index}', index + 1)
+        await calculate_guild_rankings()
+
+        with patch.object(guild_table, 'query', wraps=guild_table.query) as query_spy, \
+                patch.object(guild_table, 'get_item', wraps=guild_table.get_item) as get_spy:
+            first = await get_guild_rankings_page(limit=2)
+            second = await get_guild_rankings_page(limit=2, cursor=first['next_cursor'])
+            third = await get_guild_rankings_page(limit=2, cursor=second['next_cursor'])
+
+        assert query_spy.call_count == 3
+        assert get_spy.call_count == 0  # pointer cached by the calculation run
+        positions = [r['position'] for page in (first, second, third) for r in page['rankings']]
+        assert positions == [1, 2, 3, 4, 5]
+
+    @pytest.mark.asyncio
+    async def test_trend_tracks_previous_position(self, guild_table):
+        rising = await _create_with_members(guild_table, 'Rising', 1)
+        await _create_with_members(guild_table, 'Leader', 5)
+        await calculate_guild_rankings()
+
+        guild_table.update_item(
+            Key={'PK': f'GUILD#{rising.guild_id}', 'SK': 'METADATA'},
+            UpdateExpression='SET member_count = :count',
+            ExpressionAttributeValues={':count': 10}
+        )
+        await calculate_guild_rankings()
+        rankings = await get_guild_rankings()
+
+        assert rankings[0]['name'] == 'Rising'
+        assert rankings[0]['previous_position'] == 2
+        assert rankings[0]['trend'] == 'up'
+        assert rankings[1]['trend'] == 'down'
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_rejected(self, guild_table):
+        with pytest.raises(GuildValidationError):
+            await get_guild_rankings_page(cursor='bogus')
+
+
+class TestScheduledEventEndpoint:
+    LAMBDA_CONTEXT = {'x-amzn-lambda-context': '{"request_id": "req-1"}'}
+    EVENT = {'action': 'calculate_rankings'}
+
+    @pytest.fixture
+    def client(self):
+        from fastapi.testclient import TestClient
+        from app.main import app
+        return TestClient(app)
+
+    def test_pass_through_event_runs_the_ranking_job(self, client):
+        with patch('app.main.calculate_guild_rankings', return_value={'ranked': 3}) as calculate:
+            response = client.post('/events', json=self.EVENT, headers=self.LAMBDA_CONTEXT)
+
+        assert response.status_code == 200
+        calculate.assert_awaited_once()
+
+    @pytest.mark.parametrize('headers', [
+        {},
+        {**LAMBDA_CONTEXT, 'x-amzn-request-context': '{"stage": "v1"}'},
+    ], ids=['no-adapter', 'http-request'])
+    def test_http_callers_cannot_trigger_the_job(self, client, headers):
+        with patch('app.main.calculate_guild_rankings') as calculate:
+            response = client.post('/events', json=self.EVENT, headers=headers)
+
+        assert response.status_code == 403
+        calculate.assert_not_called()
@@ -0,0 +1,76 @@
+"""
+Tests for the per-day guild activity counters behind ranking scores.
+
+Uses the moto-backed ``guild_table`` fixture from conftest.
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.guild_db import (
+    _increment_guild_score_counters, _quests_completed_score, _social_engagement_score,
+    create_guild, create_guild_comment, like_guild_comment, get_guild_activity_counters,
+    calculate_guild_rankings, get_guild_rankings, GUILD_SCORE_WINDOW_DAYS
+)
+from app.models.guild import GuildType
+
+
+async def _create_guild():
+    return await create_guild(
+        name='Counters',
+        description=None,
+        guild_type=GuildType.PUBLIC,
+        tags=[],
+        created_by='user_1',
+        created_by_username='owner'
+    )
+
+
+class TestGuildScoreCounters:
+    @pytest.mark.asyncio
+    async def test_comment_and_like_increment_todays_bucket(self, guild_table):
+        guild = await _create_guild()
+
+        comment = await create_guild_comment(guild.guild_id, 'user_1', 'owner', 'hello', 'owner')
+        await like_guild_comment(guild.guild_id, comment.comment_id, 'user_1')
+
+        bucket = guild_table.get_item(
+            Key={'PK': f'GUILD#{guild.guild_id}', 'SK': f'SCORE#{datetime.utcnow().date().isoformat()}'}
+        )['Item']
+        assert bucket['comments'] == 1
+        assert bucket['likes'] == 1
+        assert 'TTL' in bucket
+
+        # Unlike nets the like back out
+        await like_guild_comment(guild.guild_id, comment.comment_id, 'user_1')
+        counters = get_guild_activity_counters(guild.guild_id, datetime.utcnow() - timedelta(days=1))
+        assert _social_engagement_score(counters) == 1
+
+    @pytest.mark.asyncio
+    async def test_rolling_window_sums_only_recent_buckets(self, guild_table):
+        now = datetime.utcnow()
+        _increment_guild_score_counters('g1', at=now, quests_completed=1)
+        _increment_guild_score_counters('g1', at=now - timedelta(days=GUILD_SCORE_WINDOW_DAYS - 1), quests_completed=2)
+        _increment_guild_score_counters('g1', at=now - timedelta(days=GUILD_SCORE_WINDOW_DAYS + 1), quests_completed=5)
+
+        since = now - timedelta(days=GUILD_SCORE_WINDOW_DAYS - 1)
+        counters = get_guild_activity_counters('g1', since)
+
+        assert counters == {'quests_completed': 3, 'comments': 0, 'likes': 0}
+        assert _quests_completed_score(counters) == 150
+
+    @pytest.mark.asyncio
+    async def test_rankings_read_counters(self, guild_table):
+        guild = await _create_guild()
+        _increment_guild_score_counters(guild.guild_id, quests_completed=2, comments=3, likes=4)
+
+        await calculate_guild_rankings()
+        ranking = (await get_guild_rankings())[0]
+
+        assert ranking['quests_completed_score'] == 100
+        assert ranking['social_engagement_score'] == 7
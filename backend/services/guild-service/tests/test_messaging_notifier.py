@@ -0,0 +1,85 @@
+"""Tests for revoking a removed or blocked member's chat access."""
+
+from unittest.mock import AsyncMock, patch
+
+import jwt
+import pytest
+
+from app.api import moderation
+from app.models.moderation import ModerationActionPayload
+from app.security.auth_models import AuthContext
+from app.utils import messaging
+
+
+@pytest.fixture(autouse=True)
+def jwt_secret(monkeypatch):
+    monkeypatch.setenv("JWT_SECRET", "guild-service-test-secret-0123456789abcdef")
+    messaging._jwt_secret.cache_clear()
+    yield "guild-service-test-secret-0123456789abcdef"
+    messaging._jwt_secret.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_notify_posts_to_the_revoke_endpoint_with_a_service_token(monkeypatch, jwt_secret):
+    monkeypatch.setenv("MESSAGING_SERVICE_URL", "https://api.example.com/v1/")
+    monkeypatch.setenv("MESSAGING_API_KEY", "internal-key")
+    calls = []
+    monkeypatch.setattr(messaging, "_post", lambda url, headers: calls.append((url, headers)) or 200)
+
+    assert await messaging.notify_membership_revoked("g 1", "user_a") is True
+
+    [(url, headers)] = calls
+    assert url == "https://api.example.com/v1/messaging/guilds/g%201/members/user_a/revoke"
+    assert headers["x-api-key"] == "internal-key"
+    scheme, token = headers["Authorization"].split(" ", 1)
+    assert scheme == "Bearer"
+    claims = jwt.decode(token, jwt_secret, algorithms=["HS256"])
+    assert claims["sub"] == "guild-service"
+    assert claims["token_use"] == "service"
+    assert claims["exp"] - claims["iat"] == messaging.SERVICE_TOKEN_TTL_SECONDS
+
+
+@pytest.mark.asyncio
+async def test_notify_is_skipped_without_a_messaging_url(monkeypatch):
+    monkeypatch.delenv("MESSAGING_SERVICE_URL", raising=False)
+    post = lambda url, headers: pytest.fail("should not post")
+    monkeypatch.setattr(messaging, "_post", post)
+
+    assert await messaging.notify_membership_revoked("g1", "user_a") is False
+
+
+@pytest.mark.asyncio
+async def test_notify_failures_are_logged_not_raised(monkeypatch):
+    monkeypatch.setenv("MESSAGING_SERVICE_URL", "https://api.example.com")
+
+    def unreachable(url, headers):
+        raise OSError("connection refused")
+
+    monkeypatch.setattr(messaging, "_post", unreachable)
+
+    assert await messaging.notify_membership_revoked("g1", "user_a") is False
+
+
+@pytest.mark.asyncio
+async def test_blocking_a_member_revokes_their_chat_access():
+    auth = AuthContext(user_id="mod_1", claims={"sub": "mod_1"}, provider="test")
+    payload = ModerationActionPayload(action="block_user", target_user_id="user_a")
+
+    with patch.object(moderation, "db_perform_moderation_action", new=AsyncMock()) as perform, \
+         patch.object(moderation, "notify_membership_revoked", new=AsyncMock()) as notify:
+        await moderation.perform_moderation_action("g1", payload, auth=auth)
+
+    perform.assert_awaited_once()
+    notify.assert_awaited_once_with("g1", "user_a")
+
+
+@pytest.mark.asyncio
+async def test_other_moderation_actions_leave_chat_access_alone():
+    auth = AuthContext(user_id="mod_2", claims={"sub": "mod_2"}, provider="test")
+    payload = ModerationActionPayload(action="unblock_user", target_user_id="user_a")
+
+    with patch.object(moderation, "db_perform_moderation_action", new=AsyncMock()), \
+         patch.object(moderation, "notify_membership_revoked", new=AsyncMock()) as notify:
+        await moderation.perform_moderation_action("g1", payload, auth=auth)
+
+    notify.assert_not_awaited()
@@ -0,0 +1,53 @@
+"""Tests for the per-user endpoint rate limiting decorator."""
+
+import pytest
+from fastapi import HTTPException
+
+from app.security.auth_models import AuthContext
+from app.security.rate_limiter import rate_limit
+
+
+def _auth(user_id: str) -> AuthContext:
+    return AuthContext(user_id=user_id, claims={"sub": user_id}, provider="test")
+
+
+@rate_limit(requests_per_hour=2)
+async def _limited_endpoint(guild_id: str, auth: AuthContext):
+    return {"guild_id": guild_id, "user_id": auth.user_id}
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_allows_up_to_limit_then_rejects_with_retry_after():
+    auth = _auth("user_a")
+    assert await _limited_endpoint("g1", auth=auth) == {"guild_id": "g1", "user_id": "user_a"}
+    assert await _limited_endpoint("g1", auth=auth)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await _limited_endpoint("g1", auth=auth)
+
+    assert exc_info.value.status_code == 429
+    assert int(exc_info.value.headers["Retry-After"]) > 0
+    assert exc_info.value.headers["X-RateLimit-Remaining"] == "0"
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_is_tracked_per_user():
+    for _ in range(2):
+        await _limited_endpoint("g1", auth=_auth("user_a"))
+
+    assert await _limited_endpoint("g1", auth=_auth("user_b"))
+
+
+def test_decorated_endpoints_get_separate_limiters():
+    from app.api.moderation import transfer_ownership
+
+    assert transfer_ownership.limiter.name == "guild:transfer_ownership"
+    assert transfer_ownership.limiter.rate.limit == 1
+    assert _limited_endpoint.limiter is not transfer_ownership.limiter
+
+
+def test_member_read_endpoints_are_not_rate_limited():
+    from app.api import members
+
+    for endpoint in (members.get_guild_members, members.get_guild_member, members.get_my_guild_membership):
+        assert not hasattr(endpoint, "limiter")
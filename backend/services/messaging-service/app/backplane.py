@@ -0,0 +1,296 @@
+"""
+Pub/sub backplane for fanning room messages out across messaging-service replicas.
+
+Each replica (node) keeps its own WebSocket connections. When a message is
+broadcast to a room, the node delivers it to its local sockets and publishes it
+on the backplane; every other node subscribed to that room delivers it to its
+own sockets. The backplane also tracks which users are present in a room on
+any node.
+
+Two implementations are provided:
+
+* ``InMemoryBackplane``: single process. Several instances can share an
+  ``InMemoryHub`` to simulate multiple nodes (tests, local development).
+* ``RedisBackplane``: Redis pub/sub for messages and a sorted set per room for
+  presence, so it works across processes and hosts. ``redis`` is an optional
+  dependency, imported only when this backplane is used.
+
+Select one with ``MESSAGING_BACKPLANE_URL`` (unset for in-memory,
+``redis://host:6379/0`` for Redis), see ``create_backplane``.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Called with (room_id, message) for messages published by other nodes
+MessageHandler = Callable[[str, str], Awaitable[None]]
+
+
+class Backplane(ABC):
+    """Delivers room messages and presence between messaging-service nodes."""
+
+    kind = "abstract"
+
+    def __init__(self, node_id: Optional[str] = None):
+        self.node_id = node_id or uuid.uuid4().hex
+        self._handler: Optional[MessageHandler] = None
+
+    async def start(self, handler: MessageHandler) -> None:
+        """Start receiving messages from other nodes."""
+        self._handler = handler
+
+    async def stop(self) -> None:
+        """Stop receiving messages and withdraw this node's presence."""
+        self._handler = None
+
+    async def _dispatch(self, room_id: str, message: str) -> None:
+        if self._handler is None:
+            return
+        try:
+            await self._handler(room_id, message)
+        except Exception as e:
+            logger.error(f"Error delivering backplane message for room {room_id}: {e}")
+
+    @abstractmethod
+    async def subscribe(self, room_id: str) -> None:
+        """Receive messages for a room (called when the first local socket joins it)."""
+
+    @abstractmethod
+    async def unsubscribe(self, room_id: str) -> None:
+        """Stop receiving messages for a room (called when the last local socket leaves it)."""
+
+    @abstractmethod
+    async def publish(self, room_id: str, message: str) -> None:
+        """Send a message to the other nodes subscribed to the room."""
+
+    @abstractmethod
+    async def add_presence(self, room_id: str, user_id: str) -> None:
+        """Mark a user as present in a room on this node."""
+
+    @abstractmethod
+    async def remove_presence(self, room_id: str, user_id: str) -> None:
+        """Remove a user's presence in a room on this node."""
+
+    @abstractmethod
+    async def room_presence(self, room_id: str) -> Set[str]:
+        """Users present in a room on any node."""
+
+
+class InMemoryHub:
+    """Shared state for in-process nodes: room subscriptions and presence."""
+
+    def __init__(self):
+        # room_id -> nodes subscribed to it
+        self.subscribers: Dict[str, Set["InMemoryBackplane"]] = {}
+        # room_id -> user_id -> node ids where the user is present
+        self.presence: Dict[str, Dict[str, Set[str]]] = {}
+
+
+class InMemoryBackplane(Backplane):
+    """Backplane for a single process; nodes sharing a hub see each other's messages."""
+
+    kind = "memory"
+
+    def __init__(self, hub: Optional[InMemoryHub] = None, node_id: Optional[str] = None):
+        super().__init__(node_id)
+        self.hub = hub or InMemoryHub()
+
+    async def stop(self) -> None:
+        for subscribers in self.hub.subscribers.values():
+            subscribers.discard(self)
+        for room_id, users in list(self.hub.presence.items()):
+            for user_id in list(users):
+                self._discard_presence(room_id, user_id)
+        await super().stop()
+
+    async def subscribe(self, room_id: str) -> None:
+        self.hub.subscribers.setdefault(room_id, set()).add(self)
+
+    async def unsubscribe(self, room_id: str) -> None:
+        subscribers = self.hub.subscribers.get(room_id)
+        if subscribers is None:
+            return
+        subscribers.discard(self)
+        if not subscribers:
+            del self.hub.subscribers[room_id]
+
+    async def publish(self, room_id: str, message: str) -> None:
+        for node in list(self.hub.subscribers.get(room_id, ())):
+            if node is not self:
+                await node._dispatch(room_id, message)
+
+    async def add_presence(self, room_id: str, user_id: str) -> None:
+        self.hub.presence.setdefault(room_id, {}).setdefault(user_id, set()).add(self.node_id)
+
+    async def remove_presence(self, room_id: str, user_id: str) -> None:
+        self._discard_presence(room_id, user_id)
+
+    def _discard_presence(self, room_id: str, user_id: str) -> None:
+        users = self.hub.presence.get(room_id)
+        if not users or user_id not in users:
+            return
+        users[user_id].discard(self.node_id)
+        if not users[user_id]:
+            del users[user_id]
+        if not users:
+            del self.hub.presence[room_id]
+
+    async def room_presence(self, room_id: str) -> Set[str]:
+        return set(self.hub.presence.get(room_id, {}))
+
+
+class RedisBackplane(Backplane):
+    """
+    Redis-backed backplane.
+
+    Messages go through one pub/sub channel per room. Presence is a sorted set
+    per room whose members are ``{node_id}|{user_id}`` scored by expiry time;
+    each node refreshes its own entries every ``presence_ttl / 3`` seconds, so
+    a node that dies stops counting as present after ``presence_ttl``.
+    """
+
+    kind = "redis"
+    CHANNEL_PREFIX = "messaging:room:"
+    PRESENCE_PREFIX = "messaging:presence:"
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        client=None,
+        node_id: Optional[str] = None,
+        presence_ttl: float = 60.0,
+    ):
+        super().__init__(node_id)
+        if client is None:
+            try:
+                import redis.asyncio as redis_asyncio
+            except ImportError as e:
+                raise RuntimeError("The redis package is required for the Redis messaging backplane") from e
+            client = redis_asyncio.from_url(url)
+        self.redis = client
+        self.presence_ttl = presence_ttl
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._local_presence: Set[Tuple[str, str]] = set()
+
+    def _channel(self, room_id: str) -> str:
+        return f"{self.CHANNEL_PREFIX}{room_id}"
+
+    def _presence_key(self, room_id: str) -> str:
+        return f"{self.PRESENCE_PREFIX}{room_id}"
+
+    def _presence_member(self, user_id: str) -> str:
+        return f"{self.node_id}|{user_id}"
+
+    async def start(self, handler: MessageHandler) -> None:
+        await super().start(handler)
+        self._pubsub = self.redis.pubsub()
+        self._listener = asyncio.create_task(self._listen())
+        self._heartbeat = asyncio.create_task(self._refresh_presence())
+
+    async def stop(self) -> None:
+        for task in (self._listener, self._heartbeat):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self._listener = self._heartbeat = None
+        for room_id, user_id in list(self._local_presence):
+            await self.remove_presence(room_id, user_id)
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        await super().stop()
+
+    async def subscribe(self, room_id: str) -> None:
+        if self._pubsub is not None:
+            await self._pubsub.subscribe(self._channel(room_id))
+
+    async def unsubscribe(self, room_id: str) -> None:
+        if self._pubsub is not None:
+            await self._pubsub.unsubscribe(self._channel(room_id))
+
+    async def publish(self, room_id: str, message: str) -> None:
+        envelope = json.dumps({"origin": self.node_id, "message": message})
+        await self.redis.publish(self._channel(room_id), envelope)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                event = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Redis backplane receive failed: {e}")
+                await asyncio.sleep(1.0)
+                continue
+            if not event or event.get("type") != "message":
+                continue
+            try:
+                channel = event["channel"]
+                data = event["data"]
+                if isinstance(channel, bytes):
+                    channel = channel.decode()
+                if isinstance(data, bytes):
+                    data = data.decode()
+                envelope = json.loads(data)
+                origin, message = envelope.get("origin"), envelope["message"]
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                # One malformed publish must not stop this node's listener
+                logger.warning(f"Dropping malformed backplane message: {e}")
+                continue
+            if origin == self.node_id:
+                continue
+            await self._dispatch(channel[len(self.CHANNEL_PREFIX):], message)
+
+    async def add_presence(self, room_id: str, user_id: str) -> None:
+        self._local_presence.add((room_id, user_id))
+        expires_at = time.time() + self.presence_ttl
+        await self.redis.zadd(self._presence_key(room_id), {self._presence_member(user_id): expires_at})
+
+    async def remove_presence(self, room_id: str, user_id: str) -> None:
+        self._local_presence.discard((room_id, user_id))
+        await self.redis.zrem(self._presence_key(room_id), self._presence_member(user_id))
+
+    async def room_presence(self, room_id: str) -> Set[str]:
+        members = await self.redis.zrangebyscore(self._presence_key(room_id), time.time(), "+inf")
+        users = set()
+        for member in members:
+            if isinstance(member, bytes):
+                member = member.decode()
+            users.add(member.split("|", 1)[1])
+        return users
+
+    async def _refresh_presence(self) -> None:
+        while True:
+            await asyncio.sleep(self.presence_ttl / 3)
+            now = time.time()
+            try:
+                for room_id, user_id in list(self._local_presence):
+                    key = self._presence_key(room_id)
+                    await self.redis.zadd(key, {self._presence_member(user_id): now + self.presence_ttl})
+                    # Drop entries left behind by nodes that stopped refreshing
+                    await self.redis.zremrangebyscore(key, "-inf", now)
+            except Exception as e:
+                logger.error(f"Redis backplane presence refresh failed: {e}")
+
+
+def create_backplane(url: Optional[str] = None) -> Backplane:
+    """Build the backplane configured by ``url`` or ``MESSAGING_BACKPLANE_URL``."""
+    url = url if url is not None else os.getenv("MESSAGING_BACKPLANE_URL", "")
+    if not url or url == "memory://":
+        return InMemoryBackplane()
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackplane(url=url)
+    raise ValueError(f"Unsupported messaging backplane URL: {url}")
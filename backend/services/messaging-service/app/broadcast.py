@@ -0,0 +1,211 @@
+"""
+Concurrent, backpressure-aware fan-out of room messages to WebSockets.
+
+A broadcast is serialized once and put on a bounded send queue per
+connection; each connection has its own writer task, so one slow client no
+longer stalls delivery to the rest of the room. When a connection's queue is
+full the slow-consumer policy decides what happens:
+
+* ``drop_oldest`` (default): discard the oldest queued message, keeping the
+  client current at the cost of gaps
+* ``drop_newest``: discard the new message
+* ``disconnect``: drop the client; it can reconnect and resync
+
+Sends that take longer than ``send_timeout`` also count as a slow consumer
+and disconnect the client. Per-room delivery latency (broadcast to
+``send_text`` completion), drops and disconnects are kept in ``RoomStats``.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SLOW_CONSUMER_POLICIES = ("drop_oldest", "drop_newest", "disconnect")
+
+# Called with the websocket that should be disconnected
+SlowConsumerHandler = Callable[[Any], Awaitable[None]]
+
+
+def encode_message(message: Any) -> str:
+    """Serialize a message once for every recipient; strings are sent as-is."""
+    return message if isinstance(message, str) else json.dumps(message)
+
+
+class RoomStats:
+    """Delivery counters and a window of recent latencies for one room."""
+
+    def __init__(self, window: int = 1024):
+        self.broadcasts = 0
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self.slow_consumers_disconnected = 0
+        self.latencies_ms: Deque[float] = deque(maxlen=window)
+
+    def snapshot(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies_ms)
+
+        def pct(value: float) -> Optional[float]:
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(value * len(ordered)))], 3)
+
+        return {
+            "broadcasts": self.broadcasts,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "slowConsumersDisconnected": self.slow_consumers_disconnected,
+            "latencyMs": {
+                "p50": pct(0.50),
+                "p95": pct(0.95),
+                "p99": pct(0.99),
+                "max": round(ordered[-1], 3) if ordered else None,
+                "samples": len(ordered),
+            },
+        }
+
+
+class _ConnectionSender:
+    """Bounded send queue and writer task for one websocket."""
+
+    def __init__(self, engine: "BroadcastEngine", websocket):
+        self.engine = engine
+        self.websocket = websocket
+        # (payload, room_id, enqueued_at)
+        self.queue: Deque[Tuple[str, str, float]] = deque()
+        self.closed = False
+        # Only runs while the queue has messages, so idle connections cost no task
+        self.task: Optional[asyncio.Task] = None
+
+    def offer(self, payload: str, room_id: str, enqueued_at: float) -> bool:
+        """Queue a message; returns False when the slow-consumer policy rejected it."""
+        engine = self.engine
+        if len(self.queue) >= engine.queue_size:
+            stats = engine.room_stats(room_id)
+            if engine.policy == "disconnect":
+                stats.slow_consumers_disconnected += 1
+                engine.drop_connection(self.websocket)
+                return False
+            stats.dropped += 1
+            if engine.policy == "drop_newest":
+                return False
+            self.queue.popleft()
+        self.queue.append((payload, room_id, enqueued_at))
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(self._run())
+        return True
+
+    async def _run(self):
+        engine = self.engine
+        while self.queue and not self.closed:
+            payload, room_id, enqueued_at = self.queue.popleft()
+            stats = engine.room_stats(room_id)
+            try:
+                await asyncio.wait_for(self.websocket.send_text(payload), timeout=engine.send_timeout)
+            except asyncio.TimeoutError:
+                stats.slow_consumers_disconnected += 1
+                logger.warning(f"Send to a connection in room {room_id} timed out; dropping slow consumer")
+                engine.drop_connection(self.websocket)
+                return
+            except Exception as e:
+                stats.failed += 1
+                logger.error(f"Error broadcasting to room {room_id}: {e}")
+                continue
+            stats.delivered += 1
+            stats.latencies_ms.append((time.perf_counter() - enqueued_at) * 1000)
+
+    def close(self):
+        self.closed = True
+        self.queue.clear()
+        if self.task is not None and self.task is not asyncio.current_task():
+            self.task.cancel()
+
+
+class BroadcastEngine:
+    """Fans serialized messages out to websockets through per-connection queues."""
+
+    def __init__(
+        self,
+        queue_size: Optional[int] = None,
+        policy: Optional[str] = None,
+        send_timeout: Optional[float] = None,
+        on_slow_consumer: Optional[SlowConsumerHandler] = None,
+    ):
+        self.queue_size = max(1, queue_size or int(os.getenv("MESSAGING_SEND_QUEUE_SIZE", "100")))
+        self.policy = policy or os.getenv("MESSAGING_SLOW_CONSUMER_POLICY", "drop_oldest")
+        if self.policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"Unknown slow consumer policy: {self.policy}")
+        self.send_timeout = send_timeout or float(os.getenv("MESSAGING_SEND_TIMEOUT_SECONDS", "5"))
+        self.on_slow_consumer = on_slow_consumer
+        self._senders: Dict[Any, _ConnectionSender] = {}
+        self._stats: Dict[str, RoomStats] = {}
+        self._background_tasks = set()
+
+    def room_stats(self, room_id: str) -> RoomStats:
+        stats = self._stats.get(room_id)
+        if stats is None:
+            stats = self._stats[room_id] = RoomStats()
+        return stats
+
+    def metrics(self, room_id: str) -> Dict[str, Any]:
+        """Delivery metrics for a room, including how many messages are still queued."""
+        snapshot = self.room_stats(room_id).snapshot() if room_id in self._stats else RoomStats().snapshot()
+        snapshot["queued"] = sum(
+            1 for sender in self._senders.values() for _, queued_room, _ in sender.queue if queued_room == room_id
+        )
+        return snapshot
+
+    def forget_room(self, room_id: str):
+        self._stats.pop(room_id, None)
+
+    async def broadcast(self, room_id: str, message: Any, connections: Iterable, exclude=None) -> int:
+        """
+        Queue ``message`` for every connection except ``exclude``.
+
+        Returns the number of connections the message was queued for. Delivery
+        happens on the writer tasks; this only yields once so they can start.
+        """
+        payload = encode_message(message)
+        enqueued_at = time.perf_counter()
+        stats = self.room_stats(room_id)
+        stats.broadcasts += 1
+        queued = 0
+        for websocket in list(connections):
+            if websocket is exclude:
+                continue
+            if self._sender(websocket).offer(payload, room_id, enqueued_at):
+                queued += 1
+        await asyncio.sleep(0)
+        return queued
+
+    def _sender(self, websocket) -> _ConnectionSender:
+        sender = self._senders.get(websocket)
+        if sender is None:
+            sender = self._senders[websocket] = _ConnectionSender(self, websocket)
+        return sender
+
+    def discard(self, websocket):
+        """Stop the writer for a websocket that has left."""
+        sender = self._senders.pop(websocket, None)
+        if sender is not None:
+            sender.close()
+
+    def drop_connection(self, websocket):
+        """Apply the slow-consumer policy: stop sending and let the owner disconnect it."""
+        self.discard(websocket)
+        if self.on_slow_consumer is None:
+            return
+        task = asyncio.get_running_loop().create_task(self.on_slow_consumer(websocket))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def close(self):
+        for websocket in list(self._senders):
+            self.discard(websocket)
@@ -9,13 +9,33 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import jwt
 import json
 import asyncio
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from datetime import datetime
 import logging
 from pydantic import BaseModel
 import os
+from functools import lru_cache
 import boto3
 
+try:
+    from .backplane import Backplane, InMemoryBackplane, create_backplane
+    from .broadcast import BroadcastEngine, encode_message
+    from .message_history import InvalidCursor, MessageHistory
+    from .message_store import (
+        InvalidMessage, MessageStoreFull, build_message_item, create_message_store, table_for_room, validate_message_text,
+    )
+    from .rate_limit import RateLimiter, create_rate_limiter
+    from .ttl_cache import TTLCache
+except ImportError:  # loaded as a top-level module (app/ on sys.path)
+    from backplane import Backplane, InMemoryBackplane, create_backplane
+    from broadcast import BroadcastEngine, encode_message
+    from message_history import InvalidCursor, MessageHistory
+    from message_store import (
+        InvalidMessage, MessageStoreFull, build_message_item, create_message_store, table_for_room, validate_message_text,
+    )
+    from rate_limit import RateLimiter, create_rate_limiter
+    from ttl_cache import TTLCache
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -38,47 +58,180 @@ app.add_middleware(
 # Security
 security = HTTPBearer()
 
+# AWS clients are created on first use and reused for the life of the container
+@lru_cache(maxsize=1)
+def get_dynamodb_resource():
+    return boto3.resource('dynamodb')
+
+@lru_cache(maxsize=1)
+def get_ssm_client():
+    return boto3.client('ssm')
+
+# Reconnect storms (e.g. after a deploy) would otherwise read the secret from
+# SSM and the membership from DynamoDB on every connection attempt
+JWT_SECRET_CACHE_TTL_SECONDS = float(os.getenv("JWT_SECRET_CACHE_TTL_SECONDS", "300"))
+GUILD_MEMBERSHIP_CACHE_TTL_SECONDS = float(os.getenv("GUILD_MEMBERSHIP_CACHE_TTL_SECONDS", "60"))
+# Denials are cached briefly so a user who was just added is let in soon
+GUILD_MEMBERSHIP_DENIED_TTL_SECONDS = float(os.getenv("GUILD_MEMBERSHIP_DENIED_TTL_SECONDS", "10"))
+_jwt_secret_cache = TTLCache(ttl=JWT_SECRET_CACHE_TTL_SECONDS, max_entries=4)
+# (guild_id, user_id) -> is an active, unblocked member
+_membership_cache = TTLCache(ttl=GUILD_MEMBERSHIP_CACHE_TTL_SECONDS, max_entries=50000)
+
+# Backplane channel every node subscribes to for control events (not a chat room)
+CONTROL_ROOM = "__control__"
+
 # Connection management
 class ConnectionManager:
-    def __init__(self):
-        # room_id -> List[WebSocket]
-        self.active_connections: Dict[str, List[WebSocket]] = {}
-        # user_id -> List[room_id]
-        self.user_rooms: Dict[str, List[str]] = {}
+    """
+    Tracks this node's WebSocket connections and fans room messages out
+    through the backplane so rooms span every replica.
+    """
+
+    def __init__(self, backplane: Optional[Backplane] = None):
+        # Every lookup below is a dict or set operation, so connect, disconnect
+        # and per-room/per-user queries don't depend on the total socket count.
+        # room_id -> Set[WebSocket]
+        self.active_connections: Dict[str, Set[WebSocket]] = {}
+        # user_id -> Set[room_id] (WebSocket and HTTP joins)
+        self.user_rooms: Dict[str, Set[str]] = {}
         # WebSocket -> user_id
         self.connection_users: Dict[WebSocket, str] = {}
+        # WebSocket -> Set[room_id]
+        self.connection_rooms: Dict[WebSocket, Set[str]] = {}
+        # user_id -> Set[WebSocket]
+        self.user_connections: Dict[str, Set[WebSocket]] = {}
+        # (room_id, user_id) -> number of the user's sockets in the room
+        self._room_user_sockets: Dict[Tuple[str, str], int] = {}
+        self.backplane = backplane or InMemoryBackplane()
+        self.broadcaster = BroadcastEngine(on_slow_consumer=self._drop_slow_consumer)
+        # (room_id, user_id) -> local sockets/HTTP joins keeping the user present
+        self._presence_refs: Dict[Tuple[str, str], int] = {}
+        # (room_id, user_id) joined over HTTP
+        self._http_presence: Set[Tuple[str, str]] = set()
+        self._background_tasks: Set[asyncio.Task] = set()
+        # Control event type -> handler(manager, event), for events every node must act on
+        self.control_handlers: Dict[str, Callable[["ConnectionManager", dict], Awaitable[None]]] = {}
+
+    async def start(self):
+        await self.backplane.start(self._deliver_from_backplane)
+        await self.backplane.subscribe(CONTROL_ROOM)
+
+    async def stop(self):
+        await self.backplane.stop()
+        await self.broadcaster.close()
 
     async def connect(self, websocket: WebSocket, room_id: str, user_id: str):
         await websocket.accept()
         
-        if room_id not in self.active_connections:
-            self.active_connections[room_id] = []
-        
-        self.active_connections[room_id].append(websocket)
+        first_in_room = room_id not in self.active_connections
+        self.active_connections.setdefault(room_id, set()).add(websocket)
         self.connection_users[websocket] = user_id
+        self.connection_rooms.setdefault(websocket, set()).add(room_id)
+        self.user_connections.setdefault(user_id, set()).add(websocket)
+        self.user_rooms.setdefault(user_id, set()).add(room_id)
+        key = (room_id, user_id)
+        self._room_user_sockets[key] = self._room_user_sockets.get(key, 0) + 1
         
-        if user_id not in self.user_rooms:
-            self.user_rooms[user_id] = []
-        if room_id not in self.user_rooms[user_id]:
-            self.user_rooms[user_id].append(room_id)
+        if first_in_room:
+            await self.backplane.subscribe(room_id)
+        await self._acquire_presence(room_id, user_id)
         
         logger.info(f"User {user_id} connected to room {room_id}")
         return websocket
 
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.connection_users:
-            user_id = self.connection_users[websocket]
-            del self.connection_users[websocket]
-            
-            # Remove from user_rooms
-            for room_id in list(self.user_rooms.get(user_id, [])):
-                if websocket in self.active_connections.get(room_id, []):
-                    self.active_connections[room_id].remove(websocket)
-                    if not self.active_connections[room_id]:
-                        del self.active_connections[room_id]
-                    self.user_rooms[user_id].remove(room_id)
-            
-            logger.info(f"User {user_id} disconnected")
+        user_id = self.connection_users.pop(websocket, None)
+        if user_id is None:
+            return
+        self.broadcaster.discard(websocket)
+        
+        user_sockets = self.user_connections.get(user_id)
+        if user_sockets is not None:
+            user_sockets.discard(websocket)
+            if not user_sockets:
+                del self.user_connections[user_id]
+        
+        for room_id in self.connection_rooms.pop(websocket, ()):
+            connections = self.active_connections.get(room_id)
+            if connections is not None:
+                connections.discard(websocket)
+                if not connections:
+                    del self.active_connections[room_id]
+                    self.broadcaster.forget_room(room_id)
+                    self._run_in_background(self.backplane.unsubscribe(room_id))
+            # Keep the room while the user still has another socket in it
+            key = (room_id, user_id)
+            remaining = self._room_user_sockets.get(key, 1) - 1
+            if remaining > 0:
+                self._room_user_sockets[key] = remaining
+            else:
+                self._room_user_sockets.pop(key, None)
+                self._discard_user_room(user_id, room_id)
+            self._run_in_background(self._release_presence(room_id, user_id))
+        
+        logger.info(f"User {user_id} disconnected")
+
+    def _discard_user_room(self, user_id: str, room_id: str):
+        rooms = self.user_rooms.get(user_id)
+        if rooms is None:
+            return
+        rooms.discard(room_id)
+        if not rooms:
+            del self.user_rooms[user_id]
+
+    async def join_room(self, room_id: str, user_id: str):
+        """Record HTTP presence (a user in the room without a WebSocket)."""
+        self.user_rooms.setdefault(user_id, set()).add(room_id)
+        if (room_id, user_id) not in self._http_presence:
+            self._http_presence.add((room_id, user_id))
+            await self._acquire_presence(room_id, user_id)
+
+    async def leave_room(self, room_id: str, user_id: str):
+        """Remove HTTP presence recorded by join_room."""
+        self._discard_user_room(user_id, room_id)
+        if (room_id, user_id) in self._http_presence:
+            self._http_presence.discard((room_id, user_id))
+            await self._release_presence(room_id, user_id)
+
+    async def get_room_presence(self, room_id: str) -> Set[str]:
+        """Users present in the room on any node."""
+        try:
+            return await self.backplane.room_presence(room_id)
+        except Exception as e:
+            logger.error(f"Error reading presence for room {room_id}: {e}")
+            return {uid for uid, rooms in self.user_rooms.items() if room_id in rooms}
+
+    async def _acquire_presence(self, room_id: str, user_id: str):
+        key = (room_id, user_id)
+        self._presence_refs[key] = self._presence_refs.get(key, 0) + 1
+        if self._presence_refs[key] == 1:
+            try:
+                await self.backplane.add_presence(room_id, user_id)
+            except Exception as e:
+                logger.error(f"Error publishing presence for user {user_id} in room {room_id}: {e}")
+
+    async def _release_presence(self, room_id: str, user_id: str):
+        key = (room_id, user_id)
+        if key not in self._presence_refs:
+            return
+        self._presence_refs[key] -= 1
+        if self._presence_refs[key] <= 0:
+            del self._presence_refs[key]
+            try:
+                await self.backplane.remove_presence(room_id, user_id)
+            except Exception as e:
+                logger.error(f"Error removing presence for user {user_id} in room {room_id}: {e}")
+
+    def _run_in_background(self, coro):
+        """Schedule backplane bookkeeping from synchronous code paths such as disconnect."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            coro.close()
+            return
+        task = loop.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
 
     async def send_personal_message(self, message: str, websocket: WebSocket):
         try:
@@ -86,55 +239,89 @@ class ConnectionManager:
         except Exception as e:
             logger.error(f"Error sending personal message: {e}")
 
-    async def broadcast_to_room(self, message: str, room_id: str, exclude_websocket: Optional[WebSocket] = None):
-        if room_id in self.active_connections:
-            for connection in self.active_connections[room_id]:
-                if connection != exclude_websocket:
-                    try:
-                        await connection.send_text(message)
-                    except Exception as e:
-                        logger.error(f"Error broadcasting to room {room_id}: {e}")
-
-    def get_room_connections(self, room_id: str) -> List[WebSocket]:
-        return self.active_connections.get(room_id, [])
-
-    def get_user_connections(self, user_id: str) -> List[WebSocket]:
-        connections = []
-        for room_id in self.user_rooms.get(user_id, []):
-            connections.extend(self.active_connections.get(room_id, []))
-        return connections
-
-manager = ConnectionManager()
-
-# Rate limiting
-class RateLimiter:
-    def __init__(self):
-        self.user_limits: Dict[str, List[datetime]] = {}
-        self.max_messages_per_minute = 30
-        self.cleanup_interval = 60  # seconds
-
-    def is_allowed(self, user_id: str) -> bool:
-        now = datetime.now()
-        minute_ago = now - timedelta(minutes=1)
-        
-        if user_id not in self.user_limits:
-            self.user_limits[user_id] = []
-        
-        # Clean old timestamps
-        self.user_limits[user_id] = [
-            ts for ts in self.user_limits[user_id] 
-            if ts > minute_ago
-        ]
-        
-        # Check if under limit
-        return len(self.user_limits[user_id]) < self.max_messages_per_minute
+    async def broadcast_to_room(self, message: Any, room_id: str, exclude_websocket: Optional[WebSocket] = None):
+        """Send a message (a dict or an already-encoded string) to everyone in the room."""
+        payload = encode_message(message)
+        await self._deliver_local(payload, room_id, exclude_websocket)
+        try:
+            await self.backplane.publish(room_id, payload)
+        except Exception as e:
+            logger.error(f"Error publishing to room {room_id} on backplane: {e}")
 
-    def record_message(self, user_id: str):
-        if user_id not in self.user_limits:
-            self.user_limits[user_id] = []
-        self.user_limits[user_id].append(datetime.now())
+    async def _deliver_from_backplane(self, room_id: str, message: str):
+        if room_id == CONTROL_ROOM:
+            await self._handle_control(json.loads(message))
+            return
+        await self._deliver_local(message, room_id)
 
-rate_limiter = RateLimiter()
+    async def publish_control(self, event: dict):
+        """Apply a control event on this node and send it to every other node."""
+        await self._handle_control(event)
+        try:
+            await self.backplane.publish(CONTROL_ROOM, json.dumps(event))
+        except Exception as e:
+            logger.error(f"Error publishing control event {event.get('type')}: {e}")
+
+    async def _handle_control(self, event: dict):
+        handler = self.control_handlers.get(event.get("type"))
+        if handler is None:
+            return
+        try:
+            await handler(self, event)
+        except Exception as e:
+            logger.error(f"Error handling control event {event.get('type')}: {e}")
+
+    async def _deliver_local(self, payload: str, room_id: str, exclude_websocket: Optional[WebSocket] = None):
+        connections = self.active_connections.get(room_id)
+        if connections:
+            await self.broadcaster.broadcast(room_id, payload, connections, exclude=exclude_websocket)
+
+    async def _drop_slow_consumer(self, websocket: WebSocket):
+        user_id = self.connection_users.get(websocket)
+        logger.warning(f"Disconnecting slow consumer for user {user_id}")
+        self.disconnect(websocket)
+        try:
+            await websocket.close(code=1013, reason="Slow consumer")
+        except Exception:
+            pass
+
+    def get_room_metrics(self, room_id: str) -> dict:
+        return self.broadcaster.metrics(room_id)
+
+    def get_room_connections(self, room_id: str) -> Set[WebSocket]:
+        """This node's sockets in the room (the live set; copy it before disconnecting while iterating)."""
+        return self.active_connections.get(room_id, set())
+
+    def get_user_connections(self, user_id: str) -> Set[WebSocket]:
+        """This node's sockets for the user (the live set)."""
+        return self.user_connections.get(user_id, set())
+
+manager = ConnectionManager(create_backplane())
+
+
+@app.on_event("startup")
+async def _start_backplane():
+    await manager.start()
+
+
+@app.on_event("shutdown")
+async def _stop_backplane():
+    await manager.stop()
+
+# Write-behind message persistence (BatchWriteItem, see message_store.py)
+message_store = create_message_store(get_dynamodb_resource)
+message_history = MessageHistory(get_dynamodb_resource)
+# Acks waiting on a batch write (kept referenced until they complete)
+_pending_acks: Set[asyncio.Task] = set()
+
+
+@app.on_event("shutdown")
+async def _flush_message_store():
+    if message_store is not None:
+        await message_store.stop()
+
+# Rate limiting (GCRA per user, see rate_limit.py)
+rate_limiter = create_rate_limiter()
 
 # -----------------------------------------------------------------------------
 # Emoji parsing utilities
@@ -197,15 +384,9 @@ def verify_token(request: Request) -> dict:
         # Try to decode without strict validation for now
         # The Lambda authorizer has already done full validation
         try:
-            # Get JWT secret from SSM Parameter Store
-            parameter_name = os.getenv("JWT_SECRET_PARAMETER_NAME", "/goalsguild/user-service/JWT_SECRET")
-            ssm_client = boto3.client('ssm')
-            response = ssm_client.get_parameter(Name=parameter_name, WithDecryption=True)
-            secret = response['Parameter']['Value']
-            
             # Decode without strict audience/issuer validation
             # since the authorizer already did this
-            payload = jwt.decode(token, secret, algorithms=["HS256"], options={"verify_aud": False, "verify_iss": False})
+            payload = decode_jwt(token, options={"verify_aud": False, "verify_iss": False})
             logger.info(f"Token validated for user: {payload.get('sub')}")
             return payload
         except jwt.InvalidTokenError as e:
@@ -223,6 +404,25 @@ def verify_token(request: Request) -> dict:
         logger.error(f"Token validation failed: {e}")
         raise HTTPException(status_code=401, detail="Invalid token")
 
+def require_verified_token(request: Request) -> dict:
+    """
+    Like verify_token, but the JWT must verify: no fallback payload. Used by
+    endpoints that return stored room data.
+    """
+    auth_header = request.headers.get('authorization', '')
+    if not auth_header.startswith('Bearer '):
+        raise HTTPException(status_code=401, detail="Missing authorization header")
+    try:
+        payload = decode_jwt(auth_header[7:], options={"verify_aud": False, "verify_iss": False})
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(status_code=401, detail="Token expired")
+    except jwt.InvalidTokenError as e:
+        logger.warning(f"Rejected invalid token: {e}")
+        raise HTTPException(status_code=401, detail="Invalid token")
+    if not payload.get("sub"):
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return payload
+
 # Pydantic models
 class MessageData(BaseModel):
     room_id: str
@@ -289,6 +489,10 @@ async def health_check():
         "status": "healthy",
         "active_connections": sum(len(connections) for connections in manager.active_connections.values()),
         "active_rooms": len(manager.active_connections),
+        "node_id": manager.backplane.node_id,
+        "backplane": manager.backplane.kind,
+        "caches": {"guildMembership": _membership_cache.stats()},
+        "messageStore": message_store.stats() if message_store is not None else None,
         "timestamp": datetime.now().isoformat()
     }
 
@@ -318,8 +522,7 @@ async def websocket_endpoint(websocket: WebSocket, room_id: str, token: str = No
         
         # Decode JWT token
         try:
-            secret = get_jwt_secret()
-            payload = jwt.decode(token, secret, algorithms=["HS256"])
+            payload = decode_jwt(token)
             user_id = payload.get("sub")
             if not user_id:
                 await websocket.close(code=1008, reason="Invalid token")
@@ -345,8 +548,8 @@ async def websocket_endpoint(websocket: WebSocket, room_id: str, token: str = No
                 data = await websocket.receive_text()
                 message_data = json.loads(data)
                 
-                # Rate limiting check
-                if not rate_limiter.is_allowed(user_id):
+                # Rate limiting check (records the message when allowed)
+                if not await rate_limiter.acquire(user_id):
                     await manager.send_personal_message(
                         json.dumps({
                             "type": "error",
@@ -356,9 +559,6 @@ async def websocket_endpoint(websocket: WebSocket, room_id: str, token: str = No
                     )
                     continue
                 
-                # Record message for rate limiting
-                rate_limiter.record_message(user_id)
-                
                 # Process message (in a real implementation, this would call AppSync)
                 await process_message(room_id, user_id, message_data, websocket)
                 
@@ -375,75 +575,217 @@ async def websocket_endpoint(websocket: WebSocket, room_id: str, token: str = No
         except:
             pass
 
-async def validate_guild_membership(user_id: str, guild_room_id: str) -> bool:
+def _guild_id_from_room(guild_room_id: str) -> Optional[str]:
+    """Extract guild_id from a room_id of the form GUILD#{guild_id}."""
+    if not guild_room_id.startswith("GUILD#"):
+        logger.warning(f"Invalid guild room ID format: {guild_room_id}")
+        return None
+    guild_id = guild_room_id.replace("GUILD#", "")
+    if not guild_id:
+        logger.warning(f"Empty guild_id extracted from room_id: {guild_room_id}")
+        return None
+    return guild_id
+
+def _is_active_guild_member_sync(guild_id: str, user_id: str) -> bool:
+    """Read MEMBER#{user_id} under GUILD#{guild_id} from the gg_guild table."""
+    guild_table_name = os.getenv("GUILD_TABLE_NAME", "gg_guild")
+    table = get_dynamodb_resource().Table(guild_table_name)
+    response = table.get_item(
+        Key={
+            "PK": f"GUILD#{guild_id}",
+            "SK": f"MEMBER#{user_id}"
+        }
+    )
+    
+    if "Item" in response:
+        item = response["Item"]
+        # Check if member is active (not removed) and not blocked
+        status = item.get("status", "active")
+        blocked = bool(item.get("is_blocked", False))
+        logger.info(f"User {user_id} is a member of guild {guild_id} with status {status}, blocked={blocked}")
+        return status == "active" and not blocked
+    
+    logger.warning(f"User {user_id} is not a member of guild {guild_id}")
+    return False
+
+async def validate_guild_membership(user_id: str, guild_room_id: str, use_cache: bool = True) -> bool:
     """
     Validate if user is a member of the guild.
     Extracts guild_id from room_id (GUILD#{guild_id}) and queries gg_guild table.
+    Verdicts are cached (denials for a shorter time); see invalidate_guild_membership.
     """
-    try:
-        # Extract guild_id from room_id (format: GUILD#{guild_id})
-        if not guild_room_id.startswith("GUILD#"):
-            logger.warning(f"Invalid guild room ID format: {guild_room_id}")
-            return False
-        
-        guild_id = guild_room_id.replace("GUILD#", "")
-        if not guild_id:
-            logger.warning(f"Empty guild_id extracted from room_id: {guild_room_id}")
-            return False
-        
-        # Query gg_guild table to check membership
-        dynamodb = boto3.resource('dynamodb')
-        guild_table_name = os.getenv("GUILD_TABLE_NAME", "gg_guild")
-        table = dynamodb.Table(guild_table_name)
-        
-        # Check if user is a member (MEMBER#{user_id} under GUILD#{guild_id})
-        response = table.get_item(
-            Key={
-                "PK": f"GUILD#{guild_id}",
-                "SK": f"MEMBER#{user_id}"
-            }
-        )
-        
-        if "Item" in response:
-            item = response["Item"]
-            # Check if member is active (not removed)
-            status = item.get("status", "active")
-            logger.info(f"User {user_id} is a member of guild {guild_id} with status {status}")
-            return status == "active"
-        
-        logger.warning(f"User {user_id} is not a member of guild {guild_id}")
+    guild_id = _guild_id_from_room(guild_room_id)
+    if guild_id is None:
         return False
-        
+    
+    key = (guild_id, user_id)
+    if use_cache:
+        cached = _membership_cache.get(key)
+        if cached is not None:
+            return cached
+    
+    try:
+        loop = asyncio.get_running_loop()
+        is_member = await loop.run_in_executor(None, _is_active_guild_member_sync, guild_id, user_id)
     except Exception as e:
         logger.error(f"Error validating guild membership for user {user_id} in guild {guild_room_id}: {e}")
-        # Fail closed - deny access if validation fails
+        # Fail closed - deny access if validation fails (and don't cache the error)
         return False
+    
+    _membership_cache.set(key, is_member, None if is_member else GUILD_MEMBERSHIP_DENIED_TTL_SECONDS)
+    return is_member
+
+async def validate_room_access(user_id: str, room_id: str) -> bool:
+    """
+    Whether a user may read a room: guild rooms require guild membership;
+    other rooms are open unless stored as private, in which case the user
+    must be the room's creator or listed in its members.
+    """
+    if room_id.startswith("GUILD#"):
+        return await validate_guild_membership(user_id, room_id)
+    # Read errors propagate (unlike get_room_from_db) so a failed lookup never opens a private room
+    key = {"PK": f"ROOM#{room_id}", "SK": f"ROOM#{room_id}"}
+    response = await asyncio.get_event_loop().run_in_executor(None, lambda: get_dynamodb_table().get_item(Key=key))
+    room = response.get("Item")
+    if not room or room.get("is_public", room.get("isPublic", True)):
+        return True
+    return user_id == room.get("createdBy") or user_id in (room.get("members") or [])
+
+def _parse_after(after: Optional[str]) -> Optional[int]:
+    """Epoch ms from the after parameter, which may be epoch ms or an ISO timestamp."""
+    if after is None or after == "":
+        return None
+    try:
+        return int(after)
+    except ValueError:
+        pass
+    try:
+        return int(datetime.fromisoformat(after.replace("Z", "+00:00")).timestamp() * 1000)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="after must be epoch milliseconds or an ISO timestamp")
+
+def invalidate_guild_membership(guild_id: str, user_id: str) -> bool:
+    """Forget the cached verdict for one member on this node; returns whether one was cached."""
+    return _membership_cache.invalidate((guild_id, user_id))
+
+async def _on_guild_membership_revoked(node: ConnectionManager, event: dict):
+    """Control event from any node: a member was removed or blocked."""
+    guild_id, user_id = event.get("guildId"), event.get("userId")
+    if not guild_id or not user_id:
+        return
+    invalidate_guild_membership(guild_id, user_id)
+    room_id = f"GUILD#{guild_id}"
+    for websocket in list(node.get_user_connections(user_id)):
+        if room_id in node.connection_rooms.get(websocket, ()):
+            node.disconnect(websocket)
+            try:
+                await websocket.close(code=1008, reason="Guild access revoked")
+            except Exception:
+                pass
+
+manager.control_handlers["guild_membership_revoked"] = _on_guild_membership_revoked
+
+def persist_message(item: dict) -> Optional[asyncio.Future]:
+    """
+    Queue a message item for the batched write. Returns a future that
+    resolves once it is stored, or None when persistence is disabled.
+    Raises MessageStoreFull when the write buffer is full.
+    """
+    if message_store is None:
+        return None
+    return message_store.enqueue(table_for_room(item["roomId"]), item)
+
+
+async def _acknowledge_when_stored(
+    stored: Optional[asyncio.Future], message: dict, websocket: WebSocket, client_id: Optional[str] = None
+):
+    """Tell the sender whether its message was stored (the ack waits for the batch write)."""
+    ack = {"type": "ack", "id": message["id"], "ts": message["ts"]}
+    if client_id:
+        ack["client_id"] = client_id
+    try:
+        if stored is not None:
+            await stored
+    except Exception as e:
+        logger.error(f"Message {message['id']} could not be stored: {e}")
+        ack = {**ack, "type": "error", "message": "Failed to store message"}
+    try:
+        await manager.send_personal_message(json.dumps(ack), websocket)
+    except Exception:
+        # The sender disconnected before the write completed
+        pass
+
 
 async def process_message(room_id: str, user_id: str, message_data: dict, websocket: WebSocket):
     """
-    Process incoming message and broadcast to room.
-    In a real implementation, this would:
-    1. Save message to DynamoDB via AppSync
-    2. Broadcast to all room subscribers
+    Process incoming message: queue it for storage, broadcast it to the room
+    and acknowledge it to the sender once it is stored.
+
+    The broadcast doesn't wait for the write; messages are stored in batches
+    (see message_store.py) so a busy room costs one BatchWriteItem per 25
+    messages rather than one PutItem each.
     """
     try:
+        try:
+            text = validate_message_text(message_data.get("text", ""))
+        except InvalidMessage as e:
+            await manager.send_personal_message(
+                json.dumps({
+                    "type": "error",
+                    "message": str(e)
+                }),
+                websocket
+            )
+            return
+        found = extract_emojis(text)
+        item = build_message_item(
+            room_id,
+            user_id,
+            text,
+            sender_nickname=message_data.get("senderNickname", ""),
+            reply_to_id=message_data.get("replyToId"),
+            emoji_metadata={
+                "shortcodes": [unicode_to_shortcode(e) for e in found],
+                "unicodeCount": len(found),
+            },
+        )
+
+        try:
+            stored = persist_message(item)
+        except MessageStoreFull:
+            await manager.send_personal_message(
+                json.dumps({
+                    "type": "error",
+                    "message": "Server busy, message not sent. Please retry."
+                }),
+                websocket
+            )
+            return
+
         # Create message object
         message = {
-            "id": f"msg_{datetime.now().timestamp()}",
+            "id": item["id"],
             "room_id": room_id,
             "sender_id": user_id,
-            "text": message_data.get("text", ""),
+            "text": text,
+            "ts": item["ts"],
             "timestamp": datetime.now().isoformat(),
             "type": "message"
         }
-        
+
         # Broadcast to all room connections
         await manager.broadcast_to_room(
-            json.dumps(message),
+            message,
             room_id,
             exclude_websocket=websocket
         )
-        
+
+        ack_task = asyncio.create_task(
+            _acknowledge_when_stored(stored, message, websocket, client_id=message_data.get("clientId"))
+        )
+        _pending_acks.add(ack_task)
+        ack_task.add_done_callback(_pending_acks.discard)
+
         logger.info(f"Message processed for room {room_id} by user {user_id}")
         
     except Exception as e:
@@ -467,6 +809,16 @@ async def get_room_connections(room_id: str, request: Request, token: dict = Dep
         "timestamp": datetime.now().isoformat()
     }
 
+@app.get("/rooms/{room_id}/metrics")
+async def get_room_metrics(room_id: str, request: Request, token: dict = Depends(verify_token)):
+    """Get delivery metrics for a room on this node"""
+    return {
+        "room_id": room_id,
+        "active_connections": len(manager.get_room_connections(room_id)),
+        "delivery": manager.get_room_metrics(room_id),
+        "timestamp": datetime.now().isoformat()
+    }
+
 @app.get("/users/{user_id}/connections")
 async def get_user_connections(user_id: str, request: Request, token: dict = Depends(verify_token)):
     """Get active connections for a user"""
@@ -488,11 +840,9 @@ async def broadcast_message(
     user_id = token.get("sub")
     
     # Rate limiting
-    if not rate_limiter.is_allowed(user_id):
+    if not await rate_limiter.acquire(user_id):
         raise HTTPException(status_code=429, detail="Rate limit exceeded")
     
-    rate_limiter.record_message(user_id)
-    
     # Create message
     message = {
         "id": f"msg_{datetime.now().timestamp()}",
@@ -508,7 +858,7 @@ async def broadcast_message(
     }
     
     # Broadcast to room
-    await manager.broadcast_to_room(json.dumps(message), room_id)
+    await manager.broadcast_to_room(message, room_id)
     
     return {"status": "broadcasted", "message_id": message["id"]}
 
@@ -520,19 +870,16 @@ async def list_rooms(request: Request, token: dict = Depends(verify_token)):
     
     # In a real implementation, this would query DynamoDB for user's rooms
     # For now, return mock data
-    def count_members(room_id: str) -> int:
-        # Prefer HTTP presence (user_rooms) to avoid WS dependency
-        try:
-            return sum(1 for uid, rooms in manager.user_rooms.items() if room_id in rooms)
-        except Exception:
-            return len(manager.get_room_connections(room_id))
+    async def count_members(room_id: str) -> int:
+        # Presence covers HTTP joins and WebSockets on every node
+        return len(await manager.get_room_presence(room_id))
 
     rooms = [{
         "id": "ROOM-general",
         "name": "General Chat",
         "type": "general",
         "description": "General discussion room",
-        "member_count": count_members("ROOM-general"),
+        "member_count": await count_members("ROOM-general"),
         "created_at": datetime.now().isoformat(),
         "updated_at": datetime.now().isoformat()
     }]
@@ -569,11 +916,8 @@ async def get_room(room_id: str, request: Request, token: dict = Depends(verify_
     # Try to get from DynamoDB first
     db_room = await get_room_from_db(room_id)
     
-    # Get member count from active connections
-    try:
-        member_count = sum(1 for uid, rooms in manager.user_rooms.items() if room_id in rooms)
-    except Exception:
-        member_count = len(manager.get_room_connections(room_id))
+    # Get member count from presence across all nodes
+    member_count = len(await manager.get_room_presence(room_id))
     
     if db_room:
         # Return room from database with updated member count
@@ -697,10 +1041,7 @@ async def update_room_settings(room_id: str, settings: RoomSettingsUpdate, reque
         logger.warning(f"Failed to save room settings to DynamoDB for {room_id}, but continuing with response")
     
     # Get member count for response
-    try:
-        member_count = sum(1 for uid, rooms in manager.user_rooms.items() if room_id in rooms)
-    except Exception:
-        member_count = len(manager.get_room_connections(room_id))
+    member_count = len(await manager.get_room_presence(room_id))
     
     # Return updated room info
     room_info = {
@@ -727,33 +1068,52 @@ async def delete_room(room_id: str, request: Request, token: dict = Depends(veri
     
     # In a real implementation, this would delete from DynamoDB
     # Disconnect all users from the room
-    connections = manager.get_room_connections(room_id)
-    for connection in connections:
+    for connection in list(manager.get_room_connections(room_id)):
         manager.disconnect(connection)
     
     logger.info(f"Room deleted: {room_id} by user {user_id}")
     return {"status": "deleted", "room_id": room_id}
 
 @app.get("/messaging/rooms/{room_id}/messages")
-async def get_messages(room_id: str, request: Request, token: dict = Depends(verify_token), limit: int = 50, after: Optional[str] = None):
-    """Get messages from a room"""
+async def get_messages(
+    room_id: str,
+    request: Request,
+    token: dict = Depends(require_verified_token),
+    limit: int = 50,
+    after: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_reactions: bool = True,
+):
+    """
+    Get a page of messages from a room, newest first (see message_history.py).
+    Pass the returned nextCursor as cursor to load older messages; after (epoch
+    ms or an ISO timestamp) returns only messages newer than that.
+    """
     user_id = token.get("sub")
-    
-    # In a real implementation, this would query DynamoDB
-    # For now, return mock data
-    messages = [
-        {
-            "id": f"msg_{int(datetime.now().timestamp())}",
-            "room_id": room_id,
-            "sender_id": user_id,
-            "text": f"Welcome to {room_id}!",
-            "ts": int(datetime.now().timestamp()),
-            "created_at": datetime.now().isoformat(),
-            "emojiMetadata": {"shortcodes": [], "unicodeCount": 0}
-        }
-    ]
-    
-    return {"messages": messages[:limit]}
+    after_ms = _parse_after(after)
+
+    if not await validate_room_access(user_id, room_id):
+        detail = "Guild access denied" if room_id.startswith("GUILD#") else "Room access denied"
+        raise HTTPException(status_code=403, detail=detail)
+
+    loop = asyncio.get_event_loop()
+    try:
+        return await loop.run_in_executor(
+            None,
+            lambda: message_history.get_page(
+                room_id,
+                limit=limit,
+                cursor=cursor,
+                after=after_ms,
+                viewer_id=user_id,
+                include_reactions=include_reactions,
+            ),
+        )
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    except Exception as e:
+        logger.error(f"Failed to load messages for room {room_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to load messages")
 
 @app.post("/messaging/rooms/{room_id}/messages")
 async def send_message_to_room(room_id: str, message_data: MessageRequest, request: Request, token: dict = Depends(verify_token)):
@@ -761,9 +1121,14 @@ async def send_message_to_room(room_id: str, message_data: MessageRequest, reque
     user_id = token.get("sub")
     
     # Rate limiting
-    if not rate_limiter.is_allowed(user_id):
+    if not await rate_limiter.acquire(user_id):
         raise HTTPException(status_code=429, detail="Rate limit exceeded")
     
+    try:
+        validate_message_text(message_data.text)
+    except InvalidMessage as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     # Get room settings to validate message length
     existing_room = await get_room_from_db(room_id)
     if existing_room:
@@ -774,29 +1139,40 @@ async def send_message_to_room(room_id: str, message_data: MessageRequest, reque
                 detail=f"Message exceeds maximum length of {max_length} characters. Current length: {len(message_data.text)}"
             )
     
-    rate_limiter.record_message(user_id)
-    
     # Create message
     # Extract emoji metadata
     found = extract_emojis(message_data.text)
+    emoji_metadata = {
+        "shortcodes": [unicode_to_shortcode(e) for e in found],
+        "unicodeCount": len(found)
+    }
+    item = build_message_item(room_id, user_id, message_data.text, emoji_metadata=emoji_metadata)
     message = {
-        "id": f"msg_{int(datetime.now().timestamp())}",
+        "id": item["id"],
         "room_id": room_id,
         "sender_id": user_id,
         "text": message_data.text,
-        "ts": int(datetime.now().timestamp()),
+        "ts": item["ts"],
         "created_at": datetime.now().isoformat(),
-        "emojiMetadata": {
-            "shortcodes": [unicode_to_shortcode(e) for e in found],
-            "unicodeCount": len(found)
-        }
+        "emojiMetadata": emoji_metadata
     }
+
+    # Store before responding; the write shares a batch with concurrent messages
+    try:
+        stored = persist_message(item)
+        if stored is not None:
+            await stored
+    except MessageStoreFull:
+        raise HTTPException(status_code=503, detail="Server busy, please retry")
+    except Exception as e:
+        logger.error(f"Failed to store message for room {room_id}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to store message")
     
     # Broadcast to room connections
-    await manager.broadcast_to_room(json.dumps({
+    await manager.broadcast_to_room({
         "type": "message",
         "data": message
-    }), room_id)
+    }, room_id)
     
     logger.info(f"Message sent to room {room_id} by user {user_id}")
     return message
@@ -808,12 +1184,9 @@ async def join_room(room_id: str, request: Request, token: dict = Depends(verify
     
     # Track HTTP presence to support active member counts without WS
     try:
-        if user_id not in manager.user_rooms:
-            manager.user_rooms[user_id] = []
-        if room_id not in manager.user_rooms[user_id]:
-            manager.user_rooms[user_id].append(room_id)
-    except Exception:
-        pass
+        await manager.join_room(room_id, user_id)
+    except Exception as e:
+        logger.error(f"Error recording presence for user {user_id} in room {room_id}: {e}")
     logger.info(f"User {user_id} joined room {room_id}")
     
     return {"status": "joined", "room_id": room_id, "user_id": user_id}
@@ -825,32 +1198,59 @@ async def leave_room(room_id: str, request: Request, token: dict = Depends(verif
     
     # Update HTTP presence
     try:
-        if user_id in manager.user_rooms:
-            manager.user_rooms[user_id] = [r for r in manager.user_rooms[user_id] if r != room_id]
-            if not manager.user_rooms[user_id]:
-                del manager.user_rooms[user_id]
-    except Exception:
-        pass
+        await manager.leave_room(room_id, user_id)
+    except Exception as e:
+        logger.error(f"Error removing presence for user {user_id} in room {room_id}: {e}")
     logger.info(f"User {user_id} left room {room_id}")
     
     return {"status": "left", "room_id": room_id, "user_id": user_id}
 
-def get_jwt_secret() -> str:
-    """Get JWT secret from SSM Parameter Store or environment variable"""
+@app.post("/messaging/guilds/{guild_id}/members/{user_id}/revoke")
+async def revoke_guild_member(guild_id: str, user_id: str, token: dict = Depends(require_verified_token)):
+    """
+    Re-check a guild member after they were removed or blocked. If they are no
+    longer an active member, every node drops its cached verdict and closes the
+    member's sockets in the guild room.
+
+    Only guild-service calls this, with a service token (token_use=service).
+    """
+    if token.get("token_use") != "service":
+        raise HTTPException(status_code=403, detail="Service token required")
+    invalidate_guild_membership(guild_id, user_id)
+    if await validate_guild_membership(user_id, f"GUILD#{guild_id}", use_cache=False):
+        return {"status": "member", "guild_id": guild_id, "user_id": user_id}
+    
+    await manager.publish_control({"type": "guild_membership_revoked", "guildId": guild_id, "userId": user_id})
+    logger.info(f"Guild membership of user {user_id} in guild {guild_id} revoked by {token.get('sub')}")
+    return {"status": "revoked", "guild_id": guild_id, "user_id": user_id}
+
+def get_jwt_secret(force_refresh: bool = False) -> str:
+    """Get JWT secret from SSM Parameter Store (cached) or environment variable"""
+    parameter_name = os.getenv("JWT_SECRET_PARAMETER_NAME", "/goalsguild/user-service/JWT_SECRET")
+    if not force_refresh:
+        secret = _jwt_secret_cache.get(parameter_name)
+        if secret is not None:
+            return secret
     try:
-        parameter_name = os.getenv("JWT_SECRET_PARAMETER_NAME", "/goalsguild/user-service/JWT_SECRET")
-        ssm_client = boto3.client('ssm')
-        response = ssm_client.get_parameter(Name=parameter_name, WithDecryption=True)
-        return response['Parameter']['Value']
+        response = get_ssm_client().get_parameter(Name=parameter_name, WithDecryption=True)
+        secret = response['Parameter']['Value']
+        _jwt_secret_cache.set(parameter_name, secret)
+        return secret
     except Exception as e:
         logger.warning(f"Failed to get JWT secret from SSM, using env var: {e}")
         return os.getenv("JWT_SECRET", "fallback-secret-key")
 
+def decode_jwt(token: str, **kwargs) -> dict:
+    """Decode an HS256 token, re-reading the secret once if the signature doesn't match (rotation)."""
+    try:
+        return jwt.decode(token, get_jwt_secret(), algorithms=["HS256"], **kwargs)
+    except jwt.InvalidSignatureError:
+        return jwt.decode(token, get_jwt_secret(force_refresh=True), algorithms=["HS256"], **kwargs)
+
 def get_dynamodb_table():
     """Get DynamoDB table instance"""
-    dynamodb = boto3.resource('dynamodb')
     table_name = os.getenv("DYNAMODB_TABLE_NAME", "gg_core")
-    return dynamodb.Table(table_name)
+    return get_dynamodb_resource().Table(table_name)
 
 def _get_room_from_db_sync(room_id: str) -> Optional[dict]:
     """Get room from DynamoDB (synchronous)"""
@@ -927,9 +1327,7 @@ async def get_user_profile(user_id: str) -> Optional[dict]:
     """Get user profile from DynamoDB or user service"""
     try:
         # Try to get from DynamoDB directly (core table)
-        dynamodb = boto3.resource('dynamodb')
-        table_name = os.getenv("DYNAMODB_TABLE_NAME", "gg_core")
-        table = dynamodb.Table(table_name)
+        table = get_dynamodb_table()
         
         response = table.get_item(
             Key={
@@ -964,15 +1362,11 @@ async def get_room_members(room_id: str, request: Request, token: dict = Depends
     
     members = []
     
-    # Get all users who have joined this room (via HTTP presence or WebSocket)
-    user_ids_in_room = set()
-    
-    # From HTTP presence tracking
-    for uid, rooms in manager.user_rooms.items():
-        if room_id in rooms:
-            user_ids_in_room.add(uid)
+    # Get all users who have joined this room (via HTTP presence or WebSocket, on any node)
+    online_user_ids = await manager.get_room_presence(room_id)
+    user_ids_in_room = set(online_user_ids)
     
-    # From WebSocket connections
+    # From WebSocket connections on this node
     connections = manager.get_room_connections(room_id)
     for connection in connections:
         if connection in manager.connection_users:
@@ -983,12 +1377,8 @@ async def get_room_members(room_id: str, request: Request, token: dict = Depends
         try:
             profile = await get_user_profile(member_user_id)
             if profile:
-                # Check if user is online (has active WebSocket connection)
-                is_online = any(
-                    conn in manager.get_room_connections(room_id) 
-                    and manager.connection_users.get(conn) == member_user_id
-                    for conn in manager.get_room_connections(room_id)
-                ) or (member_user_id in manager.user_rooms and room_id in manager.user_rooms[member_user_id])
+                # Check if user is online (present on any node)
+                is_online = member_user_id in online_user_ids
                 
                 # Determine role (in a real implementation, this would check room/guild permissions)
                 role = "member"
@@ -1009,7 +1399,7 @@ async def get_room_members(room_id: str, request: Request, token: dict = Depends
         except Exception as e:
             logger.error(f"Error getting profile for user {member_user_id}: {e}")
             # Still add member with minimal info
-            is_online = member_user_id in manager.user_rooms and room_id in manager.user_rooms.get(member_user_id, [])
+            is_online = member_user_id in online_user_ids
             members.append(RoomMember(
                 userId=member_user_id,
                 username=f"User {member_user_id[:8]}",
@@ -0,0 +1,189 @@
+"""
+Room history reads with opaque cursors.
+
+Messages are stored under the room's partition with time-ordered sort keys
+(``MSG#{ts}#{id}``, see message_store.py), so a page is one Query read
+newest first, and the cursor is the last sort key of the previous page.
+Reactions for the page come from per-message rollup items
+(``MSG#{id}`` / ``SUMMARY#REACTIONS``, kept by the AppSync reaction
+resolvers) in one BatchGetItem, and whether the viewer reacted comes from a
+second BatchGetItem over their ``REACT#{shortcode}#{userId}`` items. A page
+therefore costs three round trips however busy the room is.
+"""
+
+import base64
+import json
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from .message_store import table_for_room
+except ImportError:  # loaded as a top-level module (app/ on sys.path)
+    from message_store import table_for_room
+
+logger = logging.getLogger(__name__)
+
+MAX_PAGE_SIZE = 100
+# BatchGetItem accepts at most 100 keys per request
+BATCH_GET_MAX_KEYS = 100
+REACTION_ROLLUP_SK = "SUMMARY#REACTIONS"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(sort_key: str) -> str:
+    """Opaque cursor for the page that starts after ``sort_key``."""
+    return base64.urlsafe_b64encode(json.dumps({"sk": sort_key}).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_key = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())["sk"]
+    except Exception as e:
+        raise InvalidCursor("Invalid cursor") from e
+    if not isinstance(sort_key, str) or not sort_key.startswith("MSG#"):
+        raise InvalidCursor("Invalid cursor")
+    return sort_key
+
+
+def reactions_table_name() -> str:
+    # Reactions live in the core table for every room, guild rooms included
+    return os.getenv("DYNAMODB_TABLE_NAME", "gg_core")
+
+
+class MessageHistory:
+    """Reads pages of room history; ``resource_factory`` returns a boto3 DynamoDB resource."""
+
+    def __init__(self, resource_factory: Callable[[], Any], max_attempts: int = 4, retry_base_delay: float = 0.05):
+        self._resource_factory = resource_factory
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+
+    def get_page(
+        self,
+        room_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        after: Optional[int] = None,
+        viewer_id: Optional[str] = None,
+        include_reactions: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Newest-first page of ``room_id``. ``cursor`` continues from a previous
+        page's ``nextCursor``; ``after`` (epoch ms) only returns newer messages.
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        items, last_sort_key = self._query(room_id, limit, cursor, after)
+        messages = [self._to_message(item, room_id) for item in items]
+        if include_reactions:
+            reactions = self.get_reactions([m["id"] for m in messages], viewer_id)
+            for message in messages:
+                message["reactions"] = reactions.get(message["id"], [])
+        return {
+            "messages": messages,
+            "nextCursor": encode_cursor(last_sort_key) if last_sort_key else None,
+        }
+
+    def _query(self, room_id: str, limit: int, cursor: Optional[str], after: Optional[int]) -> Tuple[List[dict], Optional[str]]:
+        from boto3.dynamodb.conditions import Key
+
+        if after is not None:
+            # A range on the sort key rather than a filter, so Limit only counts matching messages
+            key_condition = Key("PK").eq(room_id) & Key("SK").between(f"MSG#{int(after) + 1}", "MSG$")
+        else:
+            key_condition = Key("PK").eq(room_id) & Key("SK").begins_with("MSG#")
+        params: Dict[str, Any] = {
+            "KeyConditionExpression": key_condition,
+            "ScanIndexForward": False,
+            "Limit": limit,
+        }
+        if cursor:
+            params["ExclusiveStartKey"] = {"PK": room_id, "SK": decode_cursor(cursor)}
+        response = self._resource_factory().Table(table_for_room(room_id)).query(**params)
+        last_key = response.get("LastEvaluatedKey")
+        return response.get("Items", []), (last_key["SK"] if last_key else None)
+
+    def get_reactions(self, message_ids: List[str], viewer_id: Optional[str] = None) -> Dict[str, List[dict]]:
+        """Reaction summaries per message id, with ``viewerHasReacted`` for ``viewer_id``."""
+        if not message_ids:
+            return {}
+        table_name = reactions_table_name()
+        rollups = self._batch_get(
+            table_name, [{"PK": f"MSG#{message_id}", "SK": REACTION_ROLLUP_SK} for message_id in message_ids]
+        )
+
+        summaries: Dict[str, List[Tuple[str, str, int]]] = {}
+        for item in rollups:
+            entries = []
+            for name, value in item.items():
+                if not name.startswith("count#") or int(value) <= 0:
+                    continue
+                shortcode = name[len("count#"):]
+                entries.append((shortcode, item.get(f"unicode#{shortcode}", ""), int(value)))
+            summaries[item["PK"][len("MSG#"):]] = sorted(entries, key=lambda entry: (-entry[2], entry[0]))
+
+        reacted = set()
+        if viewer_id:
+            viewer_keys = [
+                {"PK": f"MSG#{message_id}", "SK": f"REACT#{shortcode}#{viewer_id}"}
+                for message_id, entries in summaries.items()
+                for shortcode, _, _ in entries
+            ]
+            reacted = {(item["PK"], item["SK"]) for item in self._batch_get(table_name, viewer_keys, "PK, SK")}
+
+        return {
+            message_id: [
+                {
+                    "shortcode": shortcode,
+                    "unicode": unicode,
+                    "count": count,
+                    "viewerHasReacted": (f"MSG#{message_id}", f"REACT#{shortcode}#{viewer_id}") in reacted,
+                }
+                for shortcode, unicode, count in entries
+            ]
+            for message_id, entries in summaries.items()
+        }
+
+    def _batch_get(self, table_name: str, keys: List[dict], projection: Optional[str] = None) -> List[dict]:
+        items: List[dict] = []
+        resource = self._resource_factory()
+        for start in range(0, len(keys), BATCH_GET_MAX_KEYS):
+            request: Dict[str, Any] = {"Keys": keys[start:start + BATCH_GET_MAX_KEYS]}
+            if projection:
+                request["ProjectionExpression"] = projection
+            for attempt in range(self.max_attempts):
+                if attempt:
+                    time.sleep(self.retry_base_delay * (2 ** (attempt - 1)))
+                response = resource.batch_get_item(RequestItems={table_name: request})
+                items.extend(response.get("Responses", {}).get(table_name, []))
+                unprocessed = response.get("UnprocessedKeys", {}).get(table_name)
+                if not unprocessed:
+                    break
+                request = unprocessed
+            else:
+                logger.warning(f"{len(request.get('Keys', []))} keys still unprocessed after {self.max_attempts} attempts")
+        return items
+
+    @staticmethod
+    def _to_message(item: dict, room_id: str) -> dict:
+        metadata = item.get("emojiMetadata") or {}
+        message = {
+            "id": item.get("id"),
+            "room_id": item.get("roomId", room_id),
+            "sender_id": item.get("senderId"),
+            "sender_nickname": item.get("senderNickname"),
+            "text": item.get("text", ""),
+            "ts": int(item.get("ts", 0)),
+            "emojiMetadata": {
+                "shortcodes": list(metadata.get("shortcodes", [])),
+                "unicodeCount": int(metadata.get("unicodeCount", 0)),
+            },
+        }
+        if item.get("replyToId"):
+            message["reply_to_id"] = item["replyToId"]
+        return message
@@ -0,0 +1,281 @@
+"""
+Write-behind persistence for room messages.
+
+``process_message`` hands each message to a ``MessageWriteBuffer`` and
+broadcasts it straight away; the buffer collects messages from every
+connection on this node and writes them with ``BatchWriteItem`` (up to 25
+puts per call) once ``batch_size`` messages are waiting or ``flush_interval``
+seconds have passed since the first one arrived. ``enqueue`` returns a future
+that resolves when the message is stored, which is when the sender gets its
+``ack``; if the write ultimately fails the future carries the error and the
+sender is told instead.
+
+Items use the layout the AppSync resolvers read and write
+(``PK = roomId, SK = MSG#{ts}#{id}``), with ``GUILD#`` rooms in the guild
+table and every other room in the core table.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# DynamoDB's per-request limit for BatchWriteItem
+MAX_BATCH_SIZE = 25
+
+# Same limit the AppSync sendMessage resolver enforces
+MAX_MESSAGE_LENGTH = 10000
+
+# BatchWriteItem errors worth retrying; anything else (e.g. ValidationException) won't succeed on a retry
+RETRYABLE_ERROR_CODES = frozenset({
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+})
+
+
+class MessageStoreFull(Exception):
+    """Raised by ``enqueue`` when ``max_pending`` messages are already waiting to be written."""
+
+
+class InvalidMessage(ValueError):
+    """Raised by ``validate_message_text`` for empty or oversized message text."""
+
+
+def validate_message_text(text: Any) -> str:
+    """
+    Check message text before it is queued, so one bad item can't fail the
+    ``BatchWriteItem`` it would share with other senders' messages.
+    """
+    if not isinstance(text, str) or not text.strip():
+        raise InvalidMessage("Message text is required")
+    if len(text) > MAX_MESSAGE_LENGTH:
+        raise InvalidMessage(f"Message exceeds maximum length of {MAX_MESSAGE_LENGTH} characters")
+    return text
+
+
+def _error_code(error: BaseException) -> Optional[str]:
+    """The DynamoDB error code of a botocore ``ClientError``, if it is one."""
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        return response.get("Error", {}).get("Code")
+    return None
+
+
+def build_message_item(
+    room_id: str,
+    sender_id: str,
+    text: str,
+    sender_nickname: str = "",
+    reply_to_id: Optional[str] = None,
+    emoji_metadata: Optional[dict] = None,
+    message_id: Optional[str] = None,
+    ts: Optional[int] = None,
+) -> dict:
+    """Build a message item in the ``MSG#`` layout used by the AppSync ``sendMessage`` resolver."""
+    message_id = message_id or str(uuid.uuid4())
+    ts = ts if ts is not None else int(time.time() * 1000)
+    item = {
+        "PK": room_id,
+        "SK": f"MSG#{ts}#{message_id}",
+        "type": "Message",
+        "id": message_id,
+        "roomId": room_id,
+        "senderId": sender_id,
+        "senderNickname": sender_nickname or "",
+        "text": text,
+        "ts": ts,
+        "roomType": "guild" if room_id.startswith("GUILD#") else "general",
+        "emojiMetadata": emoji_metadata or {"shortcodes": [], "unicodeCount": 0},
+    }
+    if reply_to_id:
+        item["replyToId"] = reply_to_id
+    return item
+
+
+def table_for_room(room_id: str) -> str:
+    """Table a room's messages live in (same split as the AppSync resolvers)."""
+    if room_id.startswith("GUILD#"):
+        return os.getenv("GUILD_TABLE_NAME", "gg_guild")
+    return os.getenv("DYNAMODB_TABLE_NAME", "gg_core")
+
+
+class DynamoDBBatchWriter:
+    """Writes one ``BatchWriteItem`` request and returns the items DynamoDB left unprocessed."""
+
+    def __init__(self, resource_factory: Callable[[], Any]):
+        self._resource_factory = resource_factory
+
+    def __call__(self, items_by_table: Dict[str, List[dict]]) -> Dict[str, List[dict]]:
+        response = self._resource_factory().batch_write_item(
+            RequestItems={
+                table: [{"PutRequest": {"Item": item}} for item in items]
+                for table, items in items_by_table.items()
+            }
+        )
+        return {
+            table: [request["PutRequest"]["Item"] for request in requests if "PutRequest" in request]
+            for table, requests in (response.get("UnprocessedItems") or {}).items()
+        }
+
+
+class MessageWriteBuffer:
+    """
+    Buffers message items and writes them in batches.
+
+    ``writer`` is called from a worker thread with ``{table: [item, ...]}``
+    (at most ``MAX_BATCH_SIZE`` items in total) and returns whatever is left
+    unprocessed; those items, and batches rejected with a throttling error,
+    are retried with exponential backoff up to ``max_attempts`` times. A
+    batch rejected with ``ValidationException`` is rewritten one item per
+    request so only the offending message fails.
+    """
+
+    def __init__(
+        self,
+        writer: Callable[[Dict[str, List[dict]]], Dict[str, List[dict]]],
+        batch_size: int = MAX_BATCH_SIZE,
+        flush_interval: float = 0.05,
+        max_pending: int = 10000,
+        max_attempts: int = 5,
+        retry_base_delay: float = 0.05,
+    ):
+        self.writer = writer
+        self.batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self._pending: List[Tuple[str, dict, asyncio.Future]] = []
+        self._in_flight = 0
+        self._full: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._writes: Set[asyncio.Task] = set()
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+
+    def enqueue(self, table: str, item: dict) -> asyncio.Future:
+        """Queue ``item`` for ``table``; the returned future resolves once it is stored."""
+        if len(self._pending) + self._in_flight >= self.max_pending:
+            raise MessageStoreFull(f"{self.max_pending} messages are already waiting to be written")
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((table, item, future))
+        if self._full is None:
+            self._full = asyncio.Event()
+        if len(self._pending) >= self.batch_size:
+            self._full.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return future
+
+    async def _run(self):
+        while self._pending:
+            if len(self._pending) < self.batch_size:
+                self._full.clear()
+                try:
+                    await asyncio.wait_for(self._full.wait(), timeout=self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._start_writes()
+
+    def _start_writes(self):
+        # Batches are written concurrently so one slow retry doesn't hold up the next batch
+        entries, self._pending = self._pending, []
+        for i in range(0, len(entries), self.batch_size):
+            batch = entries[i:i + self.batch_size]
+            self._in_flight += len(batch)
+            task = asyncio.create_task(self._write_batch(batch))
+            self._writes.add(task)
+            task.add_done_callback(self._writes.discard)
+
+    async def flush(self):
+        """Write everything queued so far and wait for every outstanding write."""
+        self._start_writes()
+        if self._writes:
+            await asyncio.gather(*list(self._writes), return_exceptions=True)
+
+    async def _write_batch(self, batch: List[Tuple[str, dict, asyncio.Future]]):
+        try:
+            await self._write_with_retries(batch)
+        finally:
+            self._in_flight -= len(batch)
+
+    async def _write_with_retries(self, batch: List[Tuple[str, dict, asyncio.Future]]):
+        # (table, SK) identifies an item within a batch; the SK embeds a unique message id
+        entries = {(table, item["SK"]): (table, item, future) for table, item, future in batch}
+        waiting = {key: future for key, (_, _, future) in entries.items()}
+        remaining: Dict[str, List[dict]] = {}
+        for table, item, _ in batch:
+            remaining.setdefault(table, []).append(item)
+        self.batches += 1
+
+        error: Optional[BaseException] = None
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_attempts):
+            if attempt:
+                await asyncio.sleep(self.retry_base_delay * (2 ** (attempt - 1)))
+            try:
+                unprocessed = await loop.run_in_executor(None, self.writer, remaining)
+            except Exception as e:
+                error = e
+                code = _error_code(e)
+                if code == "ValidationException" and len(waiting) > 1:
+                    # DynamoDB doesn't say which item it rejected; write them separately to find it
+                    logger.warning(f"Message batch rejected ({e}); retrying {len(waiting)} item(s) one by one")
+                    await asyncio.gather(*(self._write_with_retries([entries[key]]) for key in waiting))
+                    return
+                if code not in RETRYABLE_ERROR_CODES:
+                    break
+                # The whole request was throttled; retry all of it
+                logger.warning(f"Message batch write failed (attempt {attempt + 1}/{self.max_attempts}): {e}")
+                continue
+            left = {(table, item["SK"]) for table, items in unprocessed.items() for item in items}
+            for key, future in waiting.items():
+                if key not in left and not future.done():
+                    future.set_result(None)
+                    self.written += 1
+            waiting = {key: future for key, future in waiting.items() if key in left}
+            if not waiting:
+                return
+            remaining = unprocessed
+            error = None
+
+        error = error or RuntimeError("DynamoDB left the messages unprocessed after every retry")
+        logger.error(f"Dropping {len(waiting)} message(s): {error}")
+        for future in waiting.values():
+            if not future.done():
+                future.set_exception(error)
+                self.failed += 1
+
+    async def stop(self):
+        """Write out anything still buffered (called on shutdown)."""
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "inFlight": self._in_flight,
+            "written": self.written,
+            "failed": self.failed,
+            "batches": self.batches,
+        }
+
+
+def create_message_store(resource_factory: Callable[[], Any]) -> Optional[MessageWriteBuffer]:
+    """
+    Build the buffer configured by the environment, or ``None`` when
+    ``MESSAGING_PERSIST_MESSAGES`` is ``false``.
+    """
+    if os.getenv("MESSAGING_PERSIST_MESSAGES", "true").lower() in ("0", "false", "no"):
+        return None
+    return MessageWriteBuffer(
+        DynamoDBBatchWriter(resource_factory),
+        batch_size=int(os.getenv("MESSAGING_WRITE_BATCH_SIZE", str(MAX_BATCH_SIZE))),
+        flush_interval=float(os.getenv("MESSAGING_WRITE_FLUSH_MS", "50")) / 1000,
+        max_pending=int(os.getenv("MESSAGING_WRITE_MAX_PENDING", "10000")),
+    )
@@ -0,0 +1,158 @@
+"""
+Per-user message rate limiting with constant memory per user.
+
+Uses GCRA (the generic cell rate algorithm, equivalent to a token bucket):
+each user has a single "theoretical arrival time" (TAT). A message is allowed
+when the TAT is no more than the burst tolerance ahead of now, and recording
+it pushes the TAT forward by one emission interval (``60 / limit`` seconds).
+A user whose TAT is in the past is indistinguishable from a new user, so idle
+entries are evicted by a periodic sweep, and ``max_keys`` caps memory outright.
+
+By default the state lives in the process. With ``MESSAGING_RATE_LIMIT_URL``
+(``redis://...``) the check-and-record runs atomically in Redis so the limit
+holds across replicas; the local limiter takes over if Redis is unavailable.
+"""
+
+import logging
+import math
+import os
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class RedisRateLimitStore:
+    """GCRA state in Redis: one key per user that expires when the user goes idle."""
+
+    KEY_PREFIX = "messaging:ratelimit:"
+
+    # KEYS[1] = user key, ARGV[1] = emission interval (ms), ARGV[2] = burst tolerance (ms)
+    # Returns {allowed, retry_after_ms}. Uses the Redis clock so every replica agrees.
+    GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+  tat = now
+end
+if tat - now > tolerance then
+  return {0, tat - now - tolerance}
+end
+local new_tat = tat + interval
+redis.call('SET', KEYS[1], new_tat, 'PX', new_tat - now)
+return {1, 0}
+"""
+
+    def __init__(self, url: Optional[str] = None, client=None):
+        if client is None:
+            try:
+                import redis.asyncio as redis_asyncio
+            except ImportError as e:
+                raise RuntimeError("The redis package is required for the shared messaging rate limit") from e
+            client = redis_asyncio.from_url(url)
+        self.redis = client
+        self._script = client.register_script(self.GCRA_SCRIPT)
+
+    async def acquire(self, key: str, interval: float, tolerance: float) -> Tuple[bool, float]:
+        allowed, retry_after_ms = await self._script(
+            keys=[f"{self.KEY_PREFIX}{key}"],
+            args=[int(interval * 1000), int(tolerance * 1000)],
+        )
+        return bool(allowed), int(retry_after_ms) / 1000
+
+
+class RateLimiter:
+    """
+    Allows ``max_messages_per_minute`` messages per user on average, with
+    bursts of up to ``burst`` messages (defaults to the per-minute limit).
+    """
+
+    def __init__(
+        self,
+        max_messages_per_minute: int = 30,
+        burst: Optional[int] = None,
+        store: Optional[RedisRateLimitStore] = None,
+        max_keys: int = 100000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_messages_per_minute = max_messages_per_minute
+        self.burst = burst or max_messages_per_minute
+        self.emission_interval = 60.0 / max_messages_per_minute
+        self.burst_tolerance = self.emission_interval * (self.burst - 1)
+        self.cleanup_interval = 60  # seconds
+        self.max_keys = max_keys
+        self.store = store
+        self._clock = clock
+        self._next_cleanup = clock() + self.cleanup_interval
+        # user_id -> theoretical arrival time (clock seconds)
+        self.user_limits: Dict[str, float] = {}
+
+    def is_allowed(self, user_id: str) -> bool:
+        """Whether the next message would be allowed (does not record it)."""
+        return self.retry_after(user_id) == 0
+
+    def retry_after(self, user_id: str) -> float:
+        """Seconds until the user may send again (0 when they may send now)."""
+        now = self._clock()
+        tat = self.user_limits.get(user_id, now)
+        return max(0.0, tat - now - self.burst_tolerance)
+
+    def remaining(self, user_id: str) -> int:
+        """Messages the user can send right now."""
+        now = self._clock()
+        used = max(0.0, self.user_limits.get(user_id, now) - now)
+        return max(0, math.floor((self.burst_tolerance - used) / self.emission_interval) + 1)
+
+    def record_message(self, user_id: str):
+        now = self._clock()
+        self._maybe_cleanup(now)
+        tat = max(self.user_limits.get(user_id, now), now)
+        if user_id not in self.user_limits and len(self.user_limits) >= self.max_keys:
+            self._cleanup(now)
+            if len(self.user_limits) >= self.max_keys:
+                # Oldest inserted first; forgetting a user only makes the limit more lenient for them
+                del self.user_limits[next(iter(self.user_limits))]
+        self.user_limits[user_id] = tat + self.emission_interval
+
+    def try_acquire(self, user_id: str) -> bool:
+        """Check and record a message in this process."""
+        if not self.is_allowed(user_id):
+            return False
+        self.record_message(user_id)
+        return True
+
+    async def acquire(self, user_id: str) -> bool:
+        """Check and record a message, across replicas when a shared store is configured."""
+        if self.store is not None:
+            try:
+                allowed, _ = await self.store.acquire(user_id, self.emission_interval, self.burst_tolerance)
+                return allowed
+            except Exception as e:
+                logger.warning(f"Shared rate limit unavailable, limiting in process: {e}")
+        return self.try_acquire(user_id)
+
+    def _maybe_cleanup(self, now: float):
+        if now >= self._next_cleanup:
+            self._cleanup(now)
+
+    def _cleanup(self, now: float):
+        self._next_cleanup = now + self.cleanup_interval
+        # A TAT in the past carries no state: the user is back to a full burst
+        idle = [user_id for user_id, tat in self.user_limits.items() if tat <= now]
+        for user_id in idle:
+            del self.user_limits[user_id]
+
+
+def create_rate_limiter(url: Optional[str] = None) -> RateLimiter:
+    """Build the limiter configured by ``url`` or ``MESSAGING_RATE_LIMIT_URL``."""
+    url = url if url is not None else os.getenv("MESSAGING_RATE_LIMIT_URL", "")
+    limit = int(os.getenv("MESSAGING_RATE_LIMIT_PER_MINUTE", "30"))
+    store = None
+    if url:
+        if not url.startswith(("redis://", "rediss://", "unix://")):
+            raise ValueError(f"Unsupported messaging rate limit URL: {url}")
+        store = RedisRateLimitStore(url=url)
+    return RateLimiter(max_messages_per_minute=limit, store=store)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Backfill Reaction Rollups
+
+Message history reads reactions from one rollup item per message
+(``PK = MSG#<id>, SK = SUMMARY#REACTIONS``) that the AppSync reaction
+resolvers keep up to date. Messages reacted to before the rollup existed only
+have per-shortcode ``SUMMARY#REACT#<shortcode>`` items; this script builds
+their rollups from those. Rollups are overwritten (not added to), so it is
+safe to re-run.
+
+Usage:
+    python backfill_reaction_rollups.py [--table-name gg_core] [--region us-east-2] [--dry-run]
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+
+import boto3
+from boto3.dynamodb.conditions import Attr
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from message_history import REACTION_ROLLUP_SK  # noqa: E402
+
+SUMMARY_PREFIX = "SUMMARY#REACT#"
+
+
+def collect_rollups(table):
+    """Scan the per-shortcode summaries and group them by message."""
+    rollups = defaultdict(dict)
+    scan_kwargs = {"FilterExpression": Attr("SK").begins_with(SUMMARY_PREFIX)}
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response.get("Items", []):
+            shortcode = item["SK"][len(SUMMARY_PREFIX):]
+            if shortcode:
+                rollups[item["PK"]][shortcode] = (int(item.get("count", 0)), item.get("unicode", ""))
+
+        last_evaluated_key = response.get("LastEvaluatedKey")
+        if not last_evaluated_key:
+            return rollups
+        scan_kwargs["ExclusiveStartKey"] = last_evaluated_key
+
+
+def backfill(table_name: str, region: str, dry_run: bool = False) -> int:
+    """Write a rollup item for every message with reaction summaries. Returns the number of messages."""
+    dynamodb = boto3.resource("dynamodb", region_name=region)
+    table = dynamodb.Table(table_name)
+    rollups = collect_rollups(table)
+
+    if dry_run:
+        for pk, shortcodes in sorted(rollups.items()):
+            print(f"{pk}: {', '.join(f'{code}={count}' for code, (count, _) in sorted(shortcodes.items()))}")
+        return len(rollups)
+
+    now = int(time.time() * 1000)
+    with table.batch_writer() as batch:
+        for pk, shortcodes in rollups.items():
+            item = {"PK": pk, "SK": REACTION_ROLLUP_SK, "type": "ReactionRollup", "updatedAt": now}
+            for shortcode, (count, unicode) in shortcodes.items():
+                item[f"count#{shortcode}"] = count
+                item[f"unicode#{shortcode}"] = unicode
+            batch.put_item(Item=item)
+    return len(rollups)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build per-message reaction rollups from reaction summaries")
+    parser.add_argument("--table-name", default=os.getenv("DYNAMODB_TABLE_NAME", "gg_core"))
+    parser.add_argument("--region", default=os.getenv("AWS_REGION", "us-east-2"))
+    parser.add_argument("--dry-run", action="store_true", help="Print the rollups instead of writing them")
+    args = parser.parse_args()
+
+    count = backfill(args.table_name, args.region, dry_run=args.dry_run)
+    print(f"{'Would write' if args.dry_run else 'Wrote'} reaction rollups for {count} messages")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Tests for fanning room messages and presence out across nodes through the backplane.
+"""
+
+import asyncio
+import json
+import os
+import sys
+from unittest.mock import AsyncMock
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from backplane import InMemoryBackplane, InMemoryHub, RedisBackplane, create_backplane
+from main import ConnectionManager
+
+
+def _socket():
+    websocket = AsyncMock()
+    websocket.accept = AsyncMock()
+    return websocket
+
+
+async def _settle():
+    # Let background bookkeeping scheduled by disconnect() run
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestInMemoryBackplane:
+    @pytest.mark.asyncio
+    async def test_broadcast_reaches_sockets_on_other_nodes(self):
+        hub = InMemoryHub()
+        node_a = ConnectionManager(InMemoryBackplane(hub))
+        node_b = ConnectionManager(InMemoryBackplane(hub))
+        await node_a.start()
+        await node_b.start()
+        sender, local_peer, remote_peer, other_room = _socket(), _socket(), _socket(), _socket()
+        await node_a.connect(sender, "ROOM-1", "user-1")
+        await node_a.connect(local_peer, "ROOM-1", "user-2")
+        await node_b.connect(remote_peer, "ROOM-1", "user-3")
+        await node_b.connect(other_room, "ROOM-2", "user-4")
+
+        await node_a.broadcast_to_room("hello", "ROOM-1", exclude_websocket=sender)
+        await _settle()
+
+        sender.send_text.assert_not_called()
+        local_peer.send_text.assert_awaited_once_with("hello")
+        remote_peer.send_text.assert_awaited_once_with("hello")
+        other_room.send_text.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_presence_spans_nodes_and_follows_disconnects(self):
+        hub = InMemoryHub()
+        node_a = ConnectionManager(InMemoryBackplane(hub))
+        node_b = ConnectionManager(InMemoryBackplane(hub))
+        first_tab, second_tab, remote = _socket(), _socket(), _socket()
+        await node_a.connect(first_tab, "ROOM-1", "user-1")
+        await node_a.connect(second_tab, "ROOM-1", "user-1")
+        await node_b.connect(remote, "ROOM-1", "user-2")
+        await node_b.join_room("ROOM-1", "user-3")
+
+        assert await node_a.get_room_presence("ROOM-1") == {"user-1", "user-2", "user-3"}
+
+        node_a.disconnect(first_tab)
+        await _settle()
+        assert "user-1" in await node_b.get_room_presence("ROOM-1")
+
+        node_a.disconnect(second_tab)
+        await node_b.leave_room("ROOM-1", "user-3")
+        await _settle()
+        assert await node_b.get_room_presence("ROOM-1") == {"user-2"}
+
+    @pytest.mark.asyncio
+    async def test_node_stops_receiving_after_last_socket_leaves(self):
+        hub = InMemoryHub()
+        node_a = ConnectionManager(InMemoryBackplane(hub))
+        node_b = ConnectionManager(InMemoryBackplane(hub))
+        await node_b.start()
+        socket = _socket()
+        await node_b.connect(socket, "ROOM-1", "user-1")
+
+        node_b.disconnect(socket)
+        await _settle()
+
+        assert "ROOM-1" not in hub.subscribers
+        await node_a.broadcast_to_room("hello", "ROOM-1")
+        socket.send_text.assert_not_called()
+
+    def test_create_backplane_from_url(self):
+        assert isinstance(create_backplane(""), InMemoryBackplane)
+        with pytest.raises(ValueError):
+            create_backplane("nats://localhost:4222")
+
+
+class TestRedisBackplane:
+    @pytest.fixture
+    def redis_server(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        return fakeredis, fakeredis.FakeServer()
+
+    @staticmethod
+    def _node(redis_server, **kwargs):
+        fakeredis, server = redis_server
+        return ConnectionManager(RedisBackplane(client=fakeredis.FakeAsyncRedis(server=server), **kwargs))
+
+    @pytest.mark.asyncio
+    async def test_broadcast_reaches_other_node(self, redis_server):
+        node_a = self._node(redis_server)
+        node_b = self._node(redis_server)
+        await node_a.start()
+        await node_b.start()
+        sender, remote = _socket(), _socket()
+        try:
+            await node_a.connect(sender, "GUILD#g1", "user-1")
+            await node_b.connect(remote, "GUILD#g1", "user-2")
+
+            await node_a.broadcast_to_room('{"text": "hi"}', "GUILD#g1", exclude_websocket=sender)
+            for _ in range(50):
+                if remote.send_text.await_count:
+                    break
+                await asyncio.sleep(0.02)
+
+            remote.send_text.assert_awaited_once_with('{"text": "hi"}')
+            sender.send_text.assert_not_called()
+        finally:
+            await node_a.stop()
+            await node_b.stop()
+
+    @pytest.mark.asyncio
+    async def test_malformed_messages_do_not_stop_the_listener(self, redis_server):
+        fakeredis, server = redis_server
+        node = self._node(redis_server)
+        await node.start()
+        socket = _socket()
+        publisher = fakeredis.FakeAsyncRedis(server=server)
+        try:
+            await node.connect(socket, "ROOM-1", "user-1")
+            channel = RedisBackplane.CHANNEL_PREFIX + "ROOM-1"
+            await publisher.publish(channel, "not json")
+            await publisher.publish(channel, json.dumps({"origin": "other-node"}))
+            await publisher.publish(channel, json.dumps({"origin": "other-node", "message": "hello"}))
+            for _ in range(50):
+                if socket.send_text.await_count:
+                    break
+                await asyncio.sleep(0.02)
+
+            socket.send_text.assert_awaited_once_with("hello")
+        finally:
+            await node.stop()
+
+    @pytest.mark.asyncio
+    async def test_presence_is_shared_and_withdrawn_on_stop(self, redis_server):
+        node_a = self._node(redis_server)
+        node_b = self._node(redis_server)
+        await node_a.start()
+        await node_b.start()
+        await node_a.connect(_socket(), "ROOM-1", "user-1")
+        await node_b.join_room("ROOM-1", "user-2")
+
+        assert await node_a.get_room_presence("ROOM-1") == {"user-1", "user-2"}
+
+        await node_b.stop()
+        assert await node_a.get_room_presence("ROOM-1") == {"user-1"}
+        await node_a.stop()
+
+    @pytest.mark.asyncio
+    async def test_presence_of_unresponsive_node_expires(self, redis_server):
+        node = self._node(redis_server, presence_ttl=0.05)
+        await node.join_room("ROOM-1", "user-1")
+
+        await asyncio.sleep(0.1)
+
+        # Heartbeat was never started, as for a node that crashed
+        assert await node.get_room_presence("ROOM-1") == set()
@@ -0,0 +1,175 @@
+"""
+Tests for concurrent, backpressure-aware room broadcasts.
+"""
+
+import asyncio
+import json
+import os
+import sys
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from broadcast import BroadcastEngine, encode_message
+from main import ConnectionManager
+
+
+def _socket():
+    websocket = AsyncMock()
+    websocket.accept = AsyncMock()
+    return websocket
+
+
+def _stalled_socket():
+    """A websocket whose sends never complete until released."""
+    websocket = _socket()
+    release = asyncio.Event()
+
+    async def send_text(payload):
+        await release.wait()
+
+    websocket.send_text = AsyncMock(side_effect=send_text)
+    websocket.release = release
+    return websocket
+
+
+async def _settle():
+    # Writer tasks need a few loop iterations per send (wait_for wraps each one)
+    for _ in range(5):
+        await asyncio.sleep(0.001)
+
+
+class TestBroadcastEngine:
+    @pytest.mark.asyncio
+    async def test_slow_consumer_does_not_delay_others(self):
+        engine = BroadcastEngine(queue_size=10, send_timeout=5)
+        slow, fast = _stalled_socket(), _socket()
+
+        for i in range(3):
+            await engine.broadcast("ROOM-1", f"m{i}", [slow, fast])
+        await _settle()
+
+        assert [c.args[0] for c in fast.send_text.await_args_list] == ["m0", "m1", "m2"]
+        # The slow socket is still stuck on its first send, the rest wait in its queue
+        assert engine.metrics("ROOM-1")["queued"] == 2
+        slow.release.set()
+        await _settle()
+        assert slow.send_text.await_count == 3
+        await engine.close()
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_keeps_latest_messages(self):
+        engine = BroadcastEngine(queue_size=2, policy="drop_oldest", send_timeout=5)
+        slow = _stalled_socket()
+
+        for i in range(5):
+            await engine.broadcast("ROOM-1", f"m{i}", [slow])
+        slow.release.set()
+        await _settle()
+
+        # m0 was in flight; m1 and m2 were pushed out by m3 and m4
+        assert [c.args[0] for c in slow.send_text.await_args_list] == ["m0", "m3", "m4"]
+        assert engine.metrics("ROOM-1")["dropped"] == 2
+
+    @pytest.mark.asyncio
+    async def test_drop_newest_keeps_queued_messages(self):
+        engine = BroadcastEngine(queue_size=2, policy="drop_newest", send_timeout=5)
+        slow = _stalled_socket()
+
+        queued = [await engine.broadcast("ROOM-1", f"m{i}", [slow]) for i in range(5)]
+        slow.release.set()
+        await _settle()
+
+        assert queued == [1, 1, 1, 0, 0]
+        assert [c.args[0] for c in slow.send_text.await_args_list] == ["m0", "m1", "m2"]
+
+    @pytest.mark.asyncio
+    async def test_disconnect_policy_drops_consumer(self):
+        dropped = []
+
+        async def on_slow_consumer(websocket):
+            dropped.append(websocket)
+
+        engine = BroadcastEngine(queue_size=1, policy="disconnect", send_timeout=5, on_slow_consumer=on_slow_consumer)
+        slow, fast = _stalled_socket(), _socket()
+
+        for i in range(3):
+            await engine.broadcast("ROOM-1", f"m{i}", [slow, fast])
+            await _settle()
+
+        assert dropped == [slow]
+        assert fast.send_text.await_count == 3
+        assert engine.metrics("ROOM-1")["slowConsumersDisconnected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_send_timeout_drops_consumer(self):
+        dropped = []
+
+        async def on_slow_consumer(websocket):
+            dropped.append(websocket)
+
+        engine = BroadcastEngine(send_timeout=0.01, on_slow_consumer=on_slow_consumer)
+        slow = _stalled_socket()
+
+        await engine.broadcast("ROOM-1", "hello", [slow])
+        await asyncio.sleep(0.05)
+
+        assert dropped == [slow]
+        assert engine.metrics("ROOM-1")["slowConsumersDisconnected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_metrics_report_delivery_latency(self):
+        engine = BroadcastEngine()
+        sockets = [_socket() for _ in range(4)]
+
+        await engine.broadcast("ROOM-1", {"text": "hi"}, sockets)
+        await _settle()
+
+        metrics = engine.metrics("ROOM-1")
+        assert metrics["broadcasts"] == 1
+        assert metrics["delivered"] == 4
+        assert metrics["latencyMs"]["samples"] == 4
+        assert metrics["latencyMs"]["p99"] is not None
+
+    def test_rejects_unknown_policy(self):
+        with pytest.raises(ValueError):
+            BroadcastEngine(policy="block")
+
+
+class TestConnectionManagerBroadcast:
+    @pytest.mark.asyncio
+    async def test_message_is_serialized_once_per_broadcast(self):
+        manager = ConnectionManager()
+        sockets = [_socket() for _ in range(5)]
+        for i, websocket in enumerate(sockets):
+            await manager.connect(websocket, "ROOM-1", f"user-{i}")
+
+        with patch("broadcast.json.dumps", wraps=json.dumps) as dumps:
+            await manager.broadcast_to_room({"text": "hi"}, "ROOM-1")
+        await _settle()
+
+        assert dumps.call_count == 1
+        for websocket in sockets:
+            websocket.send_text.assert_awaited_once_with(encode_message({"text": "hi"}))
+
+    @pytest.mark.asyncio
+    async def test_slow_consumer_is_closed_and_disconnected(self):
+        manager = ConnectionManager()
+        manager.broadcaster = BroadcastEngine(
+            queue_size=1, policy="disconnect", send_timeout=5, on_slow_consumer=manager._drop_slow_consumer
+        )
+        slow, fast = _stalled_socket(), _socket()
+        await manager.connect(slow, "ROOM-1", "user-1")
+        await manager.connect(fast, "ROOM-1", "user-2")
+
+        for i in range(3):
+            await manager.broadcast_to_room(f"m{i}", "ROOM-1")
+            await _settle()
+
+        slow.close.assert_awaited_once_with(code=1013, reason="Slow consumer")
+        assert slow not in manager.active_connections["ROOM-1"]
+        assert fast.send_text.await_count == 3
+        metrics = manager.get_room_metrics("ROOM-1")
+        assert metrics["slowConsumersDisconnected"] == 1
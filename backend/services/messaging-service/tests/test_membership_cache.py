@@ -0,0 +1,160 @@
+"""
+Tests for cached guild membership checks and the cached JWT secret.
+"""
+
+import os
+import sys
+from unittest.mock import AsyncMock, Mock, patch
+
+import jwt
+import pytest
+from fastapi import HTTPException
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+import main
+from backplane import InMemoryBackplane, InMemoryHub
+from main import (
+    ConnectionManager, _on_guild_membership_revoked, decode_jwt, get_jwt_secret, invalidate_guild_membership,
+    validate_guild_membership,
+)
+from ttl_cache import TTLCache
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    main._membership_cache.clear()
+    main._jwt_secret_cache.clear()
+    yield
+    main._membership_cache.clear()
+    main._jwt_secret_cache.clear()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache:
+    def test_entries_expire_after_their_ttl(self):
+        clock = FakeClock()
+        cache = TTLCache(ttl=60, clock=clock)
+        cache.set("member", True)
+        cache.set("denied", False, ttl=10)
+
+        clock.now += 30
+        assert cache.get("member") is True
+        assert cache.get("denied") is None
+
+        clock.now += 31
+        assert cache.get("member") is None
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TTLCache(ttl=60, max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert "a" in cache and "c" in cache
+        assert "b" not in cache
+
+
+class TestGuildMembershipCache:
+    @pytest.mark.asyncio
+    async def test_verdict_is_read_once_per_member(self):
+        with patch("main._is_active_guild_member_sync", return_value=True) as lookup:
+            results = [await validate_guild_membership("user-1", "GUILD#g1") for _ in range(5)]
+
+        assert results == [True] * 5
+        lookup.assert_called_once_with("g1", "user-1")
+
+    @pytest.mark.asyncio
+    async def test_lookup_errors_are_denied_and_not_cached(self):
+        with patch("main._is_active_guild_member_sync", side_effect=RuntimeError("throttled")) as lookup:
+            assert await validate_guild_membership("user-1", "GUILD#g1") is False
+            assert await validate_guild_membership("user-1", "GUILD#g1") is False
+
+        assert lookup.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidation_forces_a_fresh_read(self):
+        with patch("main._is_active_guild_member_sync", side_effect=[True, False]):
+            assert await validate_guild_membership("user-1", "GUILD#g1") is True
+            assert invalidate_guild_membership("g1", "user-1") is True
+            assert await validate_guild_membership("user-1", "GUILD#g1") is False
+
+    def test_blocked_member_is_denied(self):
+        table = Mock()
+        table.get_item.return_value = {"Item": {"status": "active", "is_blocked": True}}
+        resource = Mock()
+        resource.Table.return_value = table
+
+        with patch("main.get_dynamodb_resource", return_value=resource):
+            assert main._is_active_guild_member_sync("g1", "user-1") is False
+
+    @pytest.mark.asyncio
+    async def test_revocation_reaches_every_node(self):
+        hub = InMemoryHub()
+        node_a = ConnectionManager(InMemoryBackplane(hub))
+        node_b = ConnectionManager(InMemoryBackplane(hub))
+        for node in (node_a, node_b):
+            node.control_handlers["guild_membership_revoked"] = _on_guild_membership_revoked
+            await node.start()
+        guild_socket, other_socket = AsyncMock(), AsyncMock()
+        await node_b.connect(guild_socket, "GUILD#g1", "user-1")
+        await node_b.connect(other_socket, "ROOM-1", "user-1")
+        main._membership_cache.set(("g1", "user-1"), True)
+
+        await node_a.publish_control({"type": "guild_membership_revoked", "guildId": "g1", "userId": "user-1"})
+
+        assert ("g1", "user-1") not in main._membership_cache
+        guild_socket.close.assert_awaited_once_with(code=1008, reason="Guild access revoked")
+        assert node_b.get_user_connections("user-1") == {other_socket}
+
+    @pytest.mark.asyncio
+    async def test_revoke_endpoint_requires_a_service_token(self):
+        with patch("main.validate_guild_membership", new=AsyncMock()) as validate:
+            with pytest.raises(HTTPException) as exc:
+                await main.revoke_guild_member("g1", "user-1", token={"sub": "mod-1"})
+
+        assert exc.value.status_code == 403
+        validate.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_revoke_endpoint_publishes_for_former_members(self):
+        token = {"sub": "guild-service", "token_use": "service"}
+        with patch("main.validate_guild_membership", new=AsyncMock(return_value=False)), \
+             patch.object(main.manager, "publish_control", new=AsyncMock()) as publish:
+            result = await main.revoke_guild_member("g1", "user-1", token=token)
+
+        assert result["status"] == "revoked"
+        publish.assert_awaited_once_with({"type": "guild_membership_revoked", "guildId": "g1", "userId": "user-1"})
+
+
+class TestJWTSecretCache:
+    def _ssm(self, *secrets):
+        client = Mock()
+        client.get_parameter.side_effect = [{"Parameter": {"Value": secret}} for secret in secrets]
+        return client
+
+    def test_secret_is_read_from_ssm_once(self):
+        client = self._ssm("secret-1")
+        with patch("main.get_ssm_client", return_value=client):
+            assert [get_jwt_secret() for _ in range(3)] == ["secret-1"] * 3
+
+        client.get_parameter.assert_called_once()
+
+    def test_rotated_secret_is_picked_up_on_signature_mismatch(self):
+        client = self._ssm("old-secret-0123456789abcdef0123456789", "new-secret-0123456789abcdef0123456789")
+        token = jwt.encode({"sub": "user-1"}, "new-secret-0123456789abcdef0123456789", algorithm="HS256")
+
+        with patch("main.get_ssm_client", return_value=client):
+            get_jwt_secret()
+            assert decode_jwt(token)["sub"] == "user-1"
+            assert get_jwt_secret() == "new-secret-0123456789abcdef0123456789"
+
+        assert client.get_parameter.call_count == 2
@@ -0,0 +1,217 @@
+"""
+Tests for cursor-paginated room history with batched reaction reads.
+"""
+
+import os
+import sys
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+moto = pytest.importorskip("moto")
+import boto3
+from fastapi.testclient import TestClient
+
+import main
+from message_history import InvalidCursor, MessageHistory, decode_cursor, encode_cursor
+from message_store import build_message_item
+
+
+def _create_table(resource, name):
+    return resource.create_table(
+        TableName=name,
+        KeySchema=[{"AttributeName": "PK", "KeyType": "HASH"}, {"AttributeName": "SK", "KeyType": "RANGE"}],
+        AttributeDefinitions=[
+            {"AttributeName": "PK", "AttributeType": "S"},
+            {"AttributeName": "SK", "AttributeType": "S"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+
+class CountingResource:
+    """Wraps the boto3 resource to count DynamoDB round trips."""
+
+    def __init__(self, resource):
+        self.resource = resource
+        self.calls = []
+
+    def Table(self, name):
+        table = self.resource.Table(name)
+        calls = self.calls
+
+        class _Table:
+            def query(self, **kwargs):
+                calls.append("query")
+                return table.query(**kwargs)
+
+        return _Table()
+
+    def batch_get_item(self, **kwargs):
+        self.calls.append("batch_get_item")
+        return self.resource.batch_get_item(**kwargs)
+
+
+@pytest.fixture
+def tables():
+    with moto.mock_aws(), patch.dict(os.environ, {"DYNAMODB_TABLE_NAME": "gg_core", "GUILD_TABLE_NAME": "gg_guild"}):
+        resource = boto3.resource("dynamodb", region_name="us-east-1")
+        core = _create_table(resource, "gg_core")
+        guild = _create_table(resource, "gg_guild")
+        yield resource, core, guild
+
+
+def _seed_messages(table, room_id, count, start_ts=1700000000000):
+    with table.batch_writer() as batch:
+        for n in range(count):
+            batch.put_item(Item=build_message_item(room_id, "user-1", f"msg {n}", message_id=f"m{n:03d}", ts=start_ts + n))
+
+
+def _react(core, message_id, shortcode, unicode, users):
+    # Same update the reaction_updateRollup resolver makes
+    core.update_item(
+        Key={"PK": f"MSG#{message_id}", "SK": "SUMMARY#REACTIONS"},
+        UpdateExpression="ADD #count :delta SET #unicode = if_not_exists(#unicode, :unicode)",
+        ExpressionAttributeNames={"#count": f"count#{shortcode}", "#unicode": f"unicode#{shortcode}"},
+        ExpressionAttributeValues={":delta": len(users), ":unicode": unicode},
+    )
+    for user_id in users:
+        core.put_item(Item={"PK": f"MSG#{message_id}", "SK": f"REACT#{shortcode}#{user_id}", "userId": user_id})
+
+
+def test_cursor_round_trips_and_rejects_tampering():
+    sort_key = "MSG#1700000000000#m1"
+    assert decode_cursor(encode_cursor(sort_key)) == sort_key
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not-a-cursor")
+    with pytest.raises(InvalidCursor):
+        decode_cursor(encode_cursor("REACT#thumbsup#user-1"))
+
+
+def test_pages_walk_back_through_the_room_without_gaps(tables):
+    resource, _, guild = tables
+    _seed_messages(guild, "GUILD#g1", 120)
+    history = MessageHistory(lambda: resource)
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = history.get_page("GUILD#g1", limit=50, cursor=cursor, include_reactions=False)
+        seen.extend(message["id"] for message in page["messages"])
+        pages += 1
+        cursor = page["nextCursor"]
+        if not cursor:
+            break
+
+    assert seen == [f"m{n:03d}" for n in reversed(range(120))]
+    assert pages == 3
+
+
+def test_after_returns_only_newer_messages(tables):
+    resource, core, _ = tables
+    _seed_messages(core, "ROOM-general", 10)
+    history = MessageHistory(lambda: resource)
+
+    page = history.get_page("ROOM-general", after=1700000000006, include_reactions=False)
+
+    assert [message["id"] for message in page["messages"]] == ["m009", "m008", "m007"]
+
+
+def test_reactions_and_viewer_flags_cost_two_batch_reads_per_page(tables):
+    resource, core, guild = tables
+    _seed_messages(guild, "GUILD#g1", 60)
+    _react(core, "m059", "thumbsup", "👍", ["viewer", "user-2"])
+    _react(core, "m059", "tada", "🎉", ["user-3"])
+    _react(core, "m058", "heart", "❤️", ["user-2"])
+    counting = CountingResource(resource)
+    history = MessageHistory(lambda: counting)
+
+    page = history.get_page("GUILD#g1", limit=50, viewer_id="viewer")
+
+    assert counting.calls == ["query", "batch_get_item", "batch_get_item"]
+    newest = page["messages"][0]
+    assert newest["reactions"] == [
+        {"shortcode": "thumbsup", "unicode": "👍", "count": 2, "viewerHasReacted": True},
+        {"shortcode": "tada", "unicode": "🎉", "count": 1, "viewerHasReacted": False},
+    ]
+    assert page["messages"][1]["reactions"][0]["viewerHasReacted"] is False
+    assert page["messages"][2]["reactions"] == []
+
+
+def test_removed_reactions_are_not_listed(tables):
+    resource, core, _ = tables
+    _seed_messages(core, "ROOM-general", 1)
+    core.put_item(Item={"PK": "MSG#m000", "SK": "SUMMARY#REACTIONS", "count#tada": 0, "unicode#tada": "🎉"})
+
+    page = MessageHistory(lambda: resource).get_page("ROOM-general", viewer_id="viewer")
+
+    assert page["messages"][0]["reactions"] == []
+
+
+def test_endpoint_pages_and_rejects_bad_cursors(tables):
+    resource, core, _ = tables
+    _seed_messages(core, "ROOM-general", 3)
+    main.app.dependency_overrides[main.require_verified_token] = lambda: {"sub": "viewer"}
+    try:
+        with patch.object(main, "message_history", MessageHistory(lambda: resource)):
+            client = TestClient(main.app)
+            first = client.get("/messaging/rooms/ROOM-general/messages?limit=2")
+            assert first.status_code == 200
+            assert [m["id"] for m in first.json()["messages"]] == ["m002", "m001"]
+
+            second = client.get(f"/messaging/rooms/ROOM-general/messages?limit=2&cursor={first.json()['nextCursor']}")
+            assert [m["id"] for m in second.json()["messages"]] == ["m000"]
+
+            assert client.get("/messaging/rooms/ROOM-general/messages?cursor=bogus").status_code == 400
+    finally:
+        main.app.dependency_overrides.clear()
+
+
+def test_endpoint_requires_guild_membership_for_guild_rooms(tables):
+    main.app.dependency_overrides[main.require_verified_token] = lambda: {"sub": "outsider"}
+    try:
+        with patch.object(main, "validate_guild_membership", new=AsyncMock(return_value=False)):
+            response = TestClient(main.app).get("/messaging/rooms/GUILD%23g1/messages")
+        assert response.status_code == 403
+    finally:
+        main.app.dependency_overrides.clear()
+
+
+def test_endpoint_rejects_tokens_that_do_not_verify(tables):
+    with patch.object(main, "get_jwt_secret", return_value="secret"):
+        response = TestClient(main.app).get(
+            "/messaging/rooms/ROOM-general/messages", headers={"Authorization": "Bearer not-a-jwt"}
+        )
+    assert response.status_code == 401
+
+
+def test_endpoint_limits_private_rooms_to_their_members(tables):
+    resource, core, _ = tables
+    core.put_item(Item={"PK": "ROOM#ROOM-staff", "SK": "ROOM#ROOM-staff", "is_public": False, "members": ["member"]})
+    _seed_messages(core, "ROOM-staff", 1)
+    try:
+        with patch.object(main, "message_history", MessageHistory(lambda: resource)):
+            client = TestClient(main.app)
+            main.app.dependency_overrides[main.require_verified_token] = lambda: {"sub": "outsider"}
+            assert client.get("/messaging/rooms/ROOM-staff/messages").status_code == 403
+            main.app.dependency_overrides[main.require_verified_token] = lambda: {"sub": "member"}
+            assert client.get("/messaging/rooms/ROOM-staff/messages").status_code == 200
+    finally:
+        main.app.dependency_overrides.clear()
+
+
+def test_endpoint_accepts_after_as_epoch_ms_or_iso_timestamp(tables):
+    resource, core, _ = tables
+    _seed_messages(core, "ROOM-general", 3)
+    main.app.dependency_overrides[main.require_verified_token] = lambda: {"sub": "viewer"}
+    try:
+        with patch.object(main, "message_history", MessageHistory(lambda: resource)):
+            client = TestClient(main.app)
+            by_ms = client.get("/messaging/rooms/ROOM-general/messages?after=1700000000000")
+            by_iso = client.get("/messaging/rooms/ROOM-general/messages?after=2023-11-14T22:13:20.000Z")
+            assert [m["id"] for m in by_ms.json()["messages"]] == ["m002", "m001"]
+            assert [m["id"] for m in by_iso.json()["messages"]] == ["m002", "m001"]
+            assert client.get("/messaging/rooms/ROOM-general/messages?after=yesterday").status_code == 400
+    finally:
+        main.app.dependency_overrides.clear()
@@ -0,0 +1,260 @@
+"""
+Tests for write-behind message persistence.
+"""
+
+import asyncio
+import json
+import os
+import sys
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+import main
+from message_store import (
+    MAX_MESSAGE_LENGTH, DynamoDBBatchWriter, InvalidMessage, MessageStoreFull, MessageWriteBuffer,
+    build_message_item, table_for_room, validate_message_text,
+)
+
+
+def _client_error(code):
+    return ClientError({"Error": {"Code": code, "Message": code}}, "BatchWriteItem")
+
+
+class RecordingWriter:
+    """Stands in for BatchWriteItem; optionally leaves items unprocessed or fails."""
+
+    def __init__(self, unprocessed_rounds=0, fail=False, error_code="ProvisionedThroughputExceededException", reject=None):
+        self.calls = []
+        self.unprocessed_rounds = unprocessed_rounds
+        self.fail = fail
+        self.error_code = error_code
+        # Items whose text is in ``reject`` fail the whole request with ValidationException
+        self.reject = reject or set()
+
+    def __call__(self, items_by_table):
+        self.calls.append({table: list(items) for table, items in items_by_table.items()})
+        if self.fail:
+            raise _client_error(self.error_code)
+        if any(item["text"] in self.reject for items in items_by_table.values() for item in items):
+            raise _client_error("ValidationException")
+        if self.unprocessed_rounds:
+            self.unprocessed_rounds -= 1
+            # DynamoDB processed the first item of each table only
+            return {table: items[1:] for table, items in items_by_table.items() if items[1:]}
+        return {}
+
+
+def _item(n, room_id="ROOM-general"):
+    return build_message_item(room_id, "user-1", f"hello {n}", message_id=f"m{n}", ts=1700000000000 + n)
+
+
+def test_message_item_uses_the_appsync_layout():
+    item = build_message_item(
+        "GUILD#g1", "user-1", "hi", sender_nickname="Ann", reply_to_id="m0", message_id="m1", ts=1700000000000
+    )
+
+    assert item["PK"] == "GUILD#g1"
+    assert item["SK"] == "MSG#1700000000000#m1"
+    assert item["type"] == "Message"
+    assert item["roomType"] == "guild"
+    assert item["replyToId"] == "m0"
+    assert item["emojiMetadata"] == {"shortcodes": [], "unicodeCount": 0}
+
+
+def test_guild_rooms_are_stored_in_the_guild_table():
+    with patch.dict(os.environ, {"GUILD_TABLE_NAME": "guilds", "DYNAMODB_TABLE_NAME": "core"}):
+        assert table_for_room("GUILD#g1") == "guilds"
+        assert table_for_room("ROOM-general") == "core"
+
+
+@pytest.mark.asyncio
+async def test_full_batches_are_written_without_waiting_for_the_interval():
+    writer = RecordingWriter()
+    buffer = MessageWriteBuffer(writer, flush_interval=60)
+
+    full = [buffer.enqueue("gg_core", _item(n)) for n in range(25)]
+    await asyncio.wait_for(asyncio.gather(*full), timeout=1)
+    assert [len(call["gg_core"]) for call in writer.calls] == [25]
+
+    rest = [buffer.enqueue("gg_core", _item(n)) for n in range(25, 30)]
+    await asyncio.sleep(0.01)
+    assert not any(future.done() for future in rest)
+
+    await buffer.flush()
+    assert [len(call["gg_core"]) for call in writer.calls] == [25, 5]
+    assert buffer.stats()["written"] == 30
+
+
+@pytest.mark.asyncio
+async def test_partial_batches_are_written_after_the_flush_interval():
+    writer = RecordingWriter()
+    buffer = MessageWriteBuffer(writer, flush_interval=0.01)
+
+    futures = [buffer.enqueue("gg_core", _item(n)) for n in range(3)]
+    futures.append(buffer.enqueue("gg_guild", _item(3, room_id="GUILD#g1")))
+    await asyncio.wait_for(asyncio.gather(*futures), timeout=1)
+
+    assert len(writer.calls) == 1
+    assert len(writer.calls[0]["gg_core"]) == 3
+    assert len(writer.calls[0]["gg_guild"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_unprocessed_items_are_retried():
+    writer = RecordingWriter(unprocessed_rounds=2)
+    buffer = MessageWriteBuffer(writer, flush_interval=0.001, retry_base_delay=0)
+
+    futures = [buffer.enqueue("gg_core", _item(n)) for n in range(3)]
+    await asyncio.wait_for(asyncio.gather(*futures), timeout=1)
+
+    assert [len(call["gg_core"]) for call in writer.calls] == [3, 2, 1]
+    assert buffer.stats()["failed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_messages_fail_after_the_last_attempt():
+    writer = RecordingWriter(fail=True)
+    buffer = MessageWriteBuffer(writer, flush_interval=0.001, max_attempts=3, retry_base_delay=0)
+
+    future = buffer.enqueue("gg_core", _item(1))
+    with pytest.raises(ClientError):
+        await asyncio.wait_for(future, timeout=1)
+
+    assert len(writer.calls) == 3
+    assert buffer.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_non_retryable_errors_are_not_retried():
+    writer = RecordingWriter(fail=True, error_code="AccessDeniedException")
+    buffer = MessageWriteBuffer(writer, flush_interval=0.001, max_attempts=5, retry_base_delay=0)
+
+    future = buffer.enqueue("gg_core", _item(1))
+    with pytest.raises(ClientError):
+        await asyncio.wait_for(future, timeout=1)
+
+    assert len(writer.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_a_rejected_item_fails_only_its_own_message():
+    writer = RecordingWriter(reject={"hello 1"})
+    buffer = MessageWriteBuffer(writer, flush_interval=0.001, retry_base_delay=0)
+
+    futures = [buffer.enqueue("gg_core", _item(n)) for n in range(3)]
+    results = await asyncio.wait_for(asyncio.gather(*futures, return_exceptions=True), timeout=1)
+
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], ClientError)
+    # One rejected batch, then one request per item
+    assert [len(call["gg_core"]) for call in writer.calls] == [3, 1, 1, 1]
+    assert buffer.stats()["written"] == 2
+    assert buffer.stats()["failed"] == 1
+
+
+def test_message_text_must_be_non_empty_and_within_the_limit():
+    assert validate_message_text("hi") == "hi"
+    for text in ("", "   ", None, "x" * (MAX_MESSAGE_LENGTH + 1)):
+        with pytest.raises(InvalidMessage):
+            validate_message_text(text)
+
+
+@pytest.mark.asyncio
+async def test_enqueue_is_refused_when_the_buffer_is_full():
+    buffer = MessageWriteBuffer(RecordingWriter(), flush_interval=60, max_pending=2)
+    buffer.enqueue("gg_core", _item(1))
+    buffer.enqueue("gg_core", _item(2))
+
+    with pytest.raises(MessageStoreFull):
+        buffer.enqueue("gg_core", _item(3))
+
+    await buffer.flush()
+    buffer.enqueue("gg_core", _item(3))
+    await buffer.flush()
+
+
+@pytest.mark.asyncio
+async def test_batch_writer_stores_items_readable_by_room():
+    moto = pytest.importorskip("moto")
+    import boto3
+    from boto3.dynamodb.conditions import Key
+
+    with moto.mock_aws():
+        resource = boto3.resource("dynamodb", region_name="us-east-1")
+        table = resource.create_table(
+            TableName="gg_core",
+            KeySchema=[{"AttributeName": "PK", "KeyType": "HASH"}, {"AttributeName": "SK", "KeyType": "RANGE"}],
+            AttributeDefinitions=[
+                {"AttributeName": "PK", "AttributeType": "S"},
+                {"AttributeName": "SK", "AttributeType": "S"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        buffer = MessageWriteBuffer(DynamoDBBatchWriter(lambda: resource), flush_interval=0.001)
+
+        await asyncio.gather(*(buffer.enqueue("gg_core", _item(n)) for n in range(30)))
+
+        items = table.query(
+            KeyConditionExpression=Key("PK").eq("ROOM-general") & Key("SK").begins_with("MSG#")
+        )["Items"]
+        assert len(items) == 30
+        assert items[0]["text"] == "hello 0"
+
+
+@pytest.mark.asyncio
+async def test_process_message_broadcasts_then_acks_once_stored():
+    writer = RecordingWriter()
+    store = MessageWriteBuffer(writer, flush_interval=0.001)
+    websocket = Mock()
+    websocket.send_text = AsyncMock()
+
+    with patch.object(main, "message_store", store), \
+            patch.object(main.manager, "broadcast_to_room", new=AsyncMock()) as broadcast:
+        await main.process_message("ROOM-general", "user-1", {"text": "hi", "clientId": "c1"}, websocket)
+        await asyncio.gather(*list(main._pending_acks))
+
+    message = broadcast.await_args.args[0]
+    assert message["text"] == "hi"
+    stored = writer.calls[0]["gg_core"][0]
+    assert stored["id"] == message["id"]
+    assert stored["SK"] == f"MSG#{message['ts']}#{message['id']}"
+    ack = json.loads(websocket.send_text.await_args.args[0])
+    assert ack == {"type": "ack", "id": message["id"], "ts": message["ts"], "client_id": "c1"}
+
+
+@pytest.mark.asyncio
+async def test_process_message_reports_a_failed_write_to_the_sender():
+    store = MessageWriteBuffer(RecordingWriter(fail=True), flush_interval=0.001, max_attempts=1)
+    websocket = Mock()
+    websocket.send_text = AsyncMock()
+
+    with patch.object(main, "message_store", store), \
+            patch.object(main.manager, "broadcast_to_room", new=AsyncMock()):
+        await main.process_message("ROOM-general", "user-1", {"text": "hi"}, websocket)
+        await asyncio.gather(*list(main._pending_acks))
+
+    reply = json.loads(websocket.send_text.await_args.args[0])
+    assert reply["type"] == "error"
+    assert reply["message"] == "Failed to store message"
+
+
+@pytest.mark.asyncio
+async def test_process_message_rejects_invalid_text_before_queueing():
+    writer = RecordingWriter()
+    store = MessageWriteBuffer(writer, flush_interval=0.001)
+    websocket = Mock()
+    websocket.send_text = AsyncMock()
+
+    with patch.object(main, "message_store", store), \
+            patch.object(main.manager, "broadcast_to_room", new=AsyncMock()) as broadcast:
+        await main.process_message("ROOM-general", "user-1", {"text": "x" * (MAX_MESSAGE_LENGTH + 1)}, websocket)
+
+    broadcast.assert_not_awaited()
+    assert store.stats()["pending"] == 0
+    reply = json.loads(websocket.send_text.await_args.args[0])
+    assert reply["type"] == "error"
+    assert "maximum length" in reply["message"]
@@ -44,17 +44,36 @@ class TestConnectionManager:
         assert mock_websocket in self.manager.active_connections["GUILD#guild-789"]
         assert self.manager.connection_users[mock_websocket] == "user-456"
 
-    def test_disconnect(self):
+    @pytest.mark.asyncio
+    async def test_disconnect(self):
         mock_websocket = AsyncMock()
-        self.manager.connection_users[mock_websocket] = "user-456"
-        self.manager.user_rooms["user-456"] = ["ROOM-123"]
-        self.manager.active_connections["ROOM-123"] = [mock_websocket]
+        other_websocket = AsyncMock()
+        await self.manager.connect(mock_websocket, "ROOM-123", "user-456")
+        await self.manager.connect(other_websocket, "ROOM-123", "user-789")
         
         self.manager.disconnect(mock_websocket)
         
         assert mock_websocket not in self.manager.connection_users
-        assert "ROOM-123" not in self.manager.user_rooms["user-456"]
+        assert mock_websocket not in self.manager.connection_rooms
+        assert "user-456" not in self.manager.user_rooms
+        assert "user-456" not in self.manager.user_connections
         assert mock_websocket not in self.manager.active_connections["ROOM-123"]
+        assert other_websocket in self.manager.active_connections["ROOM-123"]
+
+    @pytest.mark.asyncio
+    async def test_user_connections_are_only_the_users_sockets(self):
+        first_tab, second_tab, other_user = AsyncMock(), AsyncMock(), AsyncMock()
+        await self.manager.connect(first_tab, "ROOM-123", "user-456")
+        await self.manager.connect(second_tab, "GUILD#guild-789", "user-456")
+        await self.manager.connect(other_user, "ROOM-123", "user-789")
+        
+        assert self.manager.get_user_connections("user-456") == {first_tab, second_tab}
+        assert self.manager.get_room_connections("ROOM-123") == {first_tab, other_user}
+        
+        self.manager.disconnect(first_tab)
+        
+        assert self.manager.get_user_connections("user-456") == {second_tab}
+        assert self.manager.user_rooms["user-456"] == {"GUILD#guild-789"}
 
     @pytest.mark.asyncio
     async def test_broadcast_to_room(self):
@@ -106,7 +125,7 @@ class TestRateLimiter:
     def test_record_message(self):
         self.rate_limiter.record_message("user-123")
         assert "user-123" in self.rate_limiter.user_limits
-        assert len(self.rate_limiter.user_limits["user-123"]) == 1
+        assert self.rate_limiter.remaining("user-123") == 29
 
 class TestJWTValidation:
     def setup_method(self):
@@ -189,7 +208,7 @@ class TestAPIEndpoints:
     @patch('main.manager')
     @patch('main.rate_limiter')
     def test_broadcast_message(self, mock_rate_limiter, mock_manager):
-        mock_rate_limiter.is_allowed.return_value = True
+        mock_rate_limiter.acquire = AsyncMock(return_value=True)
         mock_manager.broadcast_to_room = AsyncMock()
         
         with patch('main.verify_token') as mock_verify:
@@ -207,7 +226,7 @@ class TestAPIEndpoints:
 
     @patch('main.rate_limiter')
     def test_broadcast_message_rate_limited(self, mock_rate_limiter):
-        mock_rate_limiter.is_allowed.return_value = False
+        mock_rate_limiter.acquire = AsyncMock(return_value=False)
         
         with patch('main.verify_token') as mock_verify:
             mock_verify.return_value = {"sub": "user-123"}
@@ -0,0 +1,101 @@
+"""
+Tests for the GCRA message rate limiter and its shared Redis store.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from rate_limit import RateLimiter, RedisRateLimitStore, create_rate_limiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRateLimiter:
+    def test_allows_a_burst_then_one_message_per_interval(self):
+        clock = FakeClock()
+        limiter = RateLimiter(max_messages_per_minute=30, clock=clock)
+
+        assert [limiter.try_acquire("user-1") for _ in range(31)] == [True] * 30 + [False]
+        assert limiter.retry_after("user-1") == pytest.approx(2.0)
+
+        clock.now += 2.0
+        assert limiter.try_acquire("user-1") is True
+        assert limiter.try_acquire("user-1") is False
+
+    def test_users_are_limited_independently(self):
+        limiter = RateLimiter(max_messages_per_minute=2, clock=FakeClock())
+
+        assert [limiter.try_acquire("user-1") for _ in range(3)] == [True, True, False]
+        assert limiter.try_acquire("user-2") is True
+
+    def test_idle_users_are_evicted(self):
+        clock = FakeClock()
+        limiter = RateLimiter(max_messages_per_minute=30, clock=clock)
+        for i in range(100):
+            limiter.record_message(f"user-{i}")
+
+        clock.now += limiter.cleanup_interval + 1
+        limiter.record_message("active-user")
+
+        assert list(limiter.user_limits) == ["active-user"]
+
+    def test_memory_is_capped_by_max_keys(self):
+        limiter = RateLimiter(max_messages_per_minute=30, max_keys=10, clock=FakeClock())
+        for i in range(50):
+            limiter.record_message(f"user-{i}")
+
+        assert len(limiter.user_limits) == 10
+        assert "user-49" in limiter.user_limits
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_local_limit_when_store_fails(self):
+        class BrokenStore:
+            async def acquire(self, key, interval, tolerance):
+                raise ConnectionError("redis down")
+
+        limiter = RateLimiter(max_messages_per_minute=2, store=BrokenStore(), clock=FakeClock())
+
+        assert [await limiter.acquire("user-1") for _ in range(3)] == [True, True, False]
+
+    def test_create_rate_limiter_from_url(self):
+        assert create_rate_limiter("").store is None
+        with pytest.raises(ValueError):
+            create_rate_limiter("memcached://localhost:11211")
+
+
+class TestRedisRateLimitStore:
+    @pytest.fixture
+    def redis_client(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")  # fakeredis needs it to run Lua scripts
+        return fakeredis.FakeAsyncRedis()
+
+    @pytest.mark.asyncio
+    async def test_limit_is_shared_between_replicas(self, redis_client):
+        replica_a = RateLimiter(max_messages_per_minute=3, store=RedisRateLimitStore(client=redis_client))
+        replica_b = RateLimiter(max_messages_per_minute=3, store=RedisRateLimitStore(client=redis_client))
+
+        results = [await replica.acquire("user-1") for replica in (replica_a, replica_b, replica_a, replica_b)]
+
+        assert results == [True, True, True, False]
+        assert replica_a.user_limits == {}
+
+    @pytest.mark.asyncio
+    async def test_keys_expire_when_the_user_goes_idle(self, redis_client):
+        store = RedisRateLimitStore(client=redis_client)
+
+        allowed, _ = await store.acquire("user-1", interval=2.0, tolerance=58.0)
+
+        assert allowed
+        ttl_ms = await redis_client.pttl(f"{RedisRateLimitStore.KEY_PREFIX}user-1")
+        assert 0 < ttl_ms <= 2000
@@ -45,6 +45,8 @@ def _add_common_to_path():
 _add_common_to_path()
 
 from common.logging import get_structured_logger
+from common.async_dynamodb import run_dynamodb
+from common.rate_limit import RateLimit, RateLimiter
 
 from ..models.quest import QuestCreatePayload, QuestUpdatePayload, QuestResponse, QuestStatus, QuestKind
 from ..models import GoalResponse, AnswerOutput
@@ -1045,34 +1047,18 @@ def get_quest_by_id(quest_id: str) -> Optional[QuestResponse]:
         raise QuestDBError(f"Failed to get quest by ID: {str(e)}")
 
 
-# Rate limiting for quest completion checks
-_quest_completion_checks = {}  # {user_id: {last_check: timestamp, count: int}}
+# Rate limiting for quest completion checks (shared across Lambda instances, see common.rate_limit)
 RATE_LIMIT_WINDOW = 60  # 1 minute
 MAX_CHECKS_PER_WINDOW = 10  # Max 10 checks per minute per user
+_quest_completion_check_limiter = RateLimiter(
+    "quest:completion-check", RateLimit(limit=MAX_CHECKS_PER_WINDOW, period_seconds=RATE_LIMIT_WINDOW)
+)
 
 
-def _is_rate_limited(user_id: str) -> bool:
+async def _is_rate_limited(user_id: str) -> bool:
     """Check if user has exceeded rate limit for quest completion checks"""
-    now = time.time()
-    
-    if user_id not in _quest_completion_checks:
-        _quest_completion_checks[user_id] = {'last_check': now, 'count': 0}
-        return False
-    
-    user_checks = _quest_completion_checks[user_id]
-    
-    # Reset counter if window has passed
-    if now - user_checks['last_check'] > RATE_LIMIT_WINDOW:
-        user_checks['count'] = 0
-        user_checks['last_check'] = now
-    
-    # Check if rate limited
-    if user_checks['count'] >= MAX_CHECKS_PER_WINDOW:
-        return True
-    
-    # Increment counter
-    user_checks['count'] += 1
-    return False
+    decision = await _quest_completion_check_limiter.check_async(user_id)
+    return not decision.allowed
 
 
 async def check_and_complete_quests(
@@ -1102,7 +1088,7 @@ async def check_and_complete_quests(
                    timestamp=time.time())
         
         # Check rate limiting
-        if _is_rate_limited(user_id):
+        if await _is_rate_limited(user_id):
             logger.warning('quest.auto_completion_rate_limited', 
                          user_id=user_id,
                          task_id=completed_task_id,
@@ -1114,7 +1100,7 @@ async def check_and_complete_quests(
         
         # Get all active quests for the user
         logger.info('quest.auto_completion_fetching_active_quests', user_id=user_id)
-        active_quests = list_user_quests(user_id, status="active")
+        active_quests = await run_dynamodb(list_user_quests, user_id, status="active")
         
         logger.info('quest.auto_completion_active_quests_found', 
                    user_id=user_id,
@@ -1451,7 +1437,7 @@ async def _complete_quest(quest_id: str, user_id: str) -> None:
                    completed_at=now_ms)
         
         # Update quest status to completed
-        response = table.update_item(
+        response = await run_dynamodb(table.update_item,
             Key={
                 "PK": f"USER#{user_id}",
                 "SK": f"QUEST#{quest_id}"
@@ -1489,7 +1475,7 @@ async def _complete_quest(quest_id: str, user_id: str) -> None:
                    user_id=user_id,
                    audit_event=audit_event)
         
-        table.update_item(
+        await run_dynamodb(table.update_item,
             Key={
                 "PK": f"USER#{user_id}",
                 "SK": f"QUEST#{quest_id}"
@@ -1523,7 +1509,7 @@ async def _check_tasks_completion(task_ids: list[str], user_id: str) -> bool:
         
         for task_id in task_ids:
             # Query for the task with eventual consistency for better performance
-            response = table.query(
+            response = await run_dynamodb(table.query,
                 KeyConditionExpression=Key("PK").eq(f"USER#{user_id}") & Key("SK").eq(f"TASK#{task_id}"),
                 ConsistentRead=False  # Use eventual consistency for better performance
             )
@@ -1564,7 +1550,7 @@ async def _check_goals_completion(goal_ids: list[str], user_id: str) -> bool:
         
         for goal_id in goal_ids:
             # Query for the goal with eventual consistency for better performance
-            response = table.query(
+            response = await run_dynamodb(table.query,
                 KeyConditionExpression=Key("PK").eq(f"USER#{user_id}") & Key("SK").eq(f"GOAL#{goal_id}"),
                 ConsistentRead=False  # Use eventual consistency for better performance
             )
@@ -1604,7 +1590,7 @@ async def _count_completed_tasks_after_quest_start(user_id: str, quest_start_tim
         table = _get_dynamodb_table()
 
         # Query all tasks for the user with eventual consistency for better performance
-        response = table.query(
+        response = await run_dynamodb(table.query,
             KeyConditionExpression=Key('PK').eq(f'USER#{user_id}') & Key('SK').begins_with('TASK#'),            
             ConsistentRead=False  # Use eventual consistency for better performance
         )
@@ -1646,7 +1632,7 @@ async def _count_completed_goals_after_quest_start(user_id: str, quest_start_tim
         table = _get_dynamodb_table()
 
         # Query all goals for the user with eventual consistency for better performance
-        response = table.query(
+        response = await run_dynamodb(table.query,
             KeyConditionExpression="PK = :pk AND begins_with(SK, :sk_prefix)",            
             ExpressionAttributeValues={
                 ":pk": f"USER#{user_id}",
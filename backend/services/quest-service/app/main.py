@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import time
+
+_MODULE_LOAD_STARTED = time.perf_counter()
+
 import datetime
 import hashlib
+from decimal import Decimal
 import os
 import sys
-import time
 from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -27,13 +31,8 @@ from .db.quest_db import (
     delete_quest, list_user_quests, QuestDBError, QuestNotFoundError,
     QuestVersionConflictError, QuestPermissionError, QuestValidationError
 )
-from .db.quest_template_db import (
-    create_template, get_template, update_template, delete_template,
-    list_user_templates, list_public_templates, QuestTemplateDBError,
-    QuestTemplateNotFoundError, QuestTemplatePermissionError, QuestTemplateValidationError
-)
-from .db.analytics_db import get_cached_analytics, cache_analytics, AnalyticsDBError
-from .analytics.quest_analytics import calculate_quest_analytics
+# Template and analytics data access is imported inside the endpoints that use
+# it so Lambda cold starts only pay for it on first use.
 from .utils import _normalize_date_only,_normalize_deadline_output,_sanitize_string,_validate_answers,_serialize_answers,_validate_tags
 from .security.input_validation import (
     validate_user_id, validate_quest_title, validate_quest_description,
@@ -66,7 +65,6 @@ AWS_CONFIG = Config(
 # Initialize boto3 session with optimized config
 boto3_session = boto3.Session()
 dynamodb = boto3_session.resource('dynamodb', config=AWS_CONFIG)
-dynamodb_client = boto3_session.client('dynamodb', config=AWS_CONFIG)
 
 # Add common module to path - works both locally and in containers
 def _add_common_to_path():
@@ -98,6 +96,11 @@ def _add_common_to_path():
 _add_common_to_path()
 
 from common.logging import get_structured_logger, log_event
+from common.async_dynamodb import run_dynamodb
+from common.rate_limit import RateLimiter, install_rate_limit_headers
+from .security.rate_limiter import (
+    analytics_limiter, check_rate_limit, general_limiter, quest_completion_limiter, quest_creation_limiter,
+)
 
 from .auth import TokenVerificationError, TokenVerifier
 from .settings import Settings
@@ -121,9 +124,10 @@ settings = Settings()
 root_path = os.getenv("QUEST_SERVICE_ROOT_PATH", f"/{settings.environment.upper()}")
 app = FastAPI(root_path=root_path, title="Quest Service", version="2.0.0")
 
-# Log all registered routes at startup to diagnose routing issues
+# Log all registered routes at startup to diagnose routing issues. Under
+# Lambda, Mangum runs with lifespan off, so _mangum_handler calls this directly.
 @app.on_event("startup")
-async def _log_registered_routes() -> None:
+def _log_registered_routes() -> None:
     try:
         routes_summary = []
         for route in app.router.routes:
@@ -185,6 +189,10 @@ async def ensure_cors_headers(request: Request, call_next):
     return response
 
 
+# X-RateLimit-* headers for the limits in security.rate_limiter
+install_rate_limit_headers(app)
+
+
 
 
 @app.exception_handler(RequestValidationError)
@@ -257,8 +265,16 @@ def check_goal_access(user_id: str, goal_id: str, table) -> tuple[bool, str, Opt
         if "Item" in collaborator_response:
             # User is a collaborator, extract owner from the collaborator record
             collaborator_item = collaborator_response["Item"]
-            # The PK format is RESOURCE#GOAL#{goal_id}, we need to find the actual owner
-            # We'll need to scan for the goal to find the owner
+            owner_user_id = collaborator_item.get("ownerId")
+            if owner_user_id:
+                logger.info('goal.access_check_collaboration_found', 
+                           user_id=user_id, 
+                           goal_id=goal_id, 
+                           owner_user_id=owner_user_id)
+                return True, "collaborator", owner_user_id
+            
+            # Collaborations created before ownerId was stored: resolve the
+            # owner through the goal's GSI1 entry (GOAL#{goal_id} -> USER#{owner})
             logger.info('goal.access_check_scanning_for_goal', 
                        user_id=user_id, 
                        goal_id=goal_id,
@@ -312,6 +328,84 @@ def check_goal_access(user_id: str, goal_id: str, table) -> tuple[bool, str, Opt
         return False, "none", None
 
 
+BATCH_GET_MAX_KEYS = 100  # DynamoDB BatchGetItem limit per request
+BATCH_GET_MAX_RETRIES = 5
+
+
+def _lookup_goal_owner(goal_id: str, table) -> Optional[str]:
+    """Find a goal's owner through the goal's GSI1 entry (GOAL#{goal_id} -> USER#{owner})."""
+    response = table.query(
+        IndexName="GSI1",
+        KeyConditionExpression=Key("GSI1PK").eq(f"GOAL#{goal_id}") & Key("GSI1SK").begins_with("USER#"),
+        ProjectionExpression="GSI1SK",
+        Limit=1
+    )
+    items = response.get("Items", [])
+    if not items:
+        return None
+    return items[0]["GSI1SK"].replace("USER#", "", 1)
+
+
+def _batch_get_items(table, keys: List[Dict]) -> List[Dict]:
+    """Fetch items by primary key with BatchGetItem, retrying unprocessed keys."""
+    items: List[Dict] = []
+    for start in range(0, len(keys), BATCH_GET_MAX_KEYS):
+        request_items = {table.name: {"Keys": keys[start:start + BATCH_GET_MAX_KEYS]}}
+        for attempt in range(BATCH_GET_MAX_RETRIES):
+            response = table.meta.client.batch_get_item(RequestItems=request_items)
+            items.extend(response.get("Responses", {}).get(table.name, []))
+            request_items = response.get("UnprocessedKeys")
+            if not request_items:
+                break
+            time.sleep(0.05 * (2 ** attempt))
+        else:
+            logger.warning('goal.batch_get_unprocessed_keys', table=table.name)
+    return items
+
+
+def get_collaborated_goals(user_id: str, table) -> List[Dict]:
+    """
+    Load the goals a user collaborates on.
+    
+    Collaboration records carry the goal owner's ID (``ownerId``), so every
+    goal is fetched with BatchGetItem. Older records without it fall back to
+    the goal's GSI1 owner entry; no table scans are involved.
+    
+    Args:
+        user_id: ID of the collaborating user
+        table: DynamoDB table resource
+        
+    Returns:
+        Goal items, most recently joined collaboration first
+    """
+    collaborations = _query_all_pages(
+        table,
+        IndexName="GSI1",
+        KeyConditionExpression=Key("GSI1PK").eq(f"USER#{user_id}") & Key("GSI1SK").begins_with("COLLAB#goal#"),
+        ScanIndexForward=False
+    )
+    
+    keys = []
+    seen = set()
+    for collaboration in collaborations:
+        goal_id = collaboration.get("resourceId")
+        if not goal_id or goal_id in seen:
+            continue
+        seen.add(goal_id)
+        owner_id = collaboration.get("ownerId") or _lookup_goal_owner(goal_id, table)
+        if owner_id:
+            keys.append({"PK": f"USER#{owner_id}", "SK": f"GOAL#{goal_id}"})
+    
+    if not keys:
+        return []
+    goals = _batch_get_items(table, keys)
+    
+    # BatchGetItem does not preserve request order
+    positions = {(key["PK"], key["SK"]): index for index, key in enumerate(keys)}
+    goals.sort(key=lambda goal: positions.get((goal.get("PK"), goal.get("SK")), len(positions)))
+    return goals
+
+
 @lru_cache(maxsize=1)
 def _token_verifier() -> TokenVerifier:
     return TokenVerifier(settings)
@@ -436,7 +530,18 @@ async def authenticate(request: Request) -> AuthContext:
         user_agent=user_agent
     )
 
-    return AuthContext(user_id=user_id, claims=claims, provider=provider)
+    auth = AuthContext(user_id=user_id, claims=claims, provider=provider)
+    request.state.auth_context = auth
+    await check_rate_limit(general_limiter, request)
+    return auth
+
+
+def rate_limited(limiter: RateLimiter):
+    """Route dependency applying ``limiter`` per authenticated user, on top of the general limit."""
+    async def enforce(request: Request, auth: AuthContext = Depends(authenticate)) -> None:
+        request.state.auth_context = auth
+        await check_rate_limit(limiter, request)
+    return enforce
 
 
 
@@ -478,6 +583,8 @@ def _build_goal_item(user_id: str, payload: GoalCreatePayload) -> Dict:
         "status": "active",
         "createdAt": now_ms,
         "updatedAt": now_ms,
+        "totalTasks": 0,
+        "completedTasks": 0,
         "GSI1PK": f"GOAL#{goal_id}",
         "GSI1SK": f"USER#{user_id}",
     }
@@ -613,7 +720,7 @@ def _to_response_with_access(item: Dict, access_type: str, current_user_id: str)
 # GET /quests endpoint removed - now handled by AppSync GraphQL resolver
 
 
-@app.post("/quests", response_model=GoalResponse, status_code=201)
+@app.post("/quests", response_model=GoalResponse, status_code=201, dependencies=[Depends(rate_limited(quest_creation_limiter))])
 async def create_goal(
     payload: GoalCreatePayload,
     auth: AuthContext = Depends(authenticate),
@@ -622,7 +729,7 @@ async def create_goal(
     item = _build_goal_item(auth.user_id, payload)
     log_event(logger, 'quests.create_start', user_id=auth.user_id, goal_id=item['id'])
     try:
-        table.put_item(
+        await run_dynamodb(table.put_item,
             Item=item,
             ConditionExpression="attribute_not_exists(PK) AND attribute_not_exists(SK)",
         )
@@ -652,7 +759,7 @@ async def update_goal(
     
     # First, get the existing goal to ensure it exists and user owns it
     try:
-        response = table.get_item(
+        response = await run_dynamodb(table.get_item,
             Key={"PK": f"USER#{auth.user_id}", "SK": f"GOAL#{goal_id}"}
         )
     except (ClientError, BotoCoreError) as exc:
@@ -731,7 +838,7 @@ async def update_goal(
     update_expression = "SET " + ", ".join(update_expression_parts)
 
     try:
-        table.update_item(
+        await run_dynamodb(table.update_item,
             Key={"PK": f"USER#{auth.user_id}", "SK": f"GOAL#{goal_id}"},
             UpdateExpression=update_expression,
             ExpressionAttributeValues=expression_attribute_values,
@@ -747,7 +854,7 @@ async def update_goal(
 
     # Return updated goal
     try:
-        response = table.get_item(
+        response = await run_dynamodb(table.get_item,
             Key={"PK": f"USER#{auth.user_id}", "SK": f"GOAL#{goal_id}"}
         )
         updated_item = response.get("Item")
@@ -757,26 +864,11 @@ async def update_goal(
         # Trigger progress recalculation if deadline was updated
         if payload.deadline is not None:
             try:
-                # Calculate progress and update goal record
-                progress_data = compute_goal_progress(goal_id, auth.user_id, table)
-                
-                # Update goal with progress data
-                goal_update_expression = "SET progress = :progress, milestones = :milestones, completedTasks = :completedTasks, totalTasks = :totalTasks, updatedAt = :updatedAt"
-                goal_expression_values = {
-                    ":progress": progress_data.progressPercentage,
-                    ":milestones": [milestone.dict() for milestone in progress_data.milestones],
-                    ":completedTasks": progress_data.completedTasks,
-                    ":totalTasks": progress_data.totalTasks,
-                    ":updatedAt": int(time.time() * 1000)
-                }
-                
-                table.update_item(
-                    Key={"PK": f"USER#{auth.user_id}", "SK": f"GOAL#{goal_id}"},
-                    UpdateExpression=goal_update_expression,
-                    ExpressionAttributeValues=goal_expression_values
-                )
+                # Time progress depends on the deadline; task counters are unchanged
+                progress_data = await run_dynamodb(refresh_goal_progress, table, auth.user_id, {**updated_item, "id": goal_id})
                 
-                logger.info('progress.recalculated_after_goal_deadline_update', goal_id=goal_id, progress=progress_data.progressPercentage)
+                logger.info('progress.recalculated_after_goal_deadline_update', goal_id=goal_id,
+                            progress=progress_data.progressPercentage if progress_data else None)
                 
             except Exception as exc:
                 # Log error but don't fail the goal update
@@ -803,7 +895,7 @@ async def delete_goal(
     
     # First, check if goal exists and user owns it
     try:
-        response = table.get_item(
+        response = await run_dynamodb(table.get_item,
             Key={"PK": f"USER#{auth.user_id}", "SK": f"GOAL#{goal_id}"}
         )
     except (ClientError, BotoCoreError) as exc:
@@ -822,7 +914,7 @@ async def delete_goal(
     try:
         # Query for all tasks with this goal_id using the main table
         # Tasks have SK pattern: TASK#{task_id} and goalId field
-        query_response = table.query(
+        query_response = await run_dynamodb(table.query,
             KeyConditionExpression="PK = :pk AND begins_with(SK, :sk_prefix)",
             FilterExpression="goalId = :goal_id",
             ExpressionAttributeValues={
@@ -837,7 +929,7 @@ async def delete_goal(
             task_id = task_item.get("id")
             if task_id:
                 try:
-                    table.delete_item(
+                    await run_dynamodb(table.delete_item,
                         Key={"PK": f"USER#{auth.user_id}", "SK": f"TASK#{task_id}"}
                     )
                     log_event(logger, 'quests.delete_task_success', user_id=auth.user_id, task_id=task_id, goal_id=goal_id)
@@ -859,7 +951,7 @@ async def delete_goal(
 
     # Delete the goal
     try:
-        table.delete_item(
+        await run_dynamodb(table.delete_item,
             Key={"PK": f"USER#{auth.user_id}", "SK": f"GOAL#{goal_id}"}
         )
     except (ClientError, BotoCoreError) as exc:
@@ -973,7 +1065,7 @@ async def create_task(
              task_title=payload.title)
 
   # Check if user has access to the goal (owner or collaborator)
-  has_access, access_type, owner_user_id = check_goal_access(user_id, payload.goalId, table)
+  has_access, access_type, owner_user_id = await run_dynamodb(check_goal_access, user_id, payload.goalId, table)
   
   logger.info('task.access_check_result', 
              user_id=user_id, 
@@ -991,12 +1083,12 @@ async def create_task(
   # Get the goal item from the owner's record
   try:
     if access_type == "owner":
-      response = table.get_item(
+      response = await run_dynamodb(table.get_item,
         Key={"PK": f"USER#{user_id}", "SK": f"GOAL#{payload.goalId}"}
       )
     else:
       # User is a collaborator, get goal from owner's record
-      response = table.get_item(
+      response = await run_dynamodb(table.get_item,
         Key={"PK": f"USER#{owner_user_id}", "SK": f"GOAL#{payload.goalId}"}
       )
   except (ClientError, BotoCoreError) as exc:
@@ -1032,35 +1124,20 @@ async def create_task(
   task_owner_id = owner_user_id if access_type == "collaborator" else user_id
   item = _build_task_item(task_owner_id, payload)
   try:
-    table.put_item(
+    await run_dynamodb(table.put_item,
       Item=item,
       ConditionExpression="attribute_not_exists(PK) AND attribute_not_exists(SK)",
     )
   except (ClientError, BotoCoreError) as exc:
     raise HTTPException(status_code=500, detail="Could not create task at this time")
 
-  # Trigger progress recalculation for the goal (asynchronous)
+  # Maintain the goal's task counters and progress snapshot
   try:
-    # Calculate progress and update goal record
-    progress_data = compute_goal_progress(payload.goalId, task_owner_id, table)
-    
-    # Update goal with progress data
-    goal_update_expression = "SET progress = :progress, milestones = :milestones, completedTasks = :completedTasks, totalTasks = :totalTasks, updatedAt = :updatedAt"
-    goal_expression_values = {
-      ":progress": progress_data.progressPercentage,
-      ":milestones": [milestone.dict() for milestone in progress_data.milestones],
-      ":completedTasks": progress_data.completedTasks,
-      ":totalTasks": progress_data.totalTasks,
-      ":updatedAt": int(time.time() * 1000)
-    }
-    
-    table.update_item(
-      Key={"PK": f"USER#{task_owner_id}", "SK": f"GOAL#{payload.goalId}"},
-      UpdateExpression=goal_update_expression,
-      ExpressionAttributeValues=goal_expression_values
-    )
+    total_delta, completed_delta = task_counter_deltas(None, item)
+    progress_data = await run_dynamodb(update_goal_task_counters, table, task_owner_id, payload.goalId, total_delta, completed_delta)
     
-    logger.info('progress.recalculated_after_task_creation', goal_id=payload.goalId, task_id=item.get('id'), progress=progress_data.progressPercentage)
+    logger.info('progress.recalculated_after_task_creation', goal_id=payload.goalId, task_id=item.get('id'),
+                progress=progress_data.progressPercentage if progress_data else None)
     
   except Exception as exc:
     # Log error but don't fail the task creation
@@ -1080,7 +1157,7 @@ async def update_task(
 
     # Verify task exists and belongs to user
     try:
-        response = table.get_item(
+        response = await run_dynamodb(table.get_item,
             Key={"PK": f"USER#{user_id}", "SK": f"TASK#{task_id}"}
         )
     except (ClientError, BotoCoreError) as exc:
@@ -1106,7 +1183,7 @@ async def update_task(
         goal_id = task_item.get("goalId")
         if goal_id:
             try:
-                goal_response = table.get_item(
+                goal_response = await run_dynamodb(table.get_item,
                     Key={"PK": f"USER#{user_id}", "SK": f"GOAL#{goal_id}"}
                 )
                 goal_item = goal_response.get("Item")
@@ -1160,18 +1237,22 @@ async def update_task(
         expression_attribute_values[":verificationEvidenceIds"] = payload.verificationEvidenceIds
 
     try:
-        table.update_item(
+        update_response = await run_dynamodb(table.update_item,
             Key={"PK": f"USER#{user_id}", "SK": f"TASK#{task_id}"},
             UpdateExpression=update_expression,
             ExpressionAttributeValues=expression_attribute_values,
             ExpressionAttributeNames=expression_attribute_names if expression_attribute_names else None,
+            ReturnValues="ALL_OLD",
         )
     except (ClientError, BotoCoreError) as exc:
         raise HTTPException(status_code=500, detail="Could not update task at this time")
 
+    # The task as it was right before this write, so counter deltas stay exact
+    previous_task = (update_response or {}).get("Attributes") or task_item
+
     # Fetch updated task
     try:
-        response = table.get_item(
+        response = await run_dynamodb(table.get_item,
             Key={"PK": f"USER#{user_id}", "SK": f"TASK#{task_id}"}
         )
     except (ClientError, BotoCoreError) as exc:
@@ -1181,31 +1262,16 @@ async def update_task(
     if not updated_task:
         raise HTTPException(status_code=500, detail="Could not retrieve updated task")
 
-    # Trigger progress recalculation for the goal (asynchronous)
+    # Maintain the goal's task counters and progress snapshot
     goal_id = updated_task.get("goalId")
     if goal_id:
         try:
-            # Calculate progress and update goal record
-            progress_data = compute_goal_progress(goal_id, user_id, table)
+            new_status = payload.status if payload.status is not None else previous_task.get("status")
+            total_delta, completed_delta = task_counter_deltas(previous_task, {**previous_task, "status": new_status})
+            progress_data = await run_dynamodb(update_goal_task_counters, table, user_id, goal_id, total_delta, completed_delta)
             
-            # Update goal with progress data
-            goal_update_expression = "SET progress = :progress, milestones = :milestones, completedTasks = :completedTasks, totalTasks = :totalTasks, updatedAt = :updatedAt"
-            from decimal import Decimal
-            goal_expression_values = {
-                ":progress": Decimal(str(progress_data.progressPercentage)),
-                ":milestones": [milestone.dict() for milestone in progress_data.milestones],
-                ":completedTasks": progress_data.completedTasks,
-                ":totalTasks": progress_data.totalTasks,
-                ":updatedAt": int(time.time() * 1000)
-            }
-            
-            table.update_item(
-                Key={"PK": f"USER#{user_id}", "SK": f"GOAL#{goal_id}"},
-                UpdateExpression=goal_update_expression,
-                ExpressionAttributeValues=goal_expression_values
-            )
-            
-            logger.info('progress.recalculated_after_task_update', goal_id=goal_id, task_id=task_id, progress=progress_data.progressPercentage)
+            if progress_data:
+                logger.info('progress.recalculated_after_task_update', goal_id=goal_id, task_id=task_id, progress=progress_data.progressPercentage)
             
         except Exception as exc:
             # Log error but don't fail the task update
@@ -1223,7 +1289,7 @@ async def submit_task_verification(
 ):
     user_id = auth.user_id
     try:
-        response = table.get_item(
+        response = await run_dynamodb(table.get_item,
             Key={"PK": f"USER#{user_id}", "SK": f"TASK#{task_id}"}
         )
     except (ClientError, BotoCoreError):
@@ -1269,17 +1335,28 @@ async def submit_task_verification(
     expression_attribute_names = {"#status": "status"}
 
     try:
-        table.update_item(
+        update_response = await run_dynamodb(table.update_item,
             Key={"PK": f"USER#{user_id}", "SK": f"TASK#{task_id}"},
             UpdateExpression=update_expression,
             ExpressionAttributeValues=expression_attribute_values,
             ExpressionAttributeNames=expression_attribute_names,
+            ReturnValues="ALL_OLD",
         )
     except (ClientError, BotoCoreError):
         raise HTTPException(status_code=500, detail="Could not submit verification at this time")
 
+    # Submitting evidence completes the task; keep the goal's counters in step
+    previous_task = (update_response or {}).get("Attributes") or task_item
+    goal_id = previous_task.get("goalId")
+    if goal_id:
+        try:
+            total_delta, completed_delta = task_counter_deltas(previous_task, {**previous_task, "status": "completed"})
+            await run_dynamodb(update_goal_task_counters, table, user_id, goal_id, total_delta, completed_delta)
+        except Exception as exc:
+            logger.error('progress.recalculation_failed_after_task_verification', goal_id=goal_id, task_id=task_id, exc_info=exc)
+
     try:
-        response = table.get_item(
+        response = await run_dynamodb(table.get_item,
             Key={"PK": f"USER#{user_id}", "SK": f"TASK#{task_id}"}
         )
     except (ClientError, BotoCoreError):
@@ -1301,7 +1378,7 @@ async def review_task_verification(
 ):
     user_id = auth.user_id
     try:
-        response = table.get_item(
+        response = await run_dynamodb(table.get_item,
             Key={"PK": f"USER#{user_id}", "SK": f"TASK#{task_id}"}
         )
     except (ClientError, BotoCoreError):
@@ -1330,7 +1407,7 @@ async def review_task_verification(
     }
 
     try:
-        table.update_item(
+        await run_dynamodb(table.update_item,
             Key={"PK": f"USER#{user_id}", "SK": f"TASK#{task_id}"},
             UpdateExpression=update_expression,
             ExpressionAttributeValues=expression_attribute_values,
@@ -1339,7 +1416,7 @@ async def review_task_verification(
         raise HTTPException(status_code=500, detail="Could not review verification at this time")
 
     try:
-        response = table.get_item(
+        response = await run_dynamodb(table.get_item,
             Key={"PK": f"USER#{user_id}", "SK": f"TASK#{task_id}"}
         )
     except (ClientError, BotoCoreError):
@@ -1361,7 +1438,7 @@ async def flag_task_verification(
 ):
     user_id = auth.user_id
     try:
-        response = table.get_item(
+        response = await run_dynamodb(table.get_item,
             Key={"PK": f"USER#{user_id}", "SK": f"TASK#{task_id}"}
         )
     except (ClientError, BotoCoreError):
@@ -1389,7 +1466,7 @@ async def flag_task_verification(
     }
 
     try:
-        table.update_item(
+        await run_dynamodb(table.update_item,
             Key={"PK": f"USER#{user_id}", "SK": f"TASK#{task_id}"},
             UpdateExpression=update_expression,
             ExpressionAttributeValues=expression_attribute_values,
@@ -1398,7 +1475,7 @@ async def flag_task_verification(
         raise HTTPException(status_code=500, detail="Could not flag verification at this time")
 
     try:
-        response = table.get_item(
+        response = await run_dynamodb(table.get_item,
             Key={"PK": f"USER#{user_id}", "SK": f"TASK#{task_id}"}
         )
     except (ClientError, BotoCoreError):
@@ -1421,7 +1498,7 @@ async def delete_task(
 
     # Verify task exists and belongs to user
     try:
-        response = table.get_item(
+        response = await run_dynamodb(table.get_item,
             Key={"PK": f"USER#{user_id}", "SK": f"TASK#{task_id}"}
         )
     except (ClientError, BotoCoreError) as exc:
@@ -1436,36 +1513,23 @@ async def delete_task(
     
     # Delete the task
     try:
-        table.delete_item(
-            Key={"PK": f"USER#{user_id}", "SK": f"TASK#{task_id}"}
+        delete_response = await run_dynamodb(table.delete_item,
+            Key={"PK": f"USER#{user_id}", "SK": f"TASK#{task_id}"},
+            ReturnValues="ALL_OLD",
         )
     except (ClientError, BotoCoreError) as exc:
         raise HTTPException(status_code=500, detail="Could not delete task at this time")
 
-    # Trigger progress recalculation for the goal (asynchronous)
-    if goal_id:
+    # Maintain the goal's task counters and progress snapshot. Only the request
+    # that actually removed the task (ALL_OLD returned it) adjusts them.
+    deleted_task = (delete_response or {}).get("Attributes")
+    if goal_id and deleted_task:
         try:
-            # Calculate progress and update goal record
-            progress_data = compute_goal_progress(goal_id, user_id, table)
-            
-            # Update goal with progress data
-            goal_update_expression = "SET progress = :progress, milestones = :milestones, completedTasks = :completedTasks, totalTasks = :totalTasks, updatedAt = :updatedAt"
-            from decimal import Decimal
-            goal_expression_values = {
-                ":progress": Decimal(str(progress_data.progressPercentage)),
-                ":milestones": [milestone.dict() for milestone in progress_data.milestones],
-                ":completedTasks": progress_data.completedTasks,
-                ":totalTasks": progress_data.totalTasks,
-                ":updatedAt": int(time.time() * 1000)
-            }
-            
-            table.update_item(
-                Key={"PK": f"USER#{user_id}", "SK": f"GOAL#{goal_id}"},
-                UpdateExpression=goal_update_expression,
-                ExpressionAttributeValues=goal_expression_values
-            )
+            total_delta, completed_delta = task_counter_deltas(deleted_task, None)
+            progress_data = await run_dynamodb(update_goal_task_counters, table, user_id, goal_id, total_delta, completed_delta)
             
-            logger.info('progress.recalculated_after_task_deletion', goal_id=goal_id, task_id=task_id, progress=progress_data.progressPercentage)
+            logger.info('progress.recalculated_after_task_deletion', goal_id=goal_id, task_id=task_id,
+                        progress=progress_data.progressPercentage if progress_data else None)
             
         except Exception as exc:
             # Log error but don't fail the task deletion
@@ -1485,10 +1549,15 @@ async def get_quest_template(
     auth: AuthContext = Depends(authenticate)
 ):
     """Get a quest template by ID"""
+    from .db.quest_template_db import (
+        get_template, QuestTemplateDBError, QuestTemplateNotFoundError,
+        QuestTemplatePermissionError,
+    )
+
     log_event(logger, 'quest_template.get_start', user_id=auth.user_id, template_id=template_id)
     
     try:
-        template = get_template(template_id, auth.user_id)
+        template = await run_dynamodb(get_template, template_id, auth.user_id)
         log_event(logger, 'quest_template.get_success', user_id=auth.user_id, template_id=template_id)
         return template
     except QuestTemplateNotFoundError as e:
@@ -1509,10 +1578,15 @@ async def update_quest_template(
     auth: AuthContext = Depends(authenticate)
 ):
     """Update a quest template"""
+    from .db.quest_template_db import (
+        update_template, QuestTemplateDBError, QuestTemplateNotFoundError,
+        QuestTemplatePermissionError, QuestTemplateValidationError,
+    )
+
     log_event(logger, 'quest_template.update_start', user_id=auth.user_id, template_id=template_id)
     
     try:
-        template = update_template(template_id, auth.user_id, payload)
+        template = await run_dynamodb(update_template, template_id, auth.user_id, payload)
         log_event(logger, 'quest_template.update_success', user_id=auth.user_id, template_id=template_id)
         return template
     except QuestTemplateNotFoundError as e:
@@ -1535,10 +1609,15 @@ async def delete_quest_template(
     auth: AuthContext = Depends(authenticate)
 ):
     """Delete a quest template"""
+    from .db.quest_template_db import (
+        delete_template, QuestTemplateDBError, QuestTemplateNotFoundError,
+        QuestTemplatePermissionError,
+    )
+
     log_event(logger, 'quest_template.delete_start', user_id=auth.user_id, template_id=template_id)
     
     try:
-        delete_template(template_id, auth.user_id)
+        await run_dynamodb(delete_template, template_id, auth.user_id)
         log_event(logger, 'quest_template.delete_success', user_id=auth.user_id, template_id=template_id)
         return {"success": True, "message": "Quest template deleted successfully"}
     except QuestTemplateNotFoundError as e:
@@ -1560,13 +1639,18 @@ async def list_quest_templates(
     privacy: str = "user"  # "user", "public", "all"
 ):
     """List quest templates"""
+    from .db.quest_template_db import (
+        list_user_templates, list_public_templates,
+        QuestTemplateDBError,
+    )
+
     log_event(logger, 'quest_template.list_start', user_id=auth.user_id, limit=limit, privacy=privacy)
     
     try:
         if privacy == "public":
-            result = list_public_templates(limit, next_token)
+            result = await run_dynamodb(list_public_templates, limit, next_token)
         else:
-            result = list_user_templates(auth.user_id, limit, next_token)
+            result = await run_dynamodb(list_user_templates, auth.user_id, limit, next_token)
         
         log_event(logger, 'quest_template.list_success', 
                  user_id=auth.user_id, 
@@ -1607,7 +1691,7 @@ async def get_goal(
     
     try:
         # Check if user has access to the goal
-        has_access, access_type, owner_user_id = check_goal_access(auth.user_id, goal_id, table)
+        has_access, access_type, owner_user_id = await run_dynamodb(check_goal_access, auth.user_id, goal_id, table)
         
         if not has_access:
             logger.warning('goal.access_denied', goal_id=goal_id, user_id=auth.user_id)
@@ -1631,7 +1715,7 @@ async def get_goal(
                    goal_user_id=goal_user_id)
         
         # Get the goal from the owner
-        response = table.get_item(
+        response = await run_dynamodb(table.get_item,
             Key={"PK": f"USER#{goal_user_id}", "SK": f"GOAL#{goal_id}"}
         )
         
@@ -1684,7 +1768,7 @@ async def get_goal_progress(
     
     try:
         # Check if user has access to the goal
-        has_access, access_type, owner_user_id = check_goal_access(auth.user_id, goal_id, table)
+        has_access, access_type, owner_user_id = await run_dynamodb(check_goal_access, auth.user_id, goal_id, table)
         
         if not has_access:
             logger.warning('progress.access_denied', goal_id=goal_id, user_id=auth.user_id)
@@ -1699,7 +1783,7 @@ async def get_goal_progress(
                    access_type=access_type,
                    progress_user_id=progress_user_id)
         
-        progress_data = compute_goal_progress(goal_id, progress_user_id, table)
+        progress_data = await run_dynamodb(compute_goal_progress, goal_id, progress_user_id, table)
         logger.info('progress.calculated', goal_id=goal_id, progress=progress_data.progressPercentage)
         return progress_data
     except HTTPException:
@@ -1727,23 +1811,8 @@ async def get_all_goals_progress(
     logger.info('progress.get_all_requested', user_id=auth.user_id)
     
     try:
-        # Get all goals for the user
-        response = table.query(
-            KeyConditionExpression=Key("PK").eq(f"USER#{auth.user_id}") & Key("SK").begins_with("GOAL#")
-        )
-        goals = response.get("Items", [])
-        
-        progress_list = []
-        for goal in goals:
-            try:
-                goal_id = goal.get("id")
-                if goal_id:
-                    progress_data = compute_goal_progress(goal_id, auth.user_id, table)
-                    progress_list.append(progress_data)
-            except Exception as exc:
-                logger.error('progress.calculation_failed_for_goal', goal_id=goal.get("id"), exc_info=exc)
-                # Continue with other goals even if one fails
-                continue
+        # One goals query and one tasks query, regardless of the number of goals
+        progress_list = await run_dynamodb(compute_all_goals_progress, auth.user_id, table)
         
         logger.info('progress.all_calculated', user_id=auth.user_id, count=len(progress_list))
         return progress_list
@@ -1755,6 +1824,91 @@ async def get_all_goals_progress(
 
 # ---------- Progress Calculation Functions ----------
 
+def _query_all_pages(table, **query_kwargs) -> List[Dict]:
+    """Run a query and follow LastEvaluatedKey until every page is read."""
+    items: List[Dict] = []
+    while True:
+        response = table.query(**query_kwargs)
+        items.extend(response.get("Items", []))
+        last_evaluated_key = response.get("LastEvaluatedKey")
+        if not last_evaluated_key:
+            return items
+        query_kwargs["ExclusiveStartKey"] = last_evaluated_key
+
+
+def load_user_goals_and_tasks(user_id: str, table, include_goals: bool = True) -> tuple[List[Dict], Dict[str, List[Dict]]]:
+    """
+    Load all goals of a user and their tasks grouped by goal.
+    
+    Goals and tasks share the user partition, so this is exactly two queries
+    (plus continuation pages) however many goals the user has.
+    
+    Args:
+        user_id: The user ID
+        table: DynamoDB table resource
+        include_goals: Set to False to read only the tasks
+        
+    Returns:
+        (goals, tasks_by_goal) where tasks_by_goal maps goal ID to its tasks
+    """
+    goals = []
+    if include_goals:
+        goals = _query_all_pages(
+            table,
+            KeyConditionExpression=Key("PK").eq(f"USER#{user_id}") & Key("SK").begins_with("GOAL#")
+        )
+    tasks = _query_all_pages(
+        table,
+        KeyConditionExpression=Key("PK").eq(f"USER#{user_id}") & Key("SK").begins_with("TASK#"),
+        ProjectionExpression="goalId, #status",
+        ExpressionAttributeNames={"#status": "status"}
+    )
+    
+    tasks_by_goal: Dict[str, List[Dict]] = {}
+    for task in tasks:
+        goal_id = task.get("goalId")
+        if goal_id:
+            tasks_by_goal.setdefault(goal_id, []).append(task)
+    return goals, tasks_by_goal
+
+
+def compute_all_goals_progress(user_id: str, table) -> List[GoalProgressResponse]:
+    """
+    Calculate progress for every goal of a user in one pass.
+    
+    Goals carrying persisted task counters need only the goals query; the
+    user's tasks are read once more only if some goal predates the counters.
+    
+    Args:
+        user_id: The user ID
+        table: DynamoDB table resource
+        
+    Returns:
+        List of GoalProgressResponse objects, one per goal
+    """
+    goals = _query_all_pages(
+        table,
+        KeyConditionExpression=Key("PK").eq(f"USER#{user_id}") & Key("SK").begins_with("GOAL#")
+    )
+    tasks_by_goal = None
+    if not all(has_task_counters(goal) for goal in goals):
+        _, tasks_by_goal = load_user_goals_and_tasks(user_id, table, include_goals=False)
+    
+    progress_list = []
+    for goal in goals:
+        goal_id = goal.get("id")
+        if not goal_id:
+            continue
+        try:
+            tasks = None if has_task_counters(goal) else tasks_by_goal.get(goal_id, [])
+            progress_list.append(build_goal_progress(goal, tasks))
+        except Exception as exc:
+            logger.error('progress.calculation_failed_for_goal', goal_id=goal_id, exc_info=exc)
+            # Continue with other goals even if one fails
+            continue
+    return progress_list
+
+
 def get_goal_tasks(goal_id: str, user_id: str, table) -> List[Dict]:
     """
     Get all tasks for a specific goal.
@@ -1768,11 +1922,11 @@ def get_goal_tasks(goal_id: str, user_id: str, table) -> List[Dict]:
         List of task dictionaries
     """
     try:
-        response = table.query(
+        return _query_all_pages(
+            table,
             KeyConditionExpression=Key("PK").eq(f"USER#{user_id}") & Key("SK").begins_with("TASK#"),
             FilterExpression=Key("goalId").eq(goal_id)
         )
-        return response.get("Items", [])
     except (ClientError, BotoCoreError) as exc:
         logger.error('progress.get_tasks_failed', goal_id=goal_id, user_id=user_id, exc_info=exc)
         return []
@@ -1907,6 +2061,183 @@ def is_goal_urgent(goal: Dict) -> bool:
         return False
 
 
+def has_task_counters(goal: Dict) -> bool:
+    """Whether a goal item carries the persisted totalTasks/completedTasks counters."""
+    return goal.get("totalTasks") is not None and goal.get("completedTasks") is not None
+
+
+def build_goal_progress(goal: Dict, tasks: Optional[List[Dict]] = None) -> GoalProgressResponse:
+    """
+    Calculate hybrid progress for a goal from already loaded goal and task items.
+    
+    Args:
+        goal: Goal dictionary from DynamoDB
+        tasks: The goal's task dictionaries (only ``status`` is used). When
+            omitted, the goal's persisted task counters are used instead.
+        
+    Returns:
+        GoalProgressResponse with calculated progress data
+    """
+    goal_id = goal["id"]
+    
+    # Step 1: Calculate task completion progress
+    if tasks is None:
+        total_tasks = max(0, int(goal.get("totalTasks") or 0))
+        completed_tasks = min(total_tasks, max(0, int(goal.get("completedTasks") or 0)))
+    else:
+        total_tasks = len(tasks)
+        completed_tasks = len([t for t in tasks if t.get('status') == 'completed'])
+    
+    # Goals without tasks show 0% progress (not time-based fallback)
+    task_progress = 0.0
+    if total_tasks > 0:
+        task_progress = (completed_tasks / total_tasks) * 100
+    
+    # Step 2: Calculate time-based progress (deadline is mandatory)
+    time_progress = calculate_time_progress(goal)
+    
+    # Step 3: Calculate hybrid progress (fixed 70/30 weight split)
+    hybrid_progress = (task_progress * 0.7) + (time_progress * 0.3)
+    
+    # Step 4: Determine milestones (fixed thresholds, non-retroactive)
+    milestones = calculate_milestones(hybrid_progress, goal_id)
+    
+    return GoalProgressResponse(
+        goalId=goal_id,
+        progressPercentage=round(hybrid_progress, 2),
+        taskProgress=round(task_progress, 2),
+        timeProgress=round(time_progress, 2),
+        completedTasks=completed_tasks,
+        totalTasks=total_tasks,
+        milestones=milestones,
+        lastUpdated=int(time.time() * 1000),
+        isOverdue=is_goal_overdue(goal),
+        isUrgent=is_goal_urgent(goal)
+    )
+
+
+def task_counter_deltas(old_task: Optional[Dict], new_task: Optional[Dict]) -> tuple[int, int]:
+    """
+    Return the (totalTasks, completedTasks) change for a task write.
+    
+    Args:
+        old_task: Task before the write (None when it is being created)
+        new_task: Task after the write (None when it is being deleted)
+    """
+    def counts(task: Optional[Dict]) -> tuple[int, int]:
+        if task is None:
+            return 0, 0
+        return 1, int(task.get("status") == "completed")
+    
+    old_total, old_completed = counts(old_task)
+    new_total, new_completed = counts(new_task)
+    return new_total - old_total, new_completed - old_completed
+
+
+def _seed_goal_task_counters(table, owner_id: str, goal_id: str) -> Optional[Dict]:
+    """Initialise the counters of a goal created before they were maintained by counting its tasks once."""
+    tasks = get_goal_tasks(goal_id, owner_id, table)
+    try:
+        response = table.update_item(
+            Key={"PK": f"USER#{owner_id}", "SK": f"GOAL#{goal_id}"},
+            UpdateExpression="SET totalTasks = :total, completedTasks = :completed",
+            ConditionExpression="attribute_exists(PK) AND attribute_not_exists(totalTasks)",
+            ExpressionAttributeValues={
+                ":total": len(tasks),
+                ":completed": len([t for t in tasks if t.get("status") == "completed"]),
+            },
+            ReturnValues="ALL_NEW",
+        )
+    except ClientError as exc:
+        if exc.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+            raise
+        # Goal deleted, or another request seeded the counters first
+        return None
+    return response.get("Attributes")
+
+
+def _store_goal_progress(table, owner_id: str, goal: Dict) -> GoalProgressResponse:
+    """Store the progress snapshot (progress, milestones) computed from the goal's counters."""
+    progress_data = build_goal_progress(goal)
+    try:
+        table.update_item(
+            Key={"PK": f"USER#{owner_id}", "SK": f"GOAL#{goal['id']}"},
+            UpdateExpression="SET progress = :progress, milestones = :milestones",
+            ConditionExpression="totalTasks = :totalTasks AND completedTasks = :completedTasks",
+            ExpressionAttributeValues={
+                ":progress": Decimal(str(progress_data.progressPercentage)),
+                # DynamoDB rejects floats, so milestone percentages are stored as Decimal
+                ":milestones": [
+                    {**milestone.dict(), "percentage": Decimal(str(milestone.percentage))}
+                    for milestone in progress_data.milestones
+                ],
+                ":totalTasks": goal["totalTasks"],
+                ":completedTasks": goal["completedTasks"],
+            },
+        )
+    except ClientError as exc:
+        # A concurrent task write changed the counters and stores its own snapshot
+        if exc.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+            raise
+    return progress_data
+
+
+def update_goal_task_counters(table, owner_id: str, goal_id: str, total_delta: int = 0,
+                              completed_delta: int = 0) -> Optional[GoalProgressResponse]:
+    """
+    Atomically apply task count changes to a goal and refresh its stored progress.
+    
+    Counters are adjusted with a single ``ADD`` update, so concurrent task
+    writes never lose increments and no task rows are read. Goals that predate
+    the counters are seeded once from their tasks (the count already includes
+    the write being applied).
+    
+    Args:
+        table: DynamoDB table resource
+        owner_id: ID of the user owning the goal (and its tasks)
+        goal_id: The goal ID
+        total_delta: Change in the number of tasks
+        completed_delta: Change in the number of completed tasks
+        
+    Returns:
+        The goal's new progress, or None when nothing changed or the goal no
+        longer exists
+    """
+    if not total_delta and not completed_delta:
+        return None
+    
+    try:
+        response = table.update_item(
+            Key={"PK": f"USER#{owner_id}", "SK": f"GOAL#{goal_id}"},
+            UpdateExpression="ADD totalTasks :total, completedTasks :completed SET updatedAt = :updatedAt",
+            ConditionExpression="attribute_exists(totalTasks)",
+            ExpressionAttributeValues={
+                ":total": total_delta,
+                ":completed": completed_delta,
+                ":updatedAt": int(time.time() * 1000),
+            },
+            ReturnValues="ALL_NEW",
+        )
+        goal = response.get("Attributes")
+    except ClientError as exc:
+        if exc.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+            raise
+        goal = _seed_goal_task_counters(table, owner_id, goal_id)
+    
+    if not goal:
+        return None
+    return _store_goal_progress(table, owner_id, goal)
+
+
+def refresh_goal_progress(table, owner_id: str, goal: Dict) -> Optional[GoalProgressResponse]:
+    """Recompute and store a goal's progress snapshot without changing its counters (e.g. after a deadline change)."""
+    if not has_task_counters(goal):
+        goal = _seed_goal_task_counters(table, owner_id, goal["id"])
+        if not goal:
+            return None
+    return _store_goal_progress(table, owner_id, goal)
+
+
 def compute_goal_progress(goal_id: str, user_id: str, table) -> GoalProgressResponse:
     """
     Calculate goal progress using hybrid approach: task completion + time-based progress.
@@ -1915,8 +2246,9 @@ def compute_goal_progress(goal_id: str, user_id: str, table) -> GoalProgressResp
     - Fixed 70/30 weight split (task/time)
     - Goals without tasks show 0% progress
     - Deadline is mandatory for all goals
-    - Store progress data in Goal record
-    - Asynchronous recalculation on task operations
+    - Task counts come from the counters stored on the Goal record, which
+      task operations maintain (see update_goal_task_counters); only the time
+      component is computed on read
     
     Args:
         goal_id: The goal ID
@@ -1927,19 +2259,7 @@ def compute_goal_progress(goal_id: str, user_id: str, table) -> GoalProgressResp
         GoalProgressResponse with calculated progress data
     """
     try:
-        # Step 1: Get all tasks for the goal
-        tasks = get_goal_tasks(goal_id, user_id, table)
-        
-        # Step 2: Calculate task completion progress
-        total_tasks = len(tasks)
-        completed_tasks = len([t for t in tasks if t.get('status') == 'completed'])
-        
-        # Goals without tasks show 0% progress (not time-based fallback)
-        task_progress = 0.0
-        if total_tasks > 0:
-            task_progress = (completed_tasks / total_tasks) * 100
-        
-        # Step 3: Get goal data for time calculation
+        # Step 1: Get goal data (task counters and deadline)
         goal_response = table.get_item(
             Key={"PK": f"USER#{user_id}", "SK": f"GOAL#{goal_id}"}
         )
@@ -1949,31 +2269,10 @@ def compute_goal_progress(goal_id: str, user_id: str, table) -> GoalProgressResp
             logger.error('progress.goal_not_found', goal_id=goal_id, user_id=user_id)
             raise HTTPException(status_code=404, detail="Goal not found")
         
-        # Step 4: Calculate time-based progress (deadline is mandatory)
-        time_progress = calculate_time_progress(goal)
-        
-        # Step 5: Calculate hybrid progress (fixed 70/30 weight split)
-        hybrid_progress = (task_progress * 0.7) + (time_progress * 0.3)
-        
-        # Step 6: Determine milestones (fixed thresholds, non-retroactive)
-        milestones = calculate_milestones(hybrid_progress, goal_id)
+        # Step 2: Only goals created before the counters existed need their tasks
+        tasks = None if has_task_counters(goal) else get_goal_tasks(goal_id, user_id, table)
         
-        # Step 7: Determine urgency and overdue status
-        is_overdue = is_goal_overdue(goal)
-        is_urgent = is_goal_urgent(goal)
-        
-        return GoalProgressResponse(
-            goalId=goal_id,
-            progressPercentage=round(hybrid_progress, 2),
-            taskProgress=round(task_progress, 2),
-            timeProgress=round(time_progress, 2),
-            completedTasks=completed_tasks,
-            totalTasks=total_tasks,
-            milestones=milestones,
-            lastUpdated=int(time.time() * 1000),
-            isOverdue=is_overdue,
-            isUrgent=is_urgent
-        )
+        return build_goal_progress({**goal, "id": goal_id}, tasks)
         
     except HTTPException:
         raise
@@ -1996,7 +2295,7 @@ def compute_goal_progress(goal_id: str, user_id: str, table) -> GoalProgressResp
 
 # ---------- Quest Endpoints ----------
 
-@app.post("/quests/createQuest", response_model=QuestResponse, status_code=201)
+@app.post("/quests/createQuest", response_model=QuestResponse, status_code=201, dependencies=[Depends(rate_limited(quest_creation_limiter))])
 async def create_quest_endpoint(
     payload: QuestCreatePayload,
     auth: AuthContext = Depends(authenticate),
@@ -2046,7 +2345,7 @@ async def create_quest_endpoint(
         # Check access to linked goals if any
         if validated_payload.linkedGoalIds:
             for goal_id in validated_payload.linkedGoalIds:
-                has_access, access_type, owner_user_id = check_goal_access(auth.user_id, goal_id, table)
+                has_access, access_type, owner_user_id = await run_dynamodb(check_goal_access, auth.user_id, goal_id, table)
                 if not has_access:
                     logger.warning('quest.create_quest_linked_goal_access_denied', 
                                  user_id=auth.user_id, 
@@ -2062,7 +2361,7 @@ async def create_quest_endpoint(
                            quest_title=validated_payload.title)
         
         # Create quest using database helper
-        quest = create_quest(auth.user_id, validated_payload)
+        quest = await run_dynamodb(create_quest, auth.user_id, validated_payload)
         
         # Log successful quest creation
         audit_logger.log_data_modification(
@@ -2129,7 +2428,7 @@ async def list_user_quests_endpoint(
     
     try:
         # Query for all quests for this user
-        response = table.query(
+        response = await run_dynamodb(table.query,
             KeyConditionExpression=Key("PK").eq(f"USER#{auth.user_id}") & Key("SK").begins_with("QUEST#"),
             ProjectionExpression="PK, SK, id, title, description, linkedGoalIds, #status, difficulty, kind, privacy, createdAt, updatedAt, startedAt, completedAt, failedAt, cancelledAt, #type, userid, rewardXp, category, version, deadline, linkedTaskIds, dependsOnQuestIds, targetCount, countScope, periodDays",
             ExpressionAttributeNames={"#type": "type", "#status": "status"}
@@ -2191,7 +2490,7 @@ async def list_goal_quests_endpoint(
     
     try:
         # First check if user has access to the goal
-        has_access, access_type, owner_user_id = check_goal_access(auth.user_id, goal_id, table)
+        has_access, access_type, owner_user_id = await run_dynamodb(check_goal_access, auth.user_id, goal_id, table)
         
         if not has_access:
             logger.warning('quest.list_goal_quests_access_denied', goal_id=goal_id, user_id=auth.user_id)
@@ -2215,7 +2514,7 @@ async def list_goal_quests_endpoint(
                    quest_user_id=quest_user_id)
         
         # Get quests for the specific goal
-        quests = get_quests_for_goal(quest_user_id, goal_id, table)
+        quests = await run_dynamodb(get_quests_for_goal, quest_user_id, goal_id, table)
         
         logger.info('quest.list_goal_quests_success', 
                    user_id=auth.user_id, 
@@ -2255,7 +2554,7 @@ async def get_quest_simple_endpoint(
     
     try:
         # Use the existing get_quest function which already has collaboration access
-        quest_data = get_quest(auth.user_id, quest_id)
+        quest_data = await run_dynamodb(get_quest, auth.user_id, quest_id)
         
         logger.info('quest.get_success', 
                    quest_id=quest_id, 
@@ -2287,7 +2586,7 @@ async def get_quest_endpoint(
     
     try:
         # Use the existing get_quest function which already has collaboration access
-        quest_data = get_quest(auth.user_id, quest_id)
+        quest_data = await run_dynamodb(get_quest, auth.user_id, quest_id)
         
         logger.info('quest.get_success', 
                    quest_id=quest_id, 
@@ -2320,7 +2619,7 @@ async def get_goal_endpoint(
     
     try:
         # Check if user has access to the goal
-        has_access, access_type, owner_user_id = check_goal_access(auth.user_id, goal_id, table)
+        has_access, access_type, owner_user_id = await run_dynamodb(check_goal_access, auth.user_id, goal_id, table)
         
         if not has_access:
             logger.warning('goal.access_denied', goal_id=goal_id, user_id=auth.user_id)
@@ -2344,7 +2643,7 @@ async def get_goal_endpoint(
                    goal_user_id=goal_user_id)
         
         # Get the goal from the owner
-        response = table.get_item(
+        response = await run_dynamodb(table.get_item,
             Key={"PK": f"USER#{goal_user_id}", "SK": f"GOAL#{goal_id}"}
         )
         
@@ -2400,7 +2699,7 @@ async def start_quest_endpoint(
     
     try:
         # Change quest status to active
-        quest = change_quest_status(auth.user_id, quest_id, "active")
+        quest = await run_dynamodb(change_quest_status, auth.user_id, quest_id, "active")
         
         log_event(logger, 'quests.startQuest_success', 
                  user_id=auth.user_id, quest_id=quest_id)
@@ -2457,10 +2756,10 @@ async def update_quest_endpoint(
     
     try:
         # Get current quest to get version for optimistic locking
-        current_quest = get_quest(auth.user_id, quest_id)
+        current_quest = await run_dynamodb(get_quest, auth.user_id, quest_id)
         
         # Update quest using database helper
-        quest = update_quest(auth.user_id, quest_id, payload, current_quest.version)
+        quest = await run_dynamodb(update_quest, auth.user_id, quest_id, payload, current_quest.version)
         
         log_event(logger, 'quests.updateQuest_success', 
                  user_id=auth.user_id, quest_id=quest_id)
@@ -2512,8 +2811,8 @@ async def cancel_quest_endpoint(
     
     try:
         # Change quest status to cancelled
-        quest = change_quest_status(auth.user_id, quest_id, "cancelled", 
-                                  payload.reason if payload else None)
+        quest = await run_dynamodb(change_quest_status, auth.user_id, quest_id, "cancelled",
+                                   payload.reason if payload else None)
         
         log_event(logger, 'quests.cancelQuest_success', 
                  user_id=auth.user_id, quest_id=quest_id)
@@ -2559,7 +2858,7 @@ async def fail_quest_endpoint(
     
     try:
         # Change quest status to failed
-        quest = change_quest_status(auth.user_id, quest_id, "failed")
+        quest = await run_dynamodb(change_quest_status, auth.user_id, quest_id, "failed")
         
         log_event(logger, 'quests.failQuest_success', 
                  user_id=auth.user_id, quest_id=quest_id)
@@ -2608,7 +2907,7 @@ async def delete_quest_endpoint(
         is_admin = auth.claims.get('role') == 'admin'
         
         # Delete quest using database helper
-        success = delete_quest(auth.user_id, quest_id, is_admin)
+        success = await run_dynamodb(delete_quest, auth.user_id, quest_id, is_admin)
         
         if success:
             log_event(logger, 'quests.deleteQuest_success', 
@@ -2635,7 +2934,7 @@ class QuestCompletionRequest(BaseModel):
     completed_task_id: str
     completed_goal_id: str
 
-@app.post("/quests/check-completion")
+@app.post("/quests/check-completion", dependencies=[Depends(rate_limited(quest_completion_limiter))])
 async def check_quest_completion(
     request: QuestCompletionRequest,
     auth: AuthContext = Depends(authenticate),
@@ -2710,10 +3009,15 @@ async def create_quest_template(
     auth: AuthContext = Depends(authenticate)
 ):
     """Create a new quest template"""
+    from .db.quest_template_db import (
+        create_template, QuestTemplateDBError,
+        QuestTemplateValidationError,
+    )
+
     log_event(logger, 'quest_template.create_start', user_id=auth.user_id, title=payload.title)
     
     try:
-        template = create_template(auth.user_id, payload)
+        template = await run_dynamodb(create_template, auth.user_id, payload)
         log_event(logger, 'quest_template.create_success', user_id=auth.user_id, template_id=template.id)
         return template
     except QuestTemplateValidationError as e:
@@ -2724,7 +3028,7 @@ async def create_quest_template(
         raise HTTPException(status_code=500, detail="Failed to create quest template")
 
 
-@app.get("/quests/analytics", response_model=QuestAnalytics)
+@app.get("/quests/analytics", response_model=QuestAnalytics, dependencies=[Depends(rate_limited(analytics_limiter))])
 async def get_quest_analytics(
     auth: AuthContext = Depends(authenticate),
     period: AnalyticsPeriod = "weekly",
@@ -2741,6 +3045,9 @@ async def get_quest_analytics(
     Returns:
         QuestAnalytics: Comprehensive analytics data
     """
+    from .db.analytics_db import get_cached_analytics, cache_analytics, AnalyticsDBError
+    from .analytics.quest_analytics import calculate_quest_analytics
+
     # Capture start time and input parameters for diagnostics
     t_start = time.perf_counter()
     log_event(
@@ -2762,7 +3069,7 @@ async def get_quest_analytics(
                 period=period,
             )
             try:
-                cached_analytics = get_cached_analytics(auth.user_id, period)
+                cached_analytics = await run_dynamodb(get_cached_analytics, auth.user_id, period)
                 cache_lookup_duration_ms = int((time.perf_counter() - t_cache_start) * 1000)
                 if cached_analytics:
                     age_s = max(0, int(time.time()) - int(getattr(cached_analytics, 'calculatedAt', 0)))
@@ -2811,7 +3118,7 @@ async def get_quest_analytics(
             user_id=auth.user_id,
             period=period,
         )
-        quests = list_user_quests(auth.user_id)
+        quests = await run_dynamodb(list_user_quests, auth.user_id)
         log_event(
             logger,
             'quest_analytics.list_quests_success',
@@ -2845,7 +3152,7 @@ async def get_quest_analytics(
         # Save to cache (non-blocking to result; errors are logged)
         t_cache_save_start = time.perf_counter()
         try:
-            cache_analytics(analytics)
+            await run_dynamodb(cache_analytics, analytics)
             log_event(
                 logger,
                 'quest_analytics.cache_save_success',
@@ -2905,10 +3212,15 @@ async def update_quest_template(
     auth: AuthContext = Depends(authenticate)
 ):
     """Update a quest template"""
+    from .db.quest_template_db import (
+        update_template, QuestTemplateDBError, QuestTemplateNotFoundError,
+        QuestTemplatePermissionError, QuestTemplateValidationError,
+    )
+
     log_event(logger, 'quest_template.update_start', user_id=auth.user_id, template_id=template_id)
     
     try:
-        template = update_template(template_id, auth.user_id, payload)
+        template = await run_dynamodb(update_template, template_id, auth.user_id, payload)
         log_event(logger, 'quest_template.update_success', user_id=auth.user_id, template_id=template_id)
         return template
     except QuestTemplateNotFoundError as e:
@@ -2931,10 +3243,15 @@ async def delete_quest_template(
     auth: AuthContext = Depends(authenticate)
 ):
     """Delete a quest template"""
+    from .db.quest_template_db import (
+        delete_template, QuestTemplateDBError, QuestTemplateNotFoundError,
+        QuestTemplatePermissionError,
+    )
+
     log_event(logger, 'quest_template.delete_start', user_id=auth.user_id, template_id=template_id)
     
     try:
-        delete_template(template_id, auth.user_id)
+        await run_dynamodb(delete_template, template_id, auth.user_id)
         log_event(logger, 'quest_template.delete_success', user_id=auth.user_id, template_id=template_id)
         return {"success": True, "message": "Quest template deleted successfully"}
     except QuestTemplateNotFoundError as e:
@@ -2956,13 +3273,18 @@ async def list_quest_templates(
     privacy: str = "user"  # "user", "public", "all"
 ):
     """List quest templates"""
+    from .db.quest_template_db import (
+        list_user_templates, list_public_templates,
+        QuestTemplateDBError,
+    )
+
     log_event(logger, 'quest_template.list_start', user_id=auth.user_id, limit=limit, privacy=privacy)
     
     try:
         if privacy == "public":
-            result = list_public_templates(limit, next_token)
+            result = await run_dynamodb(list_public_templates, limit, next_token)
         else:
-            result = list_user_templates(auth.user_id, limit, next_token)
+            result = await run_dynamodb(list_user_templates, auth.user_id, limit, next_token)
         
         log_event(logger, 'quest_template.list_success', 
                  user_id=auth.user_id, 
@@ -2983,19 +3305,58 @@ async def list_quest_templates(
 
 
 # Lambda handler for both GraphQL resolvers and API Gateway requests
+# Cold-start timings for this container, in milliseconds
+_cold_start_metrics: Dict[str, Optional[float]] = {
+    "moduleImportMs": None,
+    "adapterInitMs": None,
+    "firstInvocationMs": None,
+}
+_invocation_count = 0
+
+
+def get_cold_start_metrics() -> Dict:
+    """Return the cold-start timings recorded by this container."""
+    return {**_cold_start_metrics, "invocations": _invocation_count}
+
+
+@lru_cache(maxsize=1)
+def _mangum_handler():
+    """Build the API Gateway adapter once per container and reuse it on warm invocations."""
+    # mangum import is done here to avoid import-time dependency issues
+    from mangum import Mangum  # type: ignore
+
+    started = time.perf_counter()
+    # Lifespan events would re-run the startup hooks on every invocation
+    handler = Mangum(app, lifespan="off")
+    _cold_start_metrics["adapterInitMs"] = round((time.perf_counter() - started) * 1000, 2)
+    _log_registered_routes()
+    return handler
+
+
 def lambda_handler(event, context):
     """
     Lambda handler for GraphQL resolver invocations and API Gateway requests
     """
+    global _invocation_count
+    _invocation_count += 1
+    if _invocation_count > 1:
+        return _handle_lambda_event(event, context)
+
+    started = time.perf_counter()
+    try:
+        return _handle_lambda_event(event, context)
+    finally:
+        _cold_start_metrics["firstInvocationMs"] = round((time.perf_counter() - started) * 1000, 2)
+        logger.info('lambda.cold_start', **_cold_start_metrics)
+
+
+def _handle_lambda_event(event, context):
     try:
         # Check if this is an API Gateway request
         if 'httpMethod' in event and 'path' in event:
             # This is an API Gateway request, use the FastAPI app
-            # Note: mangum import is done here to avoid import-time dependency issues
             try:
-                from mangum import Mangum  # type: ignore
-                handler = Mangum(app)
-                return handler(event, context)
+                handler = _mangum_handler()
             except ImportError:
                 # Fallback if mangum is not available
                 logger.error('mangum_import_failed', exc_info=True)
@@ -3004,6 +3365,7 @@ def lambda_handler(event, context):
                     'body': '{"error": "Mangum adapter not available"}',
                     'headers': {'Content-Type': 'application/json'}
                 }
+            return handler(event, context)
         
         # Otherwise, handle as GraphQL resolver
         operation = event.get('operation')
@@ -3032,25 +3394,8 @@ def lambda_handler(event, context):
             # Get DynamoDB table
             table = get_goals_table()
             
-            # Get all user goals
-            response = table.query(
-                KeyConditionExpression=Key("PK").eq(f"USER#{user_id}") & Key("SK").begins_with("GOAL#")
-            )
-            goals = response.get("Items", [])
-            
-            # Calculate progress for each goal
-            progress_list = []
-            for goal in goals:
-                goal_id = goal.get("id")
-                if goal_id:
-                    try:
-                        progress_data = compute_goal_progress(goal_id, user_id, table)
-                        progress_list.append(progress_data.dict())
-                    except Exception as exc:
-                        logger.error('progress.calculation_failed', goal_id=goal_id, user_id=user_id, exc_info=exc)
-                        continue
-            
-            return progress_list
+            # Calculate progress for every goal from one goals and one tasks query
+            return [progress.dict() for progress in compute_all_goals_progress(user_id, table)]
             
         elif operation == 'getMyGoalsWithCollaboration':
             user_id = event.get('userId')
@@ -3071,47 +3416,10 @@ def lambda_handler(event, context):
             except Exception as e:
                 logger.error(f"Failed to get owned goals for user {user_id}: {str(e)}")
             
-            # Get collaborated goals
+            # Get collaborated goals (one collaborations query + one BatchGetItem)
             collaborated_goals = []
             try:
-                # Query GSI1 for user's collaborations
-                gsi1pk = f"USER#{user_id}"
-                collaborator_response = table.query(
-                    IndexName="GSI1",
-                    KeyConditionExpression=Key("GSI1PK").eq(gsi1pk) & Key("GSI1SK").begins_with("COLLAB#GOAL#"),
-                    ScanIndexForward=False
-                )
-                
-                # For each collaboration, get the actual goal from the owner
-                for collab_item in collaborator_response.get("Items", []):
-                    try:
-                        # Extract goal ID from GSI1SK (COLLAB#GOAL#{goal_id})
-                        gsi1sk = collab_item.get("GSI1SK", "")
-                        if gsi1sk.startswith("COLLAB#GOAL#"):
-                            goal_id = gsi1sk.replace("COLLAB#GOAL#", "")
-                            
-                            # Find the owner by scanning for the goal
-                            owner_scan = table.scan(
-                                FilterExpression=Attr("type").eq("Goal") & Attr("id").eq(goal_id),
-                                ProjectionExpression="PK",
-                                Limit=1
-                            )
-                            
-                            if owner_scan.get("Items"):
-                                owner_pk = owner_scan["Items"][0]["PK"]
-                                owner_user_id = owner_pk.replace("USER#", "")
-                                
-                                # Get the goal from the owner
-                                goal_response = table.get_item(
-                                    Key={"PK": f"USER#{owner_user_id}", "SK": f"GOAL#{goal_id}"}
-                                )
-                                
-                                if "Item" in goal_response:
-                                    collaborated_goals.append(goal_response["Item"])
-                    except Exception as e:
-                        logger.warning(f"Failed to get collaborated goal: {str(e)}")
-                        continue
-                        
+                collaborated_goals = get_collaborated_goals(user_id, table)
             except Exception as e:
                 logger.error(f"Failed to get collaborated goals for user {user_id}: {str(e)}")
             
@@ -3220,3 +3528,6 @@ def lambda_handler(event, context):
     except Exception as exc:
         logger.error('lambda_handler.error', exc_info=exc)
         raise exc
+
+
+_cold_start_metrics["moduleImportMs"] = round((time.perf_counter() - _MODULE_LOAD_STARTED) * 1000, 2)
@@ -1,7 +1,17 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 # Add the services directory to Python path so we can import app.main
 services_dir = Path(__file__).resolve().parents[2]
 if str(services_dir) not in sys.path:
     sys.path.insert(0, str(services_dir))
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits() -> None:
+    """Tests reuse a handful of user ids, so start each one with full rate limits."""
+    from common.rate_limit import default_backend
+
+    default_backend().reset()
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 from unittest.mock import Mock, patch
 from fastapi.testclient import TestClient
@@ -110,6 +112,42 @@ def test_delete_goal_success(app_client):
     assert resp.json()["message"].startswith("Goal")
 
 
+def test_goal_routes_call_dynamodb_off_the_event_loop(app_client):
+    client, mock_table = app_client
+    calls_on_loop = []
+
+    def recording(result):
+        def call(*args, **kwargs):
+            try:
+                asyncio.get_running_loop()
+                calls_on_loop.append(True)
+            except RuntimeError:
+                calls_on_loop.append(False)
+            return result
+        return call
+
+    existing = {
+        "PK": "USER#user-123",
+        "SK": "GOAL#gid-3",
+        "id": "gid-3",
+        "userId": "user-123",
+        "title": "Off the loop",
+        "status": "active",
+        "deadline": "2025-12-31",
+        "createdAt": 1,
+        "updatedAt": 1,
+    }
+    mock_table.get_item.side_effect = recording({"Item": existing})
+    mock_table.query.side_effect = recording({"Items": [{"id": "t1"}]})
+    mock_table.delete_item.side_effect = recording({})
+
+    resp = client.delete("/quests/gid-3", headers={"Authorization": "Bearer test"})
+
+    assert resp.status_code == 200
+    # get goal, query tasks, delete task, delete goal
+    assert calls_on_loop == [False, False, False, False]
+
+
 def test_create_task_success(app_client):
     client, mock_table = app_client
 
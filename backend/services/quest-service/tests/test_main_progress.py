@@ -82,3 +82,106 @@ def test_compute_goal_progress_happy_path():
     assert gp.totalTasks == 0
 
 
+
+
+def test_compute_all_goals_progress_uses_two_queries():
+    from app.main import compute_all_goals_progress
+    created = int((datetime.datetime.now() - datetime.timedelta(days=1)).timestamp() * 1000)
+    deadline = (datetime.datetime.now() + datetime.timedelta(days=10)).strftime('%Y-%m-%d')
+    goals = [{"id": f"g{i}", "createdAt": created, "deadline": deadline} for i in range(20)]
+    tasks = [
+        {"goalId": "g0", "status": "completed"},
+        {"goalId": "g0", "status": "active"},
+        {"goalId": "g1", "status": "completed"},
+    ]
+    table = Mock()
+    # Goals come back in two pages, tasks in one
+    table.query.side_effect = [
+        {"Items": goals[:10], "LastEvaluatedKey": {"PK": "USER#user-123", "SK": "GOAL#g9"}},
+        {"Items": goals[10:]},
+        {"Items": tasks},
+    ]
+
+    progress = compute_all_goals_progress("user-123", table)
+
+    assert table.query.call_count == 3
+    assert table.query.call_args_list[1].kwargs["ExclusiveStartKey"] == {"PK": "USER#user-123", "SK": "GOAL#g9"}
+    table.get_item.assert_not_called()
+    assert len(progress) == 20
+    by_goal = {p.goalId: p for p in progress}
+    assert (by_goal["g0"].completedTasks, by_goal["g0"].totalTasks) == (1, 2)
+    assert by_goal["g1"].taskProgress == 100.0
+    assert by_goal["g5"].totalTasks == 0
+
+
+def _goal_with_counters(total, completed):
+    return {
+        "id": "g1",
+        "createdAt": int((datetime.datetime.now() - datetime.timedelta(days=1)).timestamp() * 1000),
+        "deadline": (datetime.datetime.now() + datetime.timedelta(days=10)).strftime('%Y-%m-%d'),
+        "totalTasks": total,
+        "completedTasks": completed,
+    }
+
+
+def test_task_counter_deltas():
+    from app.main import task_counter_deltas
+    active = {"status": "active"}
+    done = {"status": "completed"}
+    assert task_counter_deltas(None, active) == (1, 0)
+    assert task_counter_deltas(active, done) == (0, 1)
+    assert task_counter_deltas(done, active) == (0, -1)
+    assert task_counter_deltas(done, done) == (0, 0)
+    assert task_counter_deltas(done, None) == (-1, -1)
+
+
+def test_update_goal_task_counters_adds_and_stores_snapshot():
+    from app.main import update_goal_task_counters
+    table = Mock()
+    table.update_item.side_effect = [{"Attributes": _goal_with_counters(4, 3)}, {}]
+
+    progress = update_goal_task_counters(table, "user-123", "g1", 0, 1)
+
+    counter_call, snapshot_call = table.update_item.call_args_list
+    assert counter_call.kwargs["UpdateExpression"].startswith("ADD totalTasks :total, completedTasks :completed")
+    assert counter_call.kwargs["ExpressionAttributeValues"][":completed"] == 1
+    assert snapshot_call.kwargs["ExpressionAttributeValues"][":totalTasks"] == 4
+    assert (progress.completedTasks, progress.totalTasks, progress.taskProgress) == (3, 4, 75.0)
+    table.query.assert_not_called()
+
+
+def test_update_goal_task_counters_seeds_legacy_goal():
+    from app.main import update_goal_task_counters
+    table = Mock()
+    conditional = ClientError({'Error': {'Code': 'ConditionalCheckFailedException', 'Message': 'msg'}}, 'UpdateItem')
+    table.update_item.side_effect = [conditional, {"Attributes": _goal_with_counters(2, 1)}, {}]
+    table.query.return_value = {"Items": [{"status": "completed"}, {"status": "active"}]}
+
+    progress = update_goal_task_counters(table, "user-123", "g1", 1, 0)
+
+    seed_call = table.update_item.call_args_list[1]
+    assert seed_call.kwargs["ExpressionAttributeValues"] == {":total": 2, ":completed": 1}
+    assert "attribute_not_exists(totalTasks)" in seed_call.kwargs["ConditionExpression"]
+    assert progress.totalTasks == 2
+
+
+def test_update_goal_task_counters_noop_without_changes():
+    from app.main import update_goal_task_counters
+    table = Mock()
+    assert update_goal_task_counters(table, "user-123", "g1") is None
+    table.update_item.assert_not_called()
+
+
+def test_progress_reads_use_counters_without_task_queries():
+    from app.main import compute_goal_progress, compute_all_goals_progress
+    table = Mock()
+    table.get_item.return_value = {"Item": _goal_with_counters(5, 5)}
+    table.query.return_value = {"Items": [_goal_with_counters(5, 5)]}
+
+    single = compute_goal_progress("g1", "user-123", table)
+    table.query.assert_not_called()
+    progress = compute_all_goals_progress("user-123", table)
+
+    assert single.taskProgress == 100.0
+    assert table.query.call_count == 1
+    assert progress[0].completedTasks == 5
@@ -76,7 +76,7 @@ class FakeTable:
         key = (Key["PK"], Key["SK"])
         return {"Item": self.items.get(key)}
 
-    def query(self, KeyConditionExpression, FilterExpression=None):  # noqa: N802 - boto interface
+    def query(self, KeyConditionExpression, FilterExpression=None, **kwargs):  # noqa: N802 - boto interface
         # Simple mock implementation for testing
         results = []
         
@@ -90,6 +90,9 @@ class FakeTable:
                     # Apply goalId filter for tasks
                     if item.get("goalId") == "test-goal-1":  # Hardcoded for test
                         results.append(item)
+                elif sk.startswith("TASK#") and "ProjectionExpression" in kwargs:
+                    # Bulk progress reads every task of the user
+                    results.append(item)
                 elif sk.startswith("GOAL#") and not FilterExpression:
                     # Return goals without filter
                     results.append(item)
@@ -0,0 +1,87 @@
+"""Tests for the per-user quest-service rate limits."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from common.rate_limit import RateLimit
+
+
+@pytest.fixture
+def app_client():
+    with patch('app.settings.Settings') as mock_settings:
+        mock_settings.return_value.environment = 'test'
+        mock_settings.return_value.aws_region = 'us-east-1'
+        mock_settings.return_value.core_table_name = 'gg_core_test'
+        mock_settings.return_value.allowed_origins = ["http://localhost:3000"]
+
+        from app.main import app, authenticate, get_goals_table, AuthContext
+
+        app.dependency_overrides[authenticate] = lambda: AuthContext(user_id="user-123", claims={}, provider="local")
+        app.dependency_overrides[get_goals_table] = lambda: Mock()
+
+        yield TestClient(app)
+
+        app.dependency_overrides.clear()
+
+
+def test_quest_creation_limit_returns_429_with_rate_limit_headers(app_client, monkeypatch):
+    from app.security.rate_limiter import quest_creation_limiter
+
+    monkeypatch.setattr(quest_creation_limiter, "rate", RateLimit(limit=1, period_seconds=60))
+    payload = {"title": "Read a book", "category": "Learning", "deadline": "2030-12-31"}
+
+    first = app_client.post("/quests", json=payload, headers={"Authorization": "Bearer test"})
+    assert first.status_code == 201
+    assert first.headers["X-RateLimit-Limit"] == "1"
+    assert first.headers["X-RateLimit-Remaining"] == "0"
+
+    second = app_client.post("/quests", json=payload, headers={"Authorization": "Bearer test"})
+    assert second.status_code == 429
+    assert int(second.headers["Retry-After"]) > 0
+    assert second.json()["detail"]["limit"] == 1
+
+
+def test_limits_are_tracked_per_user(app_client, monkeypatch):
+    from app.main import app, authenticate, AuthContext
+    from app.security.rate_limiter import analytics_limiter
+
+    monkeypatch.setattr(analytics_limiter, "rate", RateLimit(limit=1, period_seconds=60))
+    with patch('app.db.analytics_db.get_cached_analytics', side_effect=RuntimeError("no table")):
+        assert app_client.get("/quests/analytics").status_code != 429
+        assert app_client.get("/quests/analytics").status_code == 429
+
+        app.dependency_overrides[authenticate] = lambda: AuthContext(user_id="user-456", claims={}, provider="local")
+        assert app_client.get("/quests/analytics").status_code != 429
+
+
+@pytest.mark.asyncio
+async def test_authenticate_applies_the_general_limit(monkeypatch):
+    from app.main import authenticate
+    from app.security.rate_limiter import general_limiter
+
+    monkeypatch.setattr(general_limiter, "rate", RateLimit(limit=1, period_seconds=60))
+    verifier = Mock()
+    verifier.verify.return_value = ({"sub": "7c9e6679-7425-40de-944b-e07fc1f90ae7"}, "local")
+
+    def make_request():
+        return Request({
+            "type": "http",
+            "method": "GET",
+            "path": "/quests",
+            "headers": [(b"authorization", b"Bearer good")],
+            "client": ("testclient", 123),
+        })
+
+    with patch('app.main._token_verifier', return_value=verifier):
+        request = make_request()
+        auth = await authenticate(request)
+        assert request.state.auth_context is auth
+
+        with pytest.raises(HTTPException) as exc_info:
+            await authenticate(make_request())
+
+    assert exc_info.value.status_code == 429
@@ -4,7 +4,6 @@ import os
 import sys
 import time
 import uuid
-from collections import defaultdict, deque
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Any, Callable, Dict, Optional, Tuple
@@ -26,6 +25,7 @@ if str(_SERVICES_DIR) not in sys.path:
     sys.path.append(str(_SERVICES_DIR))
 
 from common.logging import get_structured_logger, log_event
+from common.rate_limit import RateLimit, RateLimiter, install_rate_limit_headers
 
 from .models import (
     ConfirmEmailResponse,
@@ -127,17 +127,23 @@ RESET_PASSWORD_TTL = 60 * 60  # 1h
 BLOCK_THRESHOLD = 3
 AVAILABILITY_RATE_LIMIT = 30  # requests per window per IP
 AVAILABILITY_RATE_WINDOW_SECONDS = 60  # window seconds
-_availability_hits: dict[str, deque[float]] = defaultdict(deque)
+_availability_limiter = RateLimiter(
+    "user:availability", RateLimit(limit=AVAILABILITY_RATE_LIMIT, period_seconds=AVAILABILITY_RATE_WINDOW_SECONDS)
+)
 
 # Waitlist rate limiting (low rate limit: 5 requests per minute per IP)
 WAITLIST_RATE_LIMIT = 5  # requests per window per IP
 WAITLIST_RATE_WINDOW_SECONDS = 60  # 1 minute window
-_waitlist_hits: dict[str, deque[float]] = defaultdict(deque)
+_waitlist_limiter = RateLimiter(
+    "user:waitlist", RateLimit(limit=WAITLIST_RATE_LIMIT, period_seconds=WAITLIST_RATE_WINDOW_SECONDS)
+)
 
 # Contact form rate limiting (stricter: 3 requests per 5 minutes per IP)
 CONTACT_RATE_LIMIT = 3  # requests per window per IP
 CONTACT_RATE_WINDOW_SECONDS = 300  # 5 minute window
-_contact_hits: dict[str, deque[float]] = defaultdict(deque)
+_contact_limiter = RateLimiter(
+    "user:contact", RateLimit(limit=CONTACT_RATE_LIMIT, period_seconds=CONTACT_RATE_WINDOW_SECONDS)
+)
 
 # -------------------------
 # Logging
@@ -177,53 +183,45 @@ def _safe_event(event: str, **kwargs):
     log_event(logger, event, **kwargs)
 
 
-def _enforce_availability_rate_limit(request: Request) -> None:
+async def _enforce_availability_rate_limit(request: Request) -> None:
     host = request.client.host if request.client else "unknown"
-    now = time.time()
-    dq = _availability_hits[host]
-    # Drop stale timestamps
-    while dq and now - dq[0] > AVAILABILITY_RATE_WINDOW_SECONDS:
-        dq.popleft()
-    if len(dq) >= AVAILABILITY_RATE_LIMIT:
-        _safe_event("availability.rate_limited", client=host, hits=len(dq))
-        raise HTTPException(status_code=429, detail="Too many availability checks. Please wait and try again.")
-    dq.append(now)
+    decision = await _availability_limiter.check_async(host)
+    if not decision.allowed:
+        _safe_event("availability.rate_limited", client=host, retry_after=decision.retry_after)
+        raise HTTPException(
+            status_code=429,
+            detail="Too many availability checks. Please wait and try again.",
+            headers=decision.headers(),
+        )
 
 
 def _enforce_waitlist_rate_limit(request: Request) -> None:
     """Enforce rate limiting for waitlist subscriptions (5 requests per minute per IP)."""
     client_ip = _client_ip(request)
     host = client_ip if client_ip else (request.client.host if request.client else "unknown")
-    now = time.time()
-    dq = _waitlist_hits[host]
-    # Drop stale timestamps
-    while dq and now - dq[0] > WAITLIST_RATE_WINDOW_SECONDS:
-        dq.popleft()
-    if len(dq) >= WAITLIST_RATE_LIMIT:
-        _safe_event("waitlist.rate_limited", client=host, hits=len(dq), ip=client_ip)
+    # Sync endpoints run in the threadpool, so the blocking check is fine here
+    decision = _waitlist_limiter.check(host)
+    if not decision.allowed:
+        _safe_event("waitlist.rate_limited", client=host, retry_after=decision.retry_after, ip=client_ip)
         raise HTTPException(
             status_code=429,
-            detail=f"Too many waitlist subscription attempts. Please wait {WAITLIST_RATE_WINDOW_SECONDS} seconds and try again."
+            detail=f"Too many waitlist subscription attempts. Please wait {WAITLIST_RATE_WINDOW_SECONDS} seconds and try again.",
+            headers=decision.headers(),
         )
-    dq.append(now)
 
 
 def _enforce_contact_rate_limit(request: Request) -> None:
     """Enforce rate limiting for contact form submissions (3 requests per 5 minutes per IP)."""
     client_ip = _client_ip(request)
     host = client_ip if client_ip else (request.client.host if request.client else "unknown")
-    now = time.time()
-    dq = _contact_hits[host]
-    # Drop stale timestamps
-    while dq and now - dq[0] > CONTACT_RATE_WINDOW_SECONDS:
-        dq.popleft()
-    if len(dq) >= CONTACT_RATE_LIMIT:
-        _safe_event("contact.rate_limited", client=host, hits=len(dq), ip=client_ip)
+    decision = _contact_limiter.check(host)
+    if not decision.allowed:
+        _safe_event("contact.rate_limited", client=host, retry_after=decision.retry_after, ip=client_ip)
         raise HTTPException(
             status_code=429,
-            detail="Too many contact form submissions. Please wait a few minutes and try again."
+            detail="Too many contact form submissions. Please wait a few minutes and try again.",
+            headers=decision.headers(),
         )
-    dq.append(now)
 
 
 def _validate_contact_input(name: str, email: str, subject: str, message: str) -> None:
@@ -405,6 +403,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# X-RateLimit-* headers for the availability, waitlist and contact limits
+install_rate_limit_headers(app)
+
 # Hardening: ensure CORS headers on all responses (including errors) when
 # the request Origin is allowed. Some adapters or frameworks may occasionally
 # omit ACAO on non-2xx responses; this guarantees it for browsers.
@@ -1725,7 +1726,7 @@ async def get_subscription_key_endpoint(
 
 @app.get("/appsync/availability-key", response_model=AvailabilityKeyResponse)
 async def get_availability_key_endpoint(request: Request) -> AvailabilityKeyResponse:
-    _enforce_availability_rate_limit(request)
+    await _enforce_availability_rate_limit(request)
     try:
         expires_at = _resolve_expiry(settings.appsync_availability_key_expires_at, fallback_minutes=15)
         api_key = settings.appsync_availability_key
@@ -39,9 +39,9 @@ def _issue_token(email: str = "user@example.com", user_id: str = "user-123") ->
     return token_data["access_token"]
 
 
-def _availability_hits():
+def _reset_availability_limit():
     from app import main as app_main
-    return app_main._availability_hits
+    app_main._availability_limiter.backend.reset()
 
 
 @pytest.fixture
@@ -73,18 +73,23 @@ def test_get_subscription_key_success(client: TestClient):
 
 
 def test_get_availability_key_success(client: TestClient):
-    _availability_hits().clear()
+    _reset_availability_limit()
     resp = client.get('/appsync/availability-key')
     assert resp.status_code == 200
     json_body = resp.json()
     assert json_body['apiKey'] == 'test-availability-key'
+    assert resp.headers['X-RateLimit-Limit'] == '30'
+    assert resp.headers['X-RateLimit-Remaining'] == '29'
     assert json_body['expiresAt'] == '2099-01-01T00:00:00Z'
 
 
 def test_get_availability_key_rate_limited(client: TestClient):
-    _availability_hits().clear()
+    _reset_availability_limit()
     for _ in range(30):
         assert client.get('/appsync/availability-key').status_code == 200
     resp = client.get('/appsync/availability-key')
     assert resp.status_code == 429
     assert resp.json()['detail'].startswith('Too many availability checks')
+    assert int(resp.headers['Retry-After']) >= 1
+    assert resp.headers['X-RateLimit-Remaining'] == '0'
+